@@ -0,0 +1,43 @@
+"""applications user_id created_at index
+
+Revision ID: 3c7a9e1d5f42
+Revises: b5e81f0c2a47
+Create Date: 2026-10-17 15:02:41.318207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c7a9e1d5f42'
+down_revision: Union[str, Sequence[str], None] = 'b5e81f0c2a47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY не блокирует запись в таблицу, но не работает в транзакции
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_applications_user_id_created_at',
+            'applications',
+            ['user_id', sa.text('created_at DESC')],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_applications_user_id_created_at',
+            table_name='applications',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
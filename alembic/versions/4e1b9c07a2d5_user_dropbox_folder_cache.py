@@ -0,0 +1,46 @@
+"""user dropbox folder cache
+
+Revision ID: 4e1b9c07a2d5
+Revises: cd80b6303db0
+Create Date: 2026-10-17 11:02:17.540913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '4e1b9c07a2d5'
+down_revision: Union[str, Sequence[str], None] = 'cd80b6303db0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'user_sessions',
+        sa.Column(
+            'dropbox_folder_path',
+            sa.String(),
+            nullable=True,
+            comment='Кэшированный путь к Dropbox-папке.',
+        ),
+    )
+    op.add_column(
+        'user_sessions',
+        sa.Column(
+            'dropbox_subfolders',
+            postgresql.ARRAY(sa.String()),
+            nullable=True,
+            comment='Известные существующие подпапки Dropbox-папки пользователя.',
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('user_sessions', 'dropbox_subfolders')
+    op.drop_column('user_sessions', 'dropbox_folder_path')
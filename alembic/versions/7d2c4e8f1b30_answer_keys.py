@@ -0,0 +1,178 @@
+"""answer keys
+
+Revision ID: 7d2c4e8f1b30
+Revises: 9a3f5d21c6e8
+Create Date: 2026-10-17 13:05:41.278310
+
+"""
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '7d2c4e8f1b30'
+down_revision: Union[str, Sequence[str], None] = '9a3f5d21c6e8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Ключи версии 1 — копия ключей, зашитых в utilities/check_function.py на момент
+# этой миграции. Копия, а не импорт: сид не должен меняться вместе с кодом
+# и данными приложения.
+SEED_ANSWER_KEY = {
+    'Starter': {
+        'task1': {
+            '1': 'C', '2': 'C', '3': 'B', '4': 'C', '5': 'C', '6': 'B',
+            '7': 'A', '8': 'B', '9': 'C', '10': 'D', '11': 'B', '12': 'C',
+            '13': 'C', '14': 'B', '15': 'B', '16': 'A', '17': 'C', '18': 'C',
+            '19': 'A', '20': 'B',
+        },
+        'task2': {
+            '1': 'C', '2': 'C', '3': 'A', '4': 'A', '5': 'A', '6': 'A',
+            '7': 'B', '8': 'A', '9': 'A', '10': 'C', '11': 'A', '12': 'B',
+            '13': 'A', '14': 'A', '15': 'B', '16': 'A', '17': 'B', '18': 'A',
+            '19': 'A', '20': 'A',
+        },
+    },
+    'Elementary': {
+        'task1': {
+            '1': 'B', '2': 'A', '3': 'B', '4': 'C', '5': 'B', '6': 'A',
+            '7': 'B', '8': 'C', '9': 'A', '10': 'A', '11': 'B', '12': 'A',
+            '13': 'B', '14': 'B', '15': 'A',
+        },
+        'task2': {
+            '1': 'B', '2': 'False', '3': ['Monday', 'Mon'], '4': 'B', '5': 'C',
+            '6': 'True', '7': ['2', 'two'], '8': 'C', '9': 'C', '10': 'False',
+        },
+        'task3': {
+            '1': 'B', '2': 'B', '3': 'B', '4': 'B', '5': 'B', '6': 'B',
+            '7': 'B', '8': 'A', '9': 'C', '10': 'C',
+        },
+    },
+    'Pre-Intermediate': {
+        'task1': {
+            '1': 'B', '2': 'B', '3': 'A', '4': 'B', '5': 'B', '6': 'C',
+            '7': 'C', '8': 'A', '9': 'B', '10': 'B', '11': 'B', '12': 'C',
+            '13': 'B', '14': 'C', '15': 'B',
+        },
+        'task2': {
+            '1': 'C', '2': 'B', '3': 'B', '4': 'C',
+            '5': ['four days', '4 days'], '6': 'pasta',
+            '7': ['90 minutes', 'ninety minutes'], '8': 'south',
+            '9': ['3', 'three'], '10': ['2', 'two'], '11': ['1', 'one'],
+            '12': 'C',
+        },
+        'task3': {
+            '1': 'B', '2': 'C', '3': 'D', '4': 'B', '5': 'A', '6': 'B',
+            '7': 'B', '8': 'B', '9': 'A', '10': 'C', '11': 'C', '12': 'A',
+            '13': 'A', '14': 'C', '15': 'B',
+        },
+    },
+    'Intermediate': {
+        'task1': {
+            '1': 'C', '2': 'B', '3': 'A', '4': 'C', '5': 'B', '6': 'B',
+            '7': 'A', '8': 'B', '9': 'B', '10': 'A', '11': 'A', '12': 'C',
+            '13': 'B', '14': 'B', '15': 'B',
+        },
+        'task2': {
+            '1': 'C', '2': 'B', '3': 'D', '4': 'C', '5': 'C', '6': 'school',
+            '7': 'rebuild', '8': 'families', '9': 'flight', '10': 'next year',
+            '11': '1', '12': '2', '13': '4', '14': '3', '15': '5',
+        },
+        'task3': {
+            '1': 'C', '2': 'C', '3': 'C', '4': 'B', '5': 'D', '6': 'C',
+            '7': 'C', '8': 'C', '9': 'D', '10': 'C', '11': 'B', '12': 'C',
+            '13': 'C', '14': 'D', '15': 'C',
+        },
+    },
+    'Upper-Intermediate': {
+        'task1': {
+            '1': 'A', '2': 'A', '3': 'A', '4': 'C', '5': 'A', '6': 'A',
+            '7': 'B', '8': 'B', '9': 'B', '10': 'A', '11': 'A', '12': 'C',
+            '13': 'C', '14': 'A', '15': 'C',
+        },
+        'task2': {
+            '1': 'C', '2': 'B', '3': 'D', '4': 'C', '5': 'B', '6': 'C',
+            '7': 'C', '8': 'C', '9': 'C', '10': 'B',
+        },
+        'task3': {
+            '1': 'B', '2': 'C', '3': 'D', '4': 'A', '5': 'B', '6': 'D',
+            '7': 'A', '8': 'C', '9': 'B', '10': 'D', '11': 'B',
+        },
+    },
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    answer_keys = op.create_table(
+        'answer_keys',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column(
+            'level',
+            sa.Enum(
+                'starter', 'elementary', 'pre_intermediate', 'intermediate',
+                'upper_intermediate', 'advanced',
+                name='level_enum', native_enum=False,
+            ),
+            nullable=False,
+        ),
+        sa.Column('task', sa.String(length=50), nullable=False),
+        sa.Column('question', sa.String(length=20), nullable=False),
+        sa.Column(
+            'accepted_answers', postgresql.ARRAY(sa.String()), nullable=False
+        ),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint(
+            'level', 'task', 'question', 'version',
+            name='uq_answer_keys_question',
+        ),
+    )
+    op.add_column(
+        'test_results',
+        sa.Column(
+            'answer_key_version',
+            sa.Integer(),
+            nullable=True,
+            comment='Версия ключей ответов, по которой проверен результат.',
+        ),
+    )
+
+    # Версия 1 — ключи, ранее зашитые в utilities/check_function.py
+    level_names = {
+        'Starter': 'starter',
+        'Elementary': 'elementary',
+        'Pre-Intermediate': 'pre_intermediate',
+        'Intermediate': 'intermediate',
+        'Upper-Intermediate': 'upper_intermediate',
+        'Advanced': 'advanced',
+    }
+    # Значение, а не func.now(): bulk_insert передаёт строки параметрами
+    created_at = datetime.now(timezone.utc)
+    rows = []
+    for level, tasks in SEED_ANSWER_KEY.items():
+        for task, questions in tasks.items():
+            for question, correct in questions.items():
+                rows.append(
+                    {
+                        'version': 1,
+                        'level': level_names[level],
+                        'task': task,
+                        'question': question,
+                        'accepted_answers': (
+                            [correct] if isinstance(correct, str) else list(correct)
+                        ),
+                        'created_at': created_at,
+                    }
+                )
+    op.bulk_insert(answer_keys, rows)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('test_results', 'answer_key_version')
+    op.drop_table('answer_keys')
@@ -0,0 +1,59 @@
+"""notification outbox
+
+Revision ID: 9a3f5d21c6e8
+Revises: 4e1b9c07a2d5
+Create Date: 2026-10-17 12:20:05.113462
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a3f5d21c6e8'
+down_revision: Union[str, Sequence[str], None] = '4e1b9c07a2d5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'notification_outbox',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('chat_id', sa.BigInteger(), nullable=False),
+        sa.Column('text', sa.Text(), nullable=True),
+        sa.Column('document', sa.LargeBinary(), nullable=True),
+        sa.Column('filename', sa.String(length=255), nullable=True),
+        sa.Column(
+            'status',
+            sa.Enum(
+                'pending', 'sent', 'failed',
+                name='outbox_status_enum', native_enum=False,
+            ),
+            nullable=False,
+        ),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('available_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('sent_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'ix_notification_outbox_status_available_at',
+        'notification_outbox',
+        ['status', 'available_at'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        'ix_notification_outbox_status_available_at',
+        table_name='notification_outbox',
+    )
+    op.drop_table('notification_outbox')
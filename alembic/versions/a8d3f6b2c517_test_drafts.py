@@ -0,0 +1,54 @@
+"""test drafts
+
+Revision ID: a8d3f6b2c517
+Revises: f1a3c5e7b924
+Create Date: 2026-10-17 19:32:48.216304
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8d3f6b2c517'
+down_revision: Union[str, Sequence[str], None] = 'f1a3c5e7b924'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'test_drafts',
+        sa.Column('user_id', sa.BigInteger(), nullable=False),
+        sa.Column(
+            'level',
+            sa.Enum(
+                'starter', 'elementary', 'pre_intermediate', 'intermediate',
+                'upper_intermediate', 'advanced',
+                name='level_enum', native_enum=False,
+            ),
+            nullable=False,
+        ),
+        sa.Column(
+            'answers',
+            postgresql.JSONB(astext_type=sa.Text()),
+            server_default=sa.text("'{}'::jsonb"),
+            nullable=False,
+        ),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('submitted_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('user_id', 'level'),
+    )
+    op.create_index(
+        'ix_test_drafts_updated_at', 'test_drafts', ['updated_at'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_test_drafts_updated_at', table_name='test_drafts')
+    op.drop_table('test_drafts')
@@ -0,0 +1,55 @@
+"""idempotency keys
+
+Revision ID: b5e81f0c2a47
+Revises: 7d2c4e8f1b30
+Create Date: 2026-10-17 14:10:26.904513
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5e81f0c2a47'
+down_revision: Union[str, Sequence[str], None] = '7d2c4e8f1b30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'idempotency_keys',
+        sa.Column('scope', sa.String(length=50), nullable=False),
+        sa.Column('key', sa.String(length=255), nullable=False),
+        sa.Column('request_hash', sa.String(length=64), nullable=False),
+        sa.Column(
+            'status',
+            sa.Enum(
+                'in_progress', 'completed',
+                name='idempotency_status_enum', native_enum=False,
+            ),
+            nullable=False,
+        ),
+        sa.Column('status_code', sa.Integer(), nullable=True),
+        sa.Column('response', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('scope', 'key'),
+    )
+    op.create_index(
+        'ix_idempotency_keys_expires_at',
+        'idempotency_keys',
+        ['expires_at'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        'ix_idempotency_keys_expires_at', table_name='idempotency_keys'
+    )
+    op.drop_table('idempotency_keys')
@@ -0,0 +1,71 @@
+"""job queue
+
+Revision ID: cd80b6303db0
+Revises: ffa671467903
+Create Date: 2026-10-17 10:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'cd80b6303db0'
+down_revision: Union[str, Sequence[str], None] = 'ffa671467903'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'jobs',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('kind', sa.String(length=50), nullable=False),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column(
+            'status',
+            sa.Enum(
+                'pending', 'running', 'done', 'failed',
+                name='job_status_enum', native_enum=False,
+            ),
+            nullable=False,
+        ),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('max_attempts', sa.Integer(), nullable=False),
+        sa.Column('result', sa.JSON(), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('run_after', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'ix_jobs_status_run_after', 'jobs', ['status', 'run_after'], unique=False
+    )
+
+    op.alter_column(
+        'test_results', 'dropbox_file_id', existing_type=sa.String(), nullable=True
+    )
+    op.alter_column(
+        'test_results', 'file_name', existing_type=sa.String(), nullable=True
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(
+        "UPDATE test_results SET dropbox_file_id = '', file_name = '' "
+        "WHERE dropbox_file_id IS NULL OR file_name IS NULL"
+    )
+    op.alter_column(
+        'test_results', 'file_name', existing_type=sa.String(), nullable=False
+    )
+    op.alter_column(
+        'test_results', 'dropbox_file_id', existing_type=sa.String(), nullable=False
+    )
+
+    op.drop_index('ix_jobs_status_run_after', table_name='jobs')
+    op.drop_table('jobs')
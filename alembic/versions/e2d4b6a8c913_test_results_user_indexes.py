@@ -0,0 +1,58 @@
+"""test_results user_id and pending report indexes
+
+Revision ID: e2d4b6a8c913
+Revises: 3c7a9e1d5f42
+Create Date: 2026-10-17 15:48:12.604395
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2d4b6a8c913'
+down_revision: Union[str, Sequence[str], None] = '3c7a9e1d5f42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY не блокирует запись в таблицу, но не работает в транзакции
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_test_results_user_id_submitted_at',
+            'test_results',
+            ['user_id', sa.text('submitted_at DESC')],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_test_results_pending_report',
+            'test_results',
+            ['submitted_at'],
+            unique=False,
+            postgresql_where=sa.text('dropbox_file_id IS NULL'),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_test_results_pending_report',
+            table_name='test_results',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            'ix_test_results_user_id_submitted_at',
+            table_name='test_results',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,53 @@
+"""drop user_sessions.application_ids
+
+Revision ID: f1a3c5e7b924
+Revises: e2d4b6a8c913
+Create Date: 2026-10-17 16:21:05.772190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1a3c5e7b924'
+down_revision: Union[str, Sequence[str], None] = 'e2d4b6a8c913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Список дублировал applications.user_id: заявки пользователя
+    # выбираются запросом по индексу ix_applications_user_id_created_at.
+    # ID из списка, для которых нет заявки, ни на что не ссылаются.
+    op.drop_column('user_sessions', 'application_ids')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column(
+        'user_sessions',
+        sa.Column(
+            'application_ids',
+            postgresql.ARRAY(sa.Integer()),
+            nullable=True,
+            comment='Список ID заявок пользователя.',
+        ),
+    )
+    # Восстановление списка по существующим заявкам
+    op.execute(
+        """
+        UPDATE user_sessions AS us
+        SET application_ids = apps.ids
+        FROM (
+            SELECT user_id, array_agg(id ORDER BY id) AS ids
+            FROM applications
+            GROUP BY user_id
+        ) AS apps
+        WHERE apps.user_id = us.telegram_id
+        """
+    )
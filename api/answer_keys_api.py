@@ -0,0 +1,130 @@
+from typing import Any, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.security import require_admin_token
+from database.base import get_db
+from database.crud.answer_key import publish_answer_keys
+from logging_config import logger
+from utilities.answer_keys import answer_key_registry
+from utilities.job_queue import QueueFullError, job_queue
+from utilities.regrade import REGRADE_JOB
+
+router = APIRouter(prefix="/api", dependencies=[Depends(require_admin_token)])
+
+
+class AnswerKeyChangeSchema(BaseModel):
+    """
+    Изменение ключа ответа на один вопрос.
+
+    Attributes:
+        level: Уровень теста.
+        task: Идентификатор таска (например, "task1").
+        question: Номер вопроса.
+        accepted_answers: Допустимые ответы (пустой список исключает вопрос).
+    """
+
+    level: str
+    task: str
+    question: str
+    accepted_answers: List[str]
+
+
+class RegradeRequestSchema(BaseModel):
+    """
+    Параметры перепроверки сохранённых результатов.
+
+    Attributes:
+        level: Перепроверить только указанный уровень.
+        force: Перепроверить и результаты, уже проверенные по текущей версии.
+    """
+
+    level: Optional[str] = None
+    force: bool = False
+
+
+@router.get("/answer_keys/version")
+async def get_answer_keys_version() -> dict[str, Any]:
+    """
+    Возвращает версию ключей ответов, действующую в этом процессе.
+
+    Returns:
+        dict:
+            version (int): Версия ключей (0 — встроенные ключи).
+    """
+    return {"version": answer_key_registry.version}
+
+
+@router.post("/answer_keys")
+async def publish_answer_keys_endpoint(
+    changes: List[AnswerKeyChangeSchema], session: AsyncSession = Depends(get_db)
+) -> dict[str, Any]:
+    """
+    Публикует изменённые ключи ответов новой версией и применяет её.
+
+    Остальные процессы получают новую версию через NOTIFY.
+
+    Args:
+        changes: Изменённые вопросы.
+        session: Асинхронная сессия БД.
+
+    Returns:
+        dict:
+            version (int): Опубликованная версия.
+
+    Raises:
+        HTTPException: 400 при некорректных данных.
+    """
+    try:
+        version = await publish_answer_keys(
+            session, [change.model_dump() for change in changes]
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    index = await answer_key_registry.reload()
+    logger.info("Ключи ответов версии %s опубликованы через API", version)
+    return {"version": index.version}
+
+
+@router.post("/answer_keys/reload")
+async def reload_answer_keys() -> dict[str, Any]:
+    """
+    Перечитывает ключи ответов из БД во всех процессах приложения.
+
+    Returns:
+        dict:
+            version (int): Действующая версия ключей.
+    """
+    index = await answer_key_registry.reload_all()
+    return {"version": index.version}
+
+
+@router.post("/test_results/regrade")
+async def regrade_test_results_endpoint(
+    payload: RegradeRequestSchema,
+) -> dict[str, Any]:
+    """
+    Ставит перепроверку сохранённых результатов по действующим ключам в очередь.
+
+    Args:
+        payload: Параметры перепроверки.
+
+    Returns:
+        dict:
+            job_id (int): ID фоновой задачи (статус и итог: GET /api/jobs/{job_id}).
+            answer_key_version (int): Версия ключей, по которой будет перепроверка.
+
+    Raises:
+        HTTPException: 503 при переполненной очереди.
+    """
+    try:
+        job = await job_queue.enqueue(REGRADE_JOB, payload.model_dump())
+    except QueueFullError as e:
+        raise HTTPException(
+            status_code=503, detail=str(e), headers={"Retry-After": "30"}
+        ) from e
+
+    return {"job_id": job.id, "answer_key_version": answer_key_registry.version}
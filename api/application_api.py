@@ -1,27 +1,25 @@
-import os
 from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Path
+from fastapi import APIRouter, Depends, Header, HTTPException, Path, Query
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from api.idempotency import idempotent_request
 from database.base import get_db
 from database.crud.application import (
+    APPLICATIONS_PAGE_SIZE,
+    MAX_APPLICATIONS_PAGE_SIZE,
+    application_exists,
     create_application,
+    list_applications_by_user_id,
     read_application_by_id,
-    read_application_by_user_id,
     update_application_by_id,
 )
-from database.crud.user_session import append_application_id
 from logging_config import logger
-from utilities.dropbox_utils import (
-    get_dropbox_client,
-    get_or_create_user_dropbox_folder,
-    upload_to_dropbox,
-)
-from utilities.pdf_generation import generate_application_pdf
+from utilities.dropbox_utils import get_dropbox_client, upload_to_dropbox
+from utilities.notification_outbox import notification_outbox
+from utilities.pdf_renderer import RendererBusyError, pdf_renderer
 from utilities.phone_utils import normalize_phone
-from utilities.telegram_notifications import send_pdf_to_admin
 
 router = APIRouter(prefix="/api")
 
@@ -43,6 +41,8 @@ class ApplicationSchema(BaseModel):
         studied_at_lanex: Учился ли ранее в Lanex.
         previous_experience: Предыдущий опыт.
         telegram_id: Telegram ID пользователя.
+        client_request_id: Ключ идемпотентности, сгенерированный клиентом
+            (альтернатива заголовку Idempotency-Key).
     """
 
     applicant_name: str
@@ -57,6 +57,7 @@ class ApplicationSchema(BaseModel):
     studied_at_lanex: bool = False
     previous_experience: Optional[List[str]] = None
     telegram_id: int
+    client_request_id: Optional[str] = None
 
     class Config:
         use_enum_values = True
@@ -64,24 +65,42 @@ class ApplicationSchema(BaseModel):
 
 @router.post("/applications")
 async def create_application_endpoint(
-    payload: ApplicationSchema, session: AsyncSession = Depends(get_db)
+    payload: ApplicationSchema,
+    session: AsyncSession = Depends(get_db),
+    idempotency_key: Optional[str] = Header(default=None),
 ) -> dict:
     """
     Создаёт новую заявку: PDF на сервере, загрузка в Dropbox,
     уведомление админа и сохранение в БД.
 
+    Повтор запроса с тем же ключом идемпотентности (заголовок
+    Idempotency-Key или client_request_id) возвращает сохранённый ответ.
+
     Args:
         payload: Данные заявки.
         session: Асинхронная сессия БД.
+        idempotency_key: Ключ идемпотентности из заголовка.
 
     Returns:
         dict: Статус создания, ID заявки и путь в Dropbox.
     """
+    async with idempotent_request(
+        "applications", idempotency_key or payload.client_request_id, payload
+    ) as request:
+        if request.replay is not None:
+            return request.replay
+        return await request.save(await _create_application(payload, session))
+
+
+async def _create_application(
+    payload: ApplicationSchema, session: AsyncSession
+) -> dict:
+    """Генерирует PDF, загружает его, уведомляет админа и сохраняет заявку."""
     normalized_phone = normalize_phone(payload.phone_number)
 
     try:
-        # === 1. Генерация PDF на сервере ===
-        pdf_path = generate_application_pdf(
+        # === 1. Генерация PDF в памяти (в пуле процессов) ===
+        document = await pdf_renderer.render_application(
             applicant_name=payload.applicant_name,
             phone_number=normalized_phone,
             applicant_age=payload.applicant_age,
@@ -94,40 +113,29 @@ async def create_application_endpoint(
             studied_at_lanex=payload.studied_at_lanex,
             previous_experience=payload.previous_experience,
             telegram_id=payload.telegram_id,
-            output_dir="generated_applications",
             is_update=False,
         )
 
-        # === 2. Получение/создание папки пользователя в Dropbox ===
-        dbx = get_dropbox_client()
-        user_folder_path = await get_or_create_user_dropbox_folder(
-            dbx, payload.telegram_id
-        )
-
-        # === 3. Загрузка PDF в Dropbox ===
-        upload_result = upload_to_dropbox(
-            local_path=pdf_path,
-            username=payload.applicant_name,
-            file_type="application",
-            user_folder_path=user_folder_path,
-        )
-
-        # === 4. Уведомление админа ===
-        caption = (
-            f"📩 Новая заявка от {payload.applicant_name}\n"
-            f"📞 {payload.phone_number}\n"
-            f"🧩 Уровень: {payload.level or 'Не указан'}\n"
-            f"👤 Telegram ID: {payload.telegram_id}"
-        )
-        await send_pdf_to_admin(file_path=pdf_path, caption=caption)
-
-        # === 5. Удаление PDF с сервера ===
-        try:
-            os.remove(pdf_path)
-        except Exception as e:
-            logger.warning(f"Не удалось удалить временный PDF: {e}")
-
-        # === 6. Сохранение заявки в БД ===
+        with document:
+            # === 2. Загрузка PDF в папку пользователя в Dropbox ===
+            upload_result = await upload_to_dropbox(
+                document,
+                username=payload.applicant_name,
+                file_type="application",
+                dbx=get_dropbox_client(),
+                telegram_id=payload.telegram_id,
+            )
+
+            # === 3. Уведомление админа через outbox (тот же буфер) ===
+            caption = (
+                f"📩 Новая заявка от {payload.applicant_name}\n"
+                f"📞 {payload.phone_number}\n"
+                f"🧩 Уровень: {payload.level or 'Не указан'}\n"
+                f"👤 Telegram ID: {payload.telegram_id}"
+            )
+            await notification_outbox.enqueue_admin_document(document, caption)
+
+        # === 4. Сохранение заявки в БД ===
         new_app = await create_application(
             session=session,
             user_id=payload.telegram_id,
@@ -146,14 +154,17 @@ async def create_application_endpoint(
             file_name=upload_result["file_name"],
         )
 
-        await append_application_id(session, payload.telegram_id, new_app.id)
-
         return {
             "status": "success",
             "application_id": new_app.id,
             "dropbox_path": upload_result["dropbox_path"],
         }
 
+    except RendererBusyError as e:
+        logger.warning(f"Генерация PDF перегружена, заявка отклонена: {e}")
+        raise HTTPException(
+            status_code=503, detail=str(e), headers={"Retry-After": "10"}
+        ) from e
     except Exception as e:
         logger.exception(f"❌ Ошибка при создании заявки: {e}")
         raise HTTPException(status_code=500, detail=str(e)) from e
@@ -162,30 +173,31 @@ async def create_application_endpoint(
 @router.get("/applications/user/{telegram_id}")
 async def get_applications_by_user(
     telegram_id: int = Path(..., description="Telegram ID пользователя"),
+    after_id: Optional[int] = Query(
+        None, description="ID последней заявки предыдущей страницы"
+    ),
+    limit: int = Query(APPLICATIONS_PAGE_SIZE, ge=1, le=MAX_APPLICATIONS_PAGE_SIZE),
     session: AsyncSession = Depends(get_db),
 ) -> list[dict]:
     """
-    Возвращает все заявки пользователя.
+    Возвращает страницу заявок пользователя (от новых к старым).
+
+    Следующая страница запрашивается с after_id, равным ID последней
+    заявки текущей страницы; пустой список означает конец истории.
 
     Args:
         telegram_id: Telegram ID пользователя.
+        after_id: ID последней заявки предыдущей страницы.
+        limit: Размер страницы.
         session: Асинхронная сессия БД.
 
     Returns:
         list[dict]: Список заявок с ID, именем и датой создания.
     """
-    apps = await read_application_by_user_id(session, telegram_id)
+    apps = await list_applications_by_user_id(session, telegram_id, after_id, limit)
     return [
-        {
-            "id": app.id,
-            "name": app.applicant_name,
-            "date": (
-                app.created_at.strftime("%Y-%m-%d")
-                if hasattr(app, "created_at")
-                else "—"
-            ),
-        }
-        for app in apps
+        {"id": app_id, "name": name, "date": created_at.strftime("%Y-%m-%d")}
+        for app_id, name, created_at in apps
     ]
 
 
@@ -255,12 +267,12 @@ async def update_application_endpoint(
     normalized_phone = normalize_phone(payload.phone_number)
 
     try:
-        existing_app = await read_application_by_id(session, id)
-        if not existing_app:
+        # Проверка до генерации PDF, загрузки и уведомления админа
+        if not await application_exists(session, id):
             raise HTTPException(status_code=404, detail="Application not found")
 
-        # === 1. Генерация PDF ===
-        pdf_path = generate_application_pdf(
+        # === 1. Генерация PDF в памяти (в пуле процессов) ===
+        document = await pdf_renderer.render_application(
             applicant_name=payload.applicant_name,
             phone_number=normalized_phone,
             applicant_age=payload.applicant_age,
@@ -273,36 +285,25 @@ async def update_application_endpoint(
             studied_at_lanex=payload.studied_at_lanex,
             previous_experience=payload.previous_experience,
             telegram_id=payload.telegram_id,
-            output_dir="generated_applications",
             is_update=True,
         )
 
-        # === 2. Dropbox ===
-        dbx = get_dropbox_client()
-        user_folder_path = await get_or_create_user_dropbox_folder(
-            dbx, payload.telegram_id
-        )
-
-        upload_result = upload_to_dropbox(
-            local_path=pdf_path,
-            username=payload.applicant_name,
-            file_type="UPDATED_APPLICATION",
-            user_folder_path=user_folder_path,
-        )
-
-        # === 3. Уведомление админа ===
-        await send_pdf_to_admin(
-            file_path=pdf_path,
-            caption=f"🔄 Обновлена заявка от {payload.applicant_name}",
-        )
-
-        # === 4. Удаление PDF с сервера ===
-        try:
-            os.remove(pdf_path)
-        except Exception as e:
-            logger.warning(f"Не удалось удалить временный PDF: {e}")
-
-        # === 5. Обновление заявки в БД ===
+        with document:
+            # === 2. Dropbox ===
+            upload_result = await upload_to_dropbox(
+                document,
+                username=payload.applicant_name,
+                file_type="UPDATED_APPLICATION",
+                dbx=get_dropbox_client(),
+                telegram_id=payload.telegram_id,
+            )
+
+            # === 3. Уведомление админа через outbox ===
+            await notification_outbox.enqueue_admin_document(
+                document, caption=f"🔄 Обновлена заявка от {payload.applicant_name}"
+            )
+
+        # === 4. Обновление заявки в БД ===
         await update_application_by_id(
             session=session,
             id=id,
@@ -327,6 +328,13 @@ async def update_application_endpoint(
             "dropbox_path": upload_result["dropbox_path"],
         }
 
+    except HTTPException:
+        raise
+    except RendererBusyError as e:
+        logger.warning(f"Генерация PDF перегружена, обновление отклонено: {e}")
+        raise HTTPException(
+            status_code=503, detail=str(e), headers={"Retry-After": "10"}
+        ) from e
     except Exception as e:
         logger.exception(f"❌ Ошибка при обновлении заявки: {e}")
         raise HTTPException(status_code=500, detail=str(e)) from e
@@ -1,22 +1,28 @@
-import os
 import re
 from typing import Any, Dict, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from api.idempotency import idempotent_request
+from api.schemas import TelegramId
 from database.base import get_db
 from database.crud.test_result import create_test_result
 from database.crud.user_session import read_user_session
+from database.models import LevelEnum
 from logging_config import logger
-from utilities.check_function import FrontendTestPayload, check_test_results
-from utilities.dropbox_utils import (
-    get_dropbox_client,
-    get_or_create_user_dropbox_folder,
-    upload_to_dropbox,
+from utilities.check_function import (
+    FrontendTestPayload,
+    check_test_results,
+    get_answer_index,
+    summarize_check_result,
 )
-from utilities.pdf_generation import generate_test_report
+from utilities.job_queue import QueueFullError, job_queue
+from utilities.report_jobs import TEST_REPORT_JOB
+from utilities.submission_cache import grading_cache, submission_key
+from utilities.test_definitions import resolve_level
+from utilities.test_drafts import test_drafts
 
 router = APIRouter(prefix="/api")
 
@@ -30,36 +36,60 @@ class TestSubmissionSchema(BaseModel):
         username: Имя пользователя (необязательно).
         telegram_id: Telegram ID пользователя.
         answers: Словарь с ответами по задачам и вопросам.
+        client_request_id: Ключ идемпотентности, сгенерированный клиентом
+            (альтернатива заголовку Idempotency-Key).
     """
 
     level: str
     username: Optional[str] = None
-    telegram_id: int
+    telegram_id: TelegramId
     answers: Dict[str, Dict[str, str]]
+    client_request_id: Optional[str] = None
 
 
 @router.post("/check_test")
 async def check_test_endpoint(
-    payload: TestSubmissionSchema, session: AsyncSession = Depends(get_db)
+    payload: TestSubmissionSchema,
+    session: AsyncSession = Depends(get_db),
+    idempotency_key: Optional[str] = Header(default=None),
 ) -> dict[str, Any]:
     """
-    Проверяет ответы пользователя на тест, формирует PDF отчёт, загружает его в Dropbox
-    и сохраняет результат в базе данных.
+    Проверяет ответы пользователя на тест, сохраняет результат в базе данных
+    и ставит формирование PDF отчёта с загрузкой в Dropbox в очередь.
+
+    Повтор запроса с тем же ключом идемпотентности (заголовок
+    Idempotency-Key или client_request_id) возвращает сохранённый ответ
+    без повторного сохранения результата и постановки задачи.
 
     Args:
         payload: Валидированные данные отправки теста.
         session: Асинхронная сессия БД.
+        idempotency_key: Ключ идемпотентности из заголовка.
 
     Returns:
         dict:
             status (str): Статус обработки.
             username_used (str): Имя, использованное в отчёте.
-            dropbox_path (str): Путь к файлу в Dropbox.
+            test_result_id (int): ID сохранённого результата.
+            job_id (int): ID фоновой задачи (статус: GET /api/jobs/{job_id}).
             result (dict): Детальные результаты проверки.
 
     Raises:
-        HTTPException: При ошибках обработки или сохранения данных.
+        HTTPException: 503 при переполненной очереди,
+            500 при ошибках обработки или сохранения данных.
     """
+    async with idempotent_request(
+        "check_test", idempotency_key or payload.client_request_id, payload
+    ) as request:
+        if request.replay is not None:
+            return request.replay
+        return await request.save(await _check_test(payload, session))
+
+
+async def _check_test(
+    payload: TestSubmissionSchema, session: AsyncSession
+) -> dict[str, Any]:
+    """Проверяет тест, сохраняет результат и ставит задачу отчёта в очередь."""
     telegram_id = payload.telegram_id
     level = payload.level
     username = (payload.username or "").strip()
@@ -71,7 +101,12 @@ async def check_test_endpoint(
             logger.warning(f"Пустая форма от пользователя {telegram_id}")
             return {"status": "empty_form"}
 
-        # === 2. Безопасное имя пользователя ===
+        # === 2. Backpressure: не принимаем работу, которую не сможем выполнить ===
+        # Единственная проверка очереди за запрос (ограничение мягкое:
+        # параллельные отправки могут превысить его на несколько задач)
+        await job_queue.ensure_capacity()
+
+        # === 3. Безопасное имя пользователя ===
         safe_name = re.sub(r"[^a-zA-Zа-яА-Я0-9_\-\s]", "", username).strip()
         if not safe_name:
             user_session = await read_user_session(session, telegram_id)
@@ -81,79 +116,31 @@ async def check_test_endpoint(
                 else f"user_{telegram_id}"
             )
 
-        # === 3. Проверка теста и вычисление результатов ===
-        check_result = await check_test_results(
-            FrontendTestPayload(
-                level=level,
-                username=safe_name,
-                answers=answers,
-            )
-        )
-
-        # === 4. Формирование структуры закрытых/открытых ответов и баллов ===
-        closed_answers, open_answers, score = {}, {}, {}
-        for task, content in answers.items():
-            task_key = task if task.startswith("task") else f"task_{task}"
-            task_result = check_result.get(task, {})
-
-            if task_result == "open":
-                open_answers[task_key] = content
-                continue
-
-            closed_answers[task_key] = {
-                f"Q{q_num}": {
-                    "answer": user_answer,
-                    "status": task_result.get(q_num, "unchecked"),
-                }
-                for q_num, user_answer in content.items()
-            }
-
-            if isinstance(task_result, dict):
-                score_str = task_result.get("score")
-                if score_str:
-                    try:
-                        score[task_key] = int(score_str.split("/")[0])
-                    except Exception:
-                        logger.warning(
-                            f"Невозможно преобразовать балл в int для {task_key}"
-                        )
-
-        if "total" in check_result:
-            try:
-                score["total"] = float(check_result["total"].strip("%"))
-            except Exception:
-                logger.warning("Невозможно преобразовать общий балл в float")
-
-        # === 5. Генерация PDF отчёта ===
-        pdf_path = generate_test_report(
-            test_taker=safe_name,
-            level=level,
-            closed_answers=closed_answers,
-            open_answers=open_answers or None,
-            score=score,
-            output_dir="test-reports",
+        # === 4. Проверка теста по снимку действующих ключей ===
+        # Повторная отправка той же формы берёт результат из кэша
+        answer_index = get_answer_index()
+        submission = submission_key(
+            level, answer_index.version, answers, safe_name, telegram_id
         )
+        check_result = grading_cache.get(submission)
+        if check_result is None:
+            check_result = await check_test_results(
+                FrontendTestPayload(
+                    level=level,
+                    username=safe_name,
+                    answers=answers,
+                ),
+                answer_index,
+            )
+            grading_cache.set(submission, check_result)
 
-        # === 6. Работа с Dropbox ===
-        dbx = get_dropbox_client()
-        user_folder_path = await get_or_create_user_dropbox_folder(dbx, telegram_id)
-
-        upload_result = upload_to_dropbox(
-            local_path=pdf_path,
-            username=safe_name,
-            file_type="test-report",
-            level=level,
-            user_folder_path=user_folder_path,
+        # === 5. Формирование структуры закрытых/открытых ответов и баллов ===
+        closed_answers, open_answers, score = summarize_check_result(
+            answers, check_result
         )
 
-        # === 7. Удаление временного PDF с сервера ===
-        try:
-            os.remove(pdf_path)
-        except Exception as e:
-            logger.warning(f"Не удалось удалить временный PDF: {e}")
-
-        # === 8. Сохранение результата в БД ===
-        await create_test_result(
+        # === 6. Сохранение результата в БД (транзакция не фиксируется) ===
+        test_result = await create_test_result(
             session=session,
             user_id=telegram_id,
             test_taker=safe_name,
@@ -161,20 +148,50 @@ async def check_test_endpoint(
             closed_answers=closed_answers,
             open_answers=open_answers or None,
             score=score,
-            dropbox_file_id=upload_result["dropbox_file_id"],
-            file_name=upload_result["file_name"],
+            answer_key_version=answer_index.version,
+            commit=False,
+        )
+
+        # === 7. PDF отчёт и Dropbox — в фоновой задаче ===
+        # Задача фиксируется в одной транзакции с результатом: результат
+        # без задачи отчёта (или наоборот) не сохраняется
+        job = await job_queue.enqueue(
+            TEST_REPORT_JOB,
+            {"test_result_id": test_result.id, "submission_key": submission},
+            session=session,
+            check_capacity=False,
         )
 
+        # === 8. Черновик больше не нужен ===
+        await _discard_draft(telegram_id, level)
+
         # === 9. Ответ клиенту ===
         return {
             "status": "ok",
             "username_used": safe_name,
-            "dropbox_path": upload_result["dropbox_path"],
+            "test_result_id": test_result.id,
+            "job_id": job.id,
             "result": check_result,
         }
 
+    except QueueFullError as e:
+        logger.warning(f"Очередь задач переполнена, тест {telegram_id} отклонён")
+        raise HTTPException(
+            status_code=503, detail=str(e), headers={"Retry-After": "30"}
+        ) from e
     except Exception as e:
         logger.exception(
             f"❌ Ошибка при обработке теста пользователя {telegram_id}: {e}"
         )
         raise HTTPException(status_code=500, detail=str(e)) from e
+
+
+async def _discard_draft(telegram_id: int, level: str) -> None:
+    """Удаляет черновик отправленного теста; ошибка не мешает ответу."""
+    name = resolve_level(level)
+    if name is None:
+        return
+    try:
+        await test_drafts.discard(telegram_id, LevelEnum(name))
+    except Exception as e:
+        logger.warning(f"Не удалось удалить черновик теста {telegram_id}: {e}")
@@ -0,0 +1,81 @@
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+from utilities.idempotency import (
+    MAX_IDEMPOTENCY_KEY_LENGTH,
+    IdempotencyInProgressError,
+    IdempotencyMismatchError,
+    idempotency,
+    request_fingerprint,
+)
+
+
+class IdempotentRequest:
+    """
+    Состояние запроса внутри idempotent_request.
+
+    Attributes:
+        replay: Сохранённый ответ (если запрос — повтор) или None.
+    """
+
+    def __init__(
+        self, scope: str, key: Optional[str], replay: Optional[Dict[str, Any]]
+    ) -> None:
+        self.scope = scope
+        self.key = key
+        self.replay = replay
+        self.saved = False
+
+    async def save(self, response: Dict[str, Any]) -> Dict[str, Any]:
+        """Сохраняет ответ для повторов и возвращает его."""
+        if self.key is not None:
+            await idempotency.complete(self.scope, self.key, response)
+        self.saved = True
+        return response
+
+
+@asynccontextmanager
+async def idempotent_request(
+    scope: str, key: Optional[str], payload: BaseModel
+) -> AsyncIterator[IdempotentRequest]:
+    """
+    Оборачивает обработку запроса с ключом идемпотентности.
+
+    Без ключа запрос обрабатывается как обычно. Если ответ не сохранён
+    (ошибка обработки), ключ освобождается, и повтор выполнится заново.
+
+    Args:
+        scope: Эндпоинт.
+        key: Ключ идемпотентности (заголовок или client_request_id).
+        payload: Тело запроса (ключ в теле не входит в хэш).
+
+    Raises:
+        HTTPException: 400 — слишком длинный ключ, 409 — запрос с ключом
+            ещё обрабатывается, 422 — ключ использован с другим телом.
+    """
+    if not key:
+        yield IdempotentRequest(scope, None, None)
+        return
+
+    if len(key) > MAX_IDEMPOTENCY_KEY_LENGTH:
+        raise HTTPException(status_code=400, detail="Idempotency key is too long")
+
+    fingerprint = request_fingerprint(payload, exclude={"client_request_id"})
+    try:
+        replay = await idempotency.begin(scope, key, fingerprint)
+    except IdempotencyInProgressError as e:
+        raise HTTPException(
+            status_code=409, detail=str(e), headers={"Retry-After": "5"}
+        ) from e
+    except IdempotencyMismatchError as e:
+        raise HTTPException(status_code=422, detail=str(e)) from e
+
+    request = IdempotentRequest(scope, key, replay)
+    try:
+        yield request
+    finally:
+        if replay is None and not request.saved:
+            await idempotency.release(scope, key)
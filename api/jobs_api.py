@@ -0,0 +1,41 @@
+from typing import Any
+
+from fastapi import APIRouter, HTTPException
+
+from utilities.job_queue import job_queue
+
+router = APIRouter(prefix="/api")
+
+
+@router.get("/jobs/{job_id}")
+async def get_job_status(job_id: int) -> dict[str, Any]:
+    """
+    Возвращает статус фоновой задачи.
+
+    Args:
+        job_id: ID задачи, полученный при постановке в очередь.
+
+    Returns:
+        dict:
+            id (int): ID задачи.
+            kind (str): Тип задачи.
+            status (str): pending / running / done / failed.
+            attempts (int): Количество выполненных попыток.
+            result (dict | None): Результат (для статуса done).
+            error (str | None): Последняя ошибка.
+
+    Raises:
+        HTTPException: Если задача не найдена.
+    """
+    job = await job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return {
+        "id": job.id,
+        "kind": job.kind,
+        "status": job.status.value,
+        "attempts": job.attempts,
+        "result": job.result,
+        "error": job.last_error,
+    }
@@ -0,0 +1,18 @@
+from typing import Any
+
+from fastapi import APIRouter
+
+from utilities.metrics import metrics
+
+router = APIRouter(prefix="/api")
+
+
+@router.get("/metrics")
+async def get_metrics() -> dict[str, Any]:
+    """
+    Возвращает снимок метрик текущего процесса.
+
+    Returns:
+        dict: Имя метрики -> её состояние (счётчик, гистограмма или показатель).
+    """
+    return metrics.snapshot()
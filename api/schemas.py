@@ -0,0 +1,9 @@
+from typing import Annotated
+
+from pydantic import Field
+
+# Пределы BIGINT: такие ID помещаются в столбцы user_id
+BIGINT_MIN = -(2**63)
+BIGINT_MAX = 2**63 - 1
+
+TelegramId = Annotated[int, Field(ge=BIGINT_MIN, le=BIGINT_MAX)]
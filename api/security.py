@@ -0,0 +1,43 @@
+import secrets
+from typing import Optional
+
+from fastapi import Header, HTTPException
+
+from config import settings
+
+
+async def require_admin_token(
+    x_admin_token: Optional[str] = Header(default=None),
+) -> None:
+    """
+    Проверяет токен администратора в заголовке X-Admin-Token.
+
+    Служебные эндпоинты отключены, если ADMIN_API_TOKEN не задан.
+
+    Raises:
+        HTTPException: 403, если токен не задан в настройках или не совпадает.
+    """
+    expected = settings.admin_api_token
+    if not expected or not x_admin_token:
+        raise HTTPException(status_code=403, detail="Forbidden")
+    if not secrets.compare_digest(x_admin_token, expected):
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+
+async def require_telegram_secret(
+    x_telegram_bot_api_secret_token: Optional[str] = Header(default=None),
+) -> None:
+    """
+    Проверяет секрет вебхука в заголовке X-Telegram-Bot-Api-Secret-Token.
+
+    Telegram передаёт в заголовке secret_token, указанный при setWebhook.
+    Вебхук отключён, если TELEGRAM_WEBHOOK_SECRET не задан.
+
+    Raises:
+        HTTPException: 403, если секрет не задан в настройках или не совпадает.
+    """
+    expected = settings.telegram_webhook_secret
+    if not expected or not x_telegram_bot_api_secret_token:
+        raise HTTPException(status_code=403, detail="Forbidden")
+    if not secrets.compare_digest(x_telegram_bot_api_secret_token, expected):
+        raise HTTPException(status_code=403, detail="Forbidden")
@@ -0,0 +1,45 @@
+from typing import Any, Dict
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from api.security import require_telegram_secret
+from config import settings
+from logging_config import logger
+from telegram.bot import bot, dp
+
+router = APIRouter(prefix="/api")
+
+
+@router.post("/telegram/webhook", dependencies=[Depends(require_telegram_secret)])
+async def telegram_webhook(update: Dict[str, Any]) -> dict:
+    """
+    Принимает обновление Telegram (TELEGRAM_MODE=webhook).
+
+    Обработчик, не уложившийся в таймаут ответа Telegram, продолжает
+    работу в фоне, поэтому обновление не доставляется повторно.
+    Ошибки обработчиков только логируются: ответ с ошибкой заставил бы
+    Telegram повторять то же обновление.
+
+    Args:
+        update: Объект Update из тела запроса.
+
+    Returns:
+        dict: {"ok": True}.
+
+    Raises:
+        HTTPException: 404, если режим вебхука выключен;
+            403, если секрет не совпадает.
+    """
+    if settings.telegram_mode != "webhook":
+        raise HTTPException(status_code=404, detail="Not Found")
+
+    try:
+        method = await dp.feed_webhook_update(bot, update)
+        if method is not None:
+            await dp.silent_call_request(bot, method)
+    except Exception as e:
+        logger.exception(
+            f"❌ Ошибка обработки обновления Telegram {update.get('update_id')}: {e}"
+        )
+
+    return {"ok": True}
@@ -0,0 +1,138 @@
+import re
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, Header, HTTPException, Query, Response
+from pydantic import BaseModel, Field, field_validator
+
+from api.schemas import BIGINT_MAX, BIGINT_MIN, TelegramId
+from database.models import LevelEnum
+from utilities.metrics import metrics
+from utilities.test_definitions import resolve_level, test_definitions
+from utilities.test_drafts import split_draft_answers, test_drafts
+
+router = APIRouter(prefix="/api")
+
+_not_modified = metrics.counter(
+    "test_definitions_not_modified", "Test definition requests answered with 304"
+)
+
+# Ограничения одного изменения черновика
+MAX_DRAFT_ANSWERS = 200
+MAX_DRAFT_ANSWER_LENGTH = 10000
+DRAFT_QUESTION_ID = re.compile(r"^task\d+\.[\w-]{1,20}$")
+
+
+class TestDraftDeltaSchema(BaseModel):
+    """
+    Изменённые ответы черновика теста.
+
+    Attributes:
+        telegram_id: Telegram ID пользователя.
+        answers: Только изменённые ответы: "task1.3" -> ответ
+            (пустая строка — ответ стёрт).
+    """
+
+    telegram_id: TelegramId
+    answers: Dict[str, str] = Field(max_length=MAX_DRAFT_ANSWERS)
+
+    @field_validator("answers")
+    @classmethod
+    def validate_answers(cls, answers: Dict[str, str]) -> Dict[str, str]:
+        """Проверяет идентификаторы вопросов и длину ответов."""
+        for question_id, answer in answers.items():
+            if not DRAFT_QUESTION_ID.match(question_id):
+                raise ValueError(f"Некорректный идентификатор вопроса: {question_id}")
+            if len(answer) > MAX_DRAFT_ANSWER_LENGTH:
+                raise ValueError(f"Слишком длинный ответ: {question_id}")
+        return answers
+
+
+def _draft_level(level: str) -> LevelEnum:
+    """Возвращает уровень черновика или 404, если теста уровня нет."""
+    name = resolve_level(level)
+    if name is None:
+        raise HTTPException(status_code=404, detail="Test not found")
+    return LevelEnum(name)
+
+
+@router.get("/tests/{level}")
+async def get_test_definition(
+    level: str, if_none_match: Optional[str] = Header(default=None)
+) -> Response:
+    """
+    Возвращает определение теста уровня: задания, вопросы, варианты ответов
+    и URL аудио (без правильных ответов).
+
+    Ответ кэшируется браузером с обязательной проверкой: при совпадении
+    If-None-Match с ETag возвращается 304 без тела.
+
+    Args:
+        level: Уровень (Starter, Pre-Intermediate или pre_intermediate).
+        if_none_match: ETag ранее полученного определения.
+
+    Returns:
+        Response: JSON {"level": ..., "tasks": {...}} или 304.
+
+    Raises:
+        HTTPException: Если уровень не найден.
+    """
+    definition = test_definitions.get(level)
+    if definition is None:
+        raise HTTPException(status_code=404, detail="Test not found")
+
+    headers = {"ETag": definition.etag, "Cache-Control": "no-cache"}
+    if if_none_match and (
+        if_none_match.strip() == "*"
+        or definition.etag in (tag.strip() for tag in if_none_match.split(","))
+    ):
+        _not_modified.inc()
+        return Response(status_code=304, headers=headers)
+
+    return Response(definition.body, media_type="application/json", headers=headers)
+
+
+@router.patch("/tests/{level}/draft", status_code=202)
+async def update_test_draft(level: str, payload: TestDraftDeltaSchema) -> dict:
+    """
+    Принимает изменённые ответы незавершённого теста (автосохранение).
+
+    Изменения попадают в буфер в памяти и записываются в БД пакетом
+    в течение TEST_DRAFT_FLUSH_INTERVAL (utilities.test_drafts).
+
+    Args:
+        level: Уровень теста.
+        payload: Telegram ID и изменённые ответы.
+
+    Returns:
+        dict: {"status": "accepted"}.
+
+    Raises:
+        HTTPException: Если уровень не найден.
+    """
+    test_drafts.update(payload.telegram_id, _draft_level(level), payload.answers)
+    return {"status": "accepted"}
+
+
+@router.get("/tests/{level}/draft")
+async def get_test_draft(
+    level: str, telegram_id: int = Query(..., ge=BIGINT_MIN, le=BIGINT_MAX)
+) -> dict[str, Any]:
+    """
+    Возвращает черновик ответов пользователя для продолжения теста.
+
+    Args:
+        level: Уровень теста.
+        telegram_id: Telegram ID пользователя.
+
+    Returns:
+        dict:
+            level (str): Название уровня.
+            answers (dict): таск -> номер вопроса -> ответ
+                (пустой, если черновика нет).
+
+    Raises:
+        HTTPException: Если уровень не найден.
+    """
+    test_level = _draft_level(level)
+    answers = await test_drafts.read(telegram_id, test_level)
+    return {"level": test_level.value, "answers": split_draft_answers(answers)}
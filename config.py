@@ -6,10 +6,12 @@
     - Telegram-бот
     - Dropbox-интеграция
     - Параметры CORS
+    - Очередь фоновых задач
+    - Пул процессов генерации PDF
 """
 
 from functools import lru_cache
-from typing import List, Union
+from typing import List, Literal, Optional, Union
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -23,10 +25,29 @@ class Settings(BaseSettings):
     db_host: str
     db_port: int
     db_name: str
+    db_pool_size: int = 10
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    db_statement_cache_size: int = 100
 
     # Telegram
     telegram_bot_token: str
     admin_telegram_id: int
+    telegram_max_concurrency: int = 10
+    telegram_per_chat_interval: float = 1.0
+    telegram_max_retries: int = 3
+    telegram_mode: Literal["polling", "webhook", "external"] = "polling"
+    telegram_webhook_secret: Optional[str] = None
+
+    # Notification outbox
+    outbox_batch_size: int = 50
+    outbox_album_size: int = 10
+    outbox_poll_interval: float = 1.0
+    outbox_lease_timeout: float = 120.0
+    outbox_max_attempts: int = 8
+    outbox_retry_base_delay: float = 5.0
     admin_name: str
 
     # Dropbox
@@ -34,11 +55,59 @@ class Settings(BaseSettings):
     dropbox_refresh_token: str
     dropbox_app_key: str
     dropbox_app_secret: str
+    dropbox_api_url: str = "https://api.dropboxapi.com"
+    dropbox_content_url: str = "https://content.dropboxapi.com"
+    dropbox_pool_size: int = 10
+    dropbox_timeout: float = 30.0
+    dropbox_max_retries: int = 3
+    dropbox_token_refresh_margin: float = 300.0
+    dropbox_folder_cache_size: int = 10000
+    dropbox_folder_cache_ttl: float = 3600.0
+    dropbox_upload_session_threshold: int = 32 * 1024 * 1024
+    dropbox_upload_chunk_size: int = 8 * 1024 * 1024
+
+    # Idempotency keys
+    idempotency_ttl: float = 3600.0
+    idempotency_lease: float = 300.0
+    idempotency_purge_interval: float = 600.0
+
+    # Test drafts (autosave)
+    test_draft_flush_interval: float = 5.0
+    test_draft_batch_size: int = 1000
+    test_draft_max_pending: int = 20000
+    test_draft_ttl: float = 604800.0
+    test_draft_purge_interval: float = 3600.0
+
+    # Submission cache
+    submission_cache_size: int = 1000
+    submission_cache_ttl: float = 600.0
+    submission_pdf_cache_size: int = 50
+
+    # Regrading
+    regrade_batch_size: int = 1000
+    regrade_workers: int = 2
+
+    # Admin API
+    admin_api_token: Optional[str] = None
 
     # CORS and Base URL
     cors_origins: Union[List[str], str]
     base_url: str
 
+    # Job queue
+    job_workers: int = 2
+    job_max_pending: int = 500
+    job_max_attempts: int = 5
+    job_poll_interval: float = 1.0
+    job_retry_base_delay: float = 2.0
+    job_stale_timeout: float = 600.0
+
+    # PDF rendering
+    pdf_workers: int = 2
+    pdf_max_pending: int = 20
+    pdf_spill_threshold: int = 5 * 1024 * 1024
+    pdf_spill_dir: Optional[str] = None
+
     @property
     def db_url(self) -> str:
         """URL для asyncpg."""
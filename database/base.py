@@ -3,7 +3,8 @@
 
 Этот модуль предоставляет:
     - Base — базовый класс для всех моделей SQLAlchemy.
-    - engine — асинхронный движок PostgreSQL.
+    - engine — асинхронный движок PostgreSQL (пул настраивается DB_POOL_*,
+      состояние пула публикуется в метриках, см. database.pool).
     - AsyncSessionLocal — фабрику асинхронных сессий.
     - get_db — генератор сессий для зависимостей FastAPI.
 
@@ -20,6 +21,7 @@ from sqlalchemy.ext.asyncio import (
 from sqlalchemy.orm import DeclarativeBase
 
 from config import settings
+from database.pool import InstrumentedAsyncPool, register_pool_metrics
 
 
 class Base(DeclarativeBase):
@@ -32,7 +34,20 @@ class Base(DeclarativeBase):
 engine = create_async_engine(
     settings.db_url,
     echo=False,
+    poolclass=InstrumentedAsyncPool,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+    pool_recycle=settings.db_pool_recycle,
+    pool_pre_ping=settings.db_pool_pre_ping,
+    connect_args={
+        # Кэш подготовленных выражений SQLAlchemy и asyncpg
+        # (0 — отключить, например за PgBouncer в режиме transaction)
+        "prepared_statement_cache_size": settings.db_statement_cache_size,
+        "statement_cache_size": settings.db_statement_cache_size,
+    },
 )
+register_pool_metrics(engine)
 
 
 # Фабрика асинхронных сессий
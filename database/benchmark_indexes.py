@@ -0,0 +1,186 @@
+"""
+Бенчмарк запросов по пользователю до и после создания индексов.
+
+Создаёт во временной схеме копии таблиц applications и test_results
+(только колонки, участвующие в запросах, плюс «тяжёлые» JSON-колонки),
+заполняет их N строками, измеряет задержку запросов по случайным
+пользователям без индексов, затем создаёт те же индексы, что и миграции
+3c7a9e1d5f42 и e2d4b6a8c913, и повторяет измерения. Рабочие таблицы
+не затрагиваются; схема удаляется по завершении.
+
+Запросы:
+    - applications_by_user: страница заявок пользователя
+      (как в list_applications_by_user_id);
+    - test_results_by_user: последние результаты пользователя;
+    - pending_reports: результаты без PDF-отчёта
+      (как в read_test_results_without_report).
+
+Использование:
+    python -m database.benchmark_indexes [--rows 1000000] [--users 50000]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from typing import Dict, List
+
+import asyncpg
+
+from config import settings
+
+SCHEMA = "index_benchmark"
+
+SETUP = f"""
+DROP SCHEMA IF EXISTS {SCHEMA} CASCADE;
+CREATE SCHEMA {SCHEMA};
+
+CREATE UNLOGGED TABLE {SCHEMA}.applications (
+    id bigserial PRIMARY KEY,
+    user_id bigint NOT NULL,
+    applicant_name varchar(50) NOT NULL,
+    created_at timestamptz NOT NULL,
+    possible_scheduling json NOT NULL
+);
+
+CREATE UNLOGGED TABLE {SCHEMA}.test_results (
+    id bigserial PRIMARY KEY,
+    user_id bigint NOT NULL,
+    level varchar(20) NOT NULL,
+    score json,
+    dropbox_file_id varchar,
+    submitted_at timestamptz NOT NULL
+);
+"""
+
+FILL = f"""
+INSERT INTO {SCHEMA}.applications
+    (user_id, applicant_name, created_at, possible_scheduling)
+SELECT
+    (random() * ($2::bigint - 1))::bigint + 1,
+    'Applicant ' || g,
+    now() - (random() * interval '365 days'),
+    '[{{"day": "Monday", "times": ["Any"]}}]'::json
+FROM generate_series(1, $1::int) AS g;
+
+INSERT INTO {SCHEMA}.test_results
+    (user_id, level, score, dropbox_file_id, submitted_at)
+SELECT
+    (random() * ($2::bigint - 1))::bigint + 1,
+    'Starter',
+    '{{"task1": "5/10"}}'::json,
+    CASE WHEN g % 1000 = 0 THEN NULL ELSE 'id:' || g END,
+    now() - (random() * interval '365 days')
+FROM generate_series(1, $1::int) AS g;
+"""
+
+ANALYZE = f"ANALYZE {SCHEMA}.applications, {SCHEMA}.test_results"
+
+INDEXES = f"""
+CREATE INDEX ix_applications_user_id_created_at
+    ON {SCHEMA}.applications (user_id, created_at DESC);
+CREATE INDEX ix_test_results_user_id_submitted_at
+    ON {SCHEMA}.test_results (user_id, submitted_at DESC);
+CREATE INDEX ix_test_results_pending_report
+    ON {SCHEMA}.test_results (submitted_at) WHERE dropbox_file_id IS NULL;
+"""
+
+QUERIES = {
+    "applications_by_user": f"""
+        SELECT id, applicant_name, created_at FROM {SCHEMA}.applications
+        WHERE user_id = $1 ORDER BY created_at DESC, id DESC LIMIT 20
+    """,
+    "test_results_by_user": f"""
+        SELECT id, level, score, submitted_at FROM {SCHEMA}.test_results
+        WHERE user_id = $1 ORDER BY submitted_at DESC LIMIT 20
+    """,
+    "pending_reports": f"""
+        SELECT id FROM {SCHEMA}.test_results
+        WHERE dropbox_file_id IS NULL AND submitted_at < now() - interval '30 minutes'
+        ORDER BY submitted_at LIMIT 500
+    """,
+}
+
+
+async def _fill(conn: asyncpg.Connection, rows: int, users: int) -> None:
+    """Создаёт схему и заполняет таблицы."""
+    await conn.execute(SETUP)
+    for statement in FILL.split(";"):
+        if statement.strip():
+            await conn.execute(statement, rows, users)
+    await conn.execute(ANALYZE)
+
+
+async def _measure(
+    conn: asyncpg.Connection, samples: int, users: int
+) -> Dict[str, List[float]]:
+    """Возвращает задержки (мс) каждого запроса на samples случайных пользователях."""
+    timings: Dict[str, List[float]] = {}
+    for name, query in QUERIES.items():
+        per_user = "$1" in query
+        await conn.fetch(query, *([1] if per_user else []))  # прогрев плана и кэша
+
+        timings[name] = []
+        for _ in range(samples):
+            args = [random.randint(1, users)] if per_user else []
+            started = time.perf_counter()
+            await conn.fetch(query, *args)
+            timings[name].append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def _percentile(values: List[float], q: float) -> float:
+    """Перцентиль q (0–100) по отсортированной выборке."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q / 100))]
+
+
+def _report(before: Dict[str, List[float]], after: Dict[str, List[float]]) -> None:
+    """Печатает p50/p95 до и после создания индексов."""
+    print(
+        f"{'query':<22} {'p50 before':>11} {'p95 before':>11}"
+        f" {'p50 after':>10} {'p95 after':>10} {'speedup':>8}"
+    )
+    for name in QUERIES:
+        p50_before = statistics.median(before[name])
+        p50_after = statistics.median(after[name])
+        print(
+            f"{name:<22} {p50_before:>9.2f}ms {_percentile(before[name], 95):>9.2f}ms"
+            f" {p50_after:>8.2f}ms {_percentile(after[name], 95):>8.2f}ms"
+            f" {p50_before / p50_after:>7.1f}x"
+        )
+
+
+async def benchmark(rows: int, users: int, samples: int, keep: bool) -> None:
+    """Выполняет бенчмарк и печатает результаты."""
+    conn = await asyncpg.connect(settings.sync_db_url)
+    try:
+        print(f"Заполнение: {rows} строк в каждой таблице, {users} пользователей...")
+        await _fill(conn, rows, users)
+
+        before = await _measure(conn, samples, users)
+
+        await conn.execute(INDEXES)
+        await conn.execute(ANALYZE)
+        after = await _measure(conn, samples, users)
+
+        _report(before, after)
+    finally:
+        if not keep:
+            await conn.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        await conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Задержка запросов по пользователю до и после индексов"
+    )
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Строк в таблице")
+    parser.add_argument("--users", type=int, default=50_000, help="Пользователей")
+    parser.add_argument("--samples", type=int, default=200, help="Запросов на замер")
+    parser.add_argument(
+        "--keep", action="store_true", help=f"Не удалять схему {SCHEMA}"
+    )
+    args = parser.parse_args()
+    asyncio.run(benchmark(args.rows, args.users, args.samples, args.keep))
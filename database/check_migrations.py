@@ -0,0 +1,97 @@
+"""
+Проверка согласованности моделей SQLAlchemy и миграций Alembic.
+
+Сравнивает схему базы данных, приведённой миграциями к head, с метаданными
+моделей (database.models) средствами autogenerate Alembic. Расхождения
+означают, что изменение модели не сопровождается миграцией (или наоборот),
+например индекс объявлен в модели, но не создаётся ни одной ревизией.
+
+Проверяется:
+    - у цепочки миграций ровно одна голова;
+    - база данных находится на этой голове;
+    - autogenerate не находит различий между моделями и схемой БД.
+
+Используется вручную или в CI после `alembic upgrade head`:
+    python -m database.check_migrations
+
+Код возврата 0 — расхождений нет, 1 — найдены расхождения.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+from typing import Any, List
+
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy.engine import Connection
+
+from . import models  # noqa: F401  (важно, чтобы модели были импортированы)
+from .base import Base, engine
+
+ALEMBIC_INI = Path(__file__).resolve().parents[1] / "alembic.ini"
+
+
+def _compare(connection: Connection) -> tuple:
+    """Возвращает (ревизии БД, различия схемы и моделей)."""
+    context = MigrationContext.configure(connection, opts={"compare_type": True})
+    return context.get_current_heads(), compare_metadata(context, Base.metadata)
+
+
+async def check_migrations() -> List[str]:
+    """
+    Сравнивает модели с миграциями и схемой БД.
+
+    Returns:
+        list[str]: Описание найденных проблем (пустой список — всё согласовано).
+    """
+    script = ScriptDirectory.from_config(Config(str(ALEMBIC_INI)))
+    heads = script.get_heads()
+
+    problems: List[str] = []
+    if len(heads) != 1:
+        problems.append(f"Цепочка миграций имеет несколько голов: {heads}")
+
+    async with engine.connect() as conn:
+        current, diffs = await conn.run_sync(_compare)
+
+    if set(current) != set(heads):
+        problems.append(
+            f"БД на ревизии {current or '—'}, последняя миграция — {heads}"
+            " (выполните alembic upgrade head)"
+        )
+
+    problems.extend(_describe(diff) for diff in diffs)
+    return problems
+
+
+def _describe(diff: Any) -> str:
+    """Форматирует различие autogenerate в одну строку."""
+    # Изменения колонок приходят списком кортежей
+    if isinstance(diff, list):
+        return "; ".join(_describe(item) for item in diff)
+
+    operation, *args = diff
+    parts = [getattr(arg, "name", None) or repr(arg) for arg in args if arg is not None]
+    return f"{operation}: {' '.join(map(str, parts))}"
+
+
+async def main() -> int:
+    """CLI: выводит расхождения и возвращает код завершения."""
+    problems = await check_migrations()
+    await engine.dispose()
+
+    if not problems:
+        print("🟢 Модели и миграции согласованы.")
+        return 0
+
+    print("🔴 Модели и миграции расходятся:")
+    for problem in problems:
+        print(f"  - {problem}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
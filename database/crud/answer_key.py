@@ -0,0 +1,137 @@
+"""
+CRUD-операции для работы с моделью AnswerKey (версионированные ключи ответов).
+
+Содержит функции для:
+    - чтения действующих ключей (последняя версия каждого вопроса),
+    - публикации новой версии ключей,
+    - оповещения процессов о смене ключей (NOTIFY).
+
+Используемые компоненты:
+    - SQLAlchemy AsyncSession
+    - Модель AnswerKey
+    - Перечисление LevelEnum
+    - Логирование через logging_config.logger
+"""
+
+from typing import Iterable, List, Mapping
+
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.models import AnswerKey, LevelEnum
+from logging_config import logger
+
+# Канал LISTEN/NOTIFY, в который публикуется номер новой версии ключей
+ANSWER_KEYS_CHANNEL = "answer_keys_changed"
+
+
+async def read_current_answer_keys(session: AsyncSession) -> List[AnswerKey]:
+    """
+    Возвращает действующие ключи: строку с наибольшей версией для каждого вопроса.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия БД.
+
+    Returns:
+        list[AnswerKey]: Действующие ключи ответов.
+    """
+    try:
+        result = await session.execute(
+            select(AnswerKey)
+            .distinct(AnswerKey.level, AnswerKey.task, AnswerKey.question)
+            .order_by(
+                AnswerKey.level,
+                AnswerKey.task,
+                AnswerKey.question,
+                AnswerKey.version.desc(),
+            )
+        )
+        return list(result.scalars().all())
+    except SQLAlchemyError as e:
+        logger.error("❌ Ошибка БД в read_current_answer_keys: %s", e)
+        raise e
+
+
+async def publish_answer_keys(
+    session: AsyncSession, changes: Iterable[Mapping[str, object]]
+) -> int:
+    """
+    Публикует изменённые ключи как новую версию и оповещает процессы.
+
+    Номер версии выделяется под advisory-блокировкой, поэтому параллельные
+    публикации получают разные версии. NOTIFY доставляется после commit.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия БД.
+        changes: Элементы вида {"level", "task", "question", "accepted_answers"};
+            пустой accepted_answers исключает вопрос из проверки.
+
+    Returns:
+        int: Номер опубликованной версии.
+
+    Raises:
+        ValueError: Если уровень теста некорректен или изменений нет.
+        SQLAlchemyError: Ошибка БД.
+    """
+    rows = []
+    for change in changes:
+        try:
+            level = LevelEnum(change["level"])
+        except ValueError as err:
+            raise ValueError(f"Недопустимый уровень теста: {change['level']}") from err
+        rows.append(
+            {
+                "level": level,
+                "task": str(change["task"]),
+                "question": str(change["question"]),
+                "accepted_answers": list(change["accepted_answers"]),
+            }
+        )
+    if not rows:
+        raise ValueError("Нет изменений для публикации")
+
+    try:
+        await session.execute(
+            text("SELECT pg_advisory_xact_lock(hashtext(:name))"),
+            {"name": AnswerKey.__tablename__},
+        )
+        current = await session.scalar(
+            select(func.coalesce(func.max(AnswerKey.version), 0))
+        )
+        version = int(current) + 1
+
+        await session.execute(
+            insert(AnswerKey), [{**row, "version": version} for row in rows]
+        )
+        await _notify(session, version)
+        await session.commit()
+
+        logger.info("🟢 Опубликована версия ключей ответов %s (%s)", version, len(rows))
+        return version
+    except SQLAlchemyError as e:
+        await session.rollback()
+        logger.error("❌ Ошибка БД в publish_answer_keys: %s", e)
+        raise e
+
+
+async def notify_answer_keys_changed(session: AsyncSession, version: int) -> None:
+    """
+    Оповещает все процессы о необходимости перечитать ключи ответов.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия БД.
+        version (int): Номер актуальной версии.
+    """
+    try:
+        await _notify(session, version)
+        await session.commit()
+    except SQLAlchemyError as e:
+        await session.rollback()
+        logger.error("❌ Ошибка БД в notify_answer_keys_changed: %s", e)
+        raise e
+
+
+async def _notify(session: AsyncSession, version: int) -> None:
+    """Выполняет pg_notify в канал ANSWER_KEYS_CHANNEL (в текущей транзакции)."""
+    await session.execute(select(func.pg_notify(ANSWER_KEYS_CHANNEL, str(version))))
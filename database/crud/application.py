@@ -2,6 +2,8 @@
 CRUD-операции для работы с моделью Application.
 
 Содержит функции для создания, чтения и обновления заявок.
+Запись выполняется одним INSERT/UPDATE ... RETURNING, поэтому
+создание и обновление занимают один запрос к БД в одной транзакции.
 Выполняет валидацию Enum-полей, преобразуя входные строки
 в соответствующие объекты перечислений.
 
@@ -12,10 +14,11 @@ CRUD-операции для работы с моделью Application.
     - Логирование через logging_config.logger
 """
 
-from typing import Any, Dict, List, Optional, Sequence
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from fastapi import HTTPException
-from sqlalchemy import select
+from sqlalchemy import exists, insert, select, tuple_, update
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -29,6 +32,12 @@ from database.models import (
 )
 from logging_config import logger
 
+APPLICATIONS_PAGE_SIZE = 20
+MAX_APPLICATIONS_PAGE_SIZE = 100
+
+# Строка списка заявок: (id, applicant_name, created_at)
+ApplicationListRowType = Tuple[int, str, datetime]
+
 
 def validate_enum_fields(data: dict) -> dict:
     """
@@ -111,6 +120,11 @@ async def create_application(
     """
     Создаёт новую заявку.
 
+    Заявка записывается одним INSERT ... RETURNING в одной транзакции
+    (без повторного чтения после commit). Отдельный учёт заявок
+    у пользователя не ведётся: список заявок выбирается
+    по applications.user_id (list_applications_by_user_id).
+
     Args:
         session (AsyncSession): Асинхронная сессия БД.
         user_id (int): Telegram ID пользователя.
@@ -145,24 +159,27 @@ async def create_application(
     )
 
     try:
-        new_application = Application(
-            user_id=user_id,
-            applicant_name=applicant_name,
-            phone_number=phone_number,
-            applicant_age=applicant_age,
-            preferred_class_format=validated["preferred_class_format"],
-            preferred_study_mode=validated["preferred_study_mode"],
-            level=validated["level"],
-            possible_scheduling=possible_scheduling,
-            reference_source=validated["reference_source"],
-            need_ielts=need_ielts,
-            studied_at_lanex=studied_at_lanex,
-            previous_experience=validated.get("previous_experience"),
-            dropbox_file_id=dropbox_file_id,
-            file_name=file_name,
+        result = await session.execute(
+            insert(Application)
+            .values(
+                user_id=user_id,
+                applicant_name=applicant_name,
+                phone_number=phone_number,
+                applicant_age=applicant_age,
+                preferred_class_format=validated["preferred_class_format"],
+                preferred_study_mode=validated["preferred_study_mode"],
+                level=validated["level"],
+                possible_scheduling=possible_scheduling,
+                reference_source=validated["reference_source"],
+                need_ielts=need_ielts,
+                studied_at_lanex=studied_at_lanex,
+                previous_experience=validated.get("previous_experience"),
+                dropbox_file_id=dropbox_file_id,
+                file_name=file_name,
+            )
+            .returning(Application)
         )
-
-        session.add(new_application)
+        new_application = result.scalar_one()
         await session.commit()
         return new_application
 
@@ -193,6 +210,9 @@ async def update_application_by_id(
     """
     Обновляет заявку по её ID.
 
+    Выполняется одним UPDATE ... RETURNING в одной транзакции:
+    заявка предварительно не читается.
+
     Args:
         session (AsyncSession): Асинхронная сессия БД.
         id (int): ID заявки.
@@ -228,36 +248,39 @@ async def update_application_by_id(
         }
     )
 
+    fields_to_update = {
+        "user_id": user_id,
+        "applicant_name": applicant_name,
+        "phone_number": phone_number,
+        "applicant_age": applicant_age,
+        "preferred_class_format": validated["preferred_class_format"],
+        "preferred_study_mode": validated["preferred_study_mode"],
+        "level": validated["level"],
+        "possible_scheduling": possible_scheduling,
+        "reference_source": validated["reference_source"],
+        "need_ielts": need_ielts,
+        "studied_at_lanex": studied_at_lanex,
+        "previous_experience": validated.get("previous_experience"),
+    }
+
+    # обновление файлов — если переданы
+    if dropbox_file_id:
+        fields_to_update["dropbox_file_id"] = dropbox_file_id
+    if file_name:
+        fields_to_update["file_name"] = file_name
+
     try:
-        app = await read_application_by_id(session, id)
+        result = await session.execute(
+            update(Application)
+            .where(Application.id == id)
+            .values(**fields_to_update)
+            .returning(Application)
+        )
+        app = result.scalar_one_or_none()
         if not app:
+            await session.rollback()
             raise HTTPException(status_code=404, detail="Application not found")
 
-        fields_to_update = {
-            "user_id": user_id,
-            "applicant_name": applicant_name,
-            "phone_number": phone_number,
-            "applicant_age": applicant_age,
-            "preferred_class_format": validated["preferred_class_format"],
-            "preferred_study_mode": validated["preferred_study_mode"],
-            "level": validated["level"],
-            "possible_scheduling": possible_scheduling,
-            "reference_source": validated["reference_source"],
-            "need_ielts": need_ielts,
-            "studied_at_lanex": studied_at_lanex,
-            "previous_experience": validated.get("previous_experience"),
-        }
-
-        # обновление файлов — если переданы
-        if dropbox_file_id:
-            fields_to_update["dropbox_file_id"] = dropbox_file_id
-        if file_name:
-            fields_to_update["file_name"] = file_name
-
-        for field, new_value in fields_to_update.items():
-            if getattr(app, field) != new_value:
-                setattr(app, field, new_value)
-
         await session.commit()
         return app
 
@@ -267,6 +290,24 @@ async def update_application_by_id(
         raise e
 
 
+async def application_exists(session: AsyncSession, id: int) -> bool:
+    """
+    Проверяет существование заявки (без чтения её колонок).
+
+    Args:
+        session (AsyncSession): Сессия БД.
+        id (int): ID заявки.
+
+    Returns:
+        bool: True, если заявка существует.
+    """
+    try:
+        return bool(await session.scalar(select(exists().where(Application.id == id))))
+    except SQLAlchemyError as e:
+        logger.error("❌ Database error in application_exists: %s", e)
+        raise e
+
+
 async def read_application_by_id(
     session: AsyncSession, id: int
 ) -> Optional[Application]:
@@ -309,3 +350,49 @@ async def read_application_by_user_id(
     except SQLAlchemyError as e:
         logger.error("❌ Database error in read_application_by_user_id: %s", e)
         raise e
+
+
+async def list_applications_by_user_id(
+    session: AsyncSession,
+    user_id: int,
+    after_id: Optional[int] = None,
+    limit: int = APPLICATIONS_PAGE_SIZE,
+) -> List[ApplicationListRowType]:
+    """
+    Возвращает страницу заявок пользователя для списков (API, меню бота).
+
+    Выбираются только ID, имя и дата создания — без JSON- и массивных
+    колонок. Заявки упорядочены от новых к старым; пагинация по ключу
+    (created_at, id) с использованием индекса
+    ix_applications_user_id_created_at, поэтому стоимость страницы
+    не зависит от длины истории пользователя.
+
+    Args:
+        session (AsyncSession): Сессия БД.
+        user_id (int): Telegram ID пользователя.
+        after_id (int | None): ID последней заявки предыдущей страницы.
+        limit (int): Размер страницы.
+
+    Returns:
+        list[tuple]: (id, applicant_name, created_at) от новых к старым.
+    """
+    query = select(
+        Application.id, Application.applicant_name, Application.created_at
+    ).where(Application.user_id == user_id)
+
+    if after_id is not None:
+        cursor = (
+            select(Application.created_at, Application.id)
+            .where(Application.id == after_id, Application.user_id == user_id)
+            .scalar_subquery()
+        )
+        query = query.where(tuple_(Application.created_at, Application.id) < cursor)
+
+    query = query.order_by(Application.created_at.desc(), Application.id.desc())
+
+    try:
+        result = await session.execute(query.limit(limit))
+        return [(row.id, row.applicant_name, row.created_at) for row in result.all()]
+    except SQLAlchemyError as e:
+        logger.error("❌ Database error in list_applications_by_user_id: %s", e)
+        raise e
@@ -0,0 +1,175 @@
+"""
+CRUD-операции для работы с моделью IdempotencyKey (ключи идемпотентности).
+
+Содержит функции для:
+    - атомарного захвата ключа (INSERT ... ON CONFLICT),
+    - сохранения ответа обработанного запроса,
+    - освобождения ключа после ошибки обработки,
+    - удаления истёкших ключей.
+
+Используемые компоненты:
+    - SQLAlchemy AsyncSession
+    - Модель IdempotencyKey
+    - Логирование через logging_config.logger
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.models import IdempotencyKey, IdempotencyStatusEnum
+from logging_config import logger
+
+
+async def claim_idempotency_key(
+    session: AsyncSession, scope: str, key: str, request_hash: str, lease: float
+) -> Optional[IdempotencyKey]:
+    """
+    Захватывает ключ для обработки запроса.
+
+    Новый или истёкший ключ захватывается атомарно (INSERT ... ON CONFLICT
+    DO UPDATE WHERE expires_at < now). Если ключ уже занят действующей
+    записью, возвращается она.
+
+    Захват действует только lease секунд: если обработчик завершился,
+    не сохранив ответ, повтор после этого срока захватит ключ заново.
+    Срок хранения сохранённого ответа задаёт complete_idempotency_key.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия БД.
+        scope (str): Эндпоинт.
+        key (str): Ключ идемпотентности.
+        request_hash (str): Хэш тела запроса.
+        lease (float): Срок захвата ключа на время обработки (сек).
+
+    Returns:
+        IdempotencyKey | None: None, если ключ захвачен этим запросом,
+            иначе существующая запись (в обработке или с ответом).
+    """
+    try:
+        for _ in range(2):
+            now = datetime.now(timezone.utc)
+            values = {
+                "request_hash": request_hash,
+                "status": IdempotencyStatusEnum.in_progress,
+                "status_code": None,
+                "response": None,
+                "created_at": now,
+                "expires_at": now + timedelta(seconds=lease),
+            }
+            stmt = pg_insert(IdempotencyKey).values(scope=scope, key=key, **values)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[IdempotencyKey.scope, IdempotencyKey.key],
+                set_=values,
+                where=IdempotencyKey.expires_at < now,
+            ).returning(IdempotencyKey.key)
+
+            claimed = (await session.execute(stmt)).first()
+            if claimed is not None:
+                await session.commit()
+                return None
+
+            existing = await session.scalar(
+                select(IdempotencyKey).where(
+                    IdempotencyKey.scope == scope, IdempotencyKey.key == key
+                )
+            )
+            await session.commit()
+            # None — запись удалили между запросами: пробуем захватить снова
+            if existing is not None:
+                return existing
+
+        raise RuntimeError(f"Не удалось захватить ключ идемпотентности {key}")
+    except SQLAlchemyError as e:
+        await session.rollback()
+        logger.error("❌ Ошибка БД в claim_idempotency_key: %s", e)
+        raise e
+
+
+async def complete_idempotency_key(
+    session: AsyncSession,
+    scope: str,
+    key: str,
+    status_code: int,
+    response: Dict[str, Any],
+    ttl: float,
+) -> None:
+    """
+    Сохраняет ответ обработанного запроса и продлевает ключ на ttl.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия БД.
+        scope (str): Эндпоинт.
+        key (str): Ключ идемпотентности.
+        status_code (int): HTTP-статус ответа.
+        response (dict): Тело ответа.
+        ttl (float): Время хранения ответа (сек).
+    """
+    try:
+        await session.execute(
+            update(IdempotencyKey)
+            .where(IdempotencyKey.scope == scope, IdempotencyKey.key == key)
+            .values(
+                status=IdempotencyStatusEnum.completed,
+                status_code=status_code,
+                response=response,
+                expires_at=datetime.now(timezone.utc) + timedelta(seconds=ttl),
+            )
+        )
+        await session.commit()
+    except SQLAlchemyError as e:
+        await session.rollback()
+        logger.error("❌ Ошибка БД в complete_idempotency_key: %s", e)
+        raise e
+
+
+async def release_idempotency_key(session: AsyncSession, scope: str, key: str) -> None:
+    """
+    Удаляет незавершённый ключ, чтобы повтор запроса выполнился заново.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия БД.
+        scope (str): Эндпоинт.
+        key (str): Ключ идемпотентности.
+    """
+    try:
+        await session.execute(
+            delete(IdempotencyKey).where(
+                IdempotencyKey.scope == scope,
+                IdempotencyKey.key == key,
+                IdempotencyKey.status == IdempotencyStatusEnum.in_progress,
+            )
+        )
+        await session.commit()
+    except SQLAlchemyError as e:
+        await session.rollback()
+        logger.error("❌ Ошибка БД в release_idempotency_key: %s", e)
+        raise e
+
+
+async def delete_expired_idempotency_keys(session: AsyncSession) -> int:
+    """
+    Удаляет истёкшие ключи идемпотентности.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия БД.
+
+    Returns:
+        int: Количество удалённых ключей.
+    """
+    try:
+        result = await session.execute(
+            delete(IdempotencyKey).where(
+                IdempotencyKey.expires_at < datetime.now(timezone.utc)
+            )
+        )
+        await session.commit()
+        return result.rowcount or 0
+    except SQLAlchemyError as e:
+        await session.rollback()
+        logger.error("❌ Ошибка БД в delete_expired_idempotency_keys: %s", e)
+        raise e
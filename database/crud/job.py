@@ -0,0 +1,254 @@
+"""
+CRUD-операции для работы с моделью Job (очередь фоновых задач).
+
+Содержит функции для:
+    - постановки задачи в очередь,
+    - чтения задачи по ID,
+    - атомарного захвата следующей задачи воркером,
+    - фиксации успешного/неуспешного выполнения,
+    - продления выполняющейся задачи (heartbeat),
+    - возврата «зависших» задач в очередь.
+
+Захват задач выполняется через SELECT ... FOR UPDATE SKIP LOCKED,
+поэтому несколько воркеров (и несколько процессов) не берут
+одну и ту же задачу.
+
+Используемые компоненты:
+    - SQLAlchemy AsyncSession
+    - Модель Job
+    - Логирование через logging_config.logger
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.models import Job, JobStatusEnum
+from logging_config import logger
+
+
+async def create_job(
+    session: AsyncSession, kind: str, payload: Dict[str, Any], max_attempts: int
+) -> Job:
+    """
+    Ставит новую задачу в очередь.
+
+    Фиксирует транзакцию сессии целиком: записи, добавленные в неё раньше
+    (например, результат теста), сохраняются вместе с задачей.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия БД.
+        kind (str): Тип задачи.
+        payload (dict): Входные данные обработчика.
+        max_attempts (int): Максимальное количество попыток.
+
+    Returns:
+        Job: Созданная задача.
+
+    Raises:
+        SQLAlchemyError: Ошибка БД.
+    """
+    try:
+        job = Job(kind=kind, payload=payload, max_attempts=max_attempts)
+        session.add(job)
+        await session.commit()
+        return job
+    except SQLAlchemyError as e:
+        await session.rollback()
+        logger.error("❌ Ошибка БД в create_job: %s", e)
+        raise e
+
+
+async def read_job_by_id(session: AsyncSession, id: int) -> Optional[Job]:
+    """
+    Возвращает задачу по её ID.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия БД.
+        id (int): ID задачи.
+
+    Returns:
+        Job | None: Найденная задача.
+    """
+    try:
+        result = await session.execute(select(Job).where(Job.id == id))
+        return result.scalar_one_or_none()
+    except SQLAlchemyError as e:
+        logger.error("❌ Ошибка БД в read_job_by_id: %s", e)
+        raise e
+
+
+async def claim_next_job(session: AsyncSession) -> Optional[Job]:
+    """
+    Атомарно захватывает следующую готовую к выполнению задачу.
+
+    Задача переводится в статус running, счётчик попыток увеличивается.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия БД.
+
+    Returns:
+        Job | None: Захваченная задача или None, если очередь пуста.
+    """
+    now = datetime.now(timezone.utc)
+    try:
+        result = await session.execute(
+            select(Job)
+            .where(Job.status == JobStatusEnum.pending, Job.run_after <= now)
+            .order_by(Job.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        job = result.scalar_one_or_none()
+        if job is None:
+            await session.rollback()
+            return None
+
+        job.status = JobStatusEnum.running
+        job.attempts += 1
+        job.updated_at = now
+        await session.commit()
+        return job
+    except SQLAlchemyError as e:
+        await session.rollback()
+        logger.error("❌ Ошибка БД в claim_next_job: %s", e)
+        raise e
+
+
+async def complete_job(
+    session: AsyncSession, id: int, result: Optional[Dict[str, Any]]
+) -> None:
+    """
+    Отмечает задачу как успешно выполненную.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия БД.
+        id (int): ID задачи.
+        result (dict | None): Результат обработчика.
+    """
+    try:
+        await session.execute(
+            update(Job)
+            .where(Job.id == id)
+            .values(
+                status=JobStatusEnum.done,
+                result=result,
+                last_error=None,
+                updated_at=datetime.now(timezone.utc),
+            )
+        )
+        await session.commit()
+    except SQLAlchemyError as e:
+        await session.rollback()
+        logger.error("❌ Ошибка БД в complete_job: %s", e)
+        raise e
+
+
+async def fail_job(
+    session: AsyncSession, id: int, error: str, retry_in: Optional[float]
+) -> None:
+    """
+    Фиксирует ошибку выполнения задачи.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия БД.
+        id (int): ID задачи.
+        error (str): Текст ошибки.
+        retry_in (float | None): Через сколько секунд повторить задачу.
+            None — попытки исчерпаны, задача помечается как failed.
+    """
+    now = datetime.now(timezone.utc)
+    values: Dict[str, Any] = {"last_error": error, "updated_at": now}
+    if retry_in is None:
+        values["status"] = JobStatusEnum.failed
+    else:
+        values["status"] = JobStatusEnum.pending
+        values["run_after"] = now + timedelta(seconds=retry_in)
+
+    try:
+        await session.execute(update(Job).where(Job.id == id).values(**values))
+        await session.commit()
+    except SQLAlchemyError as e:
+        await session.rollback()
+        logger.error("❌ Ошибка БД в fail_job: %s", e)
+        raise e
+
+
+async def count_active_jobs(session: AsyncSession) -> int:
+    """
+    Возвращает количество задач в статусах pending и running.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия БД.
+
+    Returns:
+        int: Количество незавершённых задач.
+    """
+    try:
+        result = await session.execute(
+            select(func.count())
+            .select_from(Job)
+            .where(Job.status.in_([JobStatusEnum.pending, JobStatusEnum.running]))
+        )
+        return int(result.scalar() or 0)
+    except SQLAlchemyError as e:
+        logger.error("❌ Ошибка БД в count_active_jobs: %s", e)
+        raise e
+
+
+async def touch_running_job(session: AsyncSession, id: int) -> bool:
+    """
+    Обновляет updated_at выполняющейся задачи, чтобы она не считалась зависшей.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия БД.
+        id (int): ID задачи.
+
+    Returns:
+        bool: False, если задача уже не в статусе running.
+    """
+    try:
+        result = await session.execute(
+            update(Job)
+            .where(Job.id == id, Job.status == JobStatusEnum.running)
+            .values(updated_at=datetime.now(timezone.utc))
+        )
+        await session.commit()
+        return bool(getattr(result, "rowcount", 0))
+    except SQLAlchemyError as e:
+        await session.rollback()
+        logger.error("❌ Ошибка БД в touch_running_job: %s", e)
+        raise e
+
+
+async def requeue_stale_jobs(session: AsyncSession, older_than: float) -> int:
+    """
+    Возвращает в очередь задачи, «зависшие» в статусе running
+    (например, после падения процесса посреди выполнения).
+
+    Args:
+        session (AsyncSession): Асинхронная сессия БД.
+        older_than (float): Сколько секунд задача может находиться в running.
+
+    Returns:
+        int: Количество возвращённых в очередь задач.
+    """
+    now = datetime.now(timezone.utc)
+    try:
+        result = await session.execute(
+            update(Job)
+            .where(
+                Job.status == JobStatusEnum.running,
+                Job.updated_at < now - timedelta(seconds=older_than),
+            )
+            .values(status=JobStatusEnum.pending, run_after=now, updated_at=now)
+        )
+        await session.commit()
+        return int(getattr(result, "rowcount", 0) or 0)
+    except SQLAlchemyError as e:
+        await session.rollback()
+        logger.error("❌ Ошибка БД в requeue_stale_jobs: %s", e)
+        raise e
@@ -0,0 +1,204 @@
+"""
+CRUD-операции для работы с моделью NotificationOutbox (исходящие уведомления).
+
+Содержит функции для:
+    - постановки уведомления в очередь,
+    - атомарного захвата пачки готовых к отправке уведомлений,
+    - фиксации успешной отправки,
+    - переноса или окончательной отметки неудачной отправки,
+    - переноса без траты попытки (ограничение частоты Telegram).
+
+Захват выполняется через SELECT ... FOR UPDATE SKIP LOCKED и «аренду»:
+available_at сдвигается на lease секунд вперёд, поэтому уведомления,
+захваченные упавшим процессом, снова становятся доступны после
+истечения аренды.
+
+Используемые компоненты:
+    - SQLAlchemy AsyncSession
+    - Модель NotificationOutbox
+    - Логирование через logging_config.logger
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.models import NotificationOutbox, OutboxStatusEnum
+from logging_config import logger
+
+
+async def create_notification(
+    session: AsyncSession,
+    chat_id: int,
+    text: Optional[str] = None,
+    document: Optional[bytes] = None,
+    filename: Optional[str] = None,
+) -> NotificationOutbox:
+    """
+    Ставит уведомление в очередь на отправку.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия БД.
+        chat_id (int): ID чата получателя.
+        text (str | None): Текст сообщения или подпись к документу.
+        document (bytes | None): Содержимое документа.
+        filename (str | None): Имя файла документа.
+
+    Returns:
+        NotificationOutbox: Созданное уведомление.
+
+    Raises:
+        SQLAlchemyError: Ошибка БД.
+    """
+    try:
+        notification = NotificationOutbox(
+            chat_id=chat_id, text=text, document=document, filename=filename
+        )
+        session.add(notification)
+        await session.commit()
+        return notification
+    except SQLAlchemyError as e:
+        await session.rollback()
+        logger.error("❌ Ошибка БД в create_notification: %s", e)
+        raise e
+
+
+async def claim_notifications(
+    session: AsyncSession, limit: int, lease: float
+) -> List[NotificationOutbox]:
+    """
+    Атомарно захватывает пачку уведомлений, готовых к отправке.
+
+    Счётчик попыток увеличивается, available_at сдвигается на lease секунд.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия БД.
+        limit (int): Максимальный размер пачки.
+        lease (float): Длительность аренды (сек).
+
+    Returns:
+        list[NotificationOutbox]: Захваченные уведомления (по возрастанию ID).
+    """
+    now = datetime.now(timezone.utc)
+    try:
+        result = await session.execute(
+            select(NotificationOutbox)
+            .where(
+                NotificationOutbox.status == OutboxStatusEnum.pending,
+                NotificationOutbox.available_at <= now,
+            )
+            .order_by(NotificationOutbox.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        notifications = list(result.scalars().all())
+        if not notifications:
+            await session.rollback()
+            return []
+
+        for notification in notifications:
+            notification.attempts += 1
+            notification.available_at = now + timedelta(seconds=lease)
+        await session.commit()
+        return notifications
+    except SQLAlchemyError as e:
+        await session.rollback()
+        logger.error("❌ Ошибка БД в claim_notifications: %s", e)
+        raise e
+
+
+async def mark_notifications_sent(session: AsyncSession, ids: Sequence[int]) -> None:
+    """
+    Отмечает уведомления как отправленные и освобождает содержимое документов.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия БД.
+        ids (Sequence[int]): ID уведомлений.
+    """
+    try:
+        await session.execute(
+            update(NotificationOutbox)
+            .where(NotificationOutbox.id.in_(list(ids)))
+            .values(
+                status=OutboxStatusEnum.sent,
+                document=None,
+                last_error=None,
+                sent_at=datetime.now(timezone.utc),
+            )
+        )
+        await session.commit()
+    except SQLAlchemyError as e:
+        await session.rollback()
+        logger.error("❌ Ошибка БД в mark_notifications_sent: %s", e)
+        raise e
+
+
+async def fail_notifications(
+    session: AsyncSession,
+    ids: Sequence[int],
+    error: str,
+    retry_in: Optional[float],
+) -> None:
+    """
+    Фиксирует неудачную отправку уведомлений.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия БД.
+        ids (Sequence[int]): ID уведомлений.
+        error (str): Текст ошибки.
+        retry_in (float | None): Через сколько секунд повторить.
+            None — попытки исчерпаны, уведомления помечаются как failed.
+    """
+    now = datetime.now(timezone.utc)
+    values: Dict[str, object] = {"last_error": error}
+    if retry_in is None:
+        values["status"] = OutboxStatusEnum.failed
+    else:
+        values["available_at"] = now + timedelta(seconds=retry_in)
+
+    try:
+        await session.execute(
+            update(NotificationOutbox)
+            .where(NotificationOutbox.id.in_(list(ids)))
+            .values(**values)
+        )
+        await session.commit()
+    except SQLAlchemyError as e:
+        await session.rollback()
+        logger.error("❌ Ошибка БД в fail_notifications: %s", e)
+        raise e
+
+
+async def postpone_notifications(
+    session: AsyncSession, ids: Sequence[int], error: str, retry_in: float
+) -> None:
+    """
+    Переносит уведомления, не расходуя попытку доставки.
+
+    Используется при ответе 429: захват уже увеличил attempts, но отправка
+    не выполнялась, поэтому счётчик возвращается обратно.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия БД.
+        ids (Sequence[int]): ID уведомлений.
+        error (str): Текст ошибки.
+        retry_in (float): Через сколько секунд повторить.
+    """
+    try:
+        await session.execute(
+            update(NotificationOutbox)
+            .where(NotificationOutbox.id.in_(list(ids)))
+            .values(
+                attempts=func.greatest(NotificationOutbox.attempts - 1, 0),
+                available_at=datetime.now(timezone.utc) + timedelta(seconds=retry_in),
+                last_error=error,
+            )
+        )
+        await session.commit()
+    except SQLAlchemyError as e:
+        await session.rollback()
+        logger.error("❌ Ошибка БД в postpone_notifications: %s", e)
+        raise e
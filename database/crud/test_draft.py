@@ -0,0 +1,175 @@
+"""
+CRUD-операции для работы с моделью TestDraft (черновики тестов).
+
+Содержит функции для:
+    - пакетного слияния изменённых ответов с сохранёнными
+      (INSERT ... ON CONFLICT DO UPDATE SET answers = answers || excluded),
+    - чтения черновика пользователя,
+    - очистки черновика после отправки теста (отметка submitted_at),
+    - удаления устаревших черновиков.
+
+Изменения, полученные раньше отправки теста, к отправленному черновику
+не применяются: так буфер другого воркера, записанный после отправки,
+не восстанавливает черновик. Изменения, полученные позже (тест начат
+заново), снимают отметку.
+
+Используемые компоненты:
+    - SQLAlchemy AsyncSession
+    - Модель TestDraft
+    - Логирование через logging_config.logger
+"""
+
+from datetime import datetime, timezone
+from typing import Dict, Optional, Sequence, Tuple
+
+from sqlalchemy import delete, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.models import LevelEnum, TestDraft
+from logging_config import logger
+
+# Изменения одного черновика:
+# (Telegram ID, уровень, "task1.3" -> ответ, время получения последнего изменения)
+DraftDeltaType = Tuple[int, LevelEnum, Dict[str, str], datetime]
+
+
+async def merge_test_drafts(
+    session: AsyncSession, deltas: Sequence[DraftDeltaType]
+) -> int:
+    """
+    Сливает изменения черновиков с сохранёнными одним запросом.
+
+    Изменённые ответы заменяют сохранённые, остальные сохраняются
+    (jsonb ||). Несуществующие черновики создаются. Изменения, полученные
+    до отправки теста (submitted_at), пропускаются.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия БД.
+        deltas (Sequence[DraftDeltaType]): Изменения; пара
+            (user_id, level) встречается не более одного раза.
+
+    Returns:
+        int: Количество записанных черновиков.
+    """
+    if not deltas:
+        return 0
+
+    try:
+        stmt = pg_insert(TestDraft).values(
+            [
+                {
+                    "user_id": user_id,
+                    "level": level,
+                    "answers": answers,
+                    "updated_at": received_at,
+                }
+                for user_id, level, answers, received_at in deltas
+            ]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[TestDraft.user_id, TestDraft.level],
+            set_={
+                "answers": TestDraft.answers.op("||")(stmt.excluded.answers),
+                "updated_at": stmt.excluded.updated_at,
+                "submitted_at": None,
+            },
+            where=or_(
+                TestDraft.submitted_at.is_(None),
+                TestDraft.submitted_at < stmt.excluded.updated_at,
+            ),
+        )
+        result = await session.execute(stmt)
+        await session.commit()
+        return result.rowcount or 0
+    except SQLAlchemyError as e:
+        await session.rollback()
+        logger.error("❌ Ошибка БД в merge_test_drafts: %s", e)
+        raise e
+
+
+async def read_test_draft(
+    session: AsyncSession, user_id: int, level: LevelEnum
+) -> Optional[TestDraft]:
+    """
+    Возвращает черновик пользователя по уровню.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия БД.
+        user_id (int): Telegram ID пользователя.
+        level (LevelEnum): Уровень теста.
+
+    Returns:
+        TestDraft | None: Черновик или None, если его нет.
+    """
+    try:
+        return await session.scalar(
+            select(TestDraft).where(
+                TestDraft.user_id == user_id, TestDraft.level == level
+            )
+        )
+    except SQLAlchemyError as e:
+        logger.error("❌ Ошибка БД в read_test_draft: %s", e)
+        raise e
+
+
+async def submit_test_draft(
+    session: AsyncSession, user_id: int, level: LevelEnum
+) -> None:
+    """
+    Очищает черновик после отправки теста и отмечает время отправки.
+
+    Отметка нужна вместо удаления: изменения, полученные раньше отправки
+    и ещё не записанные другими процессами, не восстановят черновик.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия БД.
+        user_id (int): Telegram ID пользователя.
+        level (LevelEnum): Уровень теста.
+    """
+    try:
+        now = datetime.now(timezone.utc)
+        stmt = pg_insert(TestDraft).values(
+            user_id=user_id, level=level, answers={}, updated_at=now, submitted_at=now
+        )
+        await session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[TestDraft.user_id, TestDraft.level],
+                set_={
+                    "answers": stmt.excluded.answers,
+                    "updated_at": stmt.excluded.updated_at,
+                    "submitted_at": stmt.excluded.submitted_at,
+                },
+            )
+        )
+        await session.commit()
+    except SQLAlchemyError as e:
+        await session.rollback()
+        logger.error("❌ Ошибка БД в submit_test_draft: %s", e)
+        raise e
+
+
+async def delete_expired_test_drafts(
+    session: AsyncSession, updated_before: datetime
+) -> int:
+    """
+    Удаляет черновики, которые не менялись с updated_before.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия БД.
+        updated_before (datetime): Граница времени последней записи.
+
+    Returns:
+        int: Количество удалённых черновиков.
+    """
+    try:
+        result = await session.execute(
+            delete(TestDraft).where(TestDraft.updated_at < updated_before)
+        )
+        await session.commit()
+        return result.rowcount or 0
+    except SQLAlchemyError as e:
+        await session.rollback()
+        logger.error("❌ Ошибка БД в delete_expired_test_drafts: %s", e)
+        raise e
@@ -2,7 +2,11 @@
 CRUD-операции для работы с моделью TestResult.
 
 Содержит функции для:
-    - создания результата теста.
+    - создания результата теста,
+    - чтения результата по ID,
+    - привязки PDF-отчёта из Dropbox к результату,
+    - поиска результатов, отчёт для которых так и не был сформирован,
+    - постраничного (keyset) чтения и пакетной записи результатов перепроверки.
 
 Используемые компоненты:
     - SQLAlchemy AsyncSession
@@ -11,8 +15,10 @@ CRUD-операции для работы с моделью TestResult.
     - Логирование через logging_config.logger
 """
 
-from typing import Any, Dict, Optional
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
+from sqlalchemy import JSON, Integer, column, func, insert, select, update, values
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -28,8 +34,10 @@ async def create_test_result(
     closed_answers: Optional[Dict[str, Any]],
     open_answers: Optional[Dict[str, Any]],
     score: Optional[Dict[str, Any]],
-    dropbox_file_id: str,
-    file_name: str,
+    dropbox_file_id: Optional[str] = None,
+    file_name: Optional[str] = None,
+    answer_key_version: Optional[int] = None,
+    commit: bool = True,
 ) -> TestResult:
     """
     Создаёт запись результата теста.
@@ -42,8 +50,13 @@ async def create_test_result(
         closed_answers (dict | None): Ответы на закрытые задания.
         open_answers (dict | None): Ответы на открытые задания.
         score (dict | None): Баллы по заданиям.
-        dropbox_file_id (str): Уникальный file_id PDF результата.
-        file_name (str): Имя PDF файла.
+        dropbox_file_id (str | None): Уникальный file_id PDF результата.
+            None, если отчёт ещё формируется фоновой задачей.
+        file_name (str | None): Имя PDF файла.
+        answer_key_version (int | None): Версия ключей, по которой проверен тест.
+        commit (bool): Зафиксировать транзакцию. False — запись остаётся
+            в транзакции сессии (например, чтобы поставить задачу отчёта
+            в той же транзакции).
 
     Returns:
         TestResult: Созданный объект результата теста.
@@ -58,20 +71,24 @@ async def create_test_result(
         except ValueError as err:
             raise ValueError(f"Недопустимый уровень теста: {level}") from err
 
-        new_result = TestResult(
-            user_id=user_id,
-            test_taker=test_taker,
-            level=level_enum,
-            closed_answers=closed_answers,
-            open_answers=open_answers,
-            score=score,
-            dropbox_file_id=dropbox_file_id,
-            file_name=file_name,
+        result = await session.execute(
+            insert(TestResult)
+            .values(
+                user_id=user_id,
+                test_taker=test_taker,
+                level=level_enum,
+                closed_answers=closed_answers,
+                open_answers=open_answers,
+                score=score,
+                dropbox_file_id=dropbox_file_id,
+                file_name=file_name,
+                answer_key_version=answer_key_version,
+            )
+            .returning(TestResult)
         )
-
-        session.add(new_result)
-        await session.commit()
-        await session.refresh(new_result)
+        new_result = result.scalar_one()
+        if commit:
+            await session.commit()
 
         logger.info(
             "🟢 Создан TestResult для user_id=%s, уровень=%s, file_id=%s",
@@ -86,3 +103,240 @@ async def create_test_result(
         await session.rollback()
         logger.error("❌ Ошибка БД в create_test_result: %s", e)
         raise e
+
+
+async def read_test_result_by_id(
+    session: AsyncSession, id: int
+) -> Optional[TestResult]:
+    """
+    Возвращает результат теста по его ID.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия БД.
+        id (int): ID результата теста.
+
+    Returns:
+        TestResult | None: Найденный результат.
+    """
+    try:
+        result = await session.execute(select(TestResult).where(TestResult.id == id))
+        return result.scalar_one_or_none()
+    except SQLAlchemyError as e:
+        logger.error("❌ Ошибка БД в read_test_result_by_id: %s", e)
+        raise e
+
+
+async def attach_test_report(
+    session: AsyncSession, id: int, dropbox_file_id: str, file_name: str
+) -> None:
+    """
+    Привязывает загруженный в Dropbox PDF-отчёт к результату теста.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия БД.
+        id (int): ID результата теста.
+        dropbox_file_id (str): Уникальный file_id PDF результата.
+        file_name (str): Имя PDF файла.
+
+    Raises:
+        SQLAlchemyError: Если произошла ошибка БД.
+    """
+    try:
+        await session.execute(
+            update(TestResult)
+            .where(TestResult.id == id)
+            .values(dropbox_file_id=dropbox_file_id, file_name=file_name)
+        )
+        await session.commit()
+    except SQLAlchemyError as e:
+        await session.rollback()
+        logger.error("❌ Ошибка БД в attach_test_report: %s", e)
+        raise e
+
+
+async def read_test_results_without_report(
+    session: AsyncSession, submitted_before: datetime, limit: int
+) -> List[int]:
+    """
+    Возвращает ID результатов без привязанного PDF-отчёта.
+
+    Запрос обслуживается частичным индексом ix_test_results_pending_report
+    (dropbox_file_id IS NULL), который содержит только свежие отправки,
+    ещё ожидающие отчёта, поэтому не растёт вместе с таблицей.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия БД.
+        submitted_before (datetime): Учитывать только результаты,
+            отправленные раньше этого момента.
+        limit (int): Максимальное количество результатов.
+
+    Returns:
+        list[int]: ID результатов от старых к новым.
+    """
+    try:
+        result = await session.execute(
+            select(TestResult.id)
+            .where(
+                TestResult.dropbox_file_id.is_(None),
+                TestResult.submitted_at < submitted_before,
+            )
+            .order_by(TestResult.submitted_at)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+    except SQLAlchemyError as e:
+        logger.error("❌ Ошибка БД в read_test_results_without_report: %s", e)
+        raise e
+
+
+# Ограничение asyncpg — 32767 параметров на запрос (4 параметра на строку)
+REGRADE_UPDATE_CHUNK = 2000
+
+# Строка результата для перепроверки: (id, level, closed_answers, open_answers, score)
+RegradeRowType = Tuple[int, str, Optional[dict], Optional[dict], Optional[dict]]
+
+
+def _regrade_filter(level: Optional[str], exclude_version: Optional[int]) -> List[Any]:
+    """Условия отбора результатов для перепроверки."""
+    conditions: List[Any] = []
+    if level is not None:
+        conditions.append(TestResult.level == LevelEnum(level))
+    if exclude_version is not None:
+        conditions.append(
+            TestResult.answer_key_version.is_distinct_from(exclude_version)
+        )
+    return conditions
+
+
+async def count_test_results_for_regrade(
+    session: AsyncSession,
+    level: Optional[str] = None,
+    exclude_version: Optional[int] = None,
+) -> int:
+    """
+    Возвращает количество результатов, подлежащих перепроверке.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия БД.
+        level (str | None): Только указанный уровень.
+        exclude_version (int | None): Пропускать результаты, уже проверенные
+            по этой версии ключей.
+
+    Returns:
+        int: Количество результатов.
+    """
+    try:
+        return int(
+            await session.scalar(
+                select(func.count(TestResult.id)).where(
+                    *_regrade_filter(level, exclude_version)
+                )
+            )
+            or 0
+        )
+    except SQLAlchemyError as e:
+        logger.error("❌ Ошибка БД в count_test_results_for_regrade: %s", e)
+        raise e
+
+
+async def read_test_results_for_regrade(
+    session: AsyncSession,
+    after_id: int,
+    limit: int,
+    level: Optional[str] = None,
+    exclude_version: Optional[int] = None,
+) -> List[RegradeRowType]:
+    """
+    Возвращает следующую страницу результатов для перепроверки.
+
+    Пагинация по ключу (id > after_id), поэтому стоимость страницы
+    не зависит от её номера.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия БД.
+        after_id (int): ID последнего результата предыдущей страницы.
+        limit (int): Размер страницы.
+        level (str | None): Только указанный уровень.
+        exclude_version (int | None): Пропускать результаты, уже проверенные
+            по этой версии ключей.
+
+    Returns:
+        list[tuple]: (id, level, closed_answers, open_answers, score) по возрастанию id.
+    """
+    try:
+        result = await session.execute(
+            select(
+                TestResult.id,
+                TestResult.level,
+                TestResult.closed_answers,
+                TestResult.open_answers,
+                TestResult.score,
+            )
+            .where(TestResult.id > after_id, *_regrade_filter(level, exclude_version))
+            .order_by(TestResult.id)
+            .limit(limit)
+        )
+        return [
+            (row.id, row.level.value, row.closed_answers, row.open_answers, row.score)
+            for row in result.all()
+        ]
+    except SQLAlchemyError as e:
+        logger.error("❌ Ошибка БД в read_test_results_for_regrade: %s", e)
+        raise e
+
+
+async def bulk_update_test_grades(
+    session: AsyncSession,
+    changed: Sequence[Tuple[int, dict, Optional[dict], dict]],
+    unchanged_ids: Sequence[int],
+    answer_key_version: int,
+) -> None:
+    """
+    Записывает результаты перепроверки пакетом.
+
+    Изменённые результаты обновляются запросами
+    UPDATE ... FROM (VALUES ...), у неизменившихся обновляется
+    только версия ключей. Всё выполняется в одной транзакции.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия БД.
+        changed: (id, closed_answers, open_answers, score) изменившихся результатов.
+        unchanged_ids: ID результатов, оценка которых не изменилась.
+        answer_key_version (int): Версия ключей, по которой выполнена проверка.
+
+    Raises:
+        SQLAlchemyError: Ошибка БД.
+    """
+    try:
+        for start in range(0, len(changed), REGRADE_UPDATE_CHUNK):
+            rows = values(
+                column("id", Integer),
+                column("closed_answers", JSON),
+                column("open_answers", JSON),
+                column("score", JSON),
+                name="regraded",
+            ).data(list(changed[start : start + REGRADE_UPDATE_CHUNK]))
+
+            await session.execute(
+                update(TestResult)
+                .where(TestResult.id == rows.c.id)
+                .values(
+                    closed_answers=rows.c.closed_answers,
+                    open_answers=rows.c.open_answers,
+                    score=rows.c.score,
+                    answer_key_version=answer_key_version,
+                )
+            )
+
+        if unchanged_ids:
+            await session.execute(
+                update(TestResult)
+                .where(TestResult.id.in_(list(unchanged_ids)))
+                .values(answer_key_version=answer_key_version)
+            )
+
+        await session.commit()
+    except SQLAlchemyError as e:
+        await session.rollback()
+        logger.error("❌ Ошибка БД в bulk_update_test_grades: %s", e)
+        raise e
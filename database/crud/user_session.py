@@ -4,8 +4,9 @@ CRUD-операции для работы с моделью UserSession.
 Содержит функции для:
     - создания пользовательской сессии,
     - чтения сессии по Telegram ID,
-    - добавления ID заявок к пользователю,
-    - сохранения уникального Dropbox folder_id.
+    - сохранения уникального Dropbox folder_id и пути к папке,
+    - учёта уже проверенных подпапок Dropbox,
+    - сброса кэшированных данных о Dropbox-папке.
 
 Используемые компоненты:
     - SQLAlchemy AsyncSession
@@ -16,7 +17,18 @@ CRUD-операции для работы с моделью UserSession.
 from typing import Optional
 
 from fastapi import HTTPException
-from sqlalchemy import select
+from sqlalchemy import (
+    String,
+    any_,
+    cast,
+    func,
+    literal,
+    not_,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY as PG_ARRAY
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -79,16 +91,22 @@ async def read_user_session(
         raise e
 
 
-async def append_application_id(
-    session: AsyncSession, telegram_id: int, application_id: int
+async def update_dropbox_folder_id(
+    session: AsyncSession,
+    telegram_id: int,
+    folder_id: str,
+    folder_path: Optional[str] = None,
 ) -> None:
     """
-    Добавляет ID заявки в список application_ids пользователя.
+    Сохраняет или обновляет Dropbox folder_id (и путь к папке) для пользователя.
+
+    Список известных подпапок сбрасывается, так как папка могла измениться.
 
     Args:
         session (AsyncSession): Асинхронная сессия базы данных.
         telegram_id (int): Telegram ID пользователя.
-        application_id (int): ID новой заявки.
+        folder_id (str): Уникальный Dropbox folder_id.
+        folder_path (Optional[str]): Путь к папке в Dropbox.
 
     Raises:
         HTTPException: Если пользовательская сессия не найдена.
@@ -99,49 +117,110 @@ async def append_application_id(
         if not user_session:
             raise HTTPException(status_code=404, detail="UserSession not found")
 
-        if user_session.application_ids is None:
-            user_session.application_ids = [application_id]
-        else:
-            if application_id not in user_session.application_ids:
-                user_session.application_ids.append(application_id)
-
+        user_session.dropbox_folder_id = folder_id
+        user_session.dropbox_folder_path = folder_path
+        user_session.dropbox_subfolders = None
         await session.commit()
+
         logger.info(
-            "🟢 Добавлен application_id=%s пользователю %s", application_id, telegram_id
+            "🟢 Dropbox folder_id сохранён для пользователя %s: %s",
+            telegram_id,
+            folder_id,
         )
     except SQLAlchemyError as e:
-        logger.error("❌ Ошибка БД в append_application_id: %s", e)
+        logger.error("❌ Ошибка БД в update_dropbox_folder_id: %s", e)
         raise e
 
 
-async def update_dropbox_folder_id(
-    session: AsyncSession, telegram_id: int, folder_id: str
+async def update_dropbox_folder_path(
+    session: AsyncSession, telegram_id: int, folder_path: str
 ) -> None:
     """
-    Сохраняет или обновляет Dropbox folder_id для пользователя.
+    Сохраняет путь к уже известной Dropbox-папке пользователя.
 
     Args:
         session (AsyncSession): Асинхронная сессия базы данных.
         telegram_id (int): Telegram ID пользователя.
-        folder_id (str): Уникальный Dropbox folder_id.
+        folder_path (str): Путь к папке в Dropbox.
 
     Raises:
-        HTTPException: Если пользовательская сессия не найдена.
         SQLAlchemyError: Ошибка работы с базой данных.
     """
     try:
-        user_session = await read_user_session(session, telegram_id)
-        if not user_session:
-            raise HTTPException(status_code=404, detail="UserSession not found")
+        await session.execute(
+            update(UserSession)
+            .where(UserSession.telegram_id == telegram_id)
+            .values(dropbox_folder_path=folder_path)
+        )
+        await session.commit()
+    except SQLAlchemyError as e:
+        await session.rollback()
+        logger.error("❌ Ошибка БД в update_dropbox_folder_path: %s", e)
+        raise e
 
-        user_session.dropbox_folder_id = folder_id
+
+async def add_dropbox_subfolder(
+    session: AsyncSession, telegram_id: int, subfolder: str
+) -> None:
+    """
+    Атомарно добавляет подпапку в список проверенных подпапок пользователя.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия базы данных.
+        telegram_id (int): Telegram ID пользователя.
+        subfolder (str): Имя подпапки (например, "applications").
+
+    Raises:
+        SQLAlchemyError: Ошибка работы с базой данных.
+    """
+    try:
+        await session.execute(
+            update(UserSession)
+            .where(
+                UserSession.telegram_id == telegram_id,
+                or_(
+                    UserSession.dropbox_subfolders.is_(None),
+                    not_(literal(subfolder) == any_(UserSession.dropbox_subfolders)),
+                ),
+            )
+            .values(
+                dropbox_subfolders=func.array_append(
+                    func.coalesce(
+                        UserSession.dropbox_subfolders, cast([], PG_ARRAY(String))
+                    ),
+                    subfolder,
+                )
+            )
+        )
         await session.commit()
+    except SQLAlchemyError as e:
+        await session.rollback()
+        logger.error("❌ Ошибка БД в add_dropbox_subfolder: %s", e)
+        raise e
 
-        logger.info(
-            "🟢 Dropbox folder_id сохранён для пользователя %s: %s",
-            telegram_id,
-            folder_id,
+
+async def clear_dropbox_folder_cache(session: AsyncSession, telegram_id: int) -> None:
+    """
+    Сбрасывает кэшированный путь и список подпапок Dropbox пользователя.
+
+    Используется, когда Dropbox сообщает, что сохранённый путь не существует.
+    folder_id сохраняется: по нему путь будет определён заново.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия базы данных.
+        telegram_id (int): Telegram ID пользователя.
+
+    Raises:
+        SQLAlchemyError: Ошибка работы с базой данных.
+    """
+    try:
+        await session.execute(
+            update(UserSession)
+            .where(UserSession.telegram_id == telegram_id)
+            .values(dropbox_folder_path=None, dropbox_subfolders=None)
         )
+        await session.commit()
     except SQLAlchemyError as e:
-        logger.error("❌ Ошибка БД в update_dropbox_folder_id: %s", e)
+        await session.rollback()
+        logger.error("❌ Ошибка БД в clear_dropbox_folder_cache: %s", e)
         raise e
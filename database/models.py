@@ -5,6 +5,11 @@
 - модели пользователя (UserSession)
 - модели заявок (Application)
 - модели результатов тестирования (TestResult)
+- модели версионированных ключей ответов (AnswerKey)
+- модели фоновых задач (Job)
+- модели исходящих уведомлений Telegram (NotificationOutbox)
+- модели ключей идемпотентности запросов (IdempotencyKey)
+- модели черновиков тестов (TestDraft)
 - перечисления (Enum) и константы
 
 Все модели используют SQLAlchemy ORM и типы PostgreSQL.
@@ -22,11 +27,18 @@ from sqlalchemy import (
     CheckConstraint,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
+    LargeBinary,
     String,
+    Text,
+    UniqueConstraint,
+    desc,
+    text,
 )
 from sqlalchemy import Enum as SqlEnum
 from sqlalchemy.dialects.postgresql import ARRAY as PG_ARRAY
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .base import Base
@@ -90,6 +102,30 @@ class PreviousExperienceEnum(str, Enum):
     self_study = "self_study"
 
 
+class JobStatusEnum(str, Enum):
+    """Статус фоновой задачи."""
+
+    pending = "pending"
+    running = "running"
+    done = "done"
+    failed = "failed"
+
+
+class OutboxStatusEnum(str, Enum):
+    """Статус исходящего уведомления."""
+
+    pending = "pending"
+    sent = "sent"
+    failed = "failed"
+
+
+class IdempotencyStatusEnum(str, Enum):
+    """Статус запроса с ключом идемпотентности."""
+
+    in_progress = "in_progress"
+    completed = "completed"
+
+
 # =============================================================================
 # Модель сессии пользователя
 # =============================================================================
@@ -102,9 +138,10 @@ class UserSession(Base):
     Атрибуты:
         telegram_id: Telegram ID пользователя (PK).
         telegram_username: Username пользователя.
-        application_ids: Список ID созданных пользователем заявок.
         started_at: Время начала первой сессии.
         dropbox_folder_id: Индивидуальная папка пользователя в Dropbox.
+        dropbox_folder_path: Кэшированный путь к папке пользователя в Dropbox.
+        dropbox_subfolders: Подпапки, существование которых уже проверено.
     """
 
     __tablename__ = "user_sessions"
@@ -112,10 +149,6 @@ class UserSession(Base):
     telegram_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     telegram_username: Mapped[str | None] = mapped_column(nullable=True)
 
-    application_ids: Mapped[list[int] | None] = mapped_column(
-        PG_ARRAY(Integer), nullable=True, comment="Список ID заявок пользователя."
-    )
-
     started_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
@@ -126,6 +159,16 @@ class UserSession(Base):
         String(), nullable=True, comment="Персональная Dropbox-папка пользователя."
     )
 
+    dropbox_folder_path: Mapped[str | None] = mapped_column(
+        String(), nullable=True, comment="Кэшированный путь к Dropbox-папке."
+    )
+
+    dropbox_subfolders: Mapped[list[str] | None] = mapped_column(
+        PG_ARRAY(String),
+        nullable=True,
+        comment="Известные существующие подпапки Dropbox-папки пользователя.",
+    )
+
 
 # =============================================================================
 # Модель заявки
@@ -163,6 +206,9 @@ class Application(Base):
     """
 
     __tablename__ = "applications"
+    __table_args__ = (
+        Index("ix_applications_user_id_created_at", "user_id", desc("created_at")),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(
@@ -261,6 +307,9 @@ class TestResult(Base):
     итоговый балл, а также ссылку на PDF-файл результата,
     загруженный в Dropbox (через уникальный file_id).
 
+    Ссылка на PDF заполняется фоновой задачей после записи результата,
+    поэтому до её завершения dropbox_file_id и file_name равны None.
+
     Attributes:
         user_id (int): Telegram ID пользователя (FK).
         test_taker (str | None): Имя участника теста.
@@ -268,12 +317,23 @@ class TestResult(Base):
         closed_answers (dict | None): Ответы на закрытые вопросы.
         open_answers (dict | None): Ответы на открытые задания.
         score (dict | None): Баллы за задания.
-        dropbox_file_id (str): Уникальный Dropbox file_id PDF результата.
-        file_name (str): Имя PDF-файла результата теста.
+        dropbox_file_id (str | None): Уникальный Dropbox file_id PDF результата.
+        file_name (str | None): Имя PDF-файла результата теста.
+        answer_key_version (int | None): Версия ключей ответов, по которой
+            проверен результат (0 — встроенные ключи, None — до версионирования).
         submitted_at (datetime): Дата и время отправки результата.
     """
 
     __tablename__ = "test_results"
+    __table_args__ = (
+        Index("ix_test_results_user_id_submitted_at", "user_id", desc("submitted_at")),
+        # Только отправки, ожидающие PDF-отчёта (обычно свежие)
+        Index(
+            "ix_test_results_pending_report",
+            "submitted_at",
+            postgresql_where=text("dropbox_file_id IS NULL"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
 
@@ -303,14 +363,20 @@ class TestResult(Base):
         JSON, nullable=True, comment='{"task_1": 7, "task_2": 4}'
     )
 
-    dropbox_file_id: Mapped[str] = mapped_column(
+    dropbox_file_id: Mapped[str | None] = mapped_column(
         String(),
-        nullable=False,
+        nullable=True,
         comment="Уникальный Dropbox file_id PDF результата теста.",
     )
 
-    file_name: Mapped[str] = mapped_column(
-        String(), nullable=False, comment="Имя PDF-файла результата теста."
+    file_name: Mapped[str | None] = mapped_column(
+        String(), nullable=True, comment="Имя PDF-файла результата теста."
+    )
+
+    answer_key_version: Mapped[int | None] = mapped_column(
+        Integer,
+        nullable=True,
+        comment="Версия ключей ответов, по которой проверен результат.",
     )
 
     submitted_at: Mapped[datetime] = mapped_column(
@@ -318,3 +384,294 @@ class TestResult(Base):
         nullable=False,
         default=lambda: datetime.now(timezone.utc),
     )
+
+
+# =============================================================================
+# Модель ключей ответов
+# =============================================================================
+
+
+class AnswerKey(Base):
+    """
+    Версия правильных ответов на один вопрос теста.
+
+    Таблица хранит историю: исправление ключа добавляет новые строки
+    со следующим номером версии, а действующим считается ответ
+    с наибольшей версией для каждого (level, task, question).
+    Пустой accepted_answers исключает вопрос из проверки.
+
+    Attributes:
+        id (int): ID строки.
+        version (int): Номер версии ключей.
+        level (LevelEnum): Уровень теста.
+        task (str): Идентификатор таска (например, "task1").
+        question (str): Номер вопроса внутри таска.
+        accepted_answers (list[str]): Допустимые варианты ответа.
+        created_at (datetime): Дата публикации версии.
+    """
+
+    __tablename__ = "answer_keys"
+    __table_args__ = (
+        UniqueConstraint(
+            "level", "task", "question", "version", name="uq_answer_keys_question"
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+
+    version: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    level: Mapped[LevelEnum] = mapped_column(
+        SqlEnum(LevelEnum, name="level_enum", native_enum=False), nullable=False
+    )
+
+    task: Mapped[str] = mapped_column(String(50), nullable=False)
+
+    question: Mapped[str] = mapped_column(String(20), nullable=False)
+
+    accepted_answers: Mapped[list[str]] = mapped_column(
+        PG_ARRAY(String), nullable=False
+    )
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+    )
+
+
+# =============================================================================
+# Модель фоновой задачи
+# =============================================================================
+
+
+class Job(Base):
+    """
+    Фоновая задача, выполняемая воркерами очереди (utilities.job_queue).
+
+    Attributes:
+        id (int): ID задачи (возвращается клиенту для опроса статуса).
+        kind (str): Тип задачи, по которому выбирается обработчик.
+        payload (dict): Входные данные обработчика.
+        status (JobStatusEnum): Текущий статус задачи.
+        attempts (int): Количество уже выполненных попыток.
+        max_attempts (int): Максимальное количество попыток.
+        result (dict | None): Результат успешного выполнения.
+        last_error (str | None): Текст последней ошибки.
+        run_after (datetime): Время, не раньше которого задачу можно взять.
+        created_at (datetime): Время постановки в очередь.
+        updated_at (datetime): Время последнего изменения статуса.
+    """
+
+    __tablename__ = "jobs"
+    __table_args__ = (Index("ix_jobs_status_run_after", "status", "run_after"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+
+    kind: Mapped[str] = mapped_column(String(50), nullable=False)
+
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False)
+
+    status: Mapped[JobStatusEnum] = mapped_column(
+        SqlEnum(JobStatusEnum, name="job_status_enum", native_enum=False),
+        nullable=False,
+        default=JobStatusEnum.pending,
+    )
+
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    max_attempts: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    result: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    run_after: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+    )
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+    )
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+    )
+
+
+# =============================================================================
+# Модель исходящих уведомлений Telegram
+# =============================================================================
+
+
+class NotificationOutbox(Base):
+    """
+    Исходящее уведомление Telegram, ожидающее отправки диспетчером
+    (utilities.notification_outbox).
+
+    Attributes:
+        id (int): ID уведомления.
+        chat_id (int): ID чата получателя.
+        text (str | None): Текст сообщения или подпись к документу.
+        document (bytes | None): Содержимое документа (None — текстовое сообщение).
+        filename (str | None): Имя файла документа.
+        status (OutboxStatusEnum): Текущий статус.
+        attempts (int): Количество попыток отправки.
+        last_error (str | None): Текст последней ошибки.
+        available_at (datetime): Время, не раньше которого можно отправлять
+            (повтор после ошибки или аренда диспетчером).
+        created_at (datetime): Время постановки в очередь.
+        sent_at (datetime | None): Время успешной отправки.
+    """
+
+    __tablename__ = "notification_outbox"
+    __table_args__ = (
+        Index("ix_notification_outbox_status_available_at", "status", "available_at"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+
+    chat_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+
+    text: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    document: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+
+    filename: Mapped[str | None] = mapped_column(String(255), nullable=True)
+
+    status: Mapped[OutboxStatusEnum] = mapped_column(
+        SqlEnum(OutboxStatusEnum, name="outbox_status_enum", native_enum=False),
+        nullable=False,
+        default=OutboxStatusEnum.pending,
+    )
+
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    available_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+    )
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+    )
+
+    sent_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+
+# =============================================================================
+# Модель ключей идемпотентности
+# =============================================================================
+
+
+class IdempotencyKey(Base):
+    """
+    Ключ идемпотентности запроса и сохранённый ответ.
+
+    Повторный запрос с тем же ключом (например, после обрыва мобильной сети)
+    получает сохранённый ответ без повторной генерации PDF, загрузки
+    в Dropbox и уведомления администратора. Записи живут expires_at.
+
+    Attributes:
+        scope (str): Эндпоинт, к которому относится ключ.
+        key (str): Ключ, переданный клиентом.
+        request_hash (str): SHA-256 тела запроса (ключ нельзя использовать
+            с другим телом).
+        status (IdempotencyStatusEnum): in_progress / completed.
+        status_code (int | None): HTTP-статус сохранённого ответа.
+        response (dict | None): Сохранённый ответ.
+        created_at (datetime): Время первого запроса.
+        expires_at (datetime): Время, после которого ключ можно использовать снова.
+    """
+
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (Index("ix_idempotency_keys_expires_at", "expires_at"),)
+
+    scope: Mapped[str] = mapped_column(String(50), primary_key=True)
+
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+
+    request_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+
+    status: Mapped[IdempotencyStatusEnum] = mapped_column(
+        SqlEnum(
+            IdempotencyStatusEnum, name="idempotency_status_enum", native_enum=False
+        ),
+        nullable=False,
+        default=IdempotencyStatusEnum.in_progress,
+    )
+
+    status_code: Mapped[int | None] = mapped_column(Integer, nullable=True)
+
+    response: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+    )
+
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+
+
+class TestDraft(Base):
+    """
+    Черновик ответов теста, который пользователь ещё не отправил.
+
+    Страница теста периодически присылает изменённые ответы; они
+    накапливаются в памяти (utilities.test_drafts) и пакетно сливаются
+    с сохранёнными (answers || изменения). После отправки теста черновик
+    очищается и получает отметку submitted_at: изменения, полученные
+    раньше отправки (например, буфер другого воркера), к нему больше
+    не применяются. Черновики удаляются через TEST_DRAFT_TTL после
+    последней записи.
+
+    Внешнего ключа на user_sessions нет: черновик не должен срывать
+    пакетную запись всех черновиков из-за одного пользователя.
+
+    Attributes:
+        user_id (int): Telegram ID пользователя.
+        level (LevelEnum): Уровень теста.
+        answers (dict): Ответы: "task1.3" -> ответ.
+        updated_at (datetime): Время последнего полученного изменения.
+        submitted_at (datetime | None): Время отправки теста
+            (None — тест в процессе).
+    """
+
+    __tablename__ = "test_drafts"
+    __table_args__ = (Index("ix_test_drafts_updated_at", "updated_at"),)
+
+    user_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+
+    level: Mapped[LevelEnum] = mapped_column(
+        SqlEnum(LevelEnum, name="level_enum", native_enum=False), primary_key=True
+    )
+
+    answers: Mapped[dict] = mapped_column(
+        JSONB, nullable=False, server_default=text("'{}'::jsonb")
+    )
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+    )
+
+    submitted_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
@@ -0,0 +1,100 @@
+"""
+Пул соединений с метриками ожидания.
+
+Запросы FastAPI, обработчики бота, воркеры очереди и фоновые сервисы
+(outbox, идемпотентность, ключи ответов) берут соединения из одного пула.
+Чтобы подбирать DB_POOL_SIZE / DB_MAX_OVERFLOW по нагрузке, пул
+учитывает, сколько соединений выдано и сколько корутин ждёт свободного.
+
+Содержит:
+    - InstrumentedAsyncPool: AsyncAdaptedQueuePool с учётом ожидания.
+    - pool_stats: снимок состояния пула движка.
+    - register_pool_metrics: показатели пула в реестре метрик.
+
+Метрики:
+    - db_pool_wait_seconds: время получения соединения из пула.
+    - db_pool_timeouts: соединение не получено за DB_POOL_TIMEOUT.
+    - db_pool_size / db_pool_checked_out / db_pool_overflow / db_pool_waiting.
+"""
+
+import time
+from typing import Any, Dict
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from utilities.metrics import metrics
+
+# Ожидание соединения обычно короче, чем операции, для которых DEFAULT_BUCKETS
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1.0)
+
+_wait_seconds = metrics.histogram(
+    "db_pool_wait_seconds", "Time to acquire a database connection", POOL_WAIT_BUCKETS
+)
+_timeouts = metrics.counter(
+    "db_pool_timeouts", "Database connection requests that timed out"
+)
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool, учитывающий ожидание соединений.
+
+    Время получения включает ожидание освобождения соединения
+    и открытие нового (в пределах pool_size + max_overflow).
+    """
+
+    waiting = 0
+
+    def _do_get(self) -> Any:
+        """Выдаёт соединение, учитывая ожидающих и время ожидания."""
+        started = time.perf_counter()
+        self.waiting += 1
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            _timeouts.inc()
+            raise
+        finally:
+            self.waiting -= 1
+            _wait_seconds.observe(time.perf_counter() - started)
+
+
+def pool_stats(engine: AsyncEngine) -> Dict[str, int]:
+    """
+    Возвращает состояние пула соединений движка.
+
+    Args:
+        engine: Асинхронный движок с InstrumentedAsyncPool.
+
+    Returns:
+        dict: size, checked_out, overflow и waiting.
+    """
+    pool = engine.pool
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+        "waiting": getattr(pool, "waiting", 0),
+    }
+
+
+def register_pool_metrics(engine: AsyncEngine) -> None:
+    """
+    Регистрирует показатели пула движка в реестре метрик.
+
+    Пул читается при каждом снимке, поэтому после engine.dispose()
+    показатели относятся к новому пулу.
+    """
+    for name, description in (
+        ("size", "Database pool size"),
+        ("checked_out", "Database connections in use"),
+        ("overflow", "Database connections opened above pool size"),
+        ("waiting", "Coroutines waiting for a database connection"),
+    ):
+        metrics.gauge(
+            f"db_pool_{name}",
+            lambda name=name: pool_stats(engine)[name],
+            description,
+        )
@@ -310,10 +310,33 @@ document.addEventListener("DOMContentLoaded", () => {
 
   // ==================== Отправка данных на сервер ====================
 
+  // Ключ идемпотентности новой заявки: повтор той же заявки (например,
+  // после обрыва связи) получает сохранённый ответ, а не создаёт дубликат.
+  // Изменённая заявка отправляется с новым ключом.
+  let submission = null;
+
+  function newRequestId() {
+    if (typeof crypto.randomUUID === "function") return crypto.randomUUID();
+
+    const bytes = crypto.getRandomValues(new Uint8Array(16));
+    return Array.from(bytes, (b) => b.toString(16).padStart(2, "0")).join("");
+  }
+
+  function submissionKey(payload) {
+    const body = JSON.stringify(payload);
+    if (!submission || submission.body !== body) {
+      submission = { body, key: newRequestId() };
+    }
+    return submission.key;
+  }
+
   async function submitForm(payload) {
     const url = editId ? `/api/applications/${editId}` : `/api/applications`;
     const method = editId ? "PUT" : "POST";
 
+    const headers = { "Content-Type": "application/json" };
+    if (!editId) headers["Idempotency-Key"] = submissionKey(payload);
+
     const loader = document.getElementById("loader");
 
     loader?.classList.add("active");
@@ -322,7 +345,7 @@ document.addEventListener("DOMContentLoaded", () => {
     try {
       const response = await fetch(url, {
         method,
-        headers: { "Content-Type": "application/json" },
+        headers,
         body: JSON.stringify(payload),
       });
 
@@ -330,6 +353,7 @@ document.addEventListener("DOMContentLoaded", () => {
 
       if (response.ok) {
         modal && (modal.style.display = "flex");
+        submission = null;
         form.reset();
         submitBtn.disabled = true;
       } else {
@@ -0,0 +1,25 @@
+// Загрузка определения теста уровня (задания, вопросы, аудио) с сервера.
+// Ответ кэшируется браузером и перепроверяется по ETag,
+// поэтому повторное открытие теста не загружает данные заново.
+const definitions = new Map();
+
+export function loadTest(level) {
+  if (!definitions.has(level)) {
+    const request = fetch(`/api/tests/${encodeURIComponent(level)}`).then((response) => {
+      if (!response.ok) {
+        throw new Error(`Test ${level}: server returned ${response.status}`);
+      }
+      return response.json();
+    });
+    // Неудачный запрос не кэшируем: следующий вызов повторит его
+    request.catch(() => definitions.delete(level));
+    definitions.set(level, request);
+  }
+  return definitions.get(level);
+}
+
+// Данные одного задания уровня
+export async function loadTask(level, task) {
+  const definition = await loadTest(level);
+  return definition.tasks[task];
+}
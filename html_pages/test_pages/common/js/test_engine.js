@@ -94,6 +94,20 @@ const DEFAULT_OPTIONS = {
   taskSelector: '[id^="task"]'
 };
 
+const OTHER_INPUTS_SELECTOR = `
+  textarea,
+  select,
+  input[type="text"],
+  input[type="number"],
+  input[type="email"],
+  input[type="hidden"],
+  input[type="tel"],
+  input[type="url"]
+`;
+
+// Период автосохранения черновика (мс)
+const DRAFT_INTERVAL_MS = 5000;
+
 function showLoader() {
   const loader = document.getElementById('loader');
   if (loader) loader.classList.add('active');
@@ -112,14 +126,133 @@ export function initTest(level, taskData = {}, options = {}) {
     taskData,
     cfg,
     lastPayload: null,
-    lastResult: null
+    lastResult: null,
+    savedDraft: {},
+    draftTimer: null,
+    submission: null
   };
 
   attachButtonHandlers(state);
+  state.ready = restoreDraft(state).then(() => startDraftAutosave(state));
 
   return state;
 }
 
+// ===== Черновик: ответы в виде "task1.3" -> ответ =====
+function flattenAnswers(answers) {
+  const flat = {};
+
+  for (const [taskId, questions] of Object.entries(answers)) {
+    for (const [qnum, value] of Object.entries(questions)) {
+      if (typeof value === 'string') flat[`${taskId}.${qnum}`] = value;
+    }
+  }
+
+  return flat;
+}
+
+function diffAnswers(current, saved) {
+  const delta = {};
+
+  for (const [key, value] of Object.entries(current)) {
+    if ((saved[key] ?? '') !== value) delta[key] = value;
+  }
+
+  return delta;
+}
+
+function draftUrl(level) {
+  return `/api/tests/${encodeURIComponent(level)}/draft`;
+}
+
+function getTelegramId() {
+  const field = document.getElementById('telegram-id');
+  const telegramId = field ? parseInt(field.value, 10) : NaN;
+  return Number.isNaN(telegramId) ? null : telegramId;
+}
+
+async function restoreDraft(state) {
+  const telegramId = getTelegramId();
+  if (telegramId === null) return;
+
+  try {
+    const response = await fetch(
+      `${draftUrl(state.level)}?telegram_id=${telegramId}`
+    );
+    if (!response.ok) return;
+
+    const draft = await response.json();
+    applyAnswersToDOM(draft.answers || {});
+  } catch {
+    // Без черновика тест начинается с чистой формы
+  }
+}
+
+function applyAnswersToDOM(answers) {
+  const tasks = Array.from(document.querySelectorAll(DEFAULT_OPTIONS.taskSelector));
+
+  tasks.forEach((task) => {
+    const taskAnswers = answers[task.id || task.dataset.taskId];
+    if (!taskAnswers) return;
+
+    // ===== Радио-кнопки =====
+    task.querySelectorAll('input[type="radio"]').forEach((el) => {
+      const value = taskAnswers[String(extractQnumFromNameOrElement(el.name))];
+      if (value !== undefined) el.checked = el.value === value;
+    });
+
+    // ===== Остальные поля (нумерация как в collectAnswersFromDOM) =====
+    const otherInputs = Array.from(task.querySelectorAll(OTHER_INPUTS_SELECTOR));
+
+    otherInputs.forEach((el, index) => {
+      if (el.type === 'hidden') return;
+
+      const qnum =
+        findQnumFromAncestor(el) ||
+        extractQnumFromNameOrElement(el.name) ||
+        (index + 1);
+
+      const value = taskAnswers[String(qnum)];
+      if (typeof value === 'string') el.value = value;
+    });
+  });
+}
+
+function startDraftAutosave(state) {
+  if (getTelegramId() === null) return;
+
+  // Восстановленные ответы уже сохранены — отправляем только изменения
+  state.savedDraft = flattenAnswers(collectAnswersFromDOM());
+  state.draftTimer = setInterval(() => saveDraft(state), DRAFT_INTERVAL_MS);
+
+  document.addEventListener('visibilitychange', () => {
+    if (document.visibilityState === 'hidden' && state.draftTimer) {
+      saveDraft(state, true);
+    }
+  });
+}
+
+async function saveDraft(state, keepalive = false) {
+  const telegramId = getTelegramId();
+  if (telegramId === null) return;
+
+  const delta = diffAnswers(flattenAnswers(collectAnswersFromDOM()), state.savedDraft);
+  if (!Object.keys(delta).length) return;
+
+  try {
+    const response = await fetch(draftUrl(state.level), {
+      method: 'PATCH',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ telegram_id: telegramId, answers: delta }),
+      keepalive
+    });
+
+    if (response.ok) Object.assign(state.savedDraft, delta);
+  } catch {
+    // Изменения останутся в разнице и уйдут при следующем сохранении
+  }
+}
+
 function collectAnswersFromDOM() {
   const answers = {};
   const tasks = Array.from(document.querySelectorAll(DEFAULT_OPTIONS.taskSelector));
@@ -159,18 +292,7 @@ function collectAnswersFromDOM() {
     });
 
     // ===== Остальные поля =====
-    const otherSelectors = `
-      textarea,
-      select,
-      input[type="text"],
-      input[type="number"],
-      input[type="email"],
-      input[type="hidden"],
-      input[type="tel"],
-      input[type="url"]
-    `;
-
-    const otherInputs = Array.from(task.querySelectorAll(otherSelectors));
+    const otherInputs = Array.from(task.querySelectorAll(OTHER_INPUTS_SELECTOR));
 
     otherInputs.forEach((el, index) => {
       const qnumAttr = findQnumFromAncestor(el);
@@ -218,14 +340,37 @@ function collectAnswersFromDOM() {
   return answers;
 }
 
-async function postToServer(payload, cfg, timeoutMs = 8000) {
+// ===== Ключ идемпотентности: один на отправку одних и тех же ответов =====
+// Повтор после обрыва связи получает сохранённый сервером ответ
+// без повторной проверки, генерации PDF и загрузки в Dropbox.
+// Изменённые ответы отправляются с новым ключом.
+
+function newRequestId() {
+  if (typeof crypto.randomUUID === 'function') return crypto.randomUUID();
+
+  const bytes = crypto.getRandomValues(new Uint8Array(16));
+  return Array.from(bytes, (b) => b.toString(16).padStart(2, '0')).join('');
+}
+
+function submissionKey(state, payload) {
+  const body = JSON.stringify(payload);
+  if (!state.submission || state.submission.body !== body) {
+    state.submission = { body, key: newRequestId() };
+  }
+  return state.submission.key;
+}
+
+async function postToServer(payload, cfg, idempotencyKey, timeoutMs = 8000) {
   const controller = new AbortController();
   const timeoutId = setTimeout(() => controller.abort(), timeoutMs);
 
   try {
     const response = await fetch(cfg.endpoint, {
       method: 'POST',
-      headers: { 'Content-Type': 'application/json' },
+      headers: {
+        'Content-Type': 'application/json',
+        'Idempotency-Key': idempotencyKey
+      },
       body: JSON.stringify(payload),
       signal: controller.signal
     });
@@ -241,53 +386,6 @@ async function postToServer(payload, cfg, timeoutMs = 8000) {
   }
 }
 
-function localCheckAnswers(answers, taskData) {
-  const result = {};
-  const totalFractions = [];
-
-  for (const [taskId, dataArray] of Object.entries(taskData || {})) {
-    if (!Array.isArray(dataArray) || dataArray.length === 0) {
-      result[taskId] = 'open';
-      continue;
-    }
-
-    const first = dataArray[0];
-    const isClosed = typeof first === 'object' && first !== null && 'correct' in first;
-
-    if (!isClosed) {
-      result[taskId] = 'open';
-      continue;
-    }
-
-    const taskResult = {};
-    let score = 0;
-    const total = dataArray.length;
-
-    for (let i = 0; i < total; i++) {
-      const qnum = String(i + 1);
-      const correct = String(dataArray[i].correct).trim();
-      const userAns = (answers[taskId]?.[qnum] || '').trim();
-
-      if (userAns && userAns === correct) {
-        taskResult[qnum] = 'correct';
-        score++;
-      } else {
-        taskResult[qnum] = 'incorrect';
-      }
-    }
-
-    taskResult.score = `${score}/${total}`;
-    result[taskId] = taskResult;
-    totalFractions.push(score / total);
-  }
-
-  result.total = totalFractions.length
-    ? `${((totalFractions.reduce((a, b) => a + b, 0) / totalFractions.length) * 100).toFixed(1)}%`
-    : '0%';
-
-  return result;
-}
-
 function applyResultToPage(result, cfg) {
   const taskBlocks = Array.from(document.querySelectorAll(cfg.taskSelector));
 
@@ -458,7 +556,7 @@ function attachButtonHandlers(state) {
 }
 
 async function onSubmitClicked(state) {
-  const { cfg, level, taskData } = state;
+  const { cfg, level } = state;
 
   showLoader();
 
@@ -473,10 +571,16 @@ async function onSubmitClicked(state) {
 
   let result = null;
   try {
-    result = await postToServer(state.lastPayload, cfg);
+    result = await postToServer(
+      state.lastPayload,
+      cfg,
+      submissionKey(state, state.lastPayload)
+    );
   } catch {
-    result = localCheckAnswers(answers, taskData);
-    result = { status: 'ok', result };
+    // Правильных ответов на странице нет: проверяет только сервер.
+    // Ответы остаются в форме (и в черновике) для повторной отправки
+    alert('Не удалось отправить тест. Проверьте соединение и попробуйте снова.');
+    return;
   } finally {
     hideLoader();
   }
@@ -501,6 +605,10 @@ async function onSubmitClicked(state) {
   const oldWarning = document.getElementById('empty-warning');
   if (oldWarning) oldWarning.remove();
 
+  // ===== Тест отправлен — черновик больше не сохраняем =====
+  clearInterval(state.draftTimer);
+  state.draftTimer = null;
+
   applyResultToPage(result.result || {}, cfg);
 }
 
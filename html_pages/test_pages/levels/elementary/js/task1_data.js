@@ -1,114 +1,5 @@
-// ========== Task 1 (Elementary) ==========
+// Данные задания загружаются из определения теста (GET /api/tests/{level}),
+// единого источника вопросов и ключей ответов (utilities/levels/elementary.json)
+import { loadTask } from "../../../common/js/test_data.js";
 
-export const task1Data = [
-  {
-    question: "Which sentence is correct?",
-    options: [
-      "I am work in an office.",
-      "I work in an office.",
-      "I working in an office.",
-      "I works in an office."
-    ]
-  },
-  {
-    question: "Choose the best word:\nI usually go to the gym ___ the evening.",
-    options: ["in", "at", "on", "for"]
-  },
-  {
-    question: "Which sentence is in the Present Continuous?",
-    options: [
-      "I watch TV every day.",
-      "I am watching TV now.",
-      "I watched TV yesterday.",
-      "I will watch TV tomorrow."
-    ]
-  },
-  {
-    question: "Find the correct question:",
-    options: [
-      "Where you live?",
-      "Where does you live?",
-      "Where do you live?",
-      "Where are you live?"
-    ]
-  },
-  {
-    question: "Choose the correct sentence:",
-    options: [
-      "The house clean every day.",
-      "The house is cleaned every day.",
-      "The house cleans every day.",
-      "The house is clean every day by my sister."
-    ]
-  },
-  {
-    question: "Choose the best answer:\nA: How often do you go shopping?\nB: ___",
-    options: [
-      "I usually go on Sundays.",
-      "I usually am going on Sundays.",
-      "I usually going on Sundays.",
-      "I usually goes on Sundays."
-    ]
-  },
-  {
-    question: "Which is correct?",
-    options: [
-      "I can playing the guitar.",
-      "I can play the guitar.",
-      "I can plays the guitar.",
-      "I can to play the guitar."
-    ]
-  },
-  {
-    question: "Choose the best word:\nMy brother is ___ than me.",
-    options: ["more tall", "tallest", "taller", "tall"]
-  },
-  {
-    question: "Which is correct?",
-    options: [
-      "He doesn’t like swimming.",
-      "He don’t like swimming.",
-      "He doesn’t likes swimming.",
-      "He isn’t like swimming."
-    ]
-  },
-  {
-    question: "Complete the sentence:\nCould you please ___ the window? It’s hot here.",
-    options: ["close", "to close", "closing", "closes"]
-  },
-  {
-    question: "Choose the correct form:\nShe ___ to school when it started to rain.",
-    options: ["go", "was going", "goes", "going"]
-  },
-  {
-    question: "Which sentence means the same as “I started playing tennis two years ago and I still play”?",
-    options: [
-      "I have played tennis for two years.",
-      "I played tennis for two years.",
-      "I play tennis for two years.",
-      "I have been played tennis for two years."
-    ]
-  },
-  {
-    question: "Choose the correct word:\nI need to ___ a decision about my job.",
-    options: ["do", "make", "take", "give"]
-  },
-  {
-    question: "Choose the best sentence:",
-    options: [
-      "There are much apples on the table.",
-      "There are many apples on the table.",
-      "There is many apples on the table.",
-      "There are a lot apple on the table."
-    ]
-  },
-  {
-    question: "Which sentence is correct?",
-    options: [
-      "If it rains, we will stay at home.",
-      "If it will rain, we stay at home.",
-      "If it rains, we staying at home.",
-      "If it rain, we will stay at home."
-    ]
-  }
-];
+export const task1Data = await loadTask("Elementary", "task1");
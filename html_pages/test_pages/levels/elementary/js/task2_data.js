@@ -1,87 +1,5 @@
-export const task2Data = [
-  {
-    audio: "audio/elementary_task_2_1.mp3",
-    title: "Audio 1: At the Market",
-    questions: [
-      {
-        qnum: 1,
-        question: "What fruit was expensive?",
-        type: "mcq",
-        options: ["Apples", "Bananas", "Oranges", "Bread"]
-      },
-      {
-        qnum: 2,
-        question: "The speaker bought oranges.",
-        type: "truefalse"
-      }
-    ]
-  },
-  {
-    audio: "audio/elementary_task_2_2.mp3",
-    title: "Audio 2: Studying for Exams",
-    questions: [
-      {
-        qnum: 3,
-        question: "The exam is on __________ morning.",
-        type: "input"
-      },
-      {
-        qnum: 4,
-        question: "Why does the speaker study in the library?",
-        type: "mcq",
-        options: ["It’s free", "It’s quiet", "It’s close to home", "It has computers"]
-      }
-    ]
-  },
-  {
-    audio: "audio/elementary_task_2_3.mp3",
-    title: "Audio 3: A Day Off",
-    questions: [
-      {
-        qnum: 5,
-        question: "Where will they have lunch?",
-        type: "mcq",
-        options: ["At home", "In a big café", "In a small restaurant", "In the park"]
-      },
-      {
-        qnum: 6,
-        question: "They will go to the park after lunch.",
-        type: "truefalse"
-      }
-    ]
-  },
-  {
-    audio: "audio/elementary_task_2_4.mp3",
-    title: "Audio 4: Cleaning the House",
-    questions: [
-      {
-        qnum: 7,
-        question: "It takes about __________ hours to clean the house.",
-        type: "input"
-      },
-      {
-        qnum: 8,
-        question: "Who helps the speaker with the housework?",
-        type: "mcq",
-        options: ["Mother", "Father", "Brother", "Sister"]
-      }
-    ]
-  },
-  {
-    audio: "audio/elementary_task_2_5.mp3",
-    title: "Audio 5: At the Bus Stop",
-    questions: [
-      {
-        qnum: 9,
-        question: "How long did the speaker wait for the bus?",
-        type: "mcq",
-        options: ["10 minutes", "15 minutes", "20 minutes", "30 minutes"]
-      },
-      {
-        qnum: 10,
-        question: "The bus was almost empty.",
-        type: "truefalse"
-      }
-    ]
-  }
-];
+// Данные задания загружаются из определения теста (GET /api/tests/{level}),
+// единого источника вопросов и ключей ответов (utilities/levels/elementary.json)
+import { loadTask } from "../../../common/js/test_data.js";
+
+export const task2Data = await loadTask("Elementary", "task2");
@@ -1,59 +1,5 @@
-export const task3Data = {
-  passage: `
-    Last weekend, my family went to the countryside. We left our house early in the morning and drove for two hours. The weather was sunny and warm, perfect for a picnic. We brought sandwiches, fruit, and juice with us.
-    When we arrived, we went for a walk in the forest. I saw many birds and even a fox! My little sister was very excited because she had never seen a fox before. After the walk, we sat on the grass and had lunch. The sandwiches were delicious.
-    In the afternoon, we played football and flew a kite. My father took many photos. We returned home in the evening, tired but happy. It was one of the best weekends of the year.
-  `,
-  questions: [
-    {
-      qnum: 1,
-      question: "How long did it take to drive to the countryside?",
-      options: ["One hour", "Two hours", "Three hours", "Four hours"]
-    },
-    {
-      qnum: 2,
-      question: "What was the weather like?",
-      options: ["Rainy and cold", "Sunny and warm", "Windy and cold", "Cloudy and hot"]
-    },
-    {
-      qnum: 3,
-      question: "What food did they bring?",
-      options: ["Sandwiches, juice, and cake", "Sandwiches, fruit, and juice", "Bread, fruit, and tea", "Pizza and salad"]
-    },
-    {
-      qnum: 4,
-      question: "What animal did the writer see?",
-      options: ["A rabbit", "A fox", "A deer", "A bear"]
-    },
-    {
-      qnum: 5,
-      question: "Why was the little sister excited?",
-      options: ["She saw a bird.", "She saw a fox for the first time.", "She saw a rabbit.", "She went to the forest."]
-    },
-    {
-      qnum: 6,
-      question: "Where did they have lunch?",
-      options: ["At a café", "On the grass", "At home", "In the car"]
-    },
-    {
-      qnum: 7,
-      question: "What did they do in the afternoon?",
-      options: ["Played basketball and swam", "Played football and flew a kite", "Rode bikes and had tea", "Watched a film and walked"]
-    },
-    {
-      qnum: 8,
-      question: "Who took many photos?",
-      options: ["The writer’s father", "The writer’s mother", "The writer’s sister", "The writer"]
-    },
-    {
-      qnum: 9,
-      question: "When did they return home?",
-      options: ["In the afternoon", "At night", "In the evening", "In the morning"]
-    },
-    {
-      qnum: 10,
-      question: "How did the writer feel about the weekend?",
-      options: ["It was boring.", "It was okay.", "It was one of the best weekends.", "It was too short."]
-    }
-  ]
-};
+// Данные задания загружаются из определения теста (GET /api/tests/{level}),
+// единого источника вопросов и ключей ответов (utilities/levels/elementary.json)
+import { loadTask } from "../../../common/js/test_data.js";
+
+export const task3Data = await loadTask("Elementary", "task3");
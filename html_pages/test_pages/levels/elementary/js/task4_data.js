@@ -1,7 +1,5 @@
-export const task4Data = {
-  instruction: `Напишите короткий текст на английском языке (40–60 слов) о своих последних каникулах или отпуске. Укажите:
-• Куда вы ездили
-• С кем вы были
-• Что вы делали
-• Какие у вас остались впечатления`
-};
+// Данные задания загружаются из определения теста (GET /api/tests/{level}),
+// единого источника вопросов и ключей ответов (utilities/levels/elementary.json)
+import { loadTask } from "../../../common/js/test_data.js";
+
+export const task4Data = await loadTask("Elementary", "task4");
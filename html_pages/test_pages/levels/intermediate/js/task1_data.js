@@ -1,62 +1,5 @@
-export const task1Data = [
-  {
-    question: "If he had taken the earlier train, he ______ on time.",
-    options: ["would be", "will be", "would have been", "is"]
-  },
-  {
-    question: "Not only ______ the report on time, but she also presented it perfectly.",
-    options: ["she finished", "did she finish", "had she finished", "she had finished"]
-  },
-  {
-    question: "He is said ______ a new method of treatment.",
-    options: ["to have developed", "having developed", "to develop", "to be developed"]
-  },
-  {
-    question: "We need to come up ______ a solution before the deadline.",
-    options: ["to", "for", "with", "by"]
-  },
-  {
-    question: "I suggest he ______ a doctor before the symptoms get worse.",
-    options: ["sees", "saw", "will see", "is seeing"]
-  },
-  {
-    question: "I’m not really keen ______ horror movies.",
-    options: ["in", "on", "of", "for"]
-  },
-  {
-    question: "Her performance was ______ better than expected.",
-    options: ["much", "more", "many", "very"]
-  },
-  {
-    question: "The government should take immediate action to prevent further environmental ______.",
-    options: ["destroy", "destruction", "destructive", "destroying"]
-  },
-  {
-    question: "You ______ told me you were going to be late — I was really worried.",
-    options: ["could", "could have", "might", "should"]
-  },
-  {
-    question: "The teacher asked whether anyone had any questions, but no one ______ a word.",
-    options: ["said", "spoke", "told", "mentioned"]
-  },
-  {
-    question: "The manager recommended that he ______ the training before the project starts.",
-    options: ["complete", "completes", "completed", "has completed"]
-  },
-  {
-    question: "She denied ______ the files without permission.",
-    options: ["access", "to access", "accessing", "accessed"]
-  },
-  {
-    question: "It was a mistake, but there’s no point in ______ over it now.",
-    options: ["cry", "crying", "to cry", "being cried"]
-  },
-  {
-    question: "They hired a consultant to improve the company's online ______.",
-    options: ["present", "presence", "presentation", "presenting"]
-  },
-  {
-    question: "The team worked ______ to meet the deadline.",
-    options: ["hardly", "hard", "hardily", "harder"]
-  }
-];
+// Данные задания загружаются из определения теста (GET /api/tests/{level}),
+// единого источника вопросов и ключей ответов (utilities/levels/intermediate.json)
+import { loadTask } from "../../../common/js/test_data.js";
+
+export const task1Data = await loadTask("Intermediate", "task1");
@@ -1,170 +1,5 @@
-export const task3Data = [
-  {
-    title: "Text 1 – The Mystery of Icebergs",
-    passage: `
-      Icebergs are large masses of ice that have broken off from glaciers or ice shelves and float in open water. Although they appear calm and majestic, icebergs can be dangerous, especially to ships. One of the most famous iceberg-related disasters was the sinking of the Titanic in 1912.
-      What makes icebergs especially interesting is how little of them is visible. In fact, only about 10% of an iceberg is above the water, while the other 90% remains hidden beneath the surface. This is why the expression “the tip of the iceberg” is used to describe a small part of a much larger issue.
-      Icebergs form when chunks of freshwater ice break away from glaciers, usually in cold regions like Antarctica or Greenland. As the climate continues to change, scientists are observing more frequent iceberg calving — a process in which pieces of ice separate and float away. Some icebergs can be as large as cities and take years to melt completely.
-      Despite their potential hazards, icebergs play an important role in the environment. As they melt, they release fresh water and nutrients into the ocean, which supports marine life. For scientists, studying icebergs helps them learn more about climate patterns and ocean currents.
-    `,
-    questions: [
-      {
-        qnum: 1,
-        question: "What is the main idea of the text?",
-        options: [
-          "Icebergs are only dangerous for ships.",
-          "Icebergs are melting because of pollution.",
-          "Icebergs are natural phenomena with both risks and environmental value.",
-          "Icebergs are made entirely of salt water."
-        ]
-      },
-      {
-        qnum: 2,
-        question: "How much of an iceberg is usually visible above water?",
-        options: ["50%", "90%", "10%", "100%"]
-      },
-      {
-        qnum: 3,
-        question: "What does the phrase “the tip of the iceberg” mean according to the text?",
-        options: [
-          "The top part of an iceberg",
-          "The most dangerous part of an iceberg",
-          "A small part of something much bigger",
-          "The coldest section of an iceberg"
-        ]
-      },
-      {
-        qnum: 4,
-        question: "Why are scientists interested in icebergs?",
-        options: [
-          "They want to use them as fresh water sources.",
-          "Icebergs can help understand environmental processes.",
-          "Icebergs may be used as tourist attractions.",
-          "Scientists want to build research stations on them."
-        ]
-      },
-      {
-        qnum: 5,
-        question: "What happens when icebergs melt?",
-        options: [
-          "They pollute the oceans.",
-          "They make the sea warmer.",
-          "They release salt into the water.",
-          "They support marine ecosystems."
-        ]
-      },
-      {
-        qnum: 6,
-        question: "What is “iceberg calving”?",
-        options: [
-          "The process of measuring ice thickness",
-          "The movement of glaciers",
-          "The breaking away of ice chunks from glaciers",
-          "The sinking of an iceberg"
-        ]
-      },
-      {
-        qnum: 7,
-        question: "Where are icebergs most commonly found?",
-        options: [
-          "Near the equator",
-          "In deep underground lakes",
-          "In polar regions",
-          "In mountain valleys"
-        ]
-      }
-    ]
-  },
-  {
-    title: "Text 2 – Why Do We Procrastinate?",
-    passage: `
-      You have an important task to complete, but instead of starting it, you check your phone, make tea, or scroll through social media. This behavior is called procrastination — the act of delaying something even when you know it’s important.
-      Psychologists believe procrastination is often linked to emotional regulation. We tend to avoid tasks that cause stress, boredom, or anxiety. Ironically, putting them off usually makes the situation worse.
-      Another reason we procrastinate is perfectionism. If you feel your work must be flawless, you might delay starting because you’re afraid to fail. In other cases, poor time management plays a role — people underestimate how long a task will take and leave it until the last minute.
-      To overcome procrastination, experts suggest breaking large tasks into smaller ones. This makes them feel more manageable. Using timers, planning your day in advance, and removing distractions can also help.
-      While procrastination is common, understanding why it happens can help people make better choices — and feel less guilty about it.
-    `,
-    questions: [
-      {
-        qnum: 8,
-        question: "What is procrastination?",
-        options: [
-          "Doing tasks earlier than planned",
-          "Completing difficult work",
-          "Avoiding important tasks",
-          "Working without breaks"
-        ]
-      },
-      {
-        qnum: 9,
-        question: "Why do people procrastinate, according to psychologists?",
-        options: [
-          "They enjoy stress",
-          "They dislike success",
-          "They want to make others angry",
-          "They avoid negative emotions"
-        ]
-      },
-      {
-        qnum: 10,
-        question: "What is ironic about procrastination?",
-        options: [
-          "It makes people richer",
-          "It reduces stress over time",
-          "It usually creates more problems",
-          "It increases motivation"
-        ]
-      },
-      {
-        qnum: 11,
-        question: "How does perfectionism influence procrastination?",
-        options: [
-          "It helps people start early",
-          "It causes fear of failure",
-          "It reduces anxiety",
-          "It saves time"
-        ]
-      },
-      {
-        qnum: 12,
-        question: "What is NOT mentioned as a cause of procrastination?",
-        options: [
-          "Emotional discomfort",
-          "Bad time management",
-          "High intelligence",
-          "Fear of failure"
-        ]
-      },
-      {
-        qnum: 13,
-        question: "What is one method to fight procrastination?",
-        options: [
-          "Doing all tasks late at night",
-          "Waiting for inspiration",
-          "Dividing tasks into parts",
-          "Asking someone else to do it"
-        ]
-      },
-      {
-        qnum: 14,
-        question: "Why are timers and planning helpful?",
-        options: [
-          "They increase perfectionism",
-          "They remove emotions",
-          "They reduce the size of tasks",
-          "They make people stay focused"
-        ]
-      },
-      {
-        qnum: 15,
-        question: "What does the author suggest about guilt and procrastination?",
-        options: [
-          "Guilt always improves performance",
-          "We should feel more guilty",
-          "Understanding helps reduce guilt",
-          "Guilt is necessary for success"
-        ]
-      }
-    ]
-  }
-];
+// Данные задания загружаются из определения теста (GET /api/tests/{level}),
+// единого источника вопросов и ключей ответов (utilities/levels/intermediate.json)
+import { loadTask } from "../../../common/js/test_data.js";
+
+export const task3Data = await loadTask("Intermediate", "task3");
@@ -1,16 +1,5 @@
-export const task4Data = {
-  instruction: `<em>Instructions:</em><br>
-    You are planning to attend a language course at an English language centre.<br>
-    Write a formal letter to the centre administration and ask for more information about the course.<br><br>
-    In your letter, you should:<br>
-    • Say where you found the information about the centre<br>
-    • Ask about the available levels and schedules<br>
-    • Ask about the course fees and materials provided<br><br>
-    <strong>Word limit:</strong> 80–100 words<br>
-    <strong>Time:</strong> 8–10 minutes<br><br>
-    <em>Tips for students:</em><br>
-    • Use formal style.<br>
-    • Start your letter with: <code>Dear Sir or Madam,</code><br>
-    • Finish with: <code>Yours faithfully, (Your full name)</code><br>
-  `
-};
+// Данные задания загружаются из определения теста (GET /api/tests/{level}),
+// единого источника вопросов и ключей ответов (utilities/levels/intermediate.json)
+import { loadTask } from "../../../common/js/test_data.js";
+
+export const task4Data = await loadTask("Intermediate", "task4");
@@ -1,62 +1,5 @@
-export const task1Data = [
-  {
-    question: "I wish I __________ more time to watch that new series.",
-    options: ["have", "had", "will have", "am having"]
-  },
-  {
-    question: "By the time we arrived, the movie __________.",
-    options: ["started", "had started", "has started", "was starting"]
-  },
-  {
-    question: "If I __________ enough money, I will buy a new phone.",
-    options: ["have", "had", "will have", "am having"]
-  },
-  {
-    question: "I would go to the party if I __________ so tired.",
-    options: ["am not", "weren’t", "will not be", "haven’t been"]
-  },
-  {
-    question: "Have you ever __________ in a music festival?",
-    options: ["be", "been", "being", "was"]
-  },
-  {
-    question: "She’s interested __________ learning more about wildlife.",
-    options: ["to", "for", "in", "on"]
-  },
-  {
-    question: "This is the best film I __________.",
-    options: ["ever see", "ever saw", "have ever seen", "had ever seen"]
-  },
-  {
-    question: "I’d rather __________ at home tonight than go to the cinema.",
-    options: ["stay", "stayed", "staying", "to stay"]
-  },
-  {
-    question: "My computer isn’t working. It needs __________.",
-    options: ["to repair", "repairing", "repair", "to be repairing"]
-  },
-  {
-    question: "I’m not used __________ up early on weekends.",
-    options: ["get", "to getting", "getting", "to get"]
-  },
-  {
-    question: "He was looking forward to __________ his favourite football team play.",
-    options: ["watch", "watching", "watched", "to watch"]
-  },
-  {
-    question: "We ran out __________ petrol on the way to the city.",
-    options: ["from", "in", "of", "on"]
-  },
-  {
-    question: "She turned __________ the invitation because she was busy.",
-    options: ["up", "down", "off", "out"]
-  },
-  {
-    question: "My brother is afraid of __________ in front of large audiences.",
-    options: ["speak", "to speak", "speaking", "spoken"]
-  },
-  {
-    question: "The singer has just brought __________ a new album.",
-    options: ["in", "out", "up", "off"]
-  }
-];
+// Данные задания загружаются из определения теста (GET /api/tests/{level}),
+// единого источника вопросов и ключей ответов (utilities/levels/pre_intermediate.json)
+import { loadTask } from "../../../common/js/test_data.js";
+
+export const task1Data = await loadTask("Pre-Intermediate", "task1");
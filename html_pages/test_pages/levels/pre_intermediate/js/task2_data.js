@@ -1,100 +1,5 @@
-// ========== Task 2 (Pre-Intermediate) ==========
+// Данные задания загружаются из определения теста (GET /api/tests/{level}),
+// единого источника вопросов и ключей ответов (utilities/levels/pre_intermediate.json)
+import { loadTask } from "../../../common/js/test_data.js";
 
-export const task2Data = [
-  {
-    audio: "audio/pre_intermediate_task_2_1.mp3",
-    title: "Audio 1: Dialogue (Movies)",
-    questions: [
-      {
-        qnum: 1,
-        question: "Why didn’t Sarah watch the superhero film?",
-        type: "mcq",
-        options: [
-          "She was busy",
-          "She didn’t like superhero films",
-          "Tickets were sold out",
-          "She forgot"
-        ]
-      },
-      {
-        qnum: 2,
-        question: "How did Tom get his ticket?",
-        type: "mcq",
-        options: [
-          "At the cinema on the day",
-          "Online in advance",
-          "From a friend",
-          "He got it for free"
-        ]
-      },
-      {
-        qnum: 3,
-        question: "What kind of film did Sarah watch instead?",
-        type: "mcq",
-        options: ["Drama", "Comedy", "Horror", "Documentary"]
-      },
-      {
-        qnum: 4,
-        question: "When are Tom and Sarah planning to watch the superhero film together?",
-        type: "mcq",
-        options: ["Today", "Tomorrow", "Thursday", "Saturday"]
-      }
-    ]
-  },
-  {
-    audio: "audio/pre_intermediate_task_2_2.mp3",
-    title: "Audio 2: Monologue (Travel)",
-    questions: [
-      {
-        qnum: 5,
-        question: "How many days did the speaker stay in Rome?",
-        type: "input"
-      },
-      {
-        qnum: 6,
-        question: "What was the speaker’s favourite Italian dish?",
-        type: "input"
-      },
-      {
-        qnum: 7,
-        question: "How long did the train trip to Florence take?",
-        type: "input"
-      },
-      {
-        qnum: 8,
-        question: "Where does the speaker want to go next time in Italy?",
-        type: "input"
-      }
-    ]
-  },
-  {
-    audio: "audio/pre_intermediate_task_2_3.mp3",
-    title: "Audio 3: Dialogue (Technology)",
-    questions: [
-      {
-        qnum: 9,
-        question: "Model A",
-        type: "matching",
-        options: ["1. Best for video editing", "2. Long battery life", "3. Light and portable"]
-      },
-      {
-        qnum: 10,
-        question: "Model B",
-        type: "matching",
-        options: ["1. Best for video editing", "2. Long battery life", "3. Light and portable"]
-      },
-      {
-        qnum: 11,
-        question: "Model C",
-        type: "matching",
-        options: ["1. Best for video editing", "2. Long battery life", "3. Light and portable"]
-      },
-      {
-        qnum: 12,
-        question: "Which model does the man recommend to the woman?",
-        type: "mcq",
-        options: ["Model A", "Model B", "Model C"]
-      }
-    ]
-  }
-];
+export const task2Data = await loadTask("Pre-Intermediate", "task2");
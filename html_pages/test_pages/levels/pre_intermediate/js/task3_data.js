@@ -1,153 +1,5 @@
-export const task3Data = [
-  {
-    title: "Text 1 – The Mystery of the Bees",
-    passage: `
-      Bees are some of the most important insects in the world. They help plants grow by moving pollen from one flower to another, a process called pollination. Without bees, many fruits and vegetables would not grow well, and humans would have less food to eat.
-      In recent years, scientists have noticed a worrying problem: bee populations are getting smaller in many countries. There are several possible reasons for this. First, modern farming uses chemicals called pesticides, which can harm bees. Second, climate change is affecting the flowers that bees depend on. Finally, some diseases spread quickly among bee colonies.
-      To help the bees, people are trying different solutions. Some farmers are planting more flowers near their fields. Others are avoiding harmful chemicals. In cities, more people are keeping bees on rooftops and in gardens. These small actions can make a big difference, and if we work together, we can protect these amazing insects for the future.
-    `,
-    questions: [
-      {
-        qnum: 1,
-        question: "What is pollination?",
-        options: [
-          "Bees producing honey",
-          "Moving pollen between flowers",
-          "Planting more flowers",
-          "Collecting nectar"
-        ]
-      },
-      {
-        qnum: 2,
-        question: "What might happen without bees?",
-        options: [
-          "More fruits and vegetables would grow",
-          "Humans would have more food",
-          "Plants would not grow well",
-          "There would be more pesticides"
-        ]
-      },
-      {
-        qnum: 3,
-        question: "Which of these is NOT mentioned as a reason for fewer bees?",
-        options: ["Pesticides", "Climate change", "Bee diseases", "Too much rain"]
-      },
-      {
-        qnum: 4,
-        question: "What are some farmers doing to help bees?",
-        options: [
-          "Using more pesticides",
-          "Planting more flowers",
-          "Moving bees to cities",
-          "Making more honey"
-        ]
-      },
-      {
-        qnum: 5,
-        question: "Where are some city people keeping bees?",
-        options: ["On rooftops", "In supermarkets", "Inside their houses", "In schools"]
-      },
-      {
-        qnum: 6,
-        question: "What does the author think about helping bees?",
-        options: [
-          "It is too difficult",
-          "Small actions can help",
-          "Only scientists can help",
-          "It’s not important"
-        ]
-      },
-      {
-        qnum: 7,
-        question: "What is the tone of the text?",
-        options: ["Humorous", "Informative", "Angry", "Sad"]
-      }
-    ]
-  },
-  {
-    title: "Text 2 – The Northern Lights",
-    passage: `
-      The Northern Lights, also called the Aurora Borealis, are one of the most beautiful natural displays in the world. They appear as colourful lights in the night sky, usually green, pink, or purple. The best places to see them are near the Arctic Circle, in countries like Norway, Finland, and Canada.
-      The lights happen when particles from the Sun reach the Earth. These particles enter the atmosphere and hit gases like oxygen and nitrogen, which then produce light. This process is similar to how a neon sign works.
-      People have been fascinated by the Northern Lights for thousands of years. In the past, some cultures believed they were messages from the gods. Today, scientists can explain them, but they are still magical to watch.
-      The Northern Lights are not visible every night. You need a dark, clear sky, and the right time of year, usually winter. Even then, there is no guarantee you will see them, so many tourists spend several nights waiting for the perfect moment.
-    `,
-    questions: [
-      {
-        qnum: 8,
-        question: "What is another name for the Northern Lights?",
-        options: ["Polar Lights", "Aurora Borealis", "Solar Waves", "Arctic Glow"]
-      },
-      {
-        qnum: 9,
-        question: "Which colours are mentioned in the text?",
-        options: [
-          "Green, pink, purple",
-          "Blue, yellow, red",
-          "White, gold, green",
-          "Red, blue, orange"
-        ]
-      },
-      {
-        qnum: 10,
-        question: "Where are the Northern Lights most often seen?",
-        options: [
-          "Near the equator",
-          "In tropical countries",
-          "Near the Arctic Circle",
-          "In deserts"
-        ]
-      },
-      {
-        qnum: 11,
-        question: "What causes the Northern Lights?",
-        options: [
-          "The Moon’s reflection",
-          "Gases burning in the sky",
-          "Particles from the Sun hitting gases in the atmosphere",
-          "Artificial lights from cities"
-        ]
-      },
-      {
-        qnum: 12,
-        question: "What is the comparison to a neon sign for?",
-        options: [
-          "To explain how the lights are colourful",
-          "To describe the size of the lights",
-          "To say the lights are artificial",
-          "To talk about the cost of seeing them"
-        ]
-      },
-      {
-        qnum: 13,
-        question: "What did some ancient cultures believe about the lights?",
-        options: [
-          "They were messages from the gods",
-          "They were a sign of bad weather",
-          "They were caused by fire",
-          "They were dangerous"
-        ]
-      },
-      {
-        qnum: 14,
-        question: "What is needed to see the Northern Lights?",
-        options: [
-          "A telescope",
-          "A camera",
-          "A dark, clear sky and the right season",
-          "A special ticket"
-        ]
-      },
-      {
-        qnum: 15,
-        question: "Why do tourists often spend several nights looking for the lights?",
-        options: [
-          "They move very fast",
-          "They are not visible every night",
-          "They can only be seen once a year",
-          "They are very far away"
-        ]
-      }
-    ]
-  }
-];
+// Данные задания загружаются из определения теста (GET /api/tests/{level}),
+// единого источника вопросов и ключей ответов (utilities/levels/pre_intermediate.json)
+import { loadTask } from "../../../common/js/test_data.js";
+
+export const task3Data = await loadTask("Pre-Intermediate", "task3");
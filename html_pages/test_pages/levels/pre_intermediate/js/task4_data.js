@@ -1,18 +1,5 @@
-export const task4Data = {
-  instruction: `<em>Instructions:</em><br>
-    You are planning to take English courses at a language centre in another city.<br>
-    Write a letter to the administration of the language centre to ask for more information.<br><br>
-    In your letter:<br>
-    • Introduce yourself and explain why you are writing.<br>
-    • Ask about the types of courses and their schedules.<br>
-    • Ask about prices and possible discounts.<br>
-    • Request information about accommodation (if available).<br>
-    • Politely close the letter.<br><br>
-    <strong>Word limit:</strong> 70–90 words<br>
-    <strong>Time:</strong> 10 minutes<br><br>
-    <em>Tips for students:</em><br>
-    • Use correct letter format (<code>Dear Sir/Madam, Yours faithfully</code>, etc.).<br>
-    • Organise your ideas into short paragraphs.<br>
-    • Use polite and formal language.<br>
-  `
-};
+// Данные задания загружаются из определения теста (GET /api/tests/{level}),
+// единого источника вопросов и ключей ответов (utilities/levels/pre_intermediate.json)
+import { loadTask } from "../../../common/js/test_data.js";
+
+export const task4Data = await loadTask("Pre-Intermediate", "task4");
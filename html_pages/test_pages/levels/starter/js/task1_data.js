@@ -1,87 +1,5 @@
-// ========== Task 1 ==========
-export const task1Data = [
-  {
-    question: "What color is the sun?",
-    options: ["Blue", "Green", "Yellow", "Black"],
-  },
-  {
-    question: "This is my _____. I write in it.",
-    options: ["chair", "pen", "notebook", "plate"],
-  },
-  {
-    question: "What is the opposite of “big”?",
-    options: ["Long", "Small", "Tall", "Fat"],
-  },
-  {
-    question: "How many legs does a dog have?",
-    options: ["Two", "Three", "Four", "Five"],
-  },
-  {
-    question: "Choose the correct sentence:",
-    options: ["He am a teacher.", "He is teacher.", "He is a teacher.", "He are teacher."],
-  },
-  {
-    question: "What time is it? – 2:30",
-    options: ["Two o’clock", "Half past two", "Quarter to two", "Three o’clock"],
-  },
-  {
-    question: "What is she doing?",
-    image: "images/starter_t_1_q_7.jpg",
-    options: ["She is eating.", "She is sleep.", "She eats now.", "She eating."],
-  },
-  {
-    question: "What do you drink in the morning?",
-    options: ["Soup", "Coffee", "Rice", "Cake"],
-  },
-  {
-    question: "I _____ a car.",
-    options: ["am", "is", "have", "are"],
-  },
-  {
-    question: "Where is the cat?",
-    image: "images/starter_t_1_q_10.jpg",
-    options: ["On the table", "In the table", "Next to the table", "Under the table"],
-  },
-  {
-    question: "Choose the correct question:",
-    options: ["What you name?", "What’s your name?", "How you name?", "What name you?"],
-  },
-  {
-    question: "How old are you? – I’m ____",
-    options: ["fine", "tired", "ten", "name"],
-  },
-  {
-    question: "What is this?",
-    image: "images/starter_t_1_q_13.jpg",
-    options: ["Banana", "Carrot", "Apple", "Cucumber"],
-  },
-  {
-    question: "Which word is a fruit?",
-    options: ["Bread", "Banana", "Fish", "Chicken"],
-  },
-  {
-    question: "What is the correct order?",
-    options: ["Book red big", "Big red book", "Red big book", "Book big red"],
-  },
-  {
-    question: "Where do you live? – I live ____ Tashkent.",
-    options: ["in", "at", "on", "to"],
-  },
-  {
-    question: "What is the plural of “child”?",
-    options: ["Childs", "Childes", "Children", "Childrens"],
-  },
-  {
-    question: "“Monday, Tuesday, _____”",
-    options: ["January", "Weekend", "Wednesday", "Holiday"],
-  },
-  {
-    question: "My father’s brother is my _____.",
-    options: ["Uncle", "Cousin", "Nephew", "Grandfather"],
-  },
-  {
-    question: "What is the correct sentence?",
-    options: ["I not like pizza.", "I don’t like pizza.", "I no like pizza.", "I doesn’t like pizza."],
-  }
-];
+// Данные задания загружаются из определения теста (GET /api/tests/{level}),
+// единого источника вопросов и ключей ответов (utilities/levels/starter.json)
+import { loadTask } from "../../../common/js/test_data.js";
 
+export const task1Data = await loadTask("Starter", "task1");
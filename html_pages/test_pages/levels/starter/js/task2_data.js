@@ -1,24 +1,5 @@
-// ========== Task 2 ==========
-export const task2Data = [
-  { audio: "./audio/starter_task_2_1.mp3", options: ["John had a car.", "John’s in a car.", "John has a car.", "John has a card."], correct: "C" },
-  { audio: "./audio/starter_task_2_2.mp3", options: ["She is in a kitchen.", "She’s got a kitchen.", "She is in the kitchen.", "She is in the classroom."], correct: "C" },
-  { audio: "./audio/starter_task_2_3.mp3", options: ["I have two brothers.", "I had two brothers.", "I have three brothers.", "I know your brothers."], correct: "A" },
-  { audio: "./audio/starter_task_2_4.mp3", options: ["We are happy today.", "We are hungry today.", "We are happy tonight.", "We were happy today."], correct: "A" },
-  { audio: "./audio/starter_task_2_5.mp3", options: ["The baby is sleeping.", "The baby is eating.", "The baby is crying.", "The baby was sleeping."], correct: "A" },
-  { audio: "./audio/starter_task_2_6.mp3", options: ["I live in London.", "I like London.", "I go to London.", "I lived in London."], correct: "A" },
-  { audio: "./audio/starter_task_2_7.mp3", options: ["This is your phone.", "This is my phone.", "That is my phone.", "This is my friend."], correct: "B" },
-  { audio: "./audio/starter_task_2_8.mp3", options: ["He goes to work at seven.", "He starts work at seven.", "He goes to work at eleven.", "He goes to school at seven."], correct: "A" },
-  { audio: "./audio/starter_task_2_9.mp3", options: ["It’s a black bag.", "It’s a big bag.", "It’s a black cat.", "It’s a blue bag."], correct: "A" },
-  { audio: "./audio/starter_task_2_10.mp3", options: ["We have a car.", "We were in the car.", "We are in the car.", "We are in the park."], correct: "C" },
-  { audio: "./audio/starter_task_2_11.mp3", options: ["Anna has a dog.", "Anna had a dog.", "Anna has a doll.", "Anna has two dogs."], correct: "A" },
-  { audio: "./audio/starter_task_2_12.mp3", options: ["He is watching a DVD.", "He is watching TV.", "He is watching a movie.", "He has a TV."], correct: "B" },
-  { audio: "./audio/starter_task_2_13.mp3", options: ["Do you like apples?", "Would you like an apple?", "Do you like oranges?", "You like apples?"], correct: "A" },
-  { audio: "./audio/starter_task_2_14.mp3", options: ["The shop is open now.", "The shop is closed now.", "The shop opens now.", "The shop is open later."], correct: "A" },
-  { audio: "./audio/starter_task_2_15.mp3", options: ["My bag is under the chair.", "My bag is on the chair.", "My bag is in the chair.", "My back is on the chair."], correct: "A" },
-  { audio: "./audio/starter_task_2_16.mp3", options: ["Turn off the light.", "Turn on the light.", "Turn off the line.", "Turn up the light."], correct: "A" },
-  { audio: "./audio/starter_task_2_17.mp3", options: ["I was in Uzbekistan.", "I am from Uzbekistan.", "I live in Uzbekistan.", "I’m not from Uzbekistan."], correct: "B" },
-  { audio: "./audio/starter_task_2_18.mp3", options: ["She speaks English.", "She knows English.", "She speaks Spanish.", "She is speaking English."], correct: "A" },
-  { audio: "./audio/starter_task_2_19.mp3", options: ["It’s on the table.", "It’s under the table.", "It’s in the table.", "It’s at the table."], correct: "A" },
-  { audio: "./audio/starter_task_2_20.mp3", options: ["We eat dinner at six.", "We eat lunch at six.", "We ate dinner at six.", "We eat dinner at seven."], correct: "A" },
-];
+// Данные задания загружаются из определения теста (GET /api/tests/{level}),
+// единого источника вопросов и ключей ответов (utilities/levels/starter.json)
+import { loadTask } from "../../../common/js/test_data.js";
 
+export const task2Data = await loadTask("Starter", "task2");
@@ -1,62 +1,5 @@
-export const task1Data = [
-  {
-    question: "Had she known about the policy change earlier, she ______ her application differently.",
-    options: ["would have prepared", "would prepare", "had prepared", "prepared"]
-  },
-  {
-    question: "Despite initial resistance, the policy was eventually implemented across all departments, leading to a number of unforeseen _____.",
-    options: ["outcomes", "outbursts", "outlooks", "outbreaks"]
-  },
-  {
-    question: "No sooner ______ the lecture begun than the fire alarm went off.",
-    options: ["had", "has", "did", "would"]
-  },
-  {
-    question: "He speaks with such confidence, as if he ______ the topic inside out.",
-    options: ["had known", "knows", "knew", "has known"]
-  },
-  {
-    question: "The committee reached a consensus, albeit after several hours of ______ debate.",
-    options: ["intense", "intensive", "intentional", "intensifying"]
-  },
-  {
-    question: "The speaker’s argument was persuasive not because of its content, but because of the way it was _____.",
-    options: ["conveyed", "converted", "convinced", "conducted"]
-  },
-  {
-    question: "The article explores the extent to ______ media shapes public opinion.",
-    options: ["where", "which", "that", "whom"]
-  },
-  {
-    question: "The manager insisted that the report ______ by Friday at the latest.",
-    options: ["is submitted", "be submitted", "was submitted", "will be submitted"]
-  },
-  {
-    question: "The documentary sheds light on a topic few people are even remotely ______ with.",
-    options: ["aware", "familiar", "accustomed", "knowledgeable"]
-  },
-  {
-    question: "You should take his remarks with a grain of salt; he tends to ______.",
-    options: ["exaggerate", "overdo", "overwhelm", "elaborate"]
-  },
-  {
-    question: "It’s time you ______ your priorities; this approach isn’t sustainable.",
-    options: ["rethought", "have rethought", "rethink", "will rethink"]
-  },
-  {
-    question: "The plan was ambitious, to say the least, and many considered it financially ______.",
-    options: ["improbable", "invincible", "unfeasible", "inappropriate"]
-  },
-  {
-    question: "She was praised not just for her performance, but for the ______ with which she handled criticism.",
-    options: ["diplomacy", "precision", "grace", "empathy"]
-  },
-  {
-    question: "He may have seemed indifferent, but in reality he was deeply ______ by the outcome.",
-    options: ["affected", "effecting", "affecting", "effective"]
-  },
-  {
-    question: "The author makes a compelling case; however, his reasoning is not entirely ______ from bias.",
-    options: ["absent", "exempt", "immune", "divorced"]
-  }
-];
+// Данные задания загружаются из определения теста (GET /api/tests/{level}),
+// единого источника вопросов и ключей ответов (utilities/levels/upper_intermediate.json)
+import { loadTask } from "../../../common/js/test_data.js";
+
+export const task1Data = await loadTask("Upper-Intermediate", "task1");
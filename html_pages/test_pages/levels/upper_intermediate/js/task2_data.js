@@ -1,120 +1,5 @@
-// ========== Task 2 (Another Level) ==========
+// Данные задания загружаются из определения теста (GET /api/tests/{level}),
+// единого источника вопросов и ключей ответов (utilities/levels/upper_intermediate.json)
+import { loadTask } from "../../../common/js/test_data.js";
 
-export const task2Data = [
-  {
-    audio: "audio/upper_intermediate_task_2_1.mp3",
-    title: "Listening Track: Muckraking Journalism in the Early 20th Century",
-    questions: [
-      {
-        qnum: 1,
-        question: "What was the main goal of muckraking journalists in the early 20th century?",
-        type: "mcq",
-        options: [
-          "To support government policies",
-          "To entertain the public",
-          "To expose corruption and wrongdoing",
-          "To promote sensational headlines"
-        ]
-      },
-      {
-        qnum: 2,
-        question: "Which journalist is known for exposing the Standard Oil Company?",
-        type: "mcq",
-        options: [
-          "Lincoln Steffens",
-          "Ida Tarbell",
-          "Joseph Pulitzer",
-          "Upton Sinclair"
-        ]
-      },
-      {
-        qnum: 3,
-        question: "What kind of publications helped muckrakers reach a wide audience?",
-        type: "mcq",
-        options: [
-          "Radio broadcasts",
-          "Local leaflets",
-          "Academic journals",
-          "Popular magazines"
-        ]
-      },
-      {
-        qnum: 4,
-        question: "The progressive movement supported journalism because:",
-        type: "mcq",
-        options: [
-          "It provided scientific discoveries",
-          "It encouraged voting campaigns",
-          "It exposed social issues that reformers could act upon",
-          "It promoted political candidates"
-        ]
-      },
-      {
-        qnum: 5,
-        question: "How did journalism change in terms of writing style?",
-        type: "mcq",
-        options: [
-          "It became more emotional and dramatic",
-          "It adopted more objective and fact-based reporting",
-          "It began focusing only on international news",
-          "It stopped publishing on Sundays"
-        ]
-      },
-      {
-        qnum: 6,
-        question: "Why did newspapers introduce Sunday editions and women’s sections?",
-        type: "mcq",
-        options: [
-          "To compete with television",
-          "To make newspapers more expensive",
-          "To reach a broader demographic",
-          "To reduce printing costs"
-        ]
-      },
-      {
-        qnum: 7,
-        question: "What impact did journalism have on foreign policy?",
-        type: "mcq",
-        options: [
-          "It dictated international treaties",
-          "It made Americans less interested in global affairs",
-          "It influenced public perceptions of foreign conflicts",
-          "It replaced diplomats in foreign countries"
-        ]
-      },
-      {
-        qnum: 8,
-        question: "What was one major result of the move away from sensationalism?",
-        type: "mcq",
-        options: [
-          "Decline in newspaper sales",
-          "Reduced interest in politics",
-          "Increased trust in journalists",
-          "Shorter news articles"
-        ]
-      },
-      {
-        qnum: 9,
-        question: "How did reformers use the work of journalists?",
-        type: "mcq",
-        options: [
-          "To raise money for newspapers",
-          "To create entertaining books",
-          "To argue for new legislation",
-          "To train new reporters"
-        ]
-      },
-      {
-        qnum: 10,
-        question: "What best describes the overall influence of journalism during this era?",
-        type: "mcq",
-        options: [
-          "Entertainment with little political impact",
-          "A powerful force for shaping public opinion and reform",
-          "An outdated method of communication",
-          "A tool used mainly by elites"
-        ]
-      }
-    ]
-  }
-];
+export const task2Data = await loadTask("Upper-Intermediate", "task2");
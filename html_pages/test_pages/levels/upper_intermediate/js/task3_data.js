@@ -1,125 +1,5 @@
-export const task3Data = [
-  {
-    title: "Text – The Psychology of Decision-Making Under Uncertainty",
-    passage: `
-      In a world filled with constant choices—from mundane purchases to life-changing career moves—understanding how humans make decisions under uncertainty has become a central theme in psychology and behavioral economics. Unlike decisions based on certainty, where outcomes are predictable, uncertain decisions force individuals to weigh probabilities, potential risks, and emotional responses.
-      A key concept in understanding this process is "heuristics"—mental shortcuts the brain uses to make quick judgments. While heuristics can be efficient, they are also prone to systematic errors or biases. For example, the availability heuristic leads individuals to overestimate the probability of events that are more memorable or emotionally charged, such as plane crashes or shark attacks. Consequently, people often make irrational decisions, not because they lack intelligence, but because their brains prioritize speed over accuracy.
-      Another factor influencing decisions under uncertainty is risk aversion. Studies show that most individuals prefer a smaller but certain reward over a larger, probabilistic one. This behavior is central to prospect theory, developed by psychologists Daniel Kahneman and Amos Tversky. The theory challenges the traditional economic view that humans are rational actors by demonstrating that people value losses more than equivalent gains—a phenomenon known as loss aversion.
-      Interestingly, emotional states can significantly alter how we perceive risk. When anxious or stressed, individuals tend to overestimate negative outcomes and become more conservative in their choices. Conversely, a positive mood may lead to riskier decisions. Brain imaging studies support this, showing that regions associated with emotion regulation, such as the amygdala and prefrontal cortex, are highly active during uncertain decision-making.
-      Despite the complexity of human behavior, understanding these mechanisms has practical applications. In fields such as finance, public health, and marketing, knowledge of decision-making patterns can be used to predict consumer behavior, guide public policy, or improve user experience design. For instance, nudging—a concept popularized by behavioral economist Richard Thaler—relies on subtle changes in how choices are presented to influence decisions without restricting freedom.
-      In sum, decision-making under uncertainty is not simply a matter of logic and calculation. It is a deeply human process, shaped by emotions, cognitive shortcuts, and social context. By studying the hidden patterns in our behavior, researchers hope to empower people to make better choices in an increasingly complex world.
-    `,
-    questions: [
-      {
-        qnum: 1,
-        question: "What is the main idea of the passage?",
-        options: [
-          "Human decision-making is mostly illogical.",
-          "Understanding uncertainty is the key to reducing anxiety.",
-          "Human decisions under uncertainty are shaped by psychological and emotional factors.",
-          "People should avoid making decisions under pressure."
-        ]
-      },
-      {
-        qnum: 2,
-        question: "What does the author suggest about heuristics?",
-        options: [
-          "They are always inaccurate.",
-          "They are helpful but can cause predictable errors.",
-          "They eliminate the need for decision-making.",
-          "They are used only in emergency situations."
-        ]
-      },
-      {
-        qnum: 3,
-        question: "According to the text, the availability heuristic affects decision-making by:",
-        options: [
-          "Making people overly cautious in financial decisions.",
-          "Encouraging logical analysis over emotional reaction.",
-          "Causing people to judge probability based on recent or vivid events.",
-          "Helping people focus only on positive outcomes."
-        ]
-      },
-      {
-        qnum: 4,
-        question: "What is the concept of “loss aversion”?",
-        options: [
-          "People are more motivated by potential gains than losses.",
-          "People avoid any kind of risk.",
-          "People react more strongly to potential losses than to equivalent gains.",
-          "People forget about losses quickly."
-        ]
-      },
-      {
-        qnum: 5,
-        question: "According to the passage, what happens when individuals are anxious?",
-        options: [
-          "They tend to make more logical decisions.",
-          "They take more risks to compensate.",
-          "They avoid making any decision at all.",
-          "They overestimate negative outcomes and act conservatively."
-        ]
-      },
-      {
-        qnum: 6,
-        question: "What does prospect theory argue against?",
-        options: [
-          "That people can improve their decisions with practice.",
-          "That people think more clearly under pressure.",
-          "That humans are always rational decision-makers.",
-          "That risk is necessary for growth."
-        ]
-      },
-      {
-        qnum: 7,
-        question: "How does a positive emotional state affect decision-making?",
-        options: [
-          "It reduces emotional involvement.",
-          "It encourages people to seek advice.",
-          "It increases the likelihood of taking risks.",
-          "It has no significant effect."
-        ]
-      },
-      {
-        qnum: 8,
-        question: "Which area of the brain is involved in emotion regulation during decision-making?",
-        options: [
-          "Occipital lobe and hippocampus",
-          "Prefrontal cortex and amygdala",
-          "Cerebellum and thalamus",
-          "Brainstem and spinal cord"
-        ]
-      },
-      {
-        qnum: 9,
-        question: "What is the function of 'nudging' according to the passage?",
-        options: [
-          "To remove individual freedom in decision-making",
-          "To simplify difficult decisions using AI",
-          "To subtly influence choices without removing options",
-          "To manipulate emotions for profit"
-        ]
-      },
-      {
-        qnum: 10,
-        question: "Which of the following best describes the tone of the passage?",
-        options: [
-          "Critical and confrontational",
-          "Informative and analytical",
-          "Emotional and persuasive",
-          "Casual and humorous"
-        ]
-      },
-      {
-        qnum: 11,
-        question: "Insert-the-Sentence Question: 'This mental shortcut can be useful, but it often results in misjudging how likely certain events are.' Where should the sentence be inserted?",
-        options: [
-          "After paragraph 1",
-          "After 'While heuristics can be efficient, they are also prone to systematic errors or biases.'",
-          "After 'Another factor influencing decisions under uncertainty is risk aversion.'",
-          "After 'When anxious or stressed, individuals tend to overestimate negative outcomes…'"
-        ]
-      }
-    ]
-  }
-];
+// Данные задания загружаются из определения теста (GET /api/tests/{level}),
+// единого источника вопросов и ключей ответов (utilities/levels/upper_intermediate.json)
+import { loadTask } from "../../../common/js/test_data.js";
+
+export const task3Data = await loadTask("Upper-Intermediate", "task3");
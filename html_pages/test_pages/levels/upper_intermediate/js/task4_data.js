@@ -1,15 +1,5 @@
-export const task4Data = {
-  instruction: `<em>✍️ Task 4 – Writing</em><br>
-    You are planning to attend an English course at a language training centre.<br>
-    Write a formal letter to the centre’s administration to request more detailed information about the course.<br><br>
-    In your letter, you should:<br>
-    • Mention where you found the information about the centre<br>
-    • Ask about the available levels and schedule options<br>
-    • Inquire about the fees and whether course materials are included<br><br>
-    📩 <strong>Write about 80–100 words. You have 8–10 minutes to complete this task.</strong><br><br>
-    <em>Tips for students:</em><br>
-    • Use formal style.<br>
-    • Begin your letter with: <code>Dear Sir or Madam,</code><br>
-    • End your letter with: <code>Yours faithfully,<br>(Your full name)</code><br>
-  `
-};
+// Данные задания загружаются из определения теста (GET /api/tests/{level}),
+// единого источника вопросов и ключей ответов (utilities/levels/upper_intermediate.json)
+import { loadTask } from "../../../common/js/test_data.js";
+
+export const task4Data = await loadTask("Upper-Intermediate", "task4");
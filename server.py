@@ -1,34 +1,51 @@
 """Основная точка входа в приложение Lanex Online Platform.
 
-Запускает FastAPI-сервер и Telegram-бот на одном event loop.
+Запускает FastAPI-сервер. Обновления Telegram-бота получаются в этом же
+процессе (TELEGRAM_MODE=polling или webhook) или отдельным процессом
+`python -m telegram.bot` (TELEGRAM_MODE=external), см. telegram.bot.
 
 Компоненты:
     - FastAPI-приложение (REST API, статические файлы, CORS)
     - Aiogram-бот (асинхронный Telegram-бот)
+    - Очередь фоновых задач (PDF-отчёты, Dropbox)
+    - Версионированные ключи ответов с горячей перезагрузкой
+    - Outbox уведомлений администратору в Telegram
+    - Пул процессов генерации PDF
     - Единый lifespan для управления жизненным циклом приложения
 """
 
-import asyncio
 from contextlib import asynccontextmanager
-from pathlib import Path
 
-from aiogram import Bot, Dispatcher
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 
-from api import application_api, check_api
+from api import (
+    answer_keys_api,
+    application_api,
+    check_api,
+    jobs_api,
+    metrics_api,
+    telegram_webhook_api,
+    tests_api,
+)
 from config import settings
 from logging_config import logger
-from telegram.handlers import register_handlers
-
-# Основные константы
-BASE_DIR = Path(__file__).resolve().parent
-
-# Инициализация Telegram-бота
-bot = Bot(token=settings.telegram_bot_token)
-dp = Dispatcher()
-register_handlers(dp)
+from telegram.bot import bot, start_updates, stop_updates
+from utilities.answer_keys import answer_key_registry
+from utilities.dropbox_utils import dropbox_manager
+from utilities.idempotency import idempotency
+from utilities.job_queue import job_queue
+from utilities.notification_outbox import notification_outbox
+from utilities.pdf_renderer import pdf_renderer
+from utilities.regrade import register_regrade_jobs
+from utilities.report_jobs import register_report_jobs, requeue_missing_reports
+from utilities.static_assets import CachedStaticFiles, asset_manifest
+from utilities.telegram_notifications import admin_notifier
+from utilities.test_drafts import test_drafts
+
+# Регистрация обработчиков фоновых задач
+register_report_jobs(job_queue)
+register_regrade_jobs(job_queue)
 
 
 @asynccontextmanager
@@ -36,19 +53,60 @@ async def lifespan(app: FastAPI):
     """Управляет фазами запуска и завершения FastAPI-приложения.
 
     Действия при запуске:
-        - Запуск Telegram-бота на фоне.
+        - Построение манифеста статических файлов (хэши содержимого).
+        - Загрузка ключей ответов из БД и подписка на их обновления.
+        - Запуск удаления истёкших ключей идемпотентности.
+        - Запуск пакетной записи черновиков тестов.
+        - Запуск пула процессов генерации PDF.
+        - Создание общего клиента Dropbox и планового обновления токена.
+        - Привязка бота к отправителю уведомлений и запуск диспетчера outbox.
+        - Запуск воркеров очереди фоновых задач и повторная постановка
+          отчётов, оставшихся без PDF.
+        - Получение обновлений Telegram: long polling на фоне или установка
+          вебхука (по TELEGRAM_MODE).
 
     Действия при завершении:
+        - Остановка long polling (если запущен).
+        - Остановка воркеров очереди и пула процессов PDF.
+        - Остановка диспетчера outbox и отвязка отправителя от бота.
+        - Закрытие пула соединений Dropbox.
+        - Остановка слушателя обновлений ключей ответов
+          и удаления ключей идемпотентности.
+        - Запись оставшихся черновиков тестов.
         - Корректное закрытие сессии Telegram-бота.
     """
+    asset_manifest.build()
+    await answer_key_registry.start()
+    await idempotency.start()
+    await test_drafts.start()
+    pdf_renderer.start()
+    await dropbox_manager.start()
+    admin_notifier.start(bot)
+    await notification_outbox.start()
+    await job_queue.start()
+
+    try:
+        await requeue_missing_reports(job_queue)
+    except Exception as e:
+        logger.error(f"Не удалось поставить потерянные отчёты в очередь: {e}")
+
     try:
-        asyncio.create_task(dp.start_polling(bot))
+        await start_updates()
     except Exception as e:
         logger.error(f"Ошибка при запуске Telegram-бота: {e}")
         raise e
 
     yield  # --- Приложение работает ---
 
+    await stop_updates()
+    await job_queue.stop()
+    await pdf_renderer.shutdown()
+    await notification_outbox.stop()
+    admin_notifier.stop()
+    await dropbox_manager.stop()
+    await answer_key_registry.stop()
+    await idempotency.stop()
+    await test_drafts.stop()
     await bot.session.close()
 
 
@@ -56,10 +114,10 @@ async def lifespan(app: FastAPI):
 app = FastAPI(lifespan=lifespan)
 
 
-# Статические файлы
+# Статические файлы (версии по хэшу содержимого, см. utilities.static_assets)
 app.mount(
     "/html_pages",
-    StaticFiles(directory=BASE_DIR / "html_pages"),
+    CachedStaticFiles(manifest=asset_manifest),
     name="html_pages",
 )
 
@@ -67,6 +125,11 @@ app.mount(
 # Подключение маршрутов
 app.include_router(check_api.router)
 app.include_router(application_api.router)
+app.include_router(jobs_api.router)
+app.include_router(metrics_api.router)
+app.include_router(answer_keys_api.router)
+app.include_router(telegram_webhook_api.router)
+app.include_router(tests_api.router)
 
 # Настройка CORS
 app.add_middleware(
@@ -0,0 +1,116 @@
+"""
+Telegram-бот: экземпляры Bot и Dispatcher и получение обновлений.
+
+Обновления Telegram должен получать ровно один потребитель, поэтому способ
+их получения задаётся настройкой TELEGRAM_MODE:
+    - polling: long polling в процессе API (один воркер uvicorn, разработка);
+    - webhook: Telegram присылает обновления на POST /api/telegram/webhook
+      с секретом TELEGRAM_WEBHOOK_SECRET; API можно запускать
+      в любом количестве воркеров;
+    - external: API обновления не получает, их обрабатывает отдельный
+      процесс `python -m telegram.bot` (long polling).
+
+Экземпляр bot нужен API в любом режиме: через него отправляются
+уведомления администратору (utilities.telegram_notifications).
+
+Содержит:
+    - bot, dp: бот и диспетчер с зарегистрированными обработчиками.
+    - webhook_url: адрес вебхука (BASE_URL + WEBHOOK_PATH).
+    - start_updates / stop_updates: получение обновлений в процессе API.
+    - main: точка входа отдельного процесса бота.
+"""
+
+import asyncio
+from contextlib import suppress
+from typing import Optional
+
+from aiogram import Bot, Dispatcher
+
+from config import settings
+from logging_config import logger
+from telegram.handlers import register_handlers
+
+WEBHOOK_PATH = "/api/telegram/webhook"
+
+bot = Bot(token=settings.telegram_bot_token)
+dp = Dispatcher()
+register_handlers(dp)
+
+_polling_task: Optional[asyncio.Task] = None
+
+
+def webhook_url() -> str:
+    """Возвращает публичный адрес вебхука."""
+    return settings.base_url.rstrip("/") + WEBHOOK_PATH
+
+
+async def set_webhook() -> None:
+    """
+    Регистрирует вебхук в Telegram.
+
+    Вызов идемпотентен, поэтому его выполняет каждый воркер API при запуске.
+
+    Raises:
+        RuntimeError: если TELEGRAM_WEBHOOK_SECRET не задан.
+    """
+    if not settings.telegram_webhook_secret:
+        raise RuntimeError("TELEGRAM_MODE=webhook требует TELEGRAM_WEBHOOK_SECRET")
+
+    await bot.set_webhook(
+        webhook_url(),
+        secret_token=settings.telegram_webhook_secret,
+        allowed_updates=dp.resolve_used_update_types(),
+    )
+    logger.info("Вебхук Telegram установлен: %s", webhook_url())
+
+
+async def start_updates() -> None:
+    """Запускает получение обновлений в процессе API согласно TELEGRAM_MODE."""
+    global _polling_task
+
+    if settings.telegram_mode == "webhook":
+        await set_webhook()
+    elif settings.telegram_mode == "polling" and _polling_task is None:
+        await bot.delete_webhook()
+        _polling_task = asyncio.create_task(
+            dp.start_polling(bot, handle_signals=False, close_bot_session=False),
+            name="telegram-polling",
+        )
+    else:
+        logger.info("Обновления Telegram обрабатывает отдельный процесс бота")
+
+
+async def stop_updates() -> None:
+    """Останавливает long polling, запущенный start_updates."""
+    global _polling_task
+
+    if _polling_task is None:
+        return
+
+    with suppress(RuntimeError):  # polling ещё не успел запуститься
+        await dp.stop_polling()
+    _polling_task.cancel()
+    with suppress(asyncio.CancelledError):
+        await _polling_task
+    _polling_task = None
+
+
+async def main() -> None:
+    """
+    Точка входа отдельного процесса бота (TELEGRAM_MODE=external у API).
+
+    Запускается в единственном экземпляре: python -m telegram.bot
+    """
+    if settings.telegram_mode == "webhook":
+        raise SystemExit(
+            "TELEGRAM_MODE=webhook: обновления получает API, "
+            "отдельный процесс бота не нужен"
+        )
+
+    await bot.delete_webhook()
+    logger.info("Запуск Telegram-бота (long polling)")
+    await dp.start_polling(bot)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
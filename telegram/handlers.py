@@ -3,7 +3,7 @@
 
 Содержит:
     - Команду /start
-    - Обработку заявок (просмотр и редактирование)
+    - Обработку заявок (постраничный просмотр и редактирование)
     - Меню выбора уровня тестов
     - Кнопку "Назад"
 
@@ -14,10 +14,14 @@ from aiogram import Dispatcher, F, Router, types
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup, Message
 
 from database.base import AsyncSessionLocal
-from database.crud.application import read_application_by_user_id
+from database.crud.application import (
+    APPLICATIONS_PAGE_SIZE,
+    list_applications_by_user_id,
+)
 from database.crud.user_session import create_user_session
 from logging_config import logger
 from telegram.keyboards import (
+    APPLICATIONS_PAGE_CALLBACK,
     applications_menu,
     get_levels_menu,
     get_main_menu,
@@ -112,13 +116,46 @@ async def cmd_start(message: types.Message) -> None:
 @router.callback_query(F.data == "update_application")
 async def handle_update_application(callback: types.CallbackQuery) -> None:
     """
-    Загружает список заявок пользователя.
+    Показывает первую страницу заявок пользователя (APPLICATIONS_PAGE_SIZE).
     Если заявок нет — сообщает об этом и показывает кнопку "Назад".
     """
+    await show_applications_page(callback, after_id=None)
+
+
+@router.callback_query(F.data.startswith(APPLICATIONS_PAGE_CALLBACK))
+async def handle_applications_page(callback: types.CallbackQuery) -> None:
+    """
+    Показывает следующую страницу заявок (кнопка "Ещё").
+    callback_data содержит ID последней заявки предыдущей страницы.
+    """
+    try:
+        after_id = int((callback.data or "").removeprefix(APPLICATIONS_PAGE_CALLBACK))
+    except ValueError:
+        logger.warning("Invalid applications page callback: %s", callback.data)
+        await callback.answer()
+        return
+
+    await show_applications_page(callback, after_id=after_id)
+
+
+async def show_applications_page(
+    callback: types.CallbackQuery, after_id: int | None
+) -> None:
+    """
+    Выводит страницу заявок пользователя с кнопкой "Ещё", если есть следующая.
+
+    Параметры:
+        callback (types.CallbackQuery): объект callback от Telegram.
+        after_id (int | None): ID последней заявки предыдущей страницы;
+            None — первая страница.
+    """
     telegram_id = callback.from_user.id
 
+    # Запрашиваем на одну заявку больше, чтобы узнать, есть ли следующая страница
     async with AsyncSessionLocal() as session:
-        apps = await read_application_by_user_id(session, telegram_id)
+        apps = await list_applications_by_user_id(
+            session, telegram_id, after_id, APPLICATIONS_PAGE_SIZE + 1
+        )
 
     message = get_callback_message(callback, "update_application")
     if message is None:
@@ -128,7 +165,7 @@ async def handle_update_application(callback: types.CallbackQuery) -> None:
     # Нет заявок
     if not apps:
         await message.edit_text(
-            "У вас пока нет заявок.",
+            "У вас пока нет заявок." if after_id is None else "Больше заявок нет.",
             reply_markup=InlineKeyboardMarkup(
                 inline_keyboard=[
                     [InlineKeyboardButton(text="⬅️ Назад", callback_data="go_back")]
@@ -138,19 +175,20 @@ async def handle_update_application(callback: types.CallbackQuery) -> None:
         await callback.answer()
         return
 
+    has_next = len(apps) > APPLICATIONS_PAGE_SIZE
+    apps = apps[:APPLICATIONS_PAGE_SIZE]
+
     # Есть заявки → формируем кнопки
     app_buttons = [
-        {
-            "id": app.id,
-            "name": app.applicant_name,
-            "date": app.created_at.strftime("%Y-%m-%d"),
-        }
-        for app in apps
+        {"id": app_id, "name": name, "date": created_at.strftime("%Y-%m-%d")}
+        for app_id, name, created_at in apps
     ]
 
     await message.edit_text(
         "Ваши заявки:",
-        reply_markup=applications_menu(app_buttons),
+        reply_markup=applications_menu(
+            app_buttons, next_after_id=apps[-1][0] if has_next else None
+        ),
     )
     await callback.answer()
 
@@ -4,43 +4,49 @@
 Содержит:
     - Главное меню
     - Меню выбора уровней тестов
-    - Динамическое меню с заявками пользователя
+    - Динамическое меню с заявками пользователя (постранично)
 
-Все URL формируются через versioned_url() для обхода кэширования Telegram WebView.
+Все URL формируются через versioned_url(): версия страницы — хэш её содержимого
+из манифеста статических файлов, поэтому Telegram WebView загружает страницу
+заново только после её изменения. Для страниц уровней, собранных
+utilities.build_assets, открывается собранная страница.
 """
 
-import time
 import urllib.parse
 from typing import List, Optional
 
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup, WebAppInfo
 
 from config import settings
+from utilities.static_assets import asset_manifest
 
 BASE_URL: str = settings.base_url
 
+# Префикс callback_data кнопки следующей страницы заявок
+APPLICATIONS_PAGE_CALLBACK = "applications_page:"
+
 
 def versioned_url(path: str, init_data: Optional[str] = None) -> str:
     """
-    Формирует WebApp URL с уникальной временной меткой, чтобы Telegram
-    всегда загружал свежую версию страницы.
+    Формирует WebApp URL с версией страницы по хэшу её содержимого.
 
     Args:
-        path (str): относительный путь (например: "/html_pages/...").
+        path (str): относительный путь (например: "/html_pages/...");
+            может содержать собственные параметры запроса.
         init_data (str | None): Telegram initData (для авторизации WebApp).
 
     Returns:
-        str: Полный URL с параметрами для обхода кэша.
+        str: Полный URL с параметром v=<хэш страницы>.
     """
-    timestamp = int(time.time())
-    sep = "&" if "?" in path else "?"
-
-    url = f"{BASE_URL}{path}{sep}v={timestamp}"
+    page, _, query = path.partition("?")
+    url = BASE_URL + asset_manifest.url(page)
 
+    if query:
+        url += ("&" if "?" in url else "?") + query
     if init_data:
-        url += f"&tgWebAppData={urllib.parse.quote(init_data)}"
+        sep = "&" if "?" in url else "?"
+        url += f"{sep}tgWebAppData={urllib.parse.quote(init_data)}"
 
-    url += f"&_nocache={timestamp}"
     return url
 
 
@@ -88,19 +94,19 @@ def get_main_menu(init_data: Optional[str] = None) -> InlineKeyboardMarkup:
 # ---------------------------------------------------------------------------
 
 LEVEL_BUTTONS = [
-    ("Starter", "/html_pages/levels/starter/starter_page.html"),
-    ("Elementary", "/html_pages/levels/elementary/elementary_page.html"),
+    ("Starter", "/html_pages/test_pages/levels/starter/starter_page.html"),
+    ("Elementary", "/html_pages/test_pages/levels/elementary/elementary_page.html"),
     (
         "Pre-Intermediate",
-        "/html_pages/levels/pre_intermediate/pre_intermediate_page.html",
+        "/html_pages/test_pages/levels/pre_intermediate/pre_intermediate_page.html",
     ),
     (
         "Intermediate",
-        "/html_pages/levels/intermediate/intermediate_page.html",
+        "/html_pages/test_pages/levels/intermediate/intermediate_page.html",
     ),
     (
         "Upper-Intermediate",
-        "/html_pages/levels/upper_intermediate/upper_intermediate_page.html",
+        "/html_pages/test_pages/levels/upper_intermediate/upper_intermediate_page.html",
     ),
 ]
 
@@ -131,7 +137,9 @@ def get_levels_menu(init_data: Optional[str] = None) -> InlineKeyboardMarkup:
 
 
 def applications_menu(
-    applications: List[dict], init_data: Optional[str] = None
+    applications: List[dict],
+    init_data: Optional[str] = None,
+    next_after_id: Optional[int] = None,
 ) -> InlineKeyboardMarkup:
     """
     Генерирует клавиатуру со списком заявок пользователя.
@@ -142,6 +150,8 @@ def applications_menu(
             - name: str
             - date: str (формат отображения)
         init_data (str | None): Telegram WebApp initData
+        next_after_id (int | None): ID последней заявки страницы, если
+            есть следующая страница (добавляет кнопку "Ещё")
 
     Returns:
         InlineKeyboardMarkup: меню заявок
@@ -162,6 +172,16 @@ def applications_menu(
             ]
         )
 
+    if next_after_id is not None:
+        rows.append(
+            [
+                InlineKeyboardButton(
+                    text="Ещё ➡️",
+                    callback_data=f"{APPLICATIONS_PAGE_CALLBACK}{next_after_id}",
+                )
+            ]
+        )
+
     rows.append([InlineKeyboardButton(text="⬅️ Назад", callback_data="go_back")])
 
     return InlineKeyboardMarkup(inline_keyboard=rows)
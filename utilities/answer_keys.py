@@ -0,0 +1,208 @@
+"""
+Загрузка версионированных ключей ответов из БД и их горячая замена.
+
+Ключи хранятся в таблице answer_keys (см. database.models.AnswerKey).
+При запуске приложения действующая версия загружается и компилируется
+в индекс utilities.check_function.AnswerKeyIndex. После публикации новой
+версии индекс перечитывается и заменяется одной операцией присваивания:
+уже начатые проверки завершаются по старому индексу, новые используют новый.
+
+Все процессы узнают о новой версии через LISTEN/NOTIFY (канал
+answer_keys_changed): публикация (database.crud.answer_key) и эндпоинт
+перезагрузки выполняют NOTIFY, а слушатель каждого процесса перечитывает
+ключи. После переподключения слушателя ключи перечитываются, чтобы
+не пропустить версии, опубликованные во время разрыва.
+
+Содержит:
+    - group_answer_keys: преобразование строк AnswerKey в словарь ключей.
+    - AnswerKeyRegistry: загрузка, замена индекса и слушатель NOTIFY.
+    - answer_key_registry: общий экземпляр приложения.
+
+Метрики:
+    - answer_keys_reloads: количество замен индекса.
+    - answer_keys_reload_errors: неудачные загрузки ключей.
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional, Sequence, Set
+
+import asyncpg
+
+from config import settings
+from database.base import AsyncSessionLocal
+from database.crud.answer_key import (
+    ANSWER_KEYS_CHANNEL,
+    notify_answer_keys_changed,
+    read_current_answer_keys,
+)
+from database.models import AnswerKey
+from logging_config import logger
+from utilities.check_function import (
+    AnswerKeyIndex,
+    compile_answer_key,
+    get_answer_index,
+    set_answer_index,
+)
+from utilities.metrics import metrics
+
+
+def group_answer_keys(
+    rows: Sequence[AnswerKey],
+) -> Dict[str, Dict[str, Dict[str, List[str]]]]:
+    """
+    Группирует строки ключей в словарь уровень -> таск -> вопрос -> ответы.
+
+    Вопросы с пустым accepted_answers пропускаются.
+
+    Args:
+        rows: Действующие строки AnswerKey.
+
+    Returns:
+        dict: Ключи в формате utilities.check_function.global_answer_key.
+    """
+    grouped: Dict[str, Dict[str, Dict[str, List[str]]]] = {}
+    for row in rows:
+        if not row.accepted_answers:
+            continue
+        tasks = grouped.setdefault(row.level.value, {})
+        tasks.setdefault(row.task, {})[row.question] = list(row.accepted_answers)
+    return grouped
+
+
+class AnswerKeyRegistry:
+    """
+    Источник действующего индекса ключей ответов.
+
+    Args:
+        dsn: Строка подключения PostgreSQL для слушателя LISTEN/NOTIFY.
+        reconnect_delay: Пауза перед переподключением слушателя (сек).
+    """
+
+    def __init__(self, dsn: str, reconnect_delay: float = 5.0) -> None:
+        self.dsn = dsn
+        self.reconnect_delay = reconnect_delay
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._reloads: Set[asyncio.Task] = set()
+
+        self._reloaded = metrics.counter(
+            "answer_keys_reloads", "Answer key index swaps"
+        )
+        self._errors = metrics.counter(
+            "answer_keys_reload_errors", "Failed answer key loads"
+        )
+
+    @property
+    def index(self) -> AnswerKeyIndex:
+        """Действующий индекс ключей."""
+        return get_answer_index()
+
+    @property
+    def version(self) -> int:
+        """Версия действующих ключей (0 — встроенные ключи)."""
+        return get_answer_index().version
+
+    async def reload(self) -> AnswerKeyIndex:
+        """
+        Перечитывает действующие ключи из БД и заменяет индекс.
+
+        Если таблица пуста, остаётся текущий индекс.
+
+        Returns:
+            AnswerKeyIndex: Действующий индекс после перезагрузки.
+        """
+        async with self._lock:
+            try:
+                async with AsyncSessionLocal() as session:
+                    rows = await read_current_answer_keys(session)
+            except Exception:
+                self._errors.inc()
+                raise
+
+            if not rows:
+                logger.warning("Таблица answer_keys пуста, используются текущие ключи")
+                return get_answer_index()
+
+            version = max(row.version for row in rows)
+            current = get_answer_index()
+            if version == current.version:
+                return current
+
+            index = compile_answer_key(group_answer_keys(rows), version)
+            set_answer_index(index)
+            self._reloaded.inc()
+            logger.info(
+                "🔑 Ключи ответов обновлены: версия %s → %s", current.version, version
+            )
+            return index
+
+    async def reload_all(self) -> AnswerKeyIndex:
+        """Перезагружает ключи в этом процессе и оповещает остальные (NOTIFY)."""
+        index = await self.reload()
+        async with AsyncSessionLocal() as session:
+            await notify_answer_keys_changed(session, index.version)
+        return index
+
+    async def start(self) -> None:
+        """Загружает ключи и запускает слушателя NOTIFY."""
+        try:
+            await self.reload()
+        except Exception as e:
+            logger.exception("Не удалось загрузить ключи ответов из БД: %s", e)
+
+        if self._task is None:
+            self._task = asyncio.create_task(self._listen(), name="answer-keys")
+
+    async def stop(self) -> None:
+        """Останавливает слушателя NOTIFY."""
+        tasks = [t for t in (self._task, *self._reloads) if t is not None]
+        self._task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _listen(self) -> None:
+        """Держит соединение LISTEN и переподключается при обрыве."""
+        while True:
+            conn: Optional[asyncpg.Connection] = None
+            try:
+                conn = await asyncpg.connect(self.dsn)
+                lost = asyncio.Event()
+                conn.add_termination_listener(lambda _conn, lost=lost: lost.set())
+                await conn.add_listener(ANSWER_KEYS_CHANNEL, self._on_notify)
+
+                # Версии, опубликованные до подписки, не будут объявлены
+                await self.reload()
+                await lost.wait()
+                logger.warning("Соединение LISTEN для ключей ответов потеряно")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Ошибка слушателя ключей ответов: %s", e)
+            finally:
+                if conn is not None and not conn.is_closed():
+                    await conn.close()
+
+            await asyncio.sleep(self.reconnect_delay)
+
+    def _on_notify(self, _conn: Any, _pid: int, _channel: str, payload: str) -> None:
+        """Планирует перезагрузку, если объявлена версия, отличная от действующей."""
+        try:
+            if int(payload) == self.version:
+                return
+        except ValueError:
+            pass
+
+        task = asyncio.create_task(self._reload_quietly())
+        self._reloads.add(task)
+        task.add_done_callback(self._reloads.discard)
+
+    async def _reload_quietly(self) -> None:
+        """Перезагрузка по NOTIFY: ошибки только логируются."""
+        try:
+            await self.reload()
+        except Exception as e:
+            logger.exception("Не удалось перезагрузить ключи ответов: %s", e)
+
+
+answer_key_registry = AnswerKeyRegistry(dsn=settings.sync_db_url)
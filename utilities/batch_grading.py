@@ -0,0 +1,392 @@
+"""
+Векторизованная пакетная проверка тестов на NumPy.
+
+Для массовой проверки (перепроверка, аналитика, пробные экзамены с сотнями
+одновременных отправок) ответы одного уровня кодируются в матрицу целых
+чисел: строка — отправка, столбец — вопрос ключа, значение — код
+нормализованного ответа в словаре допустимых ответов уровня (0 — ответа
+нет или он не входит ни в один набор допустимых). Правильность,
+баллы по таскам и итоговые проценты вычисляются операциями над массивами.
+
+Результат совпадает с utilities.check_function.grade для каждой отправки.
+
+Выигрыш даёт только score_batch — аналитика по когорте, где нужны баллы
+и итоги, а не пометки по вопросам. grade_batch собирает результат каждой
+отправки словарями Python и не быстрее скалярной проверки, поэтому
+перепроверка (utilities.regrade) использует grade. Соотношение на своих
+данных показывает бенчмарк.
+
+NumPy входит в необязательную группу зависимостей analytics
+(poetry install --with analytics). Без него score_batch недоступен,
+а grade_batch выполняет скалярную проверку.
+
+Содержит:
+    - LevelMatrix: словарь кодов и таблица допустимых ответов уровня.
+    - LevelScores / score_batch: баллы и итоги массивами (без словарей).
+    - grade_batch: пакетная проверка отправок в формате grade
+      (эталон формата для score_batch).
+    - CLI-бенчмарк: python -m utilities.batch_grading [--submissions N]
+"""
+
+import argparse
+import random
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from utilities.check_function import (
+    AnswerKeyIndex,
+    get_answer_index,
+    grade,
+    normalize_answer,
+)
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy необязателен
+    np = None
+
+# Отправка для пакетной проверки: (уровень, таск -> вопрос -> ответ)
+SubmissionType = Tuple[str, Mapping[str, Mapping[str, str]]]
+
+
+class LevelMatrix:
+    """
+    Ключи одного уровня в виде массивов для векторизованной проверки.
+
+    Attributes:
+        level: Уровень теста.
+        tasks: Таски ключа в порядке ключа.
+        columns: Таск -> номер вопроса -> индекс столбца.
+        task_bounds: Начало столбцов каждого таска (для np.add.reduceat).
+        task_sizes: Количество вопросов в каждом таске.
+        vocabulary: Нормализованный ответ -> код (начиная с 1).
+        accept: Булева таблица [столбец, код]: код допустим для вопроса.
+    """
+
+    def __init__(self, index: AnswerKeyIndex, level: str) -> None:
+        level_key = index.level(level)
+        self.level = level
+        self.tasks: List[str] = list(level_key)
+        self.task_position = {task: i for i, task in enumerate(self.tasks)}
+        self.columns: Dict[str, Dict[str, int]] = {}
+        self.vocabulary: Dict[str, int] = {}
+
+        accepted_by_column: List[frozenset] = []
+        bounds: List[int] = []
+        for task, questions in level_key.items():
+            bounds.append(len(accepted_by_column))
+            self.columns[task] = {}
+            for q_num, accepted in questions.items():
+                self.columns[task][q_num] = len(accepted_by_column)
+                accepted_by_column.append(accepted)
+                for answer in accepted:
+                    self.vocabulary.setdefault(answer, len(self.vocabulary) + 1)
+
+        self.task_bounds = np.array(bounds, dtype=np.intp)
+        self.task_sizes = np.array(
+            [len(level_key[task]) for task in self.tasks], dtype=np.int64
+        )
+        self.accept = np.zeros(
+            (len(accepted_by_column), len(self.vocabulary) + 1), dtype=bool
+        )
+        for column, accepted in enumerate(accepted_by_column):
+            for answer in accepted:
+                self.accept[column, self.vocabulary[answer]] = True
+
+    @property
+    def width(self) -> int:
+        """Количество вопросов (столбцов) уровня."""
+        return self.accept.shape[0]
+
+
+@lru_cache(maxsize=32)
+def _level_matrix(index: AnswerKeyIndex, level: str) -> LevelMatrix:
+    """Компилирует LevelMatrix один раз для пары (индекс, уровень)."""
+    return LevelMatrix(index, level)
+
+
+@dataclass
+class LevelScores:
+    """
+    Результаты пакетной проверки отправок одного уровня (массивы NumPy).
+
+    Attributes:
+        level: Уровень теста.
+        positions: Индексы отправок во входной последовательности.
+        tasks: Таски ключа (столбцы scores и present).
+        correct: [отправка, вопрос] — ответ верный.
+        scores: [отправка, таск] — количество верных ответов.
+        present: [отправка, таск] — таск есть в отправке.
+        totals: Итоговый процент (NaN, если закрытых тасков нет).
+        in_key_order: Таски отправки идут в порядке ключа.
+    """
+
+    level: str
+    positions: List[int]
+    tasks: List[str]
+    correct: Any
+    scores: Any
+    present: Any
+    totals: Any
+    in_key_order: List[bool]
+
+
+def score_batch(
+    submissions: Sequence[SubmissionType],
+    index: Optional[AnswerKeyIndex] = None,
+) -> Dict[str, LevelScores]:
+    """
+    Вычисляет правильность, баллы по таскам и итоги без сборки словарей.
+
+    Быстрый путь для аналитики по когорте, где нужны только баллы.
+
+    Аргументы:
+        submissions: Пары (уровень, ответы).
+        index (AnswerKeyIndex | None): Индекс ключей (по умолчанию действующий).
+
+    Returns:
+        dict: Уровень -> LevelScores.
+
+    Raises:
+        RuntimeError: Если NumPy не установлен.
+    """
+    if np is None:
+        raise RuntimeError("Для score_batch требуется NumPy")
+    index = index or get_answer_index()
+
+    by_level: Dict[str, List[int]] = {}
+    for position, (level, _answers) in enumerate(submissions):
+        by_level.setdefault(level, []).append(position)
+
+    return {
+        level: _score_level(
+            _level_matrix(index, level),
+            positions,
+            [submissions[p][1] for p in positions],
+        )
+        for level, positions in by_level.items()
+    }
+
+
+def grade_batch(
+    submissions: Sequence[SubmissionType],
+    index: Optional[AnswerKeyIndex] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Проверяет пачку отправок; результат совпадает с grade для каждой.
+
+    Аргументы:
+        submissions: Пары (уровень, ответы).
+        index (AnswerKeyIndex | None): Индекс ключей (по умолчанию действующий).
+
+    Returns:
+        list[dict]: Результаты в порядке submissions.
+    """
+    index = index or get_answer_index()
+    if np is None:
+        return [grade(level, answers, index) for level, answers in submissions]
+
+    results: List[Dict[str, Any]] = [{} for _ in submissions]
+    for level_scores in score_batch(submissions, index).values():
+        matrix = _level_matrix(index, level_scores.level)
+        for row, position in enumerate(level_scores.positions):
+            results[position] = _assemble(
+                matrix, level_scores, row, submissions[position][1], index
+            )
+    return results
+
+
+def _score_level(
+    matrix: LevelMatrix,
+    positions: List[int],
+    group: Sequence[Mapping[str, Mapping[str, str]]],
+) -> LevelScores:
+    """Кодирует отправки одного уровня и вычисляет баллы массивами."""
+    n_rows, n_tasks = len(group), len(matrix.tasks)
+
+    # --- Кодирование: одна нормализация на уникальный ответ ---
+    rows: List[int] = []
+    cols: List[int] = []
+    codes: List[int] = []
+    present_rows: List[int] = []
+    present_tasks: List[int] = []
+    in_key_order = [True] * n_rows
+    # Ответы в когорте часто повторяются: код вычисляется один раз на строку
+    known: Dict[str, Optional[int]] = {}
+    vocabulary = matrix.vocabulary
+
+    for row, answers in enumerate(group):
+        last_task = -1
+        for task, task_answers in answers.items():
+            position = matrix.task_position.get(task)
+            if position is None:
+                continue
+            present_rows.append(row)
+            present_tasks.append(position)
+            if position < last_task:
+                in_key_order[row] = False
+            last_task = position
+
+            columns = matrix.columns[task]
+            for q_num, user_answer in task_answers.items():
+                column = columns.get(q_num)
+                if column is None or not user_answer:
+                    continue
+                if user_answer in known:
+                    code = known[user_answer]
+                else:
+                    code = known[user_answer] = vocabulary.get(
+                        normalize_answer(user_answer)
+                    )
+                if code is not None:
+                    rows.append(row)
+                    cols.append(column)
+                    codes.append(code)
+
+    present = np.zeros((n_rows, n_tasks), dtype=bool)
+    present[present_rows, present_tasks] = True
+    code_matrix = np.zeros((n_rows, matrix.width), dtype=np.int32)
+    code_matrix[rows, cols] = codes
+
+    # --- Правильность, баллы и итоги ---
+    correct = matrix.accept[np.arange(matrix.width), code_matrix]
+    if n_tasks and matrix.width:
+        scores = np.add.reduceat(correct, matrix.task_bounds, axis=1, dtype=np.int64)
+    else:
+        scores = np.zeros((n_rows, n_tasks), dtype=np.int64)
+    ratios = scores / matrix.task_sizes
+
+    # Суммирование в порядке тасков — как в скалярной проверке
+    totals = np.zeros(n_rows, dtype=np.float64)
+    for task in range(n_tasks):
+        totals += np.where(present[:, task], ratios[:, task], 0.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        totals = totals / present.sum(axis=1) * 100
+
+    return LevelScores(
+        level=matrix.level,
+        positions=positions,
+        tasks=matrix.tasks,
+        correct=correct,
+        scores=scores,
+        present=present,
+        totals=totals,
+        in_key_order=in_key_order,
+    )
+
+
+def _assemble(
+    matrix: LevelMatrix,
+    level_scores: LevelScores,
+    row: int,
+    answers: Mapping[str, Mapping[str, str]],
+    index: AnswerKeyIndex,
+) -> Dict[str, Any]:
+    """Собирает результат одной отправки в формате grade."""
+    if not level_scores.in_key_order[row]:
+        # Порядок суммирования влияет на округление: точная скалярная проверка
+        return grade(matrix.level, answers, index)
+
+    row_correct = level_scores.correct[row].tolist()
+    row_scores = level_scores.scores[row].tolist()
+    sizes = matrix.task_sizes.tolist()
+
+    result: Dict[str, Any] = {}
+    closed = False
+    for task, task_answers in answers.items():
+        position = matrix.task_position.get(task)
+        if position is None:
+            result[task] = "open"
+            continue
+        closed = True
+        columns = matrix.columns[task]
+        task_result: Dict[str, str] = {}
+        for q_num in task_answers:
+            column = columns.get(q_num)
+            task_result[q_num] = (
+                "correct" if column is not None and row_correct[column] else "incorrect"
+            )
+        task_result["score"] = f"{row_scores[position]}/{sizes[position]}"
+        result[task] = task_result
+
+    result["total"] = f"{float(level_scores.totals[row]):.1f}%" if closed else "0%"
+    return result
+
+
+# --- Бенчмарк ---
+
+
+def _random_submissions(count: int, seed: int = 0) -> List[SubmissionType]:
+    """Генерирует отправки: правильные, неправильные и пустые ответы."""
+    rng = random.Random(seed)
+    index = get_answer_index()
+    levels = list(index.levels)
+    submissions: List[SubmissionType] = []
+    for _ in range(count):
+        level = rng.choice(levels)
+        answers: Dict[str, Dict[str, str]] = {}
+        for task, questions in index.level(level).items():
+            answers[task] = {}
+            for q_num, accepted in questions.items():
+                if accepted and rng.random() < 0.6:
+                    answers[task][q_num] = rng.choice(sorted(accepted)).upper()
+                else:
+                    answers[task][q_num] = rng.choice(["", "x", "1", "b"])
+        answers["task_open"] = {"1": "free text"}
+        submissions.append((level, answers))
+    return submissions
+
+
+def benchmark(count: int, repeat: int = 3) -> Dict[str, float]:
+    """
+    Сравнивает пакетную и скалярную проверку на случайных отправках.
+
+    Args:
+        count: Количество отправок.
+        repeat: Количество повторов (берётся лучшее время).
+
+    Returns:
+        dict: Время (сек) скалярной проверки, grade_batch и score_batch
+            и ускорение относительно скалярной.
+
+    Raises:
+        AssertionError: Если результаты проверок различаются.
+    """
+    submissions = _random_submissions(count)
+    index = get_answer_index()
+
+    def best(func: Any) -> Tuple[float, Any]:
+        timings, result = [], None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = func()
+            timings.append(time.perf_counter() - started)
+        return min(timings), result
+
+    scalar_time, scalar = best(
+        lambda: [grade(level, answers, index) for level, answers in submissions]
+    )
+    batch_time, batch = best(lambda: grade_batch(submissions, index))
+    assert scalar == batch, "Результаты пакетной и скалярной проверки различаются"
+    scores_time, _scores = best(lambda: score_batch(submissions, index))
+
+    return {
+        "submissions": count,
+        "scalar_seconds": round(scalar_time, 4),
+        "grade_batch_seconds": round(batch_time, 4),
+        "score_batch_seconds": round(scores_time, 4),
+        "grade_batch_speedup": round(scalar_time / batch_time, 2),
+        "score_batch_speedup": round(scalar_time / scores_time, 2),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Бенчмарк пакетной проверки тестов (NumPy) против скалярной"
+    )
+    parser.add_argument("--submissions", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    print(benchmark(args.submissions, args.repeat))
@@ -0,0 +1,607 @@
+"""
+Сборка страниц тестов: один минифицированный бандл на уровень.
+
+Страница уровня подключает движок test_engine.js, данные и рендеры заданий
+отдельными ES-модулями и общий style_v_3.css — около десяти запросов
+до первой отрисовки в Telegram WebView. Сборка для каждой страницы
+html_pages/test_pages/levels/*/*_page.html создаёт в html_pages/build/:
+    - страницу, в которую встроен критический CSS (правила, селекторы
+      которых встречаются в разметке страницы); остальные правила
+      загружаются отдельным файлом без блокировки отрисовки;
+    - бандл всех модулей страницы <page>.<hash>.js;
+    - manifest.json: исходная страница -> собранная страница и её размеры.
+
+Манифест читает utilities.static_assets: бот (telegram.keyboards) и сервер
+открывают собранную страницу вместо исходной, а при отсутствии сборки —
+исходную. Относительные адреса, вычисляемые в скриптах (аудио заданий),
+разрешаются от каталога исходной страницы через <base href>.
+
+Поддерживаемый синтаксис модулей — тот, что используется в страницах:
+именованные импорты и export function / const / let / class.
+
+Бюджет проверяется по каждой странице: число запросов к своим файлам
+для первой отрисовки (страница, бандл, стили, изображения) и суммарный
+размер страницы, бандла и стилей после gzip.
+
+Содержит:
+    - minify_js / minify_css / minify_html: консервативная минификация.
+    - bundle_modules: объединение ES-модулей в один скрипт.
+    - split_critical_css: критический и отложенный CSS страницы.
+    - build: сборка всех страниц и запись манифеста.
+
+Использование:
+    python -m utilities.build_assets [--max-requests 4] [--max-kb 24]
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import posixpath
+import re
+import shutil
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, Set, Tuple
+
+from utilities.static_assets import BUILD_DIR, BUILD_MANIFEST, asset_manifest
+
+PAGES_GLOB = "test_pages/levels/*/*_page.html"
+
+MAX_REQUESTS = 4
+MAX_KB = 24
+
+
+class BuildError(Exception):
+    """Исходные файлы не удаётся собрать."""
+
+
+# ---------------------------------------------------------------------------
+#  Минификация
+# ---------------------------------------------------------------------------
+
+_WORD = re.compile(r"[\w$]")
+_IDENT = re.compile(r"[\w$]+")
+# После этих слов "/" начинает регулярное выражение, а не деление
+_REGEX_KEYWORDS = {"return", "typeof", "case", "do", "else", "in", "of", "void"}
+
+
+def _read_string(src: str, i: int) -> int:
+    """Возвращает позицию после строки в кавычках, начинающейся в i."""
+    quote = src[i]
+    i += 1
+    while src[i] != quote:
+        if src[i] == "\\":
+            i += 1
+        elif src[i] == "\n":
+            raise BuildError("Незакрытая строка в JS")
+        i += 1
+    return i + 1
+
+
+def _read_regex(src: str, i: int) -> int:
+    """Возвращает позицию после литерала регулярного выражения."""
+    i += 1
+    in_class = False
+    while in_class or src[i] != "/":
+        if src[i] == "\\":
+            i += 1
+        elif src[i] == "[":
+            in_class = True
+        elif src[i] == "]":
+            in_class = False
+        elif src[i] == "\n":
+            raise BuildError("Незакрытое регулярное выражение в JS")
+        i += 1
+    i += 1
+    while i < len(src) and _WORD.match(src[i]):  # флаги
+        i += 1
+    return i
+
+
+def minify_js(src: str) -> str:
+    """
+    Удаляет из JS комментарии, отступы и пустые строки.
+
+    Переводы строк сохраняются (кроме следующих за ; { и ,), поэтому
+    автоматическая вставка точек с запятой работает как в исходнике.
+    Строки, шаблонные строки и регулярные выражения не изменяются.
+    """
+    out: List[str] = []
+    # Глубина фигурных скобок внутри каждой открытой подстановки ${...}
+    templates: List[int] = []
+    pending_space = pending_newline = False
+    i = 0
+
+    def last() -> str:
+        return out[-1][-1] if out else ""
+
+    def last_word() -> str:
+        match = re.search(r"[\w$]+$", out[-1]) if out else None
+        return match.group(0) if match else ""
+
+    def emit(token: str) -> None:
+        nonlocal pending_space, pending_newline
+        prev = last()
+        if pending_newline and prev and prev not in ";{,":
+            out.append("\n")
+        elif (
+            pending_space
+            and prev
+            and (
+                (_WORD.match(prev) and _WORD.match(token[0]))
+                or (prev in "+-/" and token[0] in "+-/")
+            )
+        ):
+            out.append(" ")
+        pending_space = pending_newline = False
+        out.append(token)
+
+    def read_template(i: int) -> int:
+        """Читает шаблонную строку от i до конца или до ${."""
+        start = i
+        i += 1
+        while True:
+            if src[i] == "\\":
+                i += 2
+                continue
+            if src[i] == "`":
+                emit(src[start : i + 1])
+                return i + 1
+            if src.startswith("${", i):
+                emit(src[start : i + 2])
+                templates.append(0)
+                return i + 2
+            i += 1
+
+    while i < len(src):
+        ch = src[i]
+
+        if ch in " \t\r":
+            pending_space = True
+            i += 1
+        elif ch == "\n":
+            pending_newline = True
+            i += 1
+        elif src.startswith("//", i):
+            end = src.find("\n", i)
+            i = end if end >= 0 else len(src)
+        elif src.startswith("/*", i):
+            end = src.find("*/", i + 2)
+            if end < 0:
+                raise BuildError("Незакрытый комментарий в JS")
+            pending_space = True
+            i = end + 2
+        elif ch in "'\"":
+            end = _read_string(src, i)
+            emit(src[i:end])
+            i = end
+        elif ch == "`":
+            i = read_template(i)
+        elif ch == "}" and templates and templates[-1] == 0:
+            # Конец подстановки: продолжение шаблонной строки
+            templates.pop()
+            pending_space = pending_newline = False
+            start = i
+            i += 1
+            while src[i] != "`" and not src.startswith("${", i):
+                i += 2 if src[i] == "\\" else 1
+            if src[i] == "`":
+                out.append(src[start : i + 1])
+                i += 1
+            else:
+                out.append(src[start : i + 2])
+                templates.append(0)
+                i += 2
+        elif ch == "/" and (
+            not (_WORD.match(last()) or last() in ")]")
+            or last_word() in _REGEX_KEYWORDS
+        ):
+            end = _read_regex(src, i)
+            emit(src[i:end])
+            i = end
+        else:
+            if templates and ch == "{":
+                templates[-1] += 1
+            elif templates and ch == "}":
+                templates[-1] -= 1
+
+            match = _IDENT.match(src, i)
+            token = match.group(0) if match else ch
+            emit(token)
+            i += len(token)
+
+    return "".join(out).strip() + "\n"
+
+
+def minify_css(src: str) -> str:
+    """Удаляет из CSS комментарии и незначащие пробелы."""
+    src = re.sub(r"/\*.*?\*/", "", src, flags=re.DOTALL)
+    src = re.sub(r"\s+", " ", src)
+    src = re.sub(r"\s*([{};,])\s*", r"\1", src)
+    src = re.sub(r":\s+", ":", src)
+    return src.replace(";}", "}").strip()
+
+
+def minify_html(src: str) -> str:
+    """Удаляет из HTML комментарии, отступы и пустые строки."""
+    src = re.sub(r"<!--(?!\[).*?-->", "", src, flags=re.DOTALL)
+    lines = (line.strip() for line in src.splitlines())
+    return "\n".join(line for line in lines if line) + "\n"
+
+
+# ---------------------------------------------------------------------------
+#  Бандл ES-модулей
+# ---------------------------------------------------------------------------
+
+_IMPORT = re.compile(
+    r"^[ \t]*import\s*(?:\{(?P<names>[^}]*)\}\s*from\s*)?"
+    r"(?P<q>[\"'])(?P<path>[^\"']+)(?P=q)\s*;?[ \t]*$",
+    re.MULTILINE,
+)
+_EXPORT = re.compile(
+    r"^export\s+(?:async\s+)?(?:function\*?|const|let|var|class)\s+(?P<name>[\w$]+)",
+    re.MULTILINE,
+)
+
+
+def _module_graph(root: Path, entries: Iterable[str]) -> List[str]:
+    """Возвращает модули в порядке выполнения (зависимости раньше)."""
+    order: List[str] = []
+    visiting: Set[str] = set()
+
+    def visit(path: str) -> None:
+        if path in order:
+            return
+        if path in visiting:
+            raise BuildError(f"Циклический импорт: {path}")
+        visiting.add(path)
+
+        source = (root / path).read_text(encoding="utf-8")
+        for match in _IMPORT.finditer(source):
+            visit(
+                posixpath.normpath(
+                    posixpath.join(posixpath.dirname(path), match["path"])
+                )
+            )
+
+        visiting.discard(path)
+        order.append(path)
+
+    for entry in entries:
+        visit(entry)
+    return order
+
+
+def bundle_modules(root: Path, entries: Iterable[str]) -> str:
+    """
+    Объединяет ES-модули страницы в один скрипт.
+
+    Каждый модуль выполняется в собственной асинхронной функции
+    (одноимённые функции разных модулей не конфликтуют, top-level await
+    в модулях данных работает) и возвращает объект своих экспортов;
+    импорты заменяются деструктуризацией. Модули выполняются один раз,
+    в том же порядке, что и в браузере.
+
+    Args:
+        root: Корень статических файлов.
+        entries: Пути модулей страницы относительно root в порядке подключения.
+
+    Returns:
+        str: Текст бандла (без минификации).
+
+    Raises:
+        BuildError: Циклические импорты или неподдерживаемый синтаксис.
+    """
+    order = _module_graph(root, entries)
+    index = {path: n for n, path in enumerate(order)}
+    parts = []
+
+    for path in order:
+        source = (root / path).read_text(encoding="utf-8")
+        base = posixpath.dirname(path)
+
+        def replace_import(match: re.Match, base: str = base) -> str:
+            target = posixpath.normpath(posixpath.join(base, match["path"]))
+            if match["names"] is None:
+                return ""
+            names = [
+                re.sub(r"\s+as\s+", ": ", name.strip())
+                for name in match["names"].split(",")
+                if name.strip()
+            ]
+            return f"const {{ {', '.join(names)} }} = __m{index[target]};"
+
+        body = _IMPORT.sub(replace_import, source)
+        exports = _EXPORT.findall(body)
+        body = re.sub(r"^export\s+", "", body, flags=re.MULTILINE)
+        if re.search(r"^\s*(?:import|export)\b", body, re.MULTILINE):
+            raise BuildError(f"Неподдерживаемый import/export в {path}")
+
+        parts.append(
+            f"// {path}\nconst __m{index[path]} = await (async () => {{\n{body}\n"
+            f"return {{ {', '.join(exports)} }};\n}})();\n"
+        )
+
+    return "".join(parts)
+
+
+# ---------------------------------------------------------------------------
+#  Критический CSS
+# ---------------------------------------------------------------------------
+
+
+def _css_rules(css: str) -> List[Tuple[str, str]]:
+    """Разбивает CSS на правила верхнего уровня: (прелюдия, тело)."""
+    rules = []
+    depth = 0
+    start = 0
+    prelude = ""
+    for i, ch in enumerate(css):
+        if ch == "{":
+            if depth == 0:
+                prelude, start = css[start:i].strip(), i + 1
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                rules.append((prelude, css[start:i]))
+                start = i + 1
+    return rules
+
+
+def _page_tokens(html: str) -> Set[str]:
+    """Теги, #id и .классы, встречающиеся в разметке страницы."""
+    tokens = {"html", "body", "*", ":root"}
+    tokens.update(tag.lower() for tag in re.findall(r"<([a-zA-Z][\w-]*)", html))
+    tokens.update("#" + i for i in re.findall(r'\bid="([^"]+)"', html))
+    for classes in re.findall(r'\bclass="([^"]+)"', html):
+        tokens.update("." + c for c in classes.split())
+    return tokens
+
+
+def _selector_matches(selector: str, tokens: Set[str]) -> bool:
+    """Все теги, #id и .классы селектора есть на странице."""
+    selector = re.sub(r"::?[\w-]+(\([^)]*\))?|\[[^\]]*\]", " ", selector)
+    required = re.findall(r"[#.]?[\w-]+|\*", selector)
+    return all(token.lower() in tokens or token in tokens for token in required)
+
+
+def split_critical_css(css: str, html: str) -> Tuple[str, str]:
+    """
+    Делит минифицированный CSS на критический и отложенный.
+
+    Критическими считаются правила, хотя бы один селектор которых
+    применим к разметке страницы до выполнения скриптов,
+    а также @keyframes, @font-face и прочие at-правила без селекторов.
+
+    Returns:
+        tuple: (критический CSS, отложенный CSS).
+    """
+    tokens = _page_tokens(html)
+    critical, deferred = [], []
+
+    for prelude, body in _css_rules(css):
+        if prelude.startswith("@media") or prelude.startswith("@supports"):
+            inner_critical, inner_deferred = split_critical_css(body, html)
+            if inner_critical:
+                critical.append(f"{prelude}{{{inner_critical}}}")
+            if inner_deferred:
+                deferred.append(f"{prelude}{{{inner_deferred}}}")
+        elif prelude.startswith("@") or any(
+            _selector_matches(s, tokens) for s in prelude.split(",") if s.strip()
+        ):
+            critical.append(f"{prelude}{{{body}}}")
+        else:
+            deferred.append(f"{prelude}{{{body}}}")
+
+    return "".join(critical), "".join(deferred)
+
+
+# ---------------------------------------------------------------------------
+#  Сборка страниц
+# ---------------------------------------------------------------------------
+
+_LOCAL = re.compile(r"^(?![a-z][a-z0-9+.-]*:|//|/|#)", re.IGNORECASE)
+_MODULE_SCRIPT = re.compile(
+    r'[ \t]*<script\s+type="module"\s+src="(?P<src>[^"]+)"\s*>\s*</script>\n?'
+)
+_STYLESHEET = re.compile(
+    r'[ \t]*<link\s+rel="stylesheet"\s+href="(?P<href>[^"]+)"\s*/?>\n?'
+)
+_REF = re.compile(r'(?P<attr>\b(?:src|href)=")(?P<url>[^"]+)"')
+
+
+def _digest(data: bytes) -> str:
+    """Короткий хэш содержимого для имени файла."""
+    return hashlib.sha256(data).hexdigest()[:10]
+
+
+def _write_hashed(out_dir: Path, stem: str, suffix: str, text: str) -> str:
+    """Записывает файл <stem>.<hash><suffix> и возвращает его имя."""
+    data = text.encode("utf-8")
+    name = f"{stem}.{_digest(data)}{suffix}"
+    (out_dir / name).write_bytes(data)
+    return name
+
+
+def build_page(root: Path, page: str) -> Dict[str, object]:
+    """
+    Собирает одну страницу уровня.
+
+    Args:
+        root: Корень статических файлов (html_pages).
+        page: Путь страницы относительно root.
+
+    Returns:
+        dict: Запись манифеста собранной страницы.
+    """
+    mount = asset_manifest.mount_path
+    page_dir = posixpath.dirname(page)
+    html = (root / page).read_text(encoding="utf-8")
+
+    def local(url: str) -> str:
+        return posixpath.normpath(posixpath.join(page_dir, url))
+
+    out_dir = root / BUILD_DIR / page_dir
+    out_dir.mkdir(parents=True, exist_ok=True)
+    stem = posixpath.splitext(posixpath.basename(page))[0]
+
+    # Скрипты: все локальные модули -> один бандл вместо первого из них
+    modules = [
+        m["src"] for m in _MODULE_SCRIPT.finditer(html) if _LOCAL.match(m["src"])
+    ]
+    if not modules:
+        raise BuildError(f"На странице {page} нет модулей для сборки")
+    bundle = minify_js(bundle_modules(root, [local(src) for src in modules]))
+    bundle_name = _write_hashed(out_dir, stem, ".js", bundle)
+    bundle_url = f"{mount}/{BUILD_DIR}/{page_dir}/{bundle_name}"
+
+    first = True
+
+    def replace_script(match: re.Match) -> str:
+        nonlocal first
+        if not _LOCAL.match(match["src"]):
+            return match[0]
+        if first:
+            first = False
+            return f'<script type="module" src="{bundle_url}"></script>\n'
+        return ""
+
+    html = _MODULE_SCRIPT.sub(replace_script, html)
+
+    # Стили: критическая часть встраивается, остальное грузится отложенно
+    css_sources = [
+        m["href"] for m in _STYLESHEET.finditer(html) if _LOCAL.match(m["href"])
+    ]
+    css = minify_css(
+        "".join(
+            (root / local(href)).read_text(encoding="utf-8") for href in css_sources
+        )
+    )
+    critical, deferred = split_critical_css(css, html)
+    styles = f"<style>{critical}</style>\n"
+    if deferred:
+        css_name = _write_hashed(out_dir, stem, ".css", deferred)
+        css_url = f"{mount}/{BUILD_DIR}/{page_dir}/{css_name}"
+        styles += (
+            f'<link rel="stylesheet" href="{css_url}" media="print" '
+            f"onload=\"this.media='all'\" />\n"
+            f'<noscript><link rel="stylesheet" href="{css_url}" /></noscript>\n'
+        )
+
+    first = True
+
+    def replace_stylesheet(match: re.Match) -> str:
+        nonlocal first
+        if not _LOCAL.match(match["href"]):
+            return match[0]
+        if first:
+            first = False
+            return styles
+        return ""
+
+    html = _STYLESHEET.sub(replace_stylesheet, html)
+
+    # Остальные локальные ссылки — абсолютные (manifest добавит ?v=),
+    # адреса, вычисляемые скриптами, разрешаются от исходной страницы
+    html = _REF.sub(
+        lambda m: (
+            f'{m["attr"]}{mount}/{local(m["url"])}"' if _LOCAL.match(m["url"]) else m[0]
+        ),
+        html,
+    )
+    html = html.replace("<head>", f'<head>\n<base href="{mount}/{page_dir}/" />', 1)
+    html = minify_html(html)
+
+    built = f"{BUILD_DIR}/{page}"
+    (root / built).write_text(html, encoding="utf-8")
+
+    images = [
+        m["url"]
+        for m in re.finditer(r'<img[^>]*\bsrc="(?P<url>[^"]+)"', html)
+        if m["url"].startswith(mount + "/")
+    ]
+    payload = [html, bundle, deferred]
+    return {
+        "page": built,
+        "script": f"{BUILD_DIR}/{page_dir}/{bundle_name}",
+        "requests": 2 + bool(deferred) + len(images),
+        "bytes": sum(len(text.encode("utf-8")) for text in payload),
+        "gzip_bytes": sum(
+            len(gzip.compress(text.encode("utf-8"), mtime=0)) for text in payload
+        ),
+    }
+
+
+def build(root: Path) -> Dict[str, Dict[str, object]]:
+    """
+    Собирает все страницы уровней и записывает манифест сборки.
+
+    Предыдущая сборка удаляется целиком.
+
+    Returns:
+        dict: Исходная страница -> запись манифеста.
+    """
+    shutil.rmtree(root / BUILD_DIR, ignore_errors=True)
+    pages = {
+        page: build_page(root, page)
+        for page in sorted(
+            p.relative_to(root).as_posix() for p in root.glob(PAGES_GLOB)
+        )
+    }
+    (root / BUILD_MANIFEST).write_text(
+        json.dumps({"pages": pages}, ensure_ascii=False, indent=2), encoding="utf-8"
+    )
+    return pages
+
+
+def check_budget(
+    pages: Dict[str, Dict[str, object]], max_requests: int, max_kb: float
+) -> List[str]:
+    """Возвращает страницы, превысившие бюджет запросов или размера."""
+    problems = []
+    for page, entry in pages.items():
+        if entry["requests"] > max_requests:
+            problems.append(f"{page}: {entry['requests']} запросов > {max_requests}")
+        if entry["gzip_bytes"] > max_kb * 1024:
+            problems.append(
+                f"{page}: {entry['gzip_bytes'] / 1024:.1f} KB (gzip) > {max_kb} KB"
+            )
+    return problems
+
+
+def main() -> int:
+    """Собирает страницы, печатает размеры и проверяет бюджет."""
+    parser = argparse.ArgumentParser(description="Сборка страниц тестов")
+    parser.add_argument(
+        "--max-requests",
+        type=int,
+        default=MAX_REQUESTS,
+        help="Запросов к своим файлам для первой отрисовки",
+    )
+    parser.add_argument(
+        "--max-kb", type=float, default=MAX_KB, help="Страница, бандл и стили, KB gzip"
+    )
+    args = parser.parse_args()
+
+    try:
+        pages = build(asset_manifest.root)
+    except BuildError as e:
+        print(f"❌ Ошибка сборки: {e}")
+        return 1
+
+    for page, entry in pages.items():
+        print(
+            f"{page:<70} {entry['requests']} запр. {entry['bytes'] / 1024:>6.1f} KB"
+            f" {entry['gzip_bytes'] / 1024:>6.1f} KB gzip"
+        )
+
+    problems = check_budget(pages, args.max_requests, args.max_kb)
+    for problem in problems:
+        print(f"❌ Бюджет превышен: {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,258 +2,34 @@
 Функции для проверки тестов пользователя по ключу правильных ответов.
 
 Содержит:
-    - глобальный словарь ключей ответов;
+    - глобальный словарь ключей ответов (из определений тестов);
+    - скомпилированный индекс ключей (AnswerKeyIndex) с заранее
+      нормализованными наборами допустимых ответов и функции его
+      атомарной замены (get_answer_index / set_answer_index);
     - нормализацию ответов;
     - проверку отдельного ответа;
-    - асинхронную проверку всех результатов теста.
+    - проверку одной отправки (grade) и пакетную проверку (check_many);
+    - асинхронную проверку всех результатов теста;
+    - преобразование результата проверки в поля TestResult
+      (summarize_check_result) и восстановление ответов из них
+      (restore_answers) для перепроверки.
 """
 
-from typing import Any, Dict, Iterable, Optional, Union
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Union
 
 from pydantic import BaseModel
 
+from logging_config import logger
+from utilities.test_definitions import level_answer_keys
+
 # Тип ключей: уровень -> таск -> номер вопроса -> правильный ответ
 AnswerKeyType = Dict[str, Dict[str, Union[str, list[str]]]]
 
 # ==== Глобальные ключи правильных ответов ====
-global_answer_key: Dict[str, AnswerKeyType] = {
-    "Starter": {
-        "task1": {
-            "1": "C",
-            "2": "C",
-            "3": "B",
-            "4": "C",
-            "5": "C",
-            "6": "B",
-            "7": "A",
-            "8": "B",
-            "9": "C",
-            "10": "D",
-            "11": "B",
-            "12": "C",
-            "13": "C",
-            "14": "B",
-            "15": "B",
-            "16": "A",
-            "17": "C",
-            "18": "C",
-            "19": "A",
-            "20": "B",
-        },
-        "task2": {
-            "1": "C",
-            "2": "C",
-            "3": "A",
-            "4": "A",
-            "5": "A",
-            "6": "A",
-            "7": "B",
-            "8": "A",
-            "9": "A",
-            "10": "C",
-            "11": "A",
-            "12": "B",
-            "13": "A",
-            "14": "A",
-            "15": "B",
-            "16": "A",
-            "17": "B",
-            "18": "A",
-            "19": "A",
-            "20": "A",
-        },
-    },
-    "Elementary": {
-        "task1": {
-            "1": "B",
-            "2": "A",
-            "3": "B",
-            "4": "C",
-            "5": "B",
-            "6": "A",
-            "7": "B",
-            "8": "C",
-            "9": "A",
-            "10": "A",
-            "11": "B",
-            "12": "A",
-            "13": "B",
-            "14": "B",
-            "15": "A",
-        },
-        "task2": {
-            "1": "B",
-            "2": "False",
-            "3": ["Monday", "Mon"],
-            "4": "B",
-            "5": "C",
-            "6": "True",
-            "7": ["2", "two"],
-            "8": "C",
-            "9": "C",
-            "10": "False",
-        },
-        "task3": {
-            "1": "B",
-            "2": "B",
-            "3": "B",
-            "4": "B",
-            "5": "B",
-            "6": "B",
-            "7": "B",
-            "8": "A",
-            "9": "C",
-            "10": "C",
-        },
-    },
-    "Pre-Intermediate": {
-        "task1": {
-            "1": "B",
-            "2": "B",
-            "3": "A",
-            "4": "B",
-            "5": "B",
-            "6": "C",
-            "7": "C",
-            "8": "A",
-            "9": "B",
-            "10": "B",
-            "11": "B",
-            "12": "C",
-            "13": "B",
-            "14": "C",
-            "15": "B",
-        },
-        "task2": {
-            "1": "C",
-            "2": "B",
-            "3": "B",
-            "4": "C",
-            "5": ["four days", "4 days"],
-            "6": "pasta",
-            "7": ["90 minutes", "ninety minutes"],
-            "8": "south",
-            "9": ["3", "three"],
-            "10": ["2", "two"],
-            "11": ["1", "one"],
-            "12": "C",
-        },
-        "task3": {
-            "1": "B",
-            "2": "C",
-            "3": "D",
-            "4": "B",
-            "5": "A",
-            "6": "B",
-            "7": "B",
-            "8": "B",
-            "9": "A",
-            "10": "C",
-            "11": "C",
-            "12": "A",
-            "13": "A",
-            "14": "C",
-            "15": "B",
-        },
-    },
-    "Intermediate": {
-        "task1": {
-            "1": "C",
-            "2": "B",
-            "3": "A",
-            "4": "C",
-            "5": "B",
-            "6": "B",
-            "7": "A",
-            "8": "B",
-            "9": "B",
-            "10": "A",
-            "11": "A",
-            "12": "C",
-            "13": "B",
-            "14": "B",
-            "15": "B",
-        },
-        "task2": {
-            "1": "C",
-            "2": "B",
-            "3": "D",
-            "4": "C",
-            "5": "C",
-            "6": "school",
-            "7": "rebuild",
-            "8": "families",
-            "9": "flight",
-            "10": "next year",
-            "11": "1",
-            "12": "2",
-            "13": "4",
-            "14": "3",
-            "15": "5",
-        },
-        "task3": {
-            "1": "C",
-            "2": "C",
-            "3": "C",
-            "4": "B",
-            "5": "D",
-            "6": "C",
-            "7": "C",
-            "8": "C",
-            "9": "D",
-            "10": "C",
-            "11": "B",
-            "12": "C",
-            "13": "C",
-            "14": "D",
-            "15": "C",
-        },
-    },
-    "Upper-Intermediate": {
-        "task1": {
-            "1": "A",
-            "2": "A",
-            "3": "A",
-            "4": "C",
-            "5": "A",
-            "6": "A",
-            "7": "B",
-            "8": "B",
-            "9": "B",
-            "10": "A",
-            "11": "A",
-            "12": "C",
-            "13": "C",
-            "14": "A",
-            "15": "C",
-        },
-        "task2": {
-            "1": "C",
-            "2": "B",
-            "3": "D",
-            "4": "C",
-            "5": "B",
-            "6": "C",
-            "7": "C",
-            "8": "C",
-            "9": "C",
-            "10": "B",
-        },
-        "task3": {
-            "1": "B",
-            "2": "C",
-            "3": "D",
-            "4": "A",
-            "5": "B",
-            "6": "D",
-            "7": "A",
-            "8": "C",
-            "9": "B",
-            "10": "D",
-            "11": "B",
-        },
-    },
-}
+# Встроенные ключи берутся из определений тестов (utilities/levels/*.json),
+# где они хранятся рядом с вопросами заданий.
+global_answer_key: Dict[str, AnswerKeyType] = level_answer_keys()
 
 
 class FrontendTestPayload(BaseModel):
@@ -273,6 +49,23 @@ class FrontendTestPayload(BaseModel):
     answers: Dict[str, Dict[str, str]]
 
 
+# Словесные числа → цифры (используется при нормализации)
+NUMBER_WORDS: Mapping[str, str] = MappingProxyType(
+    {
+        "one": "1",
+        "two": "2",
+        "three": "3",
+        "four": "4",
+        "five": "5",
+        "six": "6",
+        "seven": "7",
+        "eight": "8",
+        "nine": "9",
+        "ten": "10",
+    }
+)
+
+
 def normalize_answer(ans: str) -> str:
     """
     Приводит ответ пользователя к стандартной форме для сравнения.
@@ -291,19 +84,111 @@ def normalize_answer(ans: str) -> str:
     if not ans:
         return ""
     ans = ans.strip().lower()
-    mapping = {
-        "one": "1",
-        "two": "2",
-        "three": "3",
-        "four": "4",
-        "five": "5",
-        "six": "6",
-        "seven": "7",
-        "eight": "8",
-        "nine": "9",
-        "ten": "10",
-    }
-    return mapping.get(ans, ans)
+    return NUMBER_WORDS.get(ans, ans)
+
+
+# Тип индекса: таск -> номер вопроса -> нормализованные допустимые ответы
+TaskIndexType = Mapping[str, Mapping[str, frozenset]]
+
+
+class AnswerKeyIndex:
+    """
+    Неизменяемый индекс ключей ответов.
+
+    Допустимые ответы нормализуются один раз при компиляции, поэтому
+    проверка ответа — это одна нормализация и поиск во frozenset.
+
+    Attributes:
+        levels: Уровень -> таск -> номер вопроса -> frozenset ответов.
+        version: Версия ключей, из которых собран индекс.
+    """
+
+    __slots__ = ("levels", "version")
+
+    def __init__(self, levels: Mapping[str, TaskIndexType], version: int = 0) -> None:
+        self.levels = levels
+        self.version = version
+
+    def level(self, level: str) -> TaskIndexType:
+        """Возвращает индекс уровня (пустой, если уровень неизвестен)."""
+        return self.levels.get(level, _EMPTY_LEVEL)
+
+    def to_dict(self) -> Dict[str, AnswerKeyType]:
+        """Возвращает ключи в формате global_answer_key (нормализованные)."""
+        return {
+            level: {
+                task: {q_num: sorted(accepted) for q_num, accepted in questions.items()}
+                for task, questions in tasks.items()
+            }
+            for level, tasks in self.levels.items()
+        }
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # MappingProxyType не сериализуется: индекс пересобирается
+        # из словаря (нужно для передачи в пул процессов)
+        return compile_answer_key, (self.to_dict(), self.version)
+
+
+_EMPTY_LEVEL: TaskIndexType = MappingProxyType({})
+
+
+def _accepted_answers(correct: Optional[Union[str, Iterable[str]]]) -> frozenset:
+    """Нормализует правильный ответ (или варианты ответа) во frozenset."""
+    if not correct:
+        return frozenset()
+    if isinstance(correct, str):
+        return frozenset((normalize_answer(correct),))
+    return frozenset(normalize_answer(a) for a in correct)
+
+
+def compile_answer_key(
+    answer_key: Mapping[str, AnswerKeyType], version: int = 0
+) -> AnswerKeyIndex:
+    """
+    Компилирует словарь ключей в неизменяемый индекс AnswerKeyIndex.
+
+    Аргументы:
+        answer_key: Ключи вида уровень -> таск -> вопрос -> ответ(ы).
+        version: Версия ключей.
+
+    Returns:
+        AnswerKeyIndex: Индекс с нормализованными наборами ответов.
+    """
+    levels = {}
+    for level, tasks in answer_key.items():
+        levels[level] = MappingProxyType(
+            {
+                task: MappingProxyType(
+                    {
+                        q_num: _accepted_answers(correct)
+                        for q_num, correct in questions.items()
+                    }
+                )
+                for task, questions in tasks.items()
+            }
+        )
+    return AnswerKeyIndex(MappingProxyType(levels), version)
+
+
+# Действующий индекс ключей. До загрузки ключей из БД (utilities.answer_keys)
+# используются встроенные ключи (версия 0).
+answer_index: AnswerKeyIndex = compile_answer_key(global_answer_key)
+
+
+def get_answer_index() -> AnswerKeyIndex:
+    """Возвращает действующий индекс ключей ответов."""
+    return answer_index
+
+
+def set_answer_index(index: AnswerKeyIndex) -> None:
+    """
+    Атомарно заменяет действующий индекс ключей ответов.
+
+    Проверки, уже получившие предыдущий индекс, завершаются по нему;
+    новые проверки используют новый.
+    """
+    global answer_index
+    answer_index = index
 
 
 def is_correct(user_answer: str, correct_answer: Optional[str | Iterable[str]]) -> bool:
@@ -314,6 +199,7 @@ def is_correct(user_answer: str, correct_answer: Optional[str | Iterable[str]])
         user_answer (str): Ответ пользователя.
         correct_answer (str | Iterable[str] | None):
             Правильный ответ, набор допустимых вариантов
+            (в том числе уже нормализованный frozenset из AnswerKeyIndex)
             или None, если ключ отсутствует.
 
     Returns:
@@ -324,56 +210,56 @@ def is_correct(user_answer: str, correct_answer: Optional[str | Iterable[str]])
 
     user_norm = normalize_answer(user_answer)
 
+    if isinstance(correct_answer, frozenset):
+        return user_norm in correct_answer
+
     if isinstance(correct_answer, str):
         return user_norm == normalize_answer(correct_answer)
 
     return user_norm in {normalize_answer(a) for a in correct_answer}
 
 
-async def check_test_results(
-    frontend_response: FrontendTestPayload,
+def grade(
+    level: str,
+    answers: Mapping[str, Mapping[str, str]],
+    index: Optional[AnswerKeyIndex] = None,
 ) -> dict[str, Any]:
     """
-    Асинхронно проверяет ответы пользователя по ключу правильных ответов.
+    Синхронно проверяет ответы одной отправки по индексу ключей.
 
     Аргументы:
-        frontend_response (FrontendTestPayload): Валидированные данные от frontend.
-            Пример:
-                {
-                    "level": "Starter",
-                    "answers": {
-                        "task1": {"1": "A", "2": "B", ...},
-                        "task2": {...},
-                        ...
-                    }
-                }
+        level (str): Уровень теста.
+        answers (Mapping): Ответы пользователя: таск -> вопрос -> ответ.
+        index (AnswerKeyIndex | None): Индекс ключей (по умолчанию действующий).
 
     Returns:
         dict: Результаты проверки с пометками "correct"/"incorrect" и общим процентом.
     """
+    level_key = (index or get_answer_index()).level(level)
     result: dict[str, Any] = {}
-    level_key: AnswerKeyType = global_answer_key.get(frontend_response.level, {})
     total_scores = []
 
-    for task, answers in frontend_response.answers.items():
-        if task not in level_key:
+    for task, task_answers in answers.items():
+        accepted = level_key.get(task)
+        if accepted is None:
             result[task] = "open"
             continue
 
-        correct_answers = level_key[task]
         task_result: dict[str, str] = {}
         score = 0
 
-        for q_num, user_answer in answers.items():
-            if user_answer and is_correct(user_answer, correct_answers.get(q_num)):
+        for q_num, user_answer in task_answers.items():
+            if user_answer and normalize_answer(user_answer) in accepted.get(
+                q_num, frozenset()
+            ):
                 task_result[q_num] = "correct"
                 score += 1
             else:
                 task_result[q_num] = "incorrect"
 
-        task_result["score"] = f"{score}/{len(correct_answers)}"
+        task_result["score"] = f"{score}/{len(accepted)}"
         result[task] = task_result
-        total_scores.append(score / len(correct_answers))
+        total_scores.append(score / len(accepted))
 
     # Итоговый процент (среднее по всем закрытым таскам)
     result["total"] = (
@@ -381,3 +267,134 @@ async def check_test_results(
     )
 
     return result
+
+
+def check_many(
+    payloads: Iterable[FrontendTestPayload],
+    index: Optional[AnswerKeyIndex] = None,
+) -> List[dict[str, Any]]:
+    """
+    Пакетно проверяет несколько отправок (например, для перепроверки).
+
+    Все отправки проверяются по одному и тому же индексу, даже если
+    во время проверки глобальный индекс будет заменён.
+
+    Аргументы:
+        payloads: Отправки для проверки.
+        index (AnswerKeyIndex | None): Индекс ключей (по умолчанию действующий).
+
+    Returns:
+        list[dict]: Результаты в том же порядке, что и payloads.
+    """
+    index = index or get_answer_index()
+    return [grade(p.level, p.answers, index) for p in payloads]
+
+
+async def check_test_results(
+    frontend_response: FrontendTestPayload,
+    index: Optional[AnswerKeyIndex] = None,
+) -> dict[str, Any]:
+    """
+    Асинхронно проверяет ответы пользователя по ключу правильных ответов.
+
+    Аргументы:
+        frontend_response (FrontendTestPayload): Валидированные данные от frontend.
+            Пример:
+                {
+                    "level": "Starter",
+                    "answers": {
+                        "task1": {"1": "A", "2": "B", ...},
+                        "task2": {...},
+                        ...
+                    }
+                }
+        index (AnswerKeyIndex | None): Индекс ключей (по умолчанию действующий).
+
+    Returns:
+        dict: Результаты проверки с пометками "correct"/"incorrect" и общим процентом.
+    """
+    return grade(frontend_response.level, frontend_response.answers, index)
+
+
+def summarize_check_result(
+    answers: Mapping[str, Mapping[str, str]], check_result: Mapping[str, Any]
+) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+    """
+    Формирует поля closed_answers, open_answers и score для TestResult.
+
+    Аргументы:
+        answers (Mapping): Ответы пользователя: таск -> вопрос -> ответ.
+        check_result (Mapping): Результат grade / check_test_results.
+
+    Returns:
+        tuple: (closed_answers, open_answers, score).
+    """
+    closed_answers: Dict[str, Any] = {}
+    open_answers: Dict[str, Any] = {}
+    score: Dict[str, Any] = {}
+
+    for task, content in answers.items():
+        task_key = task if task.startswith("task") else f"task_{task}"
+        task_result = check_result.get(task, {})
+
+        if task_result == "open":
+            open_answers[task_key] = content
+            continue
+
+        closed_answers[task_key] = {
+            f"Q{q_num}": {
+                "answer": user_answer,
+                "status": task_result.get(q_num, "unchecked"),
+            }
+            for q_num, user_answer in content.items()
+        }
+
+        if isinstance(task_result, dict):
+            score_str = task_result.get("score")
+            if score_str:
+                try:
+                    score[task_key] = int(score_str.split("/")[0])
+                except Exception:
+                    logger.warning(
+                        f"Невозможно преобразовать балл в int для {task_key}"
+                    )
+
+    if "total" in check_result:
+        try:
+            score["total"] = float(check_result["total"].strip("%"))
+        except Exception:
+            logger.warning("Невозможно преобразовать общий балл в float")
+
+    return closed_answers, open_answers, score
+
+
+def restore_answers(
+    closed_answers: Optional[Mapping[str, Any]],
+    open_answers: Optional[Mapping[str, Any]],
+) -> Dict[str, Dict[str, str]]:
+    """
+    Восстанавливает исходные ответы пользователя из полей TestResult.
+
+    Обратное преобразование к summarize_check_result: таски frontend
+    называются "task1", "task2", ..., поэтому ключи тасков не меняются.
+
+    Аргументы:
+        closed_answers (Mapping | None): Сохранённые закрытые ответы.
+        open_answers (Mapping | None): Сохранённые открытые ответы.
+
+    Returns:
+        dict: Ответы пользователя: таск -> вопрос -> ответ.
+    """
+    answers: Dict[str, Dict[str, str]] = {}
+
+    for task_key, questions in (closed_answers or {}).items():
+        answers[task_key] = {
+            q_label[1:] if q_label.startswith("Q") else q_label: item.get("answer", "")
+            for q_label, item in questions.items()
+        }
+
+    for task_key, content in (open_answers or {}).items():
+        if isinstance(content, Mapping):
+            answers[task_key] = dict(content)
+
+    return answers
@@ -0,0 +1,236 @@
+"""
+Локальный фейковый сервер Dropbox API для тестов и отладки.
+
+Реализует в памяти подмножество Dropbox HTTP API, которое использует
+utilities.dropbox_utils:
+    - POST /oauth2/token (grant_type=refresh_token)
+    - POST /2/users/get_current_account
+    - POST /2/files/get_metadata
+    - POST /2/files/create_folder_v2
+    - POST /2/files/upload
+    - POST /2/files/upload_session/start, append_v2, finish
+
+Ошибки возвращаются в формате Dropbox (HTTP 409 и error_summary),
+поэтому клиент обрабатывает их так же, как ответы настоящего API.
+
+Запуск:
+    python -m utilities.dropbox_fake --port 8765
+
+и в .env:
+    DROPBOX_API_URL=http://127.0.0.1:8765
+    DROPBOX_CONTENT_URL=http://127.0.0.1:8765
+"""
+
+import argparse
+import itertools
+import json
+import posixpath
+from typing import Any, Dict, Optional
+
+from aiohttp import web
+
+
+class FakeDropboxState:
+    """
+    Состояние фейкового Dropbox: дерево файлов и папок в памяти.
+
+    Attributes:
+        entries: Метаданные объектов по пути в нижнем регистре.
+        contents: Содержимое файлов по пути в нижнем регистре.
+        calls: Счётчик вызовов по маршрутам (для проверок в тестах).
+        token_refreshes: Количество выданных access token.
+        sessions: Данные открытых upload session по session_id.
+        lose_append_responses: Сколько следующих append_v2 принять,
+            но ответить 503 (имитация потерянного ответа).
+    """
+
+    def __init__(self) -> None:
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.contents: Dict[str, bytes] = {}
+        self.calls: Dict[str, int] = {}
+        self.token_refreshes = 0
+        self.sessions: Dict[str, bytearray] = {}
+        self.lose_append_responses = 0
+        self._ids = itertools.count(1)
+
+    def resolve(self, path: str) -> Optional[Dict[str, Any]]:
+        """Возвращает метаданные по пути или по "id:..."."""
+        if path.startswith("id:"):
+            for entry in self.entries.values():
+                if entry["id"] == path:
+                    return entry
+            return None
+        return self.entries.get(path.lower())
+
+    def add(self, tag: str, path: str, size: int = 0) -> Dict[str, Any]:
+        """Создаёт объект (и недостающие родительские папки)."""
+        parent = posixpath.dirname(path)
+        if parent not in ("", "/") and parent.lower() not in self.entries:
+            self.add("folder", parent)
+
+        existing = self.entries.get(path.lower())
+        entry = {
+            ".tag": tag,
+            "id": existing["id"] if existing else f"id:fake{next(self._ids)}",
+            "name": posixpath.basename(path),
+            "path_lower": path.lower(),
+            "path_display": path,
+        }
+        if tag == "file":
+            entry["size"] = size
+        self.entries[path.lower()] = entry
+        return entry
+
+
+def _error(summary: str, error: Dict[str, Any]) -> web.Response:
+    """Формирует ответ с ошибкой в формате Dropbox API."""
+    return web.json_response({"error_summary": summary, "error": error}, status=409)
+
+
+def _not_found(prefix: str = "path") -> web.Response:
+    return _error(
+        f"{prefix}/not_found/.", {".tag": prefix, prefix: {".tag": "not_found"}}
+    )
+
+
+def _incorrect_offset(correct_offset: int) -> web.Response:
+    return _error(
+        "lookup_failed/incorrect_offset/.",
+        {
+            ".tag": "lookup_failed",
+            "lookup_failed": {
+                ".tag": "incorrect_offset",
+                "correct_offset": correct_offset,
+            },
+        },
+    )
+
+
+def create_fake_dropbox_app(
+    state: Optional[FakeDropboxState] = None,
+) -> web.Application:
+    """
+    Создаёт aiohttp-приложение фейкового Dropbox.
+
+    Args:
+        state: Состояние хранилища (по умолчанию — новое пустое).
+
+    Returns:
+        web.Application: Приложение; состояние доступно как app["state"].
+    """
+    state = state or FakeDropboxState()
+    app = web.Application()
+    app["state"] = state
+
+    def track(route: str) -> None:
+        state.calls[route] = state.calls.get(route, 0) + 1
+
+    async def token(request: web.Request) -> web.Response:
+        track("oauth2/token")
+        form = await request.post()
+        if form.get("grant_type") != "refresh_token" or not form.get("refresh_token"):
+            return web.json_response({"error": "invalid_grant"}, status=400)
+        state.token_refreshes += 1
+        return web.json_response(
+            {
+                "access_token": f"fake-token-{state.token_refreshes}",
+                "token_type": "bearer",
+                "expires_in": 14400,
+            }
+        )
+
+    def authorized(request: web.Request) -> bool:
+        return request.headers.get("Authorization", "").startswith("Bearer fake-")
+
+    async def current_account(request: web.Request) -> web.Response:
+        track("users/get_current_account")
+        if not authorized(request):
+            return web.json_response(
+                {"error_summary": "invalid_access_token/.", "error": {}}, status=401
+            )
+        return web.json_response({"account_id": "dbid:fake", "email": "fake@local"})
+
+    async def get_metadata(request: web.Request) -> web.Response:
+        track("files/get_metadata")
+        body = await request.json()
+        entry = state.resolve(body["path"])
+        if entry is None:
+            return _not_found()
+        return web.json_response(entry)
+
+    async def create_folder(request: web.Request) -> web.Response:
+        track("files/create_folder_v2")
+        body = await request.json()
+        path = body["path"]
+        if path.lower() in state.entries:
+            return _error(
+                "path/conflict/folder/.",
+                {".tag": "path", "path": {".tag": "conflict"}},
+            )
+        return web.json_response({"metadata": state.add("folder", path)})
+
+    async def upload(request: web.Request) -> web.Response:
+        track("files/upload")
+        arg = json.loads(request.headers["Dropbox-API-Arg"])
+        data = await request.read()
+        entry = state.add("file", arg["path"], size=len(data))
+        state.contents[arg["path"].lower()] = data
+        return web.json_response(entry)
+
+    def session_cursor(arg: Dict[str, Any]) -> tuple[Optional[bytearray], int]:
+        cursor = arg["cursor"]
+        return state.sessions.get(cursor["session_id"]), int(cursor["offset"])
+
+    async def session_start(request: web.Request) -> web.Response:
+        track("files/upload_session/start")
+        session_id = f"session{next(state._ids)}"
+        state.sessions[session_id] = bytearray(await request.read())
+        return web.json_response({"session_id": session_id})
+
+    async def session_append(request: web.Request) -> web.Response:
+        track("files/upload_session/append_v2")
+        arg = json.loads(request.headers["Dropbox-API-Arg"])
+        buffer, offset = session_cursor(arg)
+        data = await request.read()
+        if buffer is None:
+            return _error("lookup_failed/not_found/.", {".tag": "lookup_failed"})
+        if offset != len(buffer):
+            return _incorrect_offset(len(buffer))
+        buffer.extend(data)
+        if state.lose_append_responses > 0:
+            state.lose_append_responses -= 1
+            return web.json_response({"error_summary": "lost"}, status=503)
+        return web.json_response(None)
+
+    async def session_finish(request: web.Request) -> web.Response:
+        track("files/upload_session/finish")
+        arg = json.loads(request.headers["Dropbox-API-Arg"])
+        buffer, offset = session_cursor(arg)
+        data = await request.read()
+        if buffer is None:
+            return _error("lookup_failed/not_found/.", {".tag": "lookup_failed"})
+        if offset != len(buffer):
+            return _incorrect_offset(len(buffer))
+        buffer.extend(data)
+        path = arg["commit"]["path"]
+        state.sessions.pop(arg["cursor"]["session_id"])
+        state.contents[path.lower()] = bytes(buffer)
+        return web.json_response(state.add("file", path, size=len(buffer)))
+
+    app.router.add_post("/oauth2/token", token)
+    app.router.add_post("/2/users/get_current_account", current_account)
+    app.router.add_post("/2/files/get_metadata", get_metadata)
+    app.router.add_post("/2/files/create_folder_v2", create_folder)
+    app.router.add_post("/2/files/upload", upload)
+    app.router.add_post("/2/files/upload_session/start", session_start)
+    app.router.add_post("/2/files/upload_session/append_v2", session_append)
+    app.router.add_post("/2/files/upload_session/finish", session_finish)
+    return app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fake Dropbox API server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    web.run_app(create_fake_dropbox_app(), host=args.host, port=args.port)
@@ -1,146 +1,701 @@
 """
 Утилиты для работы с Dropbox.
 
+Работа с Dropbox HTTP API выполняется асинхронно через aiohttp с общим
+пулом keep-alive соединений, поэтому вызовы не блокируют event loop.
+
 Функции:
-    - get_dropbox_client: инициализация Dropbox клиента с проверкой доступа.
-    - upload_to_dropbox: загрузка файлов в структурированные папки Dropbox.
+    - dropbox_manager: долгоживущий менеджер клиента (создаётся в lifespan).
+    - get_dropbox_client: общий асинхронный клиент Dropbox.
+    - upload_to_dropbox: загрузка PDF (из памяти или с диска)
+      в структурированные папки Dropbox.
     - ensure_user_dropbox_folder: проверка/создание личной папки пользователя.
     - get_folder_path_by_id: получение пути по Dropbox folder ID.
     - get_or_create_user_dropbox_folder: асинхронное получение/создание
       папки и сохранение ID в БД.
+    - resolve_user_folder: путь и известные подпапки пользователя с учётом кэша.
+    - invalidate_user_folder: сброс кэша папки пользователя.
 
 Особенности:
-    - реализован retry с экспоненциальной задержкой для сетевых ошибок
+    - retry с экспоненциальной задержкой и jitter через asyncio.sleep
+      для сетевых ошибок, 429 и 5xx (с учётом Retry-After)
+    - access token кэшируется и обновляется заранее, до истечения срока,
+      фоновой задачей менеджера; при необходимости обновление выполняется
+      один раз для всех конкурентных запросов (asyncio.Lock)
+    - авторизация проверяется лениво: один раз при первом обращении
+      и повторно только после ошибки авторизации
     - отсутствие папки в Dropbox считается нормальным сценарием
-    - временные ошибки сети не валят бизнес-логику с первой попытки
+    - файлы от DROPBOX_UPLOAD_SESSION_THRESHOLD байт загружаются через
+      upload session фрагментами DROPBOX_UPLOAD_CHUNK_SIZE с повтором
+      и продолжением с подтверждённого сервером смещения
+    - путь к папке пользователя и уже проверенные подпапки кэшируются
+      в памяти процесса (TTL + LRU) и в UserSession, поэтому повторная
+      загрузка выполняется одним вызовом API; кэш сбрасывается, если
+      Dropbox сообщает об отсутствии пути
+    - адреса API настраиваются (DROPBOX_API_URL / DROPBOX_CONTENT_URL),
+      что позволяет использовать локальный фейковый сервер
+      (utilities.dropbox_fake)
 """
 
+import asyncio
+import json
 import os
 import random
 import time
+from dataclasses import dataclass
 from datetime import datetime
-from http.client import RemoteDisconnected
+from typing import Any, BinaryIO, Dict, Optional
 
-import dropbox
-from dropbox.exceptions import ApiError, AuthError, HttpError
-from dropbox.files import FileMetadata, FolderMetadata, WriteMode
-from requests.exceptions import ConnectionError
+import aiohttp
 
 from config import settings
 from database.base import AsyncSessionLocal
-from database.crud.user_session import read_user_session, update_dropbox_folder_id
+from database.crud.user_session import (
+    add_dropbox_subfolder,
+    clear_dropbox_folder_cache,
+    read_user_session,
+    update_dropbox_folder_id,
+    update_dropbox_folder_path,
+)
 from logging_config import logger
+from utilities.metrics import metrics
+from utilities.pdf_buffer import PdfDocument
+from utilities.ttl_cache import TTLCache
+
+# Коды ответа, при которых запрос имеет смысл повторить
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
 
 # ---------------------------------------------------------------------------
-# Retry utilities
+# Ошибки
 # ---------------------------------------------------------------------------
 
 
-def dropbox_retry(retries: int = 3, base_delay: float = 0.5):
+class DropboxApiError(Exception):
     """
-    Декоратор для повторных попыток вызовов Dropbox API
-    при временных сетевых ошибках.
+    Ошибка, возвращённая Dropbox API.
 
-    Args:
-        retries: максимальное количество попыток.
-        base_delay: базовая задержка (сек), увеличивается экспоненциально.
+    Attributes:
+        status: HTTP-статус ответа.
+        error_summary: Краткое описание ошибки (например, "path/not_found/..").
+        error: Структурированное описание ошибки из ответа.
+    """
 
-    Raises:
-        Исключение последней попытки при исчерпании retries.
+    def __init__(
+        self, status: int, error_summary: str, error: Optional[Dict[str, Any]] = None
+    ) -> None:
+        super().__init__(f"Dropbox API error {status}: {error_summary}")
+        self.status = status
+        self.error_summary = error_summary
+        self.error = error or {}
+
+    def is_path_not_found(self) -> bool:
+        """True, если ошибка означает отсутствие объекта по указанному пути."""
+        return "not_found" in self.error_summary.split("/")[:2]
+
+    def is_folder_conflict(self) -> bool:
+        """True, если по указанному пути уже существует папка."""
+        return self.error_summary.startswith("path/conflict/folder")
+
+    def correct_offset(self) -> Optional[int]:
+        """
+        Смещение, ожидаемое сервером, для ошибки upload session
+        "lookup_failed/incorrect_offset" (иначе None).
+        """
+        lookup = self.error.get("lookup_failed")
+        if isinstance(lookup, dict) and lookup.get(".tag") == "incorrect_offset":
+            return int(lookup["correct_offset"])
+        return None
+
+
+class DropboxAuthError(DropboxApiError):
+    """Ошибка авторизации в Dropbox (неверный или отозванный токен)."""
+
+
+class _RetryableError(Exception):
+    """Временная ошибка Dropbox, после которой запрос можно повторить."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+# ---------------------------------------------------------------------------
+# Асинхронный клиент
+# ---------------------------------------------------------------------------
+
+
+class AsyncDropboxClient:
     """
+    Асинхронный клиент Dropbox HTTP API с общим пулом соединений.
 
-    def decorator(func):
-        def wrapper(*args, **kwargs):
-            last_exc: Exception | None = None
-
-            for attempt in range(1, retries + 1):
-                try:
-                    return func(*args, **kwargs)
-                except (HttpError, ConnectionError, RemoteDisconnected) as e:
-                    last_exc = e
-                    if attempt == retries:
-                        logger.error(
-                            "Dropbox network error after %s attempts: %s",
-                            retries,
-                            e,
-                        )
-                        break
-
-                    delay = base_delay * (2 ** (attempt - 1)) + random.random()
-                    logger.warning(
-                        "Dropbox temporary error (attempt %s/%s), retry in %.2fs",
-                        attempt,
-                        retries,
-                        delay,
+    Args:
+        app_key: Ключ приложения Dropbox.
+        app_secret: Секрет приложения Dropbox.
+        refresh_token: OAuth2 refresh token.
+        api_url: Базовый URL RPC-эндпоинтов.
+        content_url: Базовый URL эндпоинтов загрузки контента.
+        pool_size: Максимум одновременных соединений в пуле.
+        timeout: Таймаут одного HTTP-запроса (сек).
+        retries: Максимальное количество попыток одного запроса.
+        base_delay: Базовая задержка повтора (сек).
+        refresh_margin: За сколько секунд до истечения токен считается устаревшим.
+    """
+
+    def __init__(
+        self,
+        app_key: str,
+        app_secret: str,
+        refresh_token: str,
+        api_url: str = "https://api.dropboxapi.com",
+        content_url: str = "https://content.dropboxapi.com",
+        pool_size: int = 10,
+        timeout: float = 30.0,
+        retries: int = 3,
+        base_delay: float = 0.5,
+        refresh_margin: float = 300.0,
+    ) -> None:
+        self.app_key = app_key
+        self.app_secret = app_secret
+        self.refresh_token = refresh_token
+        self.api_url = api_url.rstrip("/")
+        self.content_url = content_url.rstrip("/")
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.retries = retries
+        self.base_delay = base_delay
+        self.refresh_margin = refresh_margin
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._access_token: Optional[str] = None
+        self._token_expires_at = 0.0
+        self._token_lock = asyncio.Lock()
+        self._validated = False
+        self._token_refreshes = metrics.counter(
+            "dropbox_token_refreshes", "Dropbox OAuth access token refreshes"
+        )
+        self._validations = metrics.counter(
+            "dropbox_auth_validations", "Dropbox account validation round-trips"
+        )
+
+    # ---- Соединения и авторизация -----------------------------------------
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Возвращает общую HTTP-сессию, создавая её при первом обращении."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.pool_size, keepalive_timeout=60
+                ),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """Закрывает пул соединений."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def _token_is_fresh(self) -> bool:
+        """True, если кэшированный токен действует дольше refresh_margin."""
+        return bool(self._access_token) and (
+            time.monotonic() < self._token_expires_at - self.refresh_margin
+        )
+
+    def seconds_until_refresh(self) -> Optional[float]:
+        """
+        Сколько секунд осталось до планового обновления токена.
+
+        Returns:
+            float | None: None, если токен ещё ни разу не запрашивался.
+        """
+        if not self._access_token:
+            return None
+        remaining = self._token_expires_at - self.refresh_margin - time.monotonic()
+        return max(remaining, 0.0)
+
+    async def _get_access_token(self) -> str:
+        """
+        Возвращает действующий access token, обновляя его при необходимости.
+
+        Конкурентные вызовы ожидают одно обновление, а не запускают несколько.
+        """
+        if self._token_is_fresh():
+            assert self._access_token is not None
+            return self._access_token
+
+        async with self._token_lock:
+            if not self._token_is_fresh():
+                await self._refresh_access_token()
+            assert self._access_token is not None
+            return self._access_token
+
+    async def refresh_access_token(self) -> None:
+        """Принудительно обновляет access token (для планового обновления)."""
+        async with self._token_lock:
+            await self._refresh_access_token()
+
+    async def _refresh_access_token(self) -> None:
+        """Запрашивает новый access token по refresh_token (под _token_lock)."""
+        data = await self._send(
+            "POST",
+            f"{self.api_url}/oauth2/token",
+            data={
+                "grant_type": "refresh_token",
+                "refresh_token": self.refresh_token,
+            },
+            auth=aiohttp.BasicAuth(self.app_key, self.app_secret),
+        )
+        self._access_token = data["access_token"]
+        self._token_expires_at = time.monotonic() + float(data.get("expires_in", 14400))
+        self._token_refreshes.inc()
+
+    def _invalidate_token(self) -> None:
+        """Сбрасывает кэшированный access token и признак проверки аккаунта."""
+        self._access_token = None
+        self._token_expires_at = 0.0
+        self._validated = False
+
+    async def ensure_valid(self) -> None:
+        """
+        Лениво проверяет авторизацию: один запрос users/get_current_account
+        при первом обращении и после ошибки авторизации.
+
+        Raises:
+            DropboxAuthError: если токен или приложение недействительны.
+        """
+        if self._validated:
+            return
+        try:
+            await self._call(
+                f"{self.api_url}/2/users/get_current_account",
+                headers={},
+                validate=False,
+            )
+        except DropboxAuthError as e:
+            logger.error("Dropbox auth error: %s", e)
+            raise
+        self._validations.inc()
+        self._validated = True
+
+    # ---- HTTP ---------------------------------------------------------------
+
+    async def _send(self, method: str, url: str, **kwargs: Any) -> Dict[str, Any]:
+        """Выполняет HTTP-запрос с повторами при временных ошибках."""
+        last_exc: Optional[Exception] = None
+
+        for attempt in range(1, self.retries + 1):
+            try:
+                return await self._send_once(method, url, **kwargs)
+            except (
+                _RetryableError,
+                aiohttp.ClientConnectionError,
+                aiohttp.ClientPayloadError,
+                asyncio.TimeoutError,
+            ) as e:
+                last_exc = e
+                if attempt == self.retries:
+                    logger.error(
+                        "Dropbox network error after %s attempts: %s", self.retries, e
                     )
-                    time.sleep(delay)
+                    break
+
+                retry_after = getattr(e, "retry_after", None)
+                delay = retry_after or self.base_delay * (2 ** (attempt - 1))
+                delay += random.uniform(0, self.base_delay)
+                logger.warning(
+                    "Dropbox temporary error (attempt %s/%s), retry in %.2fs",
+                    attempt,
+                    self.retries,
+                    delay,
+                )
+                await asyncio.sleep(delay)
+
+        assert last_exc is not None
+        raise last_exc
+
+    async def _send_once(self, method: str, url: str, **kwargs: Any) -> Dict[str, Any]:
+        """Выполняет один HTTP-запрос и разбирает ответ Dropbox."""
+        async with self._get_session().request(method, url, **kwargs) as response:
+            text = await response.text()
+
+            if response.status == 200:
+                return json.loads(text) if text else {}
 
-            assert last_exc is not None
-            raise last_exc
+            if response.status in RETRYABLE_STATUSES:
+                retry_after = response.headers.get("Retry-After")
+                raise _RetryableError(
+                    f"HTTP {response.status}: {text[:200]}",
+                    float(retry_after) if retry_after else None,
+                )
+
+            try:
+                body = json.loads(text)
+            except ValueError:
+                body = {}
+            summary = body.get("error_summary") or body.get("error") or text[:200]
+            if not isinstance(summary, str):
+                summary = json.dumps(summary)
+            error_cls = DropboxAuthError if response.status == 401 else DropboxApiError
+            raise error_cls(response.status, summary, body.get("error"))
+
+    async def _call(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        validate: bool = True,
+        **kwargs: Any,
+    ) -> Dict[str, Any]:
+        """Выполняет авторизованный запрос, обновляя истёкший токен один раз."""
+        if validate:
+            await self.ensure_valid()
+
+        for attempt in (1, 2):
+            token = await self._get_access_token()
+            try:
+                return await self._send(
+                    "POST",
+                    url,
+                    headers={**headers, "Authorization": f"Bearer {token}"},
+                    **kwargs,
+                )
+            except DropboxAuthError:
+                if attempt == 2:
+                    raise
+                self._invalidate_token()
+        raise AssertionError("unreachable")
+
+    async def rpc(self, route: str, body: Optional[Dict[str, Any]] = None) -> Dict:
+        """Вызывает RPC-эндпоинт Dropbox API (api.dropboxapi.com/2/<route>)."""
+        if body is None:
+            return await self._call(f"{self.api_url}/2/{route}", headers={})
+        return await self._call(f"{self.api_url}/2/{route}", headers={}, json=body)
+
+    async def content(
+        self, route: str, arg: Dict[str, Any], data: bytes | memoryview
+    ) -> Dict:
+        """Вызывает content-эндпоинт Dropbox API (загрузка данных)."""
+        return await self._call(
+            f"{self.content_url}/2/{route}",
+            headers={
+                "Dropbox-API-Arg": json.dumps(arg, ensure_ascii=True),
+                "Content-Type": "application/octet-stream",
+            },
+            data=data,
+        )
+
+    # ---- Операции с файлами -----------------------------------------------
+
+    async def get_current_account(self) -> Dict[str, Any]:
+        """Возвращает информацию о текущем аккаунте."""
+        return await self.rpc("users/get_current_account")
+
+    async def get_metadata(self, path: str) -> Dict[str, Any]:
+        """Возвращает метаданные файла или папки (path может быть "id:...")."""
+        return await self.rpc("files/get_metadata", {"path": path})
+
+    async def create_folder(self, path: str) -> Dict[str, Any]:
+        """
+        Создаёт папку и возвращает её метаданные.
+
+        Если папку параллельно создал другой запрос, возвращает
+        метаданные существующей папки.
+        """
+        try:
+            result = await self.rpc(
+                "files/create_folder_v2", {"path": path, "autorename": False}
+            )
+        except DropboxApiError as e:
+            if not e.is_folder_conflict():
+                raise
+            return await self.get_metadata(path)
+        return result["metadata"]
+
+    async def upload(self, path: str, data: bytes | memoryview) -> Dict[str, Any]:
+        """Загружает файл (с перезаписью) и возвращает его метаданные."""
+        return await self.content(
+            "files/upload",
+            {"path": path, "mode": "overwrite", "mute": True},
+            data,
+        )
+
+    async def upload_large(
+        self,
+        path: str,
+        stream: BinaryIO,
+        size: int,
+        chunk_size: int = 8 * 1024 * 1024,
+    ) -> Dict[str, Any]:
+        """
+        Загружает поток через upload session (start → append_v2 → finish).
+
+        В памяти одновременно находится только один фрагмент. Каждый
+        фрагмент повторяется при временных ошибках (_send); если ответ
+        потерялся, а сервер уже принял данные, загрузка продолжается
+        со смещения, которое сервер вернул в ошибке incorrect_offset.
+
+        Args:
+            path: Путь файла в Dropbox.
+            stream: Бинарный поток с поддержкой seek.
+            size: Полный размер данных (байт).
+            chunk_size: Размер фрагмента (байт).
+
+        Returns:
+            dict: Метаданные загруженного файла.
+
+        Raises:
+            DropboxApiError: при ошибках Dropbox API.
+        """
+        chunks = metrics.counter(
+            "dropbox_upload_session_chunks", "Chunks sent via Dropbox upload sessions"
+        )
+        resumes = metrics.counter(
+            "dropbox_upload_session_resumes",
+            "Upload session chunks resumed from the server offset",
+        )
 
-        return wrapper
+        first = await asyncio.to_thread(_read_chunk, stream, 0, chunk_size)
+        chunks.inc()
+        started = await self.content(
+            "files/upload_session/start", {"close": False}, first
+        )
+        session_id = started["session_id"]
+        offset = len(first)
+        resumed = 0
+
+        while True:
+            chunk = await asyncio.to_thread(_read_chunk, stream, offset, chunk_size)
+            cursor = {"session_id": session_id, "offset": offset}
+            chunks.inc()
+            try:
+                if not chunk or offset + len(chunk) >= size:
+                    return await self.content(
+                        "files/upload_session/finish",
+                        {
+                            "cursor": cursor,
+                            "commit": {"path": path, "mode": "overwrite", "mute": True},
+                        },
+                        chunk,
+                    )
+                await self.content(
+                    "files/upload_session/append_v2",
+                    {"cursor": cursor, "close": False},
+                    chunk,
+                )
+            except DropboxApiError as e:
+                correct = e.correct_offset()
+                if correct is None or correct == offset or resumed >= self.retries:
+                    raise
+                logger.warning(
+                    "Dropbox upload session %s: resuming at offset %s (sent %s)",
+                    session_id,
+                    correct,
+                    offset,
+                )
+                resumes.inc()
+                resumed += 1
+                offset = correct
+                continue
 
-    return decorator
+            resumed = 0
+            offset += len(chunk)
 
 
 # ---------------------------------------------------------------------------
-# Dropbox client
+# Менеджер клиента
 # ---------------------------------------------------------------------------
 
 
-def get_dropbox_client() -> dropbox.Dropbox:
+class DropboxClientManager:
     """
-    Инициализирует Dropbox клиент через refresh_token
-    и проверяет валидность авторизации.
+    Владеет единственным клиентом Dropbox на процесс.
 
-    Returns:
-        dropbox.Dropbox: Инициализированный клиент Dropbox.
+    Создаётся в lifespan приложения; фоновая задача обновляет access token
+    заранее (за refresh_margin до истечения), поэтому запросы в штатном
+    режиме не тратят ни одного round-trip на авторизацию.
+    """
 
-    Raises:
-        AuthError: при ошибке авторизации.
-        HttpError: при сетевых ошибках.
-        Exception: при иных ошибках инициализации.
+    def __init__(self) -> None:
+        self._client: Optional[AsyncDropboxClient] = None
+        self._refresher: Optional[asyncio.Task] = None
+
+    @property
+    def client(self) -> AsyncDropboxClient:
+        """Клиент Dropbox (создаётся лениво, если менеджер ещё не запущен)."""
+        if self._client is None:
+            self._client = AsyncDropboxClient(
+                app_key=settings.dropbox_app_key,
+                app_secret=settings.dropbox_app_secret,
+                refresh_token=settings.dropbox_refresh_token,
+                api_url=settings.dropbox_api_url,
+                content_url=settings.dropbox_content_url,
+                pool_size=settings.dropbox_pool_size,
+                timeout=settings.dropbox_timeout,
+                retries=settings.dropbox_max_retries,
+                refresh_margin=settings.dropbox_token_refresh_margin,
+            )
+        return self._client
+
+    async def start(self) -> None:
+        """Создаёт клиент и запускает плановое обновление токена."""
+        client = self.client
+        if self._refresher is None:
+            self._refresher = asyncio.create_task(
+                self._refresh_loop(client), name="dropbox-token-refresher"
+            )
+
+    async def stop(self) -> None:
+        """Останавливает обновление токена и закрывает пул соединений."""
+        if self._refresher is not None:
+            self._refresher.cancel()
+            await asyncio.gather(self._refresher, return_exceptions=True)
+            self._refresher = None
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+    async def _refresh_loop(self, client: AsyncDropboxClient) -> None:
+        """Обновляет токен до истечения срока; до первого запроса ничего не делает."""
+        while True:
+            delay = client.seconds_until_refresh()
+            if delay is None:
+                await asyncio.sleep(60)
+                continue
+
+            await asyncio.sleep(delay)
+            try:
+                await client.refresh_access_token()
+            except Exception as e:
+                logger.warning("Scheduled Dropbox token refresh failed: %s", e)
+                await asyncio.sleep(30)
+
+
+dropbox_manager = DropboxClientManager()
+
+
+def get_dropbox_client() -> AsyncDropboxClient:
     """
-    try:
-        dbx = dropbox.Dropbox(
-            oauth2_refresh_token=settings.dropbox_refresh_token,
-            app_key=settings.dropbox_app_key,
-            app_secret=settings.dropbox_app_secret,
-        )
-        dbx.users_get_current_account()
-        return dbx
-    except AuthError as e:
-        logger.error("Dropbox auth error: %s", e)
-        raise
-    except HttpError as e:
-        logger.error("Dropbox network error: %s", e)
-        raise
-    except Exception as e:
-        logger.error("Unknown Dropbox init error: %s", e)
-        raise
+    Возвращает общий асинхронный клиент Dropbox.
+
+    Клиент живёт весь срок работы процесса и переиспользует пул соединений
+    и access token между запросами.
+
+    Returns:
+        AsyncDropboxClient: Клиент Dropbox.
+    """
+    return dropbox_manager.client
 
 
 # ---------------------------------------------------------------------------
-# Internal Dropbox helpers (with retry)
+# Folder cache
 # ---------------------------------------------------------------------------
 
 
-@dropbox_retry()
-def _get_metadata(dbx: dropbox.Dropbox, path: str):
-    """Безопасно получает метаданные Dropbox-объекта."""
-    return dbx.files_get_metadata(path)
+@dataclass(frozen=True)
+class UserFolder:
+    """
+    Разрешённая папка пользователя в Dropbox.
 
+    Attributes:
+        path: Путь к папке пользователя.
+        subfolders: Подпапки, существование которых уже проверено.
+    """
 
-@dropbox_retry()
-def _create_folder(dbx: dropbox.Dropbox, path: str):
-    """Безопасно создаёт папку в Dropbox."""
-    return dbx.files_create_folder_v2(path)
+    path: str
+    subfolders: frozenset[str] = frozenset()
 
 
-@dropbox_retry()
-def _upload_file(dbx: dropbox.Dropbox, data: bytes, path: str):
-    """Безопасно загружает файл в Dropbox."""
-    return dbx.files_upload(data, path, mode=WriteMode.overwrite)
+folder_cache: TTLCache[int, UserFolder] = TTLCache(
+    maxsize=settings.dropbox_folder_cache_size,
+    ttl=settings.dropbox_folder_cache_ttl,
+    name="dropbox_folder_cache",
+)
+
+
+async def remember_user_subfolder(telegram_id: int, subfolder: str) -> None:
+    """
+    Отмечает подпапку пользователя как существующую (в памяти и в БД).
+
+    Args:
+        telegram_id: Telegram ID пользователя.
+        subfolder: Имя подпапки.
+    """
+    cached = folder_cache.peek(telegram_id)
+    if cached is not None:
+        folder_cache.set(
+            telegram_id,
+            UserFolder(cached.path, cached.subfolders | {subfolder}),
+        )
+
+    async with AsyncSessionLocal() as session:
+        await add_dropbox_subfolder(session, telegram_id, subfolder)
+
+
+async def invalidate_user_folder(telegram_id: int) -> None:
+    """
+    Сбрасывает кэшированный путь и подпапки пользователя (в памяти и в БД).
+
+    Args:
+        telegram_id: Telegram ID пользователя.
+    """
+    folder_cache.pop(telegram_id)
+    metrics.counter(
+        "dropbox_folder_cache_invalidations",
+        "User folder cache entries dropped after path-not-found",
+    ).inc()
+
+    async with AsyncSessionLocal() as session:
+        await clear_dropbox_folder_cache(session, telegram_id)
+
+
+async def resolve_user_folder(dbx: AsyncDropboxClient, telegram_id: int) -> UserFolder:
+    """
+    Возвращает папку пользователя, обращаясь к Dropbox только при промахе кэша.
+
+    Порядок: кэш процесса → путь, сохранённый в UserSession → путь
+    по сохранённому folder_id → проверка/создание папки.
+
+    Args:
+        dbx: Клиент Dropbox.
+        telegram_id: Telegram ID пользователя.
+
+    Returns:
+        UserFolder: Путь к папке и известные подпапки.
+    """
+    cached = folder_cache.get(telegram_id)
+    if cached is not None:
+        return cached
+
+    async with AsyncSessionLocal() as session:
+        user_session = await read_user_session(session, telegram_id)
+        folder: UserFolder | None = None
+
+        if user_session and user_session.dropbox_folder_path:
+            folder = UserFolder(
+                user_session.dropbox_folder_path,
+                frozenset(user_session.dropbox_subfolders or ()),
+            )
+
+        elif user_session and user_session.dropbox_folder_id:
+            try:
+                path = await get_folder_path_by_id(dbx, user_session.dropbox_folder_id)
+                await update_dropbox_folder_path(session, telegram_id, path)
+                folder = UserFolder(path)
+            except Exception as e:
+                logger.warning(
+                    "Stored Dropbox folder_id invalid for user %s: %s",
+                    telegram_id,
+                    e,
+                )
+
+        if folder is None:
+            folder_id, folder_path = await ensure_user_dropbox_folder(dbx, telegram_id)
+            await update_dropbox_folder_id(session, telegram_id, folder_id, folder_path)
+            folder = UserFolder(folder_path)
+
+    folder_cache.set(telegram_id, folder)
+    return folder
 
 
 # ---------------------------------------------------------------------------
@@ -148,22 +703,89 @@ def _upload_file(dbx: dropbox.Dropbox, data: bytes, path: str):
 # ---------------------------------------------------------------------------
 
 
-def upload_to_dropbox(
-    local_path: str,
+def _read_file(local_path: str) -> bytes:
+    """Читает локальный файл целиком."""
+    with open(local_path, "rb") as f:
+        return f.read()
+
+
+def _read_chunk(stream: BinaryIO, offset: int, size: int) -> bytes:
+    """Читает фрагмент потока начиная с offset."""
+    stream.seek(offset)
+    return stream.read(size)
+
+
+def _source_size(source: str | PdfDocument) -> int:
+    """Возвращает размер загружаемых данных в байтах."""
+    if isinstance(source, PdfDocument):
+        return source.size
+    try:
+        return os.path.getsize(source)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Файл не найден: {source}") from None
+
+
+async def _upload_source(
+    dbx: AsyncDropboxClient, dropbox_path: str, source: str | PdfDocument
+) -> Dict[str, Any]:
+    """
+    Загружает данные одним запросом или, начиная с
+    DROPBOX_UPLOAD_SESSION_THRESHOLD байт, через upload session.
+    """
+    size = _source_size(source)
+    if size < settings.dropbox_upload_session_threshold:
+        return await dbx.upload(dropbox_path, await _read_source(source))
+
+    stream = source.open() if isinstance(source, PdfDocument) else open(source, "rb")
+    with stream:
+        return await dbx.upload_large(
+            dropbox_path,
+            stream,
+            size,
+            chunk_size=settings.dropbox_upload_chunk_size,
+        )
+
+
+async def _read_source(source: str | PdfDocument) -> bytes | memoryview:
+    """
+    Возвращает содержимое для загрузки.
+
+    Документ в памяти передаётся без копирования; файлы на диске
+    (в том числе выгруженные документы) читаются в отдельном потоке.
+    """
+    if isinstance(source, PdfDocument):
+        if source.spilled:
+            return await asyncio.to_thread(source.read)
+        return source.getbuffer()
+
+    try:
+        return await asyncio.to_thread(_read_file, source)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Файл не найден: {source}") from None
+
+
+async def upload_to_dropbox(
+    source: str | PdfDocument,
     file_type: str,
     username: str | None = None,
     level: str | None = None,
     user_folder_path: str | None = None,
+    dbx: AsyncDropboxClient | None = None,
+    telegram_id: int | None = None,
 ) -> dict:
     """
     Загружает файл в Dropbox и возвращает информацию о нём.
 
     Args:
-        local_path: путь к локальному файлу.
+        source: PDF-документ в памяти (PdfDocument) или путь к локальному файлу.
         file_type: тип файла ("application", "UPDATED_APPLICATION", "test-report").
         username: имя пользователя (используется в имени файла).
         level: уровень теста (для отчётов).
         user_folder_path: путь к пользовательской папке в Dropbox.
+        dbx: клиент Dropbox (по умолчанию — общий клиент процесса).
+        telegram_id: Telegram ID пользователя; если указан, папка и уже
+            проверенные подпапки берутся из кэша (resolve_user_folder),
+            а при ответе "path not found" кэш сбрасывается.
 
     Returns:
         dict с ключами:
@@ -174,12 +796,16 @@ def upload_to_dropbox(
     Raises:
         FileNotFoundError: если файл не найден локально.
         ValueError: при некорректных аргументах.
-        ApiError, HttpError: при ошибках Dropbox API.
+        DropboxApiError: при ошибках Dropbox API.
     """
-    dbx = get_dropbox_client()
+    dbx = dbx or get_dropbox_client()
 
-    if not os.path.exists(local_path):
-        raise FileNotFoundError(f"Файл не найден: {local_path}")
+    known_subfolders: frozenset[str] = frozenset()
+    if telegram_id is not None:
+        folder = await resolve_user_folder(dbx, telegram_id)
+        if not user_folder_path or user_folder_path == folder.path:
+            user_folder_path = folder.path
+            known_subfolders = folder.subfolders
 
     if not user_folder_path:
         raise ValueError("Не указан путь к папке пользователя (user_folder_path)")
@@ -198,42 +824,50 @@ def upload_to_dropbox(
         raise ValueError(f"Некорректный тип файла: {file_type}")
 
     subfolder_path = f"{user_folder_path.rstrip('/')}/{subfolder}"
-
-    try:
-        _get_metadata(dbx, subfolder_path)
-    except ApiError as e:
-        if e.error.is_path() and e.error.get_path().is_not_found():
-            logger.info("Dropbox subfolder not found, creating: %s", subfolder_path)
-            _create_folder(dbx, subfolder_path)
-        else:
-            logger.error("Dropbox folder check error: %s", e)
-            raise
-
     dropbox_path = f"{subfolder_path}/{filename}"
 
-    with open(local_path, "rb") as f:
-        _upload_file(dbx, f.read(), dropbox_path)
+    try:
+        if subfolder not in known_subfolders:
+            try:
+                await dbx.get_metadata(subfolder_path)
+            except DropboxApiError as e:
+                if not e.is_path_not_found():
+                    logger.error("Dropbox folder check error: %s", e)
+                    raise
+                logger.info("Dropbox subfolder not found, creating: %s", subfolder_path)
+                await dbx.create_folder(subfolder_path)
+
+            if telegram_id is not None:
+                await remember_user_subfolder(telegram_id, subfolder)
+
+        metadata = await _upload_source(dbx, dropbox_path, source)
+    except DropboxApiError as e:
+        if telegram_id is not None and e.is_path_not_found():
+            logger.warning(
+                "Cached Dropbox folder for user %s is stale: %s", telegram_id, e
+            )
+            await invalidate_user_folder(telegram_id)
+        raise
 
-    metadata = _get_metadata(dbx, dropbox_path)
-    if not isinstance(metadata, FileMetadata):
+    if metadata.get(".tag", "file") != "file" or "id" not in metadata:
         raise RuntimeError("Не удалось получить метаданные загруженного файла")
 
     return {
         "dropbox_path": dropbox_path,
-        "dropbox_file_id": metadata.id,
+        "dropbox_file_id": metadata["id"],
         "file_name": filename,
     }
 
 
-def ensure_user_dropbox_folder(
-    dbx: dropbox.Dropbox, telegram_id: int
+async def ensure_user_dropbox_folder(
+    dbx: AsyncDropboxClient, telegram_id: int
 ) -> tuple[str, str]:
     """
     Проверяет существование папки пользователя в Dropbox
     и создаёт её при отсутствии.
 
     Args:
-        dbx: Инициализированный клиент Dropbox.
+        dbx: Клиент Dropbox.
         telegram_id: Telegram ID пользователя.
 
     Returns:
@@ -243,74 +877,56 @@ def ensure_user_dropbox_folder(
     user_folder_path = f"{base_folder.rstrip('/')}/{telegram_id}"
 
     try:
-        metadata = _get_metadata(dbx, user_folder_path)
-        if isinstance(metadata, FolderMetadata):
-            return metadata.id, user_folder_path
+        metadata = await dbx.get_metadata(user_folder_path)
+        if metadata.get(".tag") == "folder":
+            return metadata["id"], user_folder_path
         raise RuntimeError("Unexpected metadata type for user folder")
 
-    except ApiError as e:
-        if e.error.is_path() and e.error.get_path().is_not_found():
+    except DropboxApiError as e:
+        if e.is_path_not_found():
             logger.info("Creating Dropbox folder for user %s", telegram_id)
-            res = _create_folder(dbx, user_folder_path)
-            if res is None:
-                raise RuntimeError(
-                    "Dropbox did not return folder creation result"
-                ) from None
-            return res.metadata.id, user_folder_path
+            metadata = await dbx.create_folder(user_folder_path)
+            return metadata["id"], user_folder_path
 
         logger.error("Dropbox folder creation/check error: %s", e)
         raise
 
 
-def get_folder_path_by_id(dbx: dropbox.Dropbox, folder_id: str) -> str:
+async def get_folder_path_by_id(dbx: AsyncDropboxClient, folder_id: str) -> str:
     """
     Получает путь к папке Dropbox по её ID.
 
     Args:
-        dbx: Инициализированный клиент Dropbox.
+        dbx: Клиент Dropbox.
         folder_id: Dropbox folder ID.
 
     Returns:
         Строковый путь к папке.
     """
     try:
-        metadata = _get_metadata(dbx, folder_id)
-        if metadata is None or not hasattr(metadata, "path_display"):
+        metadata = await dbx.get_metadata(folder_id)
+        if not metadata.get("path_display"):
             raise RuntimeError(f"Invalid metadata for folder_id={folder_id}")
 
-        return metadata.path_display
-    except ApiError as e:
+        return metadata["path_display"]
+    except DropboxApiError as e:
         logger.error("Dropbox get path by ID error (%s): %s", folder_id, e)
         raise
 
 
 async def get_or_create_user_dropbox_folder(
-    dbx: dropbox.Dropbox, telegram_id: int
+    dbx: AsyncDropboxClient, telegram_id: int
 ) -> str:
     """
     Асинхронно получает путь к пользовательской папке Dropbox.
-    При отсутствии папки создаёт её и сохраняет ID в БД.
+    При отсутствии папки создаёт её и сохраняет ID и путь в БД.
 
     Args:
-        dbx: Инициализированный клиент Dropbox.
+        dbx: Клиент Dropbox.
         telegram_id: Telegram ID пользователя.
 
     Returns:
         Путь к папке пользователя в Dropbox.
     """
-    async with AsyncSessionLocal() as session:
-        user_session = await read_user_session(session, telegram_id)
-
-        if user_session and user_session.dropbox_folder_id:
-            try:
-                return get_folder_path_by_id(dbx, user_session.dropbox_folder_id)
-            except Exception as e:
-                logger.warning(
-                    "Stored Dropbox folder_id invalid for user %s: %s",
-                    telegram_id,
-                    e,
-                )
-
-        folder_id, folder_path = ensure_user_dropbox_folder(dbx, telegram_id)
-        await update_dropbox_folder_id(session, telegram_id, folder_id)
-        return folder_path
+    folder = await resolve_user_folder(dbx, telegram_id)
+    return folder.path
@@ -0,0 +1,185 @@
+"""
+Идемпотентность запросов, создающих заявки и результаты тестов.
+
+Клиент передаёт ключ идемпотентности (заголовок Idempotency-Key или
+client_request_id в теле). Первый запрос с ключом захватывает его
+в таблице idempotency_keys и после успешной обработки сохраняет ответ;
+повтор с тем же ключом в течение IDEMPOTENCY_TTL получает сохранённый
+ответ без повторной генерации PDF, загрузки в Dropbox и уведомления.
+
+Если обработка завершилась ошибкой, ключ освобождается и повтор
+выполняется заново. На время обработки ключ захватывается только на
+IDEMPOTENCY_LEASE: если процесс упал, не освободив ключ, повтор после
+этого срока выполняется заново; до IDEMPOTENCY_TTL продлевается только
+ключ с сохранённым ответом. Повтор во время обработки первого запроса получает
+IdempotencyInProgressError, повтор с другим телом — IdempotencyMismatchError.
+
+Содержит:
+    - request_fingerprint: хэш тела запроса.
+    - IdempotencyService: захват / сохранение / освобождение ключей
+      и периодическое удаление истёкших.
+    - idempotency: общий экземпляр приложения.
+
+Метрики:
+    - idempotency_replays: ответы, возвращённые из сохранённых.
+    - idempotency_conflicts: повторы во время обработки или с другим телом.
+"""
+
+import asyncio
+import hashlib
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel
+
+from config import settings
+from database.base import AsyncSessionLocal
+from database.crud.idempotency_key import (
+    claim_idempotency_key,
+    complete_idempotency_key,
+    delete_expired_idempotency_keys,
+    release_idempotency_key,
+)
+from database.models import IdempotencyStatusEnum
+from logging_config import logger
+from utilities.metrics import metrics
+
+# Максимальная длина ключа (см. IdempotencyKey.key)
+MAX_IDEMPOTENCY_KEY_LENGTH = 255
+
+
+class IdempotencyInProgressError(Exception):
+    """Запрос с этим ключом ещё обрабатывается."""
+
+
+class IdempotencyMismatchError(Exception):
+    """Ключ уже использован с другим телом запроса."""
+
+
+def request_fingerprint(payload: BaseModel, exclude: Optional[set] = None) -> str:
+    """
+    Возвращает SHA-256 тела запроса.
+
+    Args:
+        payload: Валидированное тело запроса.
+        exclude: Поля, не влияющие на результат (например, сам ключ).
+
+    Returns:
+        str: Хэш (hex).
+    """
+    body = payload.model_dump_json(exclude=exclude)
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+class IdempotencyService:
+    """
+    Операции с ключами идемпотентности.
+
+    Args:
+        ttl: Время хранения сохранённого ответа (сек).
+        lease: Срок захвата ключа на время обработки запроса (сек).
+        purge_interval: Период удаления истёкших ключей (сек).
+    """
+
+    def __init__(
+        self, ttl: float = 3600.0, lease: float = 300.0, purge_interval: float = 600.0
+    ) -> None:
+        self.ttl = ttl
+        self.lease = lease
+        self.purge_interval = purge_interval
+        self._task: Optional[asyncio.Task] = None
+        self._replays = metrics.counter(
+            "idempotency_replays", "Responses replayed for repeated idempotency keys"
+        )
+        self._conflicts = metrics.counter(
+            "idempotency_conflicts",
+            "Requests rejected: key in progress or reused with another body",
+        )
+
+    async def begin(
+        self, scope: str, key: str, fingerprint: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Захватывает ключ или возвращает сохранённый ответ.
+
+        Args:
+            scope: Эндпоинт.
+            key: Ключ идемпотентности.
+            fingerprint: Хэш тела запроса.
+
+        Returns:
+            dict | None: Сохранённый ответ или None, если запрос нужно обработать.
+
+        Raises:
+            IdempotencyInProgressError: Запрос с ключом ещё обрабатывается.
+            IdempotencyMismatchError: Ключ использован с другим телом.
+        """
+        async with AsyncSessionLocal() as session:
+            existing = await claim_idempotency_key(
+                session, scope, key, fingerprint, self.lease
+            )
+
+        if existing is None:
+            return None
+
+        if existing.request_hash != fingerprint:
+            self._conflicts.inc()
+            raise IdempotencyMismatchError(
+                "Ключ идемпотентности уже использован с другим запросом"
+            )
+        if existing.status != IdempotencyStatusEnum.completed:
+            self._conflicts.inc()
+            raise IdempotencyInProgressError("Запрос с этим ключом ещё обрабатывается")
+
+        self._replays.inc()
+        logger.info(
+            "Повтор запроса %s с ключом %s: возвращён сохранённый ответ", scope, key
+        )
+        return existing.response
+
+    async def complete(
+        self, scope: str, key: str, response: Dict[str, Any], status_code: int = 200
+    ) -> None:
+        """Сохраняет ответ обработанного запроса на ttl."""
+        async with AsyncSessionLocal() as session:
+            await complete_idempotency_key(
+                session, scope, key, status_code, response, self.ttl
+            )
+
+    async def release(self, scope: str, key: str) -> None:
+        """Освобождает ключ после ошибки обработки (ошибки БД только логируются)."""
+        try:
+            async with AsyncSessionLocal() as session:
+                await release_idempotency_key(session, scope, key)
+        except Exception as e:
+            logger.error("Не удалось освободить ключ идемпотентности %s: %s", key, e)
+
+    async def start(self) -> None:
+        """Запускает периодическое удаление истёкших ключей."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._purge(), name="idempotency-purge")
+
+    async def stop(self) -> None:
+        """Останавливает удаление истёкших ключей."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def _purge(self) -> None:
+        """Цикл удаления истёкших ключей."""
+        while True:
+            try:
+                async with AsyncSessionLocal() as session:
+                    deleted = await delete_expired_idempotency_keys(session)
+                if deleted:
+                    logger.info("Удалено истёкших ключей идемпотентности: %s", deleted)
+            except Exception as e:
+                logger.exception("Ошибка удаления ключей идемпотентности: %s", e)
+            await asyncio.sleep(self.purge_interval)
+
+
+idempotency = IdempotencyService(
+    ttl=settings.idempotency_ttl,
+    lease=settings.idempotency_lease,
+    purge_interval=settings.idempotency_purge_interval,
+)
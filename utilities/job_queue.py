@@ -0,0 +1,507 @@
+"""
+Очередь фоновых задач с асинхронными воркерами.
+
+Позволяет вынести тяжёлые шаги (генерация PDF, загрузка в Dropbox,
+обновление БД) из обработчиков HTTP-запросов: эндпоинт ставит задачу
+в очередь и сразу отвечает клиенту, а воркеры выполняют её в фоне.
+
+Содержит:
+    - JobRecord: снимок состояния задачи, не зависящий от хранилища.
+    - JobStore: интерфейс хранилища задач.
+    - PostgresJobStore: хранилище на таблице jobs (durable).
+    - InMemoryJobStore: локальное хранилище для тестов и отладки.
+    - JobQueue: реестр обработчиков, воркеры, ретраи и backpressure.
+    - job_queue: общий экземпляр очереди приложения.
+
+Особенности:
+    - задачи переживают перезапуск процесса (PostgresJobStore);
+    - повтор с экспоненциальной задержкой до max_attempts попыток;
+    - выполняющаяся задача периодически обновляет updated_at (heartbeat),
+      поэтому в очередь возвращаются только задачи, чей процесс завершился;
+    - «зависшие» в running задачи возвращаются в очередь при старте
+      и затем раз в половину job_stale_timeout;
+    - при превышении job_max_pending постановка отклоняется QueueFullError.
+"""
+
+import asyncio
+import itertools
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings
+from database.base import AsyncSessionLocal
+from database.crud.job import (
+    claim_next_job,
+    complete_job,
+    count_active_jobs,
+    create_job,
+    fail_job,
+    read_job_by_id,
+    requeue_stale_jobs,
+    touch_running_job,
+)
+from database.models import Job, JobStatusEnum
+from logging_config import logger
+
+JobHandler = Callable[[Dict[str, Any]], Awaitable[Optional[Dict[str, Any]]]]
+
+
+class QueueFullError(Exception):
+    """Очередь переполнена: новая задача не может быть принята."""
+
+
+@dataclass(frozen=True)
+class JobRecord:
+    """Снимок состояния фоновой задачи."""
+
+    id: int
+    kind: str
+    payload: Dict[str, Any]
+    status: JobStatusEnum
+    attempts: int
+    max_attempts: int
+    result: Optional[Dict[str, Any]] = None
+    last_error: Optional[str] = None
+
+    @classmethod
+    def from_model(cls, job: Job) -> "JobRecord":
+        """Создаёт снимок из ORM-объекта Job."""
+        return cls(
+            id=job.id,
+            kind=job.kind,
+            payload=job.payload,
+            status=job.status,
+            attempts=job.attempts,
+            max_attempts=job.max_attempts,
+            result=job.result,
+            last_error=job.last_error,
+        )
+
+
+# ---------------------------------------------------------------------------
+# Хранилища задач
+# ---------------------------------------------------------------------------
+
+
+class JobStore(ABC):
+    """Интерфейс хранилища задач, используемого JobQueue."""
+
+    @abstractmethod
+    async def enqueue(
+        self,
+        kind: str,
+        payload: Dict[str, Any],
+        max_attempts: int,
+        session: Optional[AsyncSession] = None,
+    ) -> JobRecord:
+        """
+        Сохраняет новую задачу в статусе pending.
+
+        С session задача фиксируется в транзакции этой сессии вместе
+        с уже добавленными в неё записями.
+        """
+
+    @abstractmethod
+    async def get(self, job_id: int) -> Optional[JobRecord]:
+        """Возвращает задачу по ID."""
+
+    @abstractmethod
+    async def claim(self) -> Optional[JobRecord]:
+        """Захватывает следующую готовую задачу (pending → running)."""
+
+    @abstractmethod
+    async def complete(self, job_id: int, result: Optional[Dict[str, Any]]) -> None:
+        """Отмечает задачу выполненной."""
+
+    @abstractmethod
+    async def fail(self, job_id: int, error: str, retry_in: Optional[float]) -> None:
+        """Фиксирует ошибку; retry_in=None означает окончательный провал."""
+
+    @abstractmethod
+    async def count_active(self) -> int:
+        """Возвращает количество задач в статусах pending и running."""
+
+    @abstractmethod
+    async def heartbeat(self, job_id: int) -> bool:
+        """Продлевает выполняющуюся задачу; False, если она уже не running."""
+
+    @abstractmethod
+    async def requeue_stale(self, older_than: float) -> int:
+        """Возвращает в очередь задачи, зависшие в running."""
+
+
+class PostgresJobStore(JobStore):
+    """Хранилище задач на таблице jobs в PostgreSQL."""
+
+    async def enqueue(
+        self,
+        kind: str,
+        payload: Dict[str, Any],
+        max_attempts: int,
+        session: Optional[AsyncSession] = None,
+    ) -> JobRecord:
+        if session is not None:
+            job = await create_job(session, kind, payload, max_attempts)
+            return JobRecord.from_model(job)
+        async with AsyncSessionLocal() as session:
+            job = await create_job(session, kind, payload, max_attempts)
+            return JobRecord.from_model(job)
+
+    async def get(self, job_id: int) -> Optional[JobRecord]:
+        async with AsyncSessionLocal() as session:
+            job = await read_job_by_id(session, job_id)
+            return JobRecord.from_model(job) if job else None
+
+    async def claim(self) -> Optional[JobRecord]:
+        async with AsyncSessionLocal() as session:
+            job = await claim_next_job(session)
+            return JobRecord.from_model(job) if job else None
+
+    async def complete(self, job_id: int, result: Optional[Dict[str, Any]]) -> None:
+        async with AsyncSessionLocal() as session:
+            await complete_job(session, job_id, result)
+
+    async def fail(self, job_id: int, error: str, retry_in: Optional[float]) -> None:
+        async with AsyncSessionLocal() as session:
+            await fail_job(session, job_id, error, retry_in)
+
+    async def count_active(self) -> int:
+        async with AsyncSessionLocal() as session:
+            return await count_active_jobs(session)
+
+    async def heartbeat(self, job_id: int) -> bool:
+        async with AsyncSessionLocal() as session:
+            return await touch_running_job(session, job_id)
+
+    async def requeue_stale(self, older_than: float) -> int:
+        async with AsyncSessionLocal() as session:
+            return await requeue_stale_jobs(session, older_than)
+
+
+class InMemoryJobStore(JobStore):
+    """
+    Хранилище задач в памяти процесса.
+
+    Не переживает перезапуск; предназначено для тестов и локального
+    запуска без PostgreSQL. Аргумент session у enqueue игнорируется.
+    """
+
+    def __init__(self) -> None:
+        self._jobs: Dict[int, JobRecord] = {}
+        self._run_after: Dict[int, datetime] = {}
+        self._updated_at: Dict[int, datetime] = {}
+        self._ids = itertools.count(1)
+
+    async def enqueue(
+        self,
+        kind: str,
+        payload: Dict[str, Any],
+        max_attempts: int,
+        session: Optional[AsyncSession] = None,
+    ) -> JobRecord:
+        now = datetime.now(timezone.utc)
+        job = JobRecord(
+            id=next(self._ids),
+            kind=kind,
+            payload=payload,
+            status=JobStatusEnum.pending,
+            attempts=0,
+            max_attempts=max_attempts,
+        )
+        self._jobs[job.id] = job
+        self._run_after[job.id] = now
+        self._updated_at[job.id] = now
+        return job
+
+    async def get(self, job_id: int) -> Optional[JobRecord]:
+        return self._jobs.get(job_id)
+
+    async def claim(self) -> Optional[JobRecord]:
+        now = datetime.now(timezone.utc)
+        for job in self._jobs.values():
+            if job.status == JobStatusEnum.pending and self._run_after[job.id] <= now:
+                claimed = replace(
+                    job, status=JobStatusEnum.running, attempts=job.attempts + 1
+                )
+                self._jobs[job.id] = claimed
+                self._updated_at[job.id] = now
+                return claimed
+        return None
+
+    async def complete(self, job_id: int, result: Optional[Dict[str, Any]]) -> None:
+        self._jobs[job_id] = replace(
+            self._jobs[job_id],
+            status=JobStatusEnum.done,
+            result=result,
+            last_error=None,
+        )
+        self._updated_at[job_id] = datetime.now(timezone.utc)
+
+    async def fail(self, job_id: int, error: str, retry_in: Optional[float]) -> None:
+        now = datetime.now(timezone.utc)
+        status = JobStatusEnum.failed if retry_in is None else JobStatusEnum.pending
+        self._jobs[job_id] = replace(
+            self._jobs[job_id], status=status, last_error=error
+        )
+        self._updated_at[job_id] = now
+        if retry_in is not None:
+            self._run_after[job_id] = now + timedelta(seconds=retry_in)
+
+    async def count_active(self) -> int:
+        active = {JobStatusEnum.pending, JobStatusEnum.running}
+        return sum(1 for job in self._jobs.values() if job.status in active)
+
+    async def heartbeat(self, job_id: int) -> bool:
+        job = self._jobs.get(job_id)
+        if job is None or job.status != JobStatusEnum.running:
+            return False
+        self._updated_at[job_id] = datetime.now(timezone.utc)
+        return True
+
+    async def requeue_stale(self, older_than: float) -> int:
+        now = datetime.now(timezone.utc)
+        deadline = now - timedelta(seconds=older_than)
+        requeued = 0
+        for job_id, job in self._jobs.items():
+            if (
+                job.status == JobStatusEnum.running
+                and self._updated_at[job_id] < deadline
+            ):
+                self._jobs[job_id] = replace(job, status=JobStatusEnum.pending)
+                self._run_after[job_id] = now
+                self._updated_at[job_id] = now
+                requeued += 1
+        return requeued
+
+
+# ---------------------------------------------------------------------------
+# Очередь и воркеры
+# ---------------------------------------------------------------------------
+
+
+class JobQueue:
+    """
+    Очередь фоновых задач с пулом асинхронных воркеров.
+
+    Args:
+        store: Хранилище задач.
+        workers: Количество воркеров.
+        max_pending: Максимум незавершённых задач (backpressure).
+        max_attempts: Максимальное количество попыток для одной задачи.
+        poll_interval: Интервал опроса хранилища при пустой очереди (сек).
+        retry_base_delay: Базовая задержка повтора (сек), растёт экспоненциально.
+        stale_timeout: Через сколько секунд задача в running считается зависшей;
+            проверка зависших задач выполняется раз в stale_timeout / 2.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        workers: int = 2,
+        max_pending: int = 500,
+        max_attempts: int = 5,
+        poll_interval: float = 1.0,
+        retry_base_delay: float = 2.0,
+        stale_timeout: float = 600.0,
+    ) -> None:
+        self.store = store
+        self.workers = workers
+        self.max_pending = max_pending
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+        self.retry_base_delay = retry_base_delay
+        self.stale_timeout = stale_timeout
+
+        self._handlers: Dict[str, JobHandler] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+
+    def register(self, kind: str, handler: JobHandler) -> None:
+        """Регистрирует обработчик для задач указанного типа."""
+        if kind in self._handlers:
+            logger.warning("Job handler for '%s' is already registered", kind)
+        self._handlers[kind] = handler
+
+    async def enqueue(
+        self,
+        kind: str,
+        payload: Dict[str, Any],
+        session: Optional[AsyncSession] = None,
+        check_capacity: bool = True,
+    ) -> JobRecord:
+        """
+        Ставит задачу в очередь.
+
+        Args:
+            kind: Тип задачи.
+            payload: Входные данные обработчика.
+            session: Сессия, в транзакции которой сохраняется задача
+                (вместе с уже добавленными в неё записями).
+            check_capacity: Проверить заполненность очереди. False — если
+                вызывающий уже проверил её через ensure_capacity.
+
+        Raises:
+            QueueFullError: если незавершённых задач не меньше max_pending.
+            ValueError: если для типа задачи нет обработчика.
+        """
+        if kind not in self._handlers:
+            raise ValueError(f"Неизвестный тип задачи: {kind}")
+
+        if check_capacity:
+            await self.ensure_capacity()
+        job = await self.store.enqueue(kind, payload, self.max_attempts, session)
+        self._wakeup.set()
+        return job
+
+    async def ensure_capacity(self) -> None:
+        """
+        Проверяет, может ли очередь принять ещё одну задачу.
+
+        Raises:
+            QueueFullError: если незавершённых задач не меньше max_pending.
+        """
+        if await self.store.count_active() >= self.max_pending:
+            raise QueueFullError("Очередь фоновых задач переполнена")
+
+    async def get(self, job_id: int) -> Optional[JobRecord]:
+        """Возвращает состояние задачи по ID."""
+        return await self.store.get(job_id)
+
+    async def start(self) -> None:
+        """
+        Возвращает зависшие задачи в очередь и запускает воркеры
+        и периодическую проверку зависших задач.
+        """
+        if self._tasks:
+            return
+
+        self._stopping = False
+        requeued = await self.store.requeue_stale(self.stale_timeout)
+        if requeued:
+            logger.warning("Requeued %s stale jobs on startup", requeued)
+
+        self._tasks = [
+            asyncio.create_task(self._worker(n), name=f"job-worker-{n}")
+            for n in range(self.workers)
+        ]
+        self._tasks.append(
+            asyncio.create_task(self._requeue_stale_loop(), name="job-requeue-stale")
+        )
+
+    async def stop(self) -> None:
+        """Останавливает воркеры; прерванные задачи вернутся в очередь при старте."""
+        self._stopping = True
+        self._wakeup.set()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _worker(self, number: int) -> None:
+        """Цикл воркера: захват задачи, выполнение, ожидание новых задач."""
+        while not self._stopping:
+            try:
+                job = await self.store.claim()
+            except Exception as e:
+                logger.exception("Job worker %s failed to claim a job: %s", number, e)
+                job = None
+
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(
+                        self._wakeup.wait(), timeout=self.poll_interval
+                    )
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            try:
+                await self._run_job(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Результат не записан (например, БД недоступна): задача
+                # останется в running, её heartbeat остановлен, поэтому
+                # _requeue_stale_loop вернёт её в очередь через stale_timeout
+                logger.exception(
+                    "Job worker %s failed to record job %s: %s", number, job.id, e
+                )
+                await asyncio.sleep(self.poll_interval)
+
+    async def _requeue_stale_loop(self) -> None:
+        """Раз в stale_timeout / 2 возвращает зависшие задачи в очередь."""
+        while not self._stopping:
+            await asyncio.sleep(self.stale_timeout / 2)
+            try:
+                requeued = await self.store.requeue_stale(self.stale_timeout)
+            except Exception as e:
+                logger.exception("Failed to requeue stale jobs: %s", e)
+                continue
+            if requeued:
+                logger.warning("Requeued %s stale jobs", requeued)
+                self._wakeup.set()
+
+    async def _run_job(self, job: JobRecord) -> None:
+        """Выполняет задачу и фиксирует результат или ошибку."""
+        handler = self._handlers.get(job.kind)
+        if handler is None:
+            await self.store.fail(job.id, f"No handler for kind '{job.kind}'", None)
+            return
+
+        if job.attempts > job.max_attempts:
+            await self.store.fail(job.id, job.last_error or "Attempts exhausted", None)
+            return
+
+        heartbeat = asyncio.create_task(
+            self._heartbeat(job), name=f"job-heartbeat-{job.id}"
+        )
+        try:
+            result = await handler(job.payload)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            retry_in: Optional[float] = None
+            if job.attempts < job.max_attempts:
+                retry_in = self.retry_base_delay * (2 ** (job.attempts - 1))
+
+            logger.exception(
+                "Job %s (%s) failed, attempt %s/%s: %s",
+                job.id,
+                job.kind,
+                job.attempts,
+                job.max_attempts,
+                e,
+            )
+            await self.store.fail(job.id, str(e) or type(e).__name__, retry_in)
+            return
+        finally:
+            heartbeat.cancel()
+            await asyncio.gather(heartbeat, return_exceptions=True)
+
+        await self.store.complete(job.id, result)
+
+    async def _heartbeat(self, job: JobRecord) -> None:
+        """Пока задача выполняется, продлевает её раз в треть stale_timeout."""
+        while True:
+            await asyncio.sleep(self.stale_timeout / 3)
+            try:
+                await self.store.heartbeat(job.id)
+            except Exception as e:
+                logger.warning("Job %s heartbeat failed: %s", job.id, e)
+
+
+job_queue = JobQueue(
+    PostgresJobStore(),
+    workers=settings.job_workers,
+    max_pending=settings.job_max_pending,
+    max_attempts=settings.job_max_attempts,
+    poll_interval=settings.job_poll_interval,
+    retry_base_delay=settings.job_retry_base_delay,
+    stale_timeout=settings.job_stale_timeout,
+)
@@ -0,0 +1,163 @@
+"""
+Простые метрики процесса (счётчики и гистограммы).
+
+Содержит:
+    - Counter: монотонный счётчик.
+    - Histogram: гистограмма с фиксированными границами корзин.
+    - Gauge: текущее значение, вычисляемое при снятии снимка.
+    - MetricsRegistry: реестр метрик со снимком для API.
+    - metrics: общий реестр приложения.
+
+Метрики хранятся в памяти процесса и отдаются через GET /api/metrics.
+"""
+
+import threading
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Sequence, Tuple
+
+# Границы корзин по умолчанию (секунды)
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class Counter:
+    """Монотонно возрастающий счётчик."""
+
+    def __init__(self, description: str = "") -> None:
+        self.description = description
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Увеличивает счётчик на amount."""
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> float:
+        """Текущее значение счётчика."""
+        return self._value
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Возвращает значение счётчика для сериализации."""
+        return {"type": "counter", "value": self._value}
+
+
+class Histogram:
+    """Гистограмма наблюдений с фиксированными (кумулятивными) корзинами."""
+
+    def __init__(
+        self, description: str = "", buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> None:
+        self.description = description
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._count = 0
+        self._sum = 0.0
+        self._max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """Регистрирует одно наблюдение."""
+        with self._lock:
+            self._counts[bisect_left(self.buckets, value)] += 1
+            self._count += 1
+            self._sum += value
+            self._max = max(self._max, value)
+
+    @property
+    def count(self) -> int:
+        """Количество наблюдений."""
+        return self._count
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Возвращает состояние гистограммы для сериализации."""
+        with self._lock:
+            cumulative, buckets = 0, {}
+            for bound, count in zip(self.buckets, self._counts, strict=False):
+                cumulative += count
+                buckets[f"le_{bound}"] = cumulative
+            buckets["le_inf"] = self._count
+
+            return {
+                "type": "histogram",
+                "count": self._count,
+                "sum": round(self._sum, 6),
+                "avg": round(self._sum / self._count, 6) if self._count else 0.0,
+                "max": round(self._max, 6),
+                "buckets": buckets,
+            }
+
+
+class Gauge:
+    """Текущее значение (например, размер пула), читаемое функцией при снимке."""
+
+    def __init__(self, read: Callable[[], float], description: str = "") -> None:
+        self.description = description
+        self._read = read
+
+    @property
+    def value(self) -> float:
+        """Текущее значение."""
+        return self._read()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Возвращает текущее значение для сериализации."""
+        return {"type": "gauge", "value": self._read()}
+
+
+class MetricsRegistry:
+    """Реестр именованных метрик процесса."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, description: str = "") -> Counter:
+        """Возвращает счётчик с указанным именем, создавая его при необходимости."""
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = Counter(description)
+            return metric
+
+    def histogram(
+        self,
+        name: str,
+        description: str = "",
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Возвращает гистограмму с указанным именем, создавая её при необходимости."""
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = Histogram(description, buckets)
+            return metric
+
+    def gauge(
+        self, name: str, read: Callable[[], float], description: str = ""
+    ) -> Gauge:
+        """Регистрирует (или заменяет) показатель с указанным именем."""
+        with self._lock:
+            metric = self._metrics[name] = Gauge(read, description)
+            return metric
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Возвращает снимок всех метрик."""
+        with self._lock:
+            items = list(self._metrics.items())
+        return {name: metric.snapshot() for name, metric in sorted(items)}
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,506 @@
+"""
+Очередь исходящих уведомлений Telegram (outbox) и её диспетчер.
+
+Эндпоинты не обращаются к Telegram напрямую: уведомление сохраняется
+в таблицу notification_outbox, а фоновый диспетчер доставляет его
+с учётом лимитов Telegram. Время ответа API не зависит от Telegram,
+а сбои отправки не теряют уведомления.
+
+Содержит:
+    - OutboxMessage: снимок уведомления, не зависящий от хранилища.
+    - OutboxStore: интерфейс хранилища уведомлений.
+    - PostgresOutboxStore: хранилище на таблице notification_outbox.
+    - InMemoryOutboxStore: локальное хранилище для тестов и отладки.
+    - NotificationOutbox: постановка уведомлений и диспетчер доставки.
+    - notification_outbox: общий экземпляр приложения.
+
+Особенности:
+    - документы одного чата, накопившиеся за время ожидания, отправляются
+      альбомом sendMediaGroup (до album_size штук), то есть одним
+      сообщением вместо серии, упирающейся в лимит 1 сообщение/сек на чат;
+    - при ответе 429 уведомления переносятся на retry_after секунд
+      без траты попытки, при прочих временных ошибках — с экспоненциальной задержкой;
+    - ошибки запроса (400/403) не повторяются: уведомление помечается failed.
+
+Метрики:
+    - outbox_sent / outbox_failed: доставленные и окончательно
+      не доставленные уведомления.
+    - outbox_albums: отправленные альбомы.
+    - outbox_delivery_seconds: время от постановки в очередь до доставки.
+"""
+
+import asyncio
+import itertools
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Sequence, Union
+
+from aiogram.exceptions import (
+    TelegramBadRequest,
+    TelegramForbiddenError,
+    TelegramRetryAfter,
+)
+from aiogram.types import BufferedInputFile
+
+from config import settings
+from database.base import AsyncSessionLocal
+from database.crud.notification_outbox import (
+    claim_notifications,
+    create_notification,
+    fail_notifications,
+    mark_notifications_sent,
+    postpone_notifications,
+)
+from database.models import NotificationOutbox as NotificationOutboxModel
+from logging_config import logger
+from utilities.metrics import metrics
+from utilities.pdf_buffer import PdfDocument
+from utilities.telegram_notifications import AdminNotifier, admin_notifier
+
+
+@dataclass(frozen=True)
+class OutboxMessage:
+    """Снимок исходящего уведомления."""
+
+    id: int
+    chat_id: int
+    text: Optional[str]
+    document: Optional[bytes]
+    filename: Optional[str]
+    attempts: int
+    created_at: datetime
+
+    @classmethod
+    def from_model(cls, model: NotificationOutboxModel) -> "OutboxMessage":
+        """Создаёт снимок из ORM-модели."""
+        return cls(
+            id=model.id,
+            chat_id=model.chat_id,
+            text=model.text,
+            document=model.document,
+            filename=model.filename,
+            attempts=model.attempts,
+            created_at=model.created_at,
+        )
+
+
+class OutboxStore(ABC):
+    """Интерфейс хранилища исходящих уведомлений."""
+
+    @abstractmethod
+    async def add(
+        self,
+        chat_id: int,
+        text: Optional[str],
+        document: Optional[bytes],
+        filename: Optional[str],
+    ) -> int:
+        """Сохраняет уведомление и возвращает его ID."""
+
+    @abstractmethod
+    async def claim(self, limit: int, lease: float) -> List[OutboxMessage]:
+        """Захватывает пачку готовых к отправке уведомлений."""
+
+    @abstractmethod
+    async def mark_sent(self, ids: Sequence[int]) -> None:
+        """Отмечает уведомления как доставленные."""
+
+    @abstractmethod
+    async def fail(
+        self, ids: Sequence[int], error: str, retry_in: Optional[float]
+    ) -> None:
+        """Переносит уведомления на retry_in секунд или помечает failed (None)."""
+
+    @abstractmethod
+    async def postpone(self, ids: Sequence[int], error: str, retry_in: float) -> None:
+        """Переносит уведомления на retry_in секунд, не расходуя попытку."""
+
+
+class PostgresOutboxStore(OutboxStore):
+    """Хранилище уведомлений в PostgreSQL (таблица notification_outbox)."""
+
+    async def add(
+        self,
+        chat_id: int,
+        text: Optional[str],
+        document: Optional[bytes],
+        filename: Optional[str],
+    ) -> int:
+        async with AsyncSessionLocal() as session:
+            notification = await create_notification(
+                session, chat_id, text=text, document=document, filename=filename
+            )
+            return notification.id
+
+    async def claim(self, limit: int, lease: float) -> List[OutboxMessage]:
+        async with AsyncSessionLocal() as session:
+            notifications = await claim_notifications(session, limit, lease)
+            return [OutboxMessage.from_model(n) for n in notifications]
+
+    async def mark_sent(self, ids: Sequence[int]) -> None:
+        async with AsyncSessionLocal() as session:
+            await mark_notifications_sent(session, ids)
+
+    async def fail(
+        self, ids: Sequence[int], error: str, retry_in: Optional[float]
+    ) -> None:
+        async with AsyncSessionLocal() as session:
+            await fail_notifications(session, ids, error, retry_in)
+
+    async def postpone(self, ids: Sequence[int], error: str, retry_in: float) -> None:
+        async with AsyncSessionLocal() as session:
+            await postpone_notifications(session, ids, error, retry_in)
+
+
+class InMemoryOutboxStore(OutboxStore):
+    """
+    Хранилище уведомлений в памяти процесса.
+
+    Не переживает перезапуск; предназначено для тестов и локальной отладки.
+    """
+
+    def __init__(self) -> None:
+        self._ids = itertools.count(1)
+        self.messages: Dict[int, OutboxMessage] = {}
+        self.available_at: Dict[int, datetime] = {}
+        self.status: Dict[int, str] = {}
+        self.errors: Dict[int, str] = {}
+
+    async def add(
+        self,
+        chat_id: int,
+        text: Optional[str],
+        document: Optional[bytes],
+        filename: Optional[str],
+    ) -> int:
+        now = datetime.now(timezone.utc)
+        message = OutboxMessage(
+            next(self._ids), chat_id, text, document, filename, 0, now
+        )
+        self.messages[message.id] = message
+        self.available_at[message.id] = now
+        self.status[message.id] = "pending"
+        return message.id
+
+    async def claim(self, limit: int, lease: float) -> List[OutboxMessage]:
+        now = datetime.now(timezone.utc)
+        claimed = []
+        for message_id in sorted(self.messages):
+            if len(claimed) >= limit:
+                break
+            if (
+                self.status[message_id] == "pending"
+                and self.available_at[message_id] <= now
+            ):
+                message = replace(
+                    self.messages[message_id],
+                    attempts=self.messages[message_id].attempts + 1,
+                )
+                self.messages[message_id] = message
+                self.available_at[message_id] = now + timedelta(seconds=lease)
+                claimed.append(message)
+        return claimed
+
+    async def mark_sent(self, ids: Sequence[int]) -> None:
+        for message_id in ids:
+            self.status[message_id] = "sent"
+
+    async def fail(
+        self, ids: Sequence[int], error: str, retry_in: Optional[float]
+    ) -> None:
+        now = datetime.now(timezone.utc)
+        for message_id in ids:
+            self.errors[message_id] = error
+            if retry_in is None:
+                self.status[message_id] = "failed"
+            else:
+                self.available_at[message_id] = now + timedelta(seconds=retry_in)
+
+    async def postpone(self, ids: Sequence[int], error: str, retry_in: float) -> None:
+        now = datetime.now(timezone.utc)
+        for message_id in ids:
+            message = self.messages[message_id]
+            self.messages[message_id] = replace(
+                message, attempts=max(message.attempts - 1, 0)
+            )
+            self.errors[message_id] = error
+            self.available_at[message_id] = now + timedelta(seconds=retry_in)
+
+
+class NotificationOutbox:
+    """
+    Постановка уведомлений в outbox и диспетчер их доставки.
+
+    Args:
+        store: Хранилище уведомлений.
+        notifier: Отправитель сообщений Telegram.
+        batch_size: Сколько уведомлений захватывать за один проход.
+        album_size: Максимум документов в одном альбоме (Telegram: 2–10).
+        poll_interval: Интервал опроса хранилища при пустой очереди (сек).
+        lease_timeout: Аренда захваченных уведомлений (сек).
+        max_attempts: Максимальное количество попыток доставки.
+        retry_base_delay: Базовая задержка повтора (сек), растёт экспоненциально.
+    """
+
+    def __init__(
+        self,
+        store: OutboxStore,
+        notifier: AdminNotifier,
+        batch_size: int = 50,
+        album_size: int = 10,
+        poll_interval: float = 1.0,
+        lease_timeout: float = 120.0,
+        max_attempts: int = 8,
+        retry_base_delay: float = 5.0,
+    ) -> None:
+        self.store = store
+        self.notifier = notifier
+        self.batch_size = batch_size
+        self.album_size = max(1, min(album_size, 10))
+        self.poll_interval = poll_interval
+        self.lease_timeout = lease_timeout
+        self.max_attempts = max_attempts
+        self.retry_base_delay = retry_base_delay
+
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+
+        self._sent = metrics.counter("outbox_sent", "Outbox notifications delivered")
+        self._failed = metrics.counter(
+            "outbox_failed", "Outbox notifications given up after retries"
+        )
+        self._albums = metrics.counter("outbox_albums", "Outbox albums sent")
+        self._delivery = metrics.histogram(
+            "outbox_delivery_seconds",
+            "Time from enqueue to delivery of an outbox notification",
+            buckets=(0.5, 1, 2.5, 5, 10, 30, 60, 300, 900, 3600),
+        )
+
+    # ---- Постановка --------------------------------------------------------
+
+    async def enqueue_document(
+        self,
+        chat_id: int,
+        document: Union[PdfDocument, bytes],
+        caption: Optional[str] = None,
+        filename: Optional[str] = None,
+    ) -> int:
+        """
+        Ставит документ в очередь на отправку.
+
+        Args:
+            chat_id: ID чата получателя.
+            document: PDF-документ или содержимое файла.
+            caption: Подпись к документу.
+            filename: Имя файла (по умолчанию — имя PdfDocument).
+
+        Returns:
+            int: ID уведомления.
+        """
+        if isinstance(document, PdfDocument):
+            filename = filename or document.filename
+            data = (
+                await asyncio.to_thread(document.read)
+                if document.spilled
+                else document.read()
+            )
+        else:
+            data = document
+
+        message_id = await self.store.add(
+            chat_id, caption, data, filename or "document.pdf"
+        )
+        self._wakeup.set()
+        return message_id
+
+    async def enqueue_text(self, chat_id: int, text: str) -> int:
+        """Ставит текстовое сообщение в очередь на отправку."""
+        message_id = await self.store.add(chat_id, text, None, None)
+        self._wakeup.set()
+        return message_id
+
+    async def enqueue_admin_document(
+        self, document: Union[PdfDocument, bytes], caption: Optional[str] = None
+    ) -> int:
+        """Ставит документ для администратора (ADMIN_TELEGRAM_ID) в очередь."""
+        return await self.enqueue_document(
+            settings.admin_telegram_id, document, caption=caption
+        )
+
+    # ---- Диспетчер ---------------------------------------------------------
+
+    async def start(self) -> None:
+        """Запускает диспетчер доставки."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="notification-outbox")
+
+    async def stop(self) -> None:
+        """Останавливает диспетчер; незавершённые отправки повторятся после аренды."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def _run(self) -> None:
+        """Цикл диспетчера: захват пачки, доставка, ожидание новых уведомлений."""
+        while True:
+            try:
+                batch = await self.store.claim(self.batch_size, self.lease_timeout)
+            except Exception as e:
+                logger.exception("Outbox dispatcher failed to claim messages: %s", e)
+                batch = []
+
+            if batch:
+                try:
+                    await self.dispatch(batch)
+                except Exception as e:
+                    # Результат не записан: уведомления повторятся после аренды
+                    logger.exception("Outbox dispatcher failed to deliver batch: %s", e)
+                    await asyncio.sleep(self.poll_interval)
+                continue
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def dispatch(self, batch: Sequence[OutboxMessage]) -> None:
+        """Доставляет пачку уведомлений; чаты обрабатываются параллельно."""
+        by_chat: Dict[int, List[OutboxMessage]] = {}
+        for message in batch:
+            by_chat.setdefault(message.chat_id, []).append(message)
+
+        results = await asyncio.gather(
+            *(
+                self._dispatch_chat(chat_id, items)
+                for chat_id, items in by_chat.items()
+            ),
+            return_exceptions=True,
+        )
+        # Сбой одного чата (например, БД при записи результата) не прерывает
+        # остальные; его уведомления повторятся после истечения аренды
+        for chat_id, result in zip(by_chat, results, strict=True):
+            if isinstance(result, asyncio.CancelledError):
+                raise result
+            if isinstance(result, Exception):
+                logger.error(
+                    "Outbox: failed to record delivery for chat %s: %s", chat_id, result
+                )
+
+    async def _dispatch_chat(self, chat_id: int, items: List[OutboxMessage]) -> None:
+        """Доставляет уведомления одного чата: документы альбомами, тексты по одному."""
+        documents = [m for m in items if m.document is not None]
+        texts = [m for m in items if m.document is None]
+
+        groups: List[List[OutboxMessage]] = [
+            documents[i : i + self.album_size]
+            for i in range(0, len(documents), self.album_size)
+        ]
+        groups += [[m] for m in texts]
+        groups.sort(key=lambda group: group[0].id)
+
+        for number, group in enumerate(groups):
+            retry_after = await self._deliver(chat_id, group)
+            if retry_after is not None:
+                # Чат упёрся в лимит: остальные сообщения ждут того же срока
+                rest = [m for g in groups[number + 1 :] for m in g]
+                if rest:
+                    await self.store.postpone(
+                        [m.id for m in rest], "Postponed: chat rate limit", retry_after
+                    )
+                return
+
+    async def _deliver(
+        self, chat_id: int, group: List[OutboxMessage]
+    ) -> Optional[float]:
+        """
+        Отправляет одно сообщение или альбом и фиксирует результат.
+
+        Returns:
+            float | None: retry_after, если Telegram ограничил частоту для чата.
+        """
+        ids = [m.id for m in group]
+        try:
+            if group[0].document is None:
+                await self.notifier.send_message(chat_id, group[0].text or "")
+            elif len(group) == 1:
+                await self.notifier.send_document(
+                    chat_id,
+                    _as_pdf_document(group[0]),
+                    caption=group[0].text,
+                )
+            else:
+                await self.notifier.send_media_group(
+                    chat_id,
+                    [
+                        (
+                            BufferedInputFile(m.document or b"", m.filename or "doc"),
+                            m.text,
+                        )
+                        for m in group
+                    ],
+                )
+                self._albums.inc()
+        except asyncio.CancelledError:
+            raise
+        except TelegramRetryAfter as e:
+            logger.warning(
+                "Outbox: Telegram rate limit for chat %s, postponing %s messages",
+                chat_id,
+                len(ids),
+            )
+            # Ограничение частоты — не ошибка доставки: попытка не расходуется
+            await self.store.postpone(ids, str(e), float(e.retry_after))
+            return float(e.retry_after)
+        except (TelegramBadRequest, TelegramForbiddenError) as e:
+            logger.error("Outbox: Telegram rejected messages %s: %s", ids, e)
+            await self._fail(group, str(e), None)
+            return None
+        except Exception as e:
+            logger.exception("Outbox: failed to deliver messages %s: %s", ids, e)
+            attempts = max(m.attempts for m in group)
+            retry_in = self.retry_base_delay * (2 ** (attempts - 1))
+            await self._fail(group, str(e) or type(e).__name__, retry_in)
+            return None
+
+        await self.store.mark_sent(ids)
+        now = datetime.now(timezone.utc)
+        for message in group:
+            self._sent.inc()
+            self._delivery.observe((now - message.created_at).total_seconds())
+        return None
+
+    async def _fail(
+        self, group: List[OutboxMessage], error: str, retry_in: Optional[float]
+    ) -> None:
+        """Переносит уведомления или помечает failed после исчерпания попыток."""
+        retry_ids = [m.id for m in group if m.attempts < self.max_attempts]
+        failed_ids = [m.id for m in group if m.attempts >= self.max_attempts]
+
+        if retry_in is not None and retry_ids:
+            await self.store.fail(retry_ids, error, retry_in)
+        else:
+            failed_ids += retry_ids
+
+        if failed_ids:
+            self._failed.inc(len(failed_ids))
+            await self.store.fail(failed_ids, error, None)
+
+
+def _as_pdf_document(message: OutboxMessage) -> PdfDocument:
+    """Оборачивает содержимое уведомления в PdfDocument для отправки."""
+    return PdfDocument(message.filename or "document.pdf", data=message.document)
+
+
+notification_outbox = NotificationOutbox(
+    PostgresOutboxStore(),
+    admin_notifier,
+    batch_size=settings.outbox_batch_size,
+    album_size=settings.outbox_album_size,
+    poll_interval=settings.outbox_poll_interval,
+    lease_timeout=settings.outbox_lease_timeout,
+    max_attempts=settings.outbox_max_attempts,
+    retry_base_delay=settings.outbox_retry_base_delay,
+)
@@ -0,0 +1,136 @@
+"""
+Сгенерированный PDF-документ в памяти (с выгрузкой на диск для больших файлов).
+
+Рендеринг выполняется в BytesIO внутри процесса-воркера; результат
+передаётся загрузке в Dropbox и уведомлению в Telegram без промежуточных
+файлов. Если документ больше порога, воркер сохраняет его во временный
+файл, чтобы не держать и не передавать между процессами большой буфер.
+
+Содержит:
+    - PdfDocument: имя файла и содержимое (bytes или временный файл).
+    - render_to_document: рендеринг генератора utilities.pdf_generation
+      в PdfDocument.
+"""
+
+import io
+import os
+import tempfile
+from typing import Any, BinaryIO, Callable, Optional
+
+
+class PdfDocument:
+    """
+    Готовый PDF: содержимое в памяти или во временном файле.
+
+    Объект сериализуем (pickle) и может возвращаться из пула процессов.
+    После использования документ нужно закрыть (close() или with),
+    чтобы удалить временный файл, если он был создан.
+
+    Args:
+        filename: Имя файла (без каталога).
+        data: Содержимое PDF, если документ хранится в памяти.
+        spill_path: Путь к временному файлу, если документ выгружен на диск.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        data: Optional[bytes] = None,
+        spill_path: Optional[str] = None,
+    ) -> None:
+        if (data is None) == (spill_path is None):
+            raise ValueError("Нужно указать либо data, либо spill_path")
+        self.filename = filename
+        self._data = data
+        self.spill_path = spill_path
+
+    @property
+    def spilled(self) -> bool:
+        """True, если содержимое хранится во временном файле."""
+        return self.spill_path is not None
+
+    @property
+    def size(self) -> int:
+        """Размер документа в байтах."""
+        if self._data is not None:
+            return len(self._data)
+        if self.spill_path is None:
+            return 0
+        return os.path.getsize(self.spill_path)
+
+    def getbuffer(self) -> memoryview:
+        """
+        Возвращает содержимое документа без копирования (для документа в памяти).
+
+        Для выгруженного документа файл читается с диска.
+        """
+        if self._data is not None:
+            return memoryview(self._data)
+        return memoryview(self.read())
+
+    def read(self) -> bytes:
+        """Возвращает содержимое документа."""
+        if self._data is not None:
+            return self._data
+        if self.spill_path is None:
+            raise ValueError("Документ уже закрыт")
+        with open(self.spill_path, "rb") as f:
+            return f.read()
+
+    def open(self) -> BinaryIO:
+        """Открывает документ как бинарный поток для чтения."""
+        if self._data is not None:
+            return io.BytesIO(self._data)
+        if self.spill_path is None:
+            raise ValueError("Документ уже закрыт")
+        return open(self.spill_path, "rb")
+
+    def close(self) -> None:
+        """Удаляет временный файл (если был) и освобождает буфер."""
+        path, self.spill_path, self._data = self.spill_path, None, None
+        if path is not None:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def __enter__(self) -> "PdfDocument":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        where = "disk" if self.spilled else "memory"
+        return f"PdfDocument({self.filename!r}, {where})"
+
+
+def render_to_document(
+    func: Callable[..., str],
+    kwargs: dict,
+    spill_threshold: int,
+    spill_dir: Optional[str] = None,
+) -> PdfDocument:
+    """
+    Рендерит PDF генератором в память и упаковывает в PdfDocument.
+
+    Args:
+        func: Генератор из utilities.pdf_generation (принимает output=).
+        kwargs: Аргументы генератора.
+        spill_threshold: Размер (байт), начиная с которого документ
+            выгружается во временный файл; 0 — не выгружать никогда.
+        spill_dir: Каталог временных файлов (по умолчанию системный).
+
+    Returns:
+        PdfDocument: Документ в памяти или во временном файле.
+    """
+    buffer = io.BytesIO()
+    filename = func(output=buffer, **kwargs)
+
+    if spill_threshold and buffer.getbuffer().nbytes >= spill_threshold:
+        fd, path = tempfile.mkstemp(suffix=".pdf", dir=spill_dir)
+        with os.fdopen(fd, "wb") as f:
+            f.write(buffer.getbuffer())
+        return PdfDocument(filename, spill_path=path)
+
+    return PdfDocument(filename, data=buffer.getvalue())
@@ -7,13 +7,16 @@
 Функции:
     - generate_application_pdf(...)
     - generate_test_report(...)
+
+Генераторы пишут PDF либо в файл в output_dir, либо в переданный
+бинарный поток (output=BytesIO()), не касаясь диска.
 """
 
 from __future__ import annotations
 
 import os
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, BinaryIO, Dict, List, Optional
 
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
@@ -240,6 +243,7 @@ def generate_application_pdf(
     need_ielts: Optional[bool] = None,
     output_dir: Optional[str] = None,
     is_update: bool = False,
+    output: Optional[BinaryIO] = None,
 ) -> str:
     """
     Генерирует PDF-файл заявки и возвращает путь к файлу.
@@ -260,23 +264,27 @@ def generate_application_pdf(
         notes: Дополнительные заметки администратора.
         output_dir: Папка для сохранения (по умолчанию ./generated_pdfs).
         is_update: Флаг — это обновлённая заявка.
+        output: Бинарный поток для записи PDF; если указан,
+            файл на диске не создаётся, а output_dir игнорируется.
 
     Returns:
-        str: Абсолютный путь к сгенерированному PDF.
+        str: Абсолютный путь к сгенерированному PDF
+            (или имя файла, если PDF записан в output).
     """
 
     try:
-        out_dir = output_dir or os.path.join(os.getcwd(), "generated_pdfs")
-        os.makedirs(out_dir, exist_ok=True)
-
         timestamp = datetime.now().strftime(TIMESTAMP_FMT)
         prefix = "UPDATED_APPLICATION" if is_update else "NEW_APPLICATION"
         safe_name = applicant_name.replace(" ", "_")
         filename = f"{prefix}_{safe_name}_{timestamp}_{telegram_id}.pdf"
-        filepath = os.path.join(out_dir, filename)
+
+        if output is None:
+            out_dir = output_dir or os.path.join(os.getcwd(), "generated_pdfs")
+            os.makedirs(out_dir, exist_ok=True)
+            filepath = os.path.join(out_dir, filename)
 
         doc = BaseDocTemplate(
-            filepath,
+            output if output is not None else filepath,
             pagesize=A4,
             rightMargin=2 * cm,
             leftMargin=2 * cm,
@@ -386,7 +394,7 @@ def generate_application_pdf(
         )
 
         doc.build(elements)
-        return filepath
+        return filename if output is not None else filepath
 
     except Exception as exc:
         logger.exception("Ошибка при генерации PDF заявки: %s", exc)
@@ -400,6 +408,7 @@ def generate_test_report(
     open_answers: Optional[Dict[str, Dict[str, Any]]],
     score: Dict[str, Any],
     output_dir: Optional[str] = None,
+    output: Optional[BinaryIO] = None,
 ) -> str:
     """
     Генерирует PDF-отчёт о тестировании и возвращает путь к файлу.
@@ -420,22 +429,25 @@ def generate_test_report(
         open_answers: Открытые ответы (может быть None).
         score: Словарь с баллами по заданиям.
         output_dir: Папка для сохранения (по умолчанию ./generated_reports).
+        output: Бинарный поток для записи PDF; если указан,
+            файл на диске не создаётся, а output_dir игнорируется.
 
     Returns:
-        str: Путь к сохранённому PDF.
+        str: Путь к сохранённому PDF (или имя файла, если PDF записан в output).
     """
 
     try:
-        reports_dir = output_dir or os.path.join(os.getcwd(), "generated_reports")
-        os.makedirs(reports_dir, exist_ok=True)
-
         timestamp = datetime.now().strftime(TIMESTAMP_FMT)
         safe_taker = (test_taker or "unknown").replace(" ", "_")
         filename = f"TEST_REPORT_{safe_taker}_{level}_{timestamp}.pdf"
-        filepath = os.path.join(reports_dir, filename)
+
+        if output is None:
+            reports_dir = output_dir or os.path.join(os.getcwd(), "generated_reports")
+            os.makedirs(reports_dir, exist_ok=True)
+            filepath = os.path.join(reports_dir, filename)
 
         doc = SimpleDocTemplate(
-            filepath,
+            output if output is not None else filepath,
             pagesize=A4,
             rightMargin=2 * cm,
             leftMargin=2 * cm,
@@ -540,6 +552,10 @@ def generate_test_report(
             onFirstPage=_add_background_and_border,
             onLaterPages=_add_background_and_border,
         )
+        if output is not None:
+            logger.info("PDF отчёт о тесте сгенерирован в памяти: %s", filename)
+            return filename
+
         logger.info("PDF отчёт о тесте сгенерирован: %s", filepath)
         return filepath
 
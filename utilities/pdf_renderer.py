@@ -0,0 +1,183 @@
+"""
+Сервис генерации PDF в пуле процессов.
+
+ReportLab выполняет рендеринг синхронно и нагружает CPU; вызов генераторов
+из utilities.pdf_generation прямо в async-обработчике останавливает весь
+event loop (API и Telegram-бот). Сервис переносит рендеринг в
+ProcessPoolExecutor и предоставляет асинхронный API. Воркеры рендерят
+в память и возвращают PdfDocument (utilities.pdf_buffer); документы
+больше PDF_SPILL_THRESHOLD байт выгружаются во временный файл.
+
+Содержит:
+    - RendererBusyError: превышена допустимая глубина очереди рендеринга.
+    - PdfRenderService: пул процессов, лимиты и метрики времени рендеринга.
+    - pdf_renderer: общий экземпляр сервиса приложения.
+
+Метрики:
+    - pdf_render_seconds.<kind>: время рендеринга внутри воркера.
+    - pdf_render_wait_seconds.<kind>: время ожидания свободного воркера.
+    - pdf_render_rejected: количество отклонённых из-за лимита запросов.
+    - pdf_spilled: количество документов, выгруженных на диск.
+"""
+
+import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Any, Callable, Optional, Tuple
+
+from config import settings
+from logging_config import logger
+from utilities.metrics import metrics
+from utilities.pdf_buffer import PdfDocument, render_to_document
+from utilities.pdf_generation import (
+    _register_fonts,
+    generate_application_pdf,
+    generate_test_report,
+)
+
+
+class RendererBusyError(Exception):
+    """Очередь рендеринга PDF переполнена."""
+
+
+def _init_worker() -> None:
+    """Инициализатор процесса-воркера: регистрирует шрифты один раз при старте."""
+    _register_fonts()
+
+
+def _timed_call(func: Callable[..., Any], kwargs: dict) -> Tuple[Any, float]:
+    """Выполняет рендеринг в воркере и возвращает результат и время выполнения."""
+    started = time.perf_counter()
+    result = func(**kwargs)
+    return result, time.perf_counter() - started
+
+
+class PdfRenderService:
+    """
+    Асинхронный фасад над пулом процессов ReportLab.
+
+    Args:
+        workers: Количество процессов-воркеров.
+        max_pending: Максимум одновременно ожидающих и выполняемых рендеров.
+        spill_threshold: Размер PDF (байт), начиная с которого документ
+            выгружается во временный файл; 0 — всегда в памяти.
+        spill_dir: Каталог временных файлов (по умолчанию системный).
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        max_pending: int = 20,
+        spill_threshold: int = 0,
+        spill_dir: Optional[str] = None,
+    ) -> None:
+        self.workers = workers
+        self.max_pending = max_pending
+        self.spill_threshold = spill_threshold
+        self.spill_dir = spill_dir
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = asyncio.Lock()
+        self._pending = 0
+        self._rejected = metrics.counter(
+            "pdf_render_rejected", "PDF renders rejected by the queue-depth limit"
+        )
+
+    @property
+    def pending(self) -> int:
+        """Текущее количество ожидающих и выполняемых рендеров."""
+        return self._pending
+
+    def start(self) -> None:
+        """Создаёт пул процессов (повторный вызов ничего не делает)."""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_init_worker
+            )
+
+    async def shutdown(self) -> None:
+        """Останавливает пул процессов, дожидаясь текущих рендеров."""
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            await asyncio.to_thread(pool.shutdown, wait=True)
+
+    async def _replace_broken_pool(
+        self, broken: ProcessPoolExecutor
+    ) -> ProcessPoolExecutor:
+        """
+        Заменяет сломанный пул новым и возвращает актуальный пул.
+
+        Пересоздаёт пул только первый вызов для данного сломанного пула;
+        остальные одновременные вызовы получают уже созданный им пул.
+        """
+        async with self._pool_lock:
+            if self._pool is broken:
+                logger.error("PDF process pool is broken, recreating it")
+                self._pool = None
+                await asyncio.to_thread(broken.shutdown, wait=True)
+            self.start()
+            assert self._pool is not None
+            return self._pool
+
+    async def render_application(self, **kwargs: Any) -> PdfDocument:
+        """Асинхронно генерирует PDF заявки (аргументы generate_application_pdf)."""
+        return await self._submit("application", generate_application_pdf, kwargs)
+
+    async def render_test_report(self, **kwargs: Any) -> PdfDocument:
+        """Асинхронно генерирует PDF отчёта (аргументы generate_test_report)."""
+        return await self._submit("test_report", generate_test_report, kwargs)
+
+    async def _submit(
+        self, kind: str, func: Callable[..., str], kwargs: dict
+    ) -> PdfDocument:
+        """Отправляет рендеринг в пул с учётом лимита и метрик."""
+        if self._pending >= self.max_pending:
+            self._rejected.inc()
+            raise RendererBusyError("Очередь генерации PDF переполнена")
+
+        self.start()
+        pool = self._pool
+        assert pool is not None
+
+        call = partial(
+            _timed_call,
+            render_to_document,
+            {
+                "func": func,
+                "kwargs": kwargs,
+                "spill_threshold": self.spill_threshold,
+                "spill_dir": self.spill_dir,
+            },
+        )
+
+        self._pending += 1
+        started = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            try:
+                result, render_time = await loop.run_in_executor(pool, call)
+            except BrokenProcessPool:
+                pool = await self._replace_broken_pool(pool)
+                result, render_time = await loop.run_in_executor(pool, call)
+        finally:
+            self._pending -= 1
+
+        total = time.perf_counter() - started
+        metrics.histogram(
+            f"pdf_render_seconds.{kind}", "PDF render time inside a worker"
+        ).observe(render_time)
+        metrics.histogram(
+            f"pdf_render_wait_seconds.{kind}", "Time spent waiting for a PDF worker"
+        ).observe(max(total - render_time, 0.0))
+        if result.spilled:
+            metrics.counter("pdf_spilled", "PDFs spilled to a temporary file").inc()
+        return result
+
+
+pdf_renderer = PdfRenderService(
+    workers=settings.pdf_workers,
+    max_pending=settings.pdf_max_pending,
+    spill_threshold=settings.pdf_spill_threshold,
+    spill_dir=settings.pdf_spill_dir or None,
+)
@@ -0,0 +1,307 @@
+"""
+Массовая перепроверка сохранённых результатов тестов.
+
+После исправления ключей ответов поля closed_answers / open_answers / score
+в test_results устаревают. Перепроверка читает результаты страницами
+по ключу (id > последний id), проверяет их в пуле процессов по снимку
+действующих ключей и записывает изменения пакетными
+UPDATE ... FROM (VALUES ...). В памяти одновременно находится
+не больше workers + 1 страниц, поэтому объём таблицы не ограничен.
+
+Каждый результат получает answer_key_version, поэтому повторный запуск
+продолжает с того места, где остановился прерванный (если не указан force).
+
+Содержит:
+    - RegradeProgress: прогресс и пропускная способность перепроверки.
+    - regrade_rows: перепроверка страницы результатов (выполняется в воркере).
+    - regrade_test_results: перепроверка всех подходящих результатов.
+    - REGRADE_JOB / register_regrade_jobs: запуск через очередь фоновых задач.
+    - CLI: python -m utilities.regrade [--level LEVEL] [--force] ...
+
+Метрики:
+    - regrade_rows: перепроверенные результаты.
+    - regrade_changed: результаты, оценка которых изменилась.
+    - regrade_batch_seconds: время проверки страницы в воркере.
+"""
+
+import argparse
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+from config import settings
+from database.base import AsyncSessionLocal
+from database.crud.test_result import (
+    RegradeRowType,
+    bulk_update_test_grades,
+    count_test_results_for_regrade,
+    read_test_results_for_regrade,
+)
+from logging_config import logger
+from utilities.answer_keys import answer_key_registry
+from utilities.check_function import (
+    AnswerKeyIndex,
+    get_answer_index,
+    grade,
+    restore_answers,
+    summarize_check_result,
+)
+from utilities.job_queue import JobQueue
+from utilities.metrics import metrics
+
+REGRADE_JOB = "regrade_test_results"
+
+# (changed: [(id, closed_answers, open_answers, score)], unchanged_ids)
+RegradeBatchResult = Tuple[List[Tuple[int, dict, Optional[dict], dict]], List[int]]
+
+_rows_total = metrics.counter("regrade_rows", "Test results regraded")
+_changed_total = metrics.counter(
+    "regrade_changed", "Regraded test results whose grade changed"
+)
+_batch_seconds = metrics.histogram(
+    "regrade_batch_seconds", "Time to regrade one batch in a worker"
+)
+
+# Индекс ключей процесса-воркера (передаётся один раз через initializer)
+_worker_index: Optional[AnswerKeyIndex] = None
+
+
+def _init_worker(index: AnswerKeyIndex) -> None:
+    """Инициализатор процесса-воркера: сохраняет снимок ключей."""
+    global _worker_index
+    _worker_index = index
+
+
+@dataclass
+class RegradeProgress:
+    """
+    Прогресс перепроверки.
+
+    Attributes:
+        total: Количество результатов, подлежащих перепроверке (на момент старта).
+        processed: Перепроверено результатов.
+        changed: Результатов, оценка которых изменилась.
+        last_id: ID последнего записанного результата.
+        answer_key_version: Версия ключей, по которой выполняется перепроверка.
+    """
+
+    total: int = 0
+    processed: int = 0
+    changed: int = 0
+    last_id: int = 0
+    answer_key_version: int = 0
+    started: float = field(default_factory=time.perf_counter)
+
+    @property
+    def elapsed(self) -> float:
+        """Время с начала перепроверки (сек)."""
+        return time.perf_counter() - self.started
+
+    @property
+    def rows_per_second(self) -> float:
+        """Пропускная способность (результатов в секунду)."""
+        elapsed = self.elapsed
+        return self.processed / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def percent(self) -> float:
+        """Доля выполненной работы (%)."""
+        return self.processed / self.total * 100 if self.total else 100.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Снимок прогресса для результата задачи и логов."""
+        return {
+            "total": self.total,
+            "processed": self.processed,
+            "changed": self.changed,
+            "last_id": self.last_id,
+            "answer_key_version": self.answer_key_version,
+            "elapsed": round(self.elapsed, 3),
+            "rows_per_second": round(self.rows_per_second, 1),
+        }
+
+
+def regrade_rows(
+    rows: Sequence[RegradeRowType], index: Optional[AnswerKeyIndex] = None
+) -> Tuple[RegradeBatchResult, float]:
+    """
+    Перепроверяет страницу результатов.
+
+    Args:
+        rows: (id, level, closed_answers, open_answers, score).
+        index: Индекс ключей (по умолчанию снимок воркера или действующий).
+
+    Returns:
+        tuple: ((изменившиеся результаты, ID неизменившихся), время проверки).
+    """
+    started = time.perf_counter()
+    index = index or _worker_index or get_answer_index()
+
+    changed: List[Tuple[int, dict, Optional[dict], dict]] = []
+    unchanged: List[int] = []
+
+    # Скалярная проверка: на этом пути (восстановление ответов, проверка,
+    # сборка полей) она быстрее пакетной (utilities.batch_grading),
+    # параллельность дают процессы пула
+    for row_id, level, closed, opened, score in rows:
+        answers = restore_answers(closed, opened)
+        new_closed, new_open, new_score = summarize_check_result(
+            answers, grade(level, answers, index)
+        )
+        new_open = new_open or None
+
+        if (new_closed, new_open, new_score) == (closed, opened, score):
+            unchanged.append(row_id)
+        else:
+            changed.append((row_id, new_closed, new_open, new_score))
+
+    return (changed, unchanged), time.perf_counter() - started
+
+
+def _log_progress(progress: RegradeProgress) -> None:
+    """Обработчик прогресса по умолчанию: запись в лог."""
+    logger.info(
+        "Перепроверка: %s/%s (%.1f%%), изменено %s, %.0f строк/с",
+        progress.processed,
+        progress.total,
+        progress.percent,
+        progress.changed,
+        progress.rows_per_second,
+    )
+
+
+async def regrade_test_results(
+    level: Optional[str] = None,
+    force: bool = False,
+    batch_size: Optional[int] = None,
+    workers: Optional[int] = None,
+    index: Optional[AnswerKeyIndex] = None,
+    on_progress: Callable[[RegradeProgress], None] = _log_progress,
+) -> RegradeProgress:
+    """
+    Перепроверяет сохранённые результаты тестов по действующим ключам.
+
+    Пока воркеры проверяют одни страницы, читается следующая; запись
+    выполняется в порядке чтения.
+
+    Args:
+        level: Перепроверить только указанный уровень.
+        force: Перепроверить и результаты, уже проверенные по этой версии.
+        batch_size: Размер страницы (по умолчанию REGRADE_BATCH_SIZE).
+        workers: Количество процессов (по умолчанию REGRADE_WORKERS).
+        index: Индекс ключей (по умолчанию действующий).
+        on_progress: Вызывается после записи каждой страницы.
+
+    Returns:
+        RegradeProgress: Итоговый прогресс.
+    """
+    index = index or get_answer_index()
+    batch_size = batch_size or settings.regrade_batch_size
+    workers = workers or settings.regrade_workers
+    exclude_version = None if force else index.version
+
+    async with AsyncSessionLocal() as session:
+        total = await count_test_results_for_regrade(session, level, exclude_version)
+
+    progress = RegradeProgress(total=total, answer_key_version=index.version)
+    logger.info("Перепроверка %s результатов по ключам версии %s", total, index.version)
+    if not total:
+        return progress
+
+    loop = asyncio.get_running_loop()
+    in_flight: Deque[Tuple[int, asyncio.Future]] = deque()
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(index,)
+    ) as pool:
+        after_id = 0
+        exhausted = False
+
+        while not exhausted or in_flight:
+            if not exhausted:
+                async with AsyncSessionLocal() as session:
+                    rows = await read_test_results_for_regrade(
+                        session, after_id, batch_size, level, exclude_version
+                    )
+                if rows:
+                    after_id = rows[-1][0]
+                    in_flight.append(
+                        (after_id, loop.run_in_executor(pool, regrade_rows, rows))
+                    )
+                exhausted = len(rows) < batch_size
+
+            if in_flight and (exhausted or len(in_flight) > workers):
+                last_id, future = in_flight.popleft()
+                (changed, unchanged), seconds = await future
+                _batch_seconds.observe(seconds)
+
+                async with AsyncSessionLocal() as session:
+                    await bulk_update_test_grades(
+                        session, changed, unchanged, index.version
+                    )
+
+                progress.processed += len(changed) + len(unchanged)
+                progress.changed += len(changed)
+                progress.last_id = last_id
+                _rows_total.inc(len(changed) + len(unchanged))
+                _changed_total.inc(len(changed))
+                on_progress(progress)
+
+    logger.info("Перепроверка завершена: %s", progress.as_dict())
+    return progress
+
+
+async def process_regrade(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Обработчик фоновой задачи перепроверки.
+
+    Задача идемпотентна: при повторе после сбоя уже перепроверенные
+    результаты пропускаются по answer_key_version. Пока она выполняется,
+    очередь продлевает её (heartbeat), поэтому долгая перепроверка
+    не возвращается в очередь как зависшая.
+
+    Args:
+        payload: {"level": str | None, "force": bool}.
+
+    Returns:
+        dict: Итоговый прогресс (RegradeProgress.as_dict).
+    """
+    progress = await regrade_test_results(
+        level=payload.get("level"), force=bool(payload.get("force"))
+    )
+    return progress.as_dict()
+
+
+def register_regrade_jobs(queue: JobQueue) -> None:
+    """Регистрирует обработчик перепроверки в очереди фоновых задач."""
+    queue.register(REGRADE_JOB, process_regrade)
+
+
+async def _main(args: argparse.Namespace) -> None:
+    """CLI: загружает действующие ключи из БД и запускает перепроверку."""
+    await answer_key_registry.reload()
+    progress = await regrade_test_results(
+        level=args.level,
+        force=args.force,
+        batch_size=args.batch_size,
+        workers=args.workers,
+    )
+    print(progress.as_dict())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Перепроверка сохранённых результатов тестов"
+    )
+    parser.add_argument("--level", help="Только указанный уровень (например, Starter)")
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Перепроверить и результаты, уже проверенные по текущей версии",
+    )
+    parser.add_argument("--batch-size", type=int, help="Размер страницы")
+    parser.add_argument("--workers", type=int, help="Количество процессов")
+    asyncio.run(_main(parser.parse_args()))
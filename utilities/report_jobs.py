@@ -0,0 +1,176 @@
+"""
+Фоновые задачи, связанные с PDF-отчётами о тестировании.
+
+Содержит:
+    - TEST_REPORT_JOB: тип задачи формирования отчёта.
+    - process_test_report: генерация PDF, загрузка в Dropbox
+      и привязка файла к записи TestResult.
+    - requeue_missing_reports: повторная постановка отчётов, которые
+      не были сформированы (задача исчерпала попытки или не была поставлена).
+    - register_report_jobs: регистрация обработчиков в очереди.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from database.base import AsyncSessionLocal
+from database.crud.test_result import (
+    attach_test_report,
+    read_test_result_by_id,
+    read_test_results_without_report,
+)
+from database.models import TestResult
+from logging_config import logger
+from utilities.dropbox_utils import get_dropbox_client, upload_to_dropbox
+from utilities.job_queue import JobQueue, QueueFullError
+from utilities.pdf_buffer import PdfDocument
+from utilities.pdf_renderer import pdf_renderer
+from utilities.submission_cache import (
+    report_lock,
+    report_pdf_cache,
+    report_upload_cache,
+)
+
+TEST_REPORT_JOB = "test_report"
+
+# Отчёт, не сформированный за это время, считается потерянным
+REPORT_REQUEUE_AFTER = timedelta(minutes=30)
+REPORT_REQUEUE_LIMIT = 500
+
+
+async def process_test_report(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Формирует PDF-отчёт по сохранённому результату теста и загружает его в Dropbox.
+
+    Задача идемпотентна: если отчёт уже привязан к результату
+    (например, при повторе после сбоя), повторная загрузка не выполняется.
+    Для повторной отправки той же формы (тот же submission_key в окне
+    кэша) привязывается уже загруженный файл, а при повторе после
+    неудачной загрузки используются закэшированные байты PDF.
+
+    Args:
+        payload: {"test_result_id": int, "submission_key": str | None}.
+
+    Returns:
+        dict: dropbox_path (при первой загрузке), dropbox_file_id и file_name.
+
+    Raises:
+        LookupError: если результат теста не найден.
+    """
+    test_result_id = int(payload["test_result_id"])
+    key = payload.get("submission_key")
+
+    async with AsyncSessionLocal() as session:
+        test_result = await read_test_result_by_id(session, test_result_id)
+
+    if test_result is None:
+        raise LookupError(f"TestResult {test_result_id} не найден")
+
+    if test_result.dropbox_file_id and test_result.file_name:
+        return {
+            "dropbox_file_id": test_result.dropbox_file_id,
+            "file_name": test_result.file_name,
+        }
+
+    if key is None:
+        upload_result = await _build_report(test_result)
+    else:
+        # Одновременные дубликаты ждут первый отчёт и получают его из кэша
+        async with report_lock(key):
+            upload_result = report_upload_cache.get(key)
+            if upload_result is None:
+                upload_result = await _build_report(test_result, key)
+                report_upload_cache.set(key, upload_result)
+
+    async with AsyncSessionLocal() as session:
+        await attach_test_report(
+            session,
+            test_result_id,
+            dropbox_file_id=upload_result["dropbox_file_id"],
+            file_name=upload_result["file_name"],
+        )
+
+    return upload_result
+
+
+async def _build_report(
+    test_result: TestResult, key: Optional[str] = None
+) -> Dict[str, Any]:
+    """Рендерит PDF-отчёт (или берёт его из кэша) и загружает в Dropbox."""
+    level = test_result.level.value
+    test_taker = test_result.test_taker or f"user_{test_result.user_id}"
+
+    cached_pdf = report_pdf_cache.get(key) if key is not None else None
+    if cached_pdf is not None:
+        filename, data = cached_pdf
+        document = PdfDocument(filename, data=data)
+    else:
+        document = await pdf_renderer.render_test_report(
+            test_taker=test_taker,
+            level=level,
+            closed_answers=test_result.closed_answers or {},
+            open_answers=test_result.open_answers,
+            score=test_result.score or {},
+        )
+        # Выгруженные на диск (большие) документы в памяти не кэшируются
+        if key is not None and not document.spilled:
+            report_pdf_cache.set(key, (document.filename, document.read()))
+
+    with document:
+        upload_result = await upload_to_dropbox(
+            document,
+            username=test_taker,
+            file_type="test-report",
+            level=level,
+            dbx=get_dropbox_client(),
+            telegram_id=test_result.user_id,
+        )
+
+    # После загрузки байты больше не нужны: дубликаты возьмут загруженный файл
+    if key is not None:
+        report_pdf_cache.pop(key)
+    return upload_result
+
+
+async def requeue_missing_reports(
+    queue: JobQueue, older_than: timedelta = REPORT_REQUEUE_AFTER
+) -> int:
+    """
+    Ставит в очередь отчёты для результатов, оставшихся без PDF.
+
+    Такие результаты появляются, если очередь отклонила задачу после
+    записи результата или задача исчерпала попытки (например, при
+    долгой недоступности Dropbox). Обработчик идемпотентен, поэтому
+    случайный дубликат задачи не приводит к повторной загрузке.
+
+    Args:
+        queue: Очередь фоновых задач.
+        older_than: Минимальный возраст результата без отчёта.
+
+    Returns:
+        int: Количество поставленных задач.
+    """
+    async with AsyncSessionLocal() as session:
+        ids = await read_test_results_without_report(
+            session,
+            datetime.now(timezone.utc) - older_than,
+            REPORT_REQUEUE_LIMIT,
+        )
+
+    enqueued = 0
+    for test_result_id in ids:
+        try:
+            await queue.enqueue(TEST_REPORT_JOB, {"test_result_id": test_result_id})
+        except QueueFullError:
+            logger.warning("Очередь переполнена, повторная постановка отчётов прервана")
+            break
+        enqueued += 1
+
+    if enqueued:
+        logger.info("Повторно поставлено отчётов о тестировании: %s", enqueued)
+    return enqueued
+
+
+def register_report_jobs(queue: JobQueue) -> None:
+    """Регистрирует обработчики задач, связанных с отчётами."""
+    queue.register(TEST_REPORT_JOB, process_test_report)
@@ -0,0 +1,313 @@
+"""
+Статические файлы WebApp: манифест версий и раздача с кэшированием.
+
+Манифест строится при запуске: каждому файлу html_pages сопоставляется
+хэш содержимого. URL ресурсов содержат этот хэш (?v=<digest>), поэтому
+браузер Telegram WebView может кэшировать их бессрочно, а после изменения
+файла автоматически получает новый URL.
+
+HTML-страницы при построении манифеста переписываются: к локальным
+ссылкам src/href добавляется ?v=<digest> файла, на который они указывают.
+Сами страницы кэшируются с обязательной проверкой (no-cache + ETag),
+поэтому повторное открытие стоит один ответ 304.
+
+Текстовые ресурсы (HTML, CSS, JS, ...) сжимаются заранее (gzip и, если
+установлен пакет brotli, br) и отдаются из памяти по Accept-Encoding.
+Остальные файлы (аудио, изображения) отдаются FileResponse с поддержкой
+Range-запросов.
+
+Если выполнена сборка страниц (python -m utilities.build_assets), url()
+для исходной страницы уровня возвращает собранную страницу из
+build/manifest.json.
+
+Содержит:
+    - Asset: запись манифеста.
+    - AssetManifest: построение манифеста и URL с версией.
+    - CachedStaticFiles: StaticFiles с Cache-Control, ETag по содержимому
+      и заранее сжатыми вариантами.
+    - asset_manifest: манифест html_pages (общий для API и бота).
+"""
+
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import posixpath
+import re
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Optional
+
+from starlette.datastructures import Headers
+from starlette.requests import Request
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli не обязателен
+    brotli = None
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+COMPRESSIBLE = frozenset({".html", ".css", ".js", ".mjs", ".json", ".svg", ".txt"})
+MIN_COMPRESS_SIZE = 512
+
+# Результат utilities.build_assets (относительно корня статических файлов)
+BUILD_DIR = "build"
+BUILD_MANIFEST = f"{BUILD_DIR}/manifest.json"
+
+# Локальные ссылки в HTML: src="..." и href="..."
+_HTML_REF = re.compile(
+    r"""(?P<attr>\b(?:src|href)=)(?P<q>["'])(?P<url>[^"'#?]+)(?P=q)"""
+)
+_EXTERNAL = re.compile(r"^(?:[a-z][a-z0-9+.-]*:|//)", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class Asset:
+    """
+    Запись манифеста.
+
+    Attributes:
+        path: Путь относительно корня (через "/").
+        digest: Хэш содержимого (первые 16 hex-символов SHA-256).
+        body: Отдаваемое содержимое, если оно хранится в памяти
+            (переписанный HTML, текстовые ресурсы), иначе None.
+        encoded: Заранее сжатые варианты body: кодировка -> байты.
+    """
+
+    path: str
+    digest: str
+    body: Optional[bytes] = None
+    encoded: Dict[str, bytes] = field(default_factory=dict)
+
+    @property
+    def etag(self) -> str:
+        """ETag несжатого содержимого."""
+        return f'"{self.digest}"'
+
+
+def _digest(data: bytes) -> str:
+    """Хэш содержимого для URL и ETag."""
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def _compress(data: bytes) -> Dict[str, bytes]:
+    """Возвращает сжатые варианты, которые меньше исходных данных."""
+    if len(data) < MIN_COMPRESS_SIZE:
+        return {}
+
+    variants = {"gzip": gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants["br"] = brotli.compress(data, quality=11)
+    return {enc: body for enc, body in variants.items() if len(body) < len(data)}
+
+
+class AssetManifest:
+    """
+    Манифест статических файлов: путь -> хэш содержимого.
+
+    Args:
+        root: Каталог со статическими файлами.
+        mount_path: Путь, по которому каталог смонтирован в приложении.
+    """
+
+    def __init__(self, root: Path, mount_path: str) -> None:
+        self.root = Path(root)
+        self.mount_path = mount_path.rstrip("/")
+        self._assets: Dict[str, Asset] = {}
+        self._pages: Dict[str, str] = {}
+        self._built = False
+        self._lock = threading.Lock()
+
+    def build(self) -> "AssetManifest":
+        """Хэширует все файлы каталога и переписывает ссылки в HTML."""
+        files = sorted(
+            p.relative_to(self.root).as_posix()
+            for p in self.root.rglob("*")
+            if p.is_file() and not p.name.startswith(".")
+        )
+        assets: Dict[str, Asset] = {}
+
+        # Сначала ресурсы, затем ссылающиеся на них страницы
+        for path in sorted(files, key=lambda p: p.endswith(".html")):
+            data = (self.root / path).read_bytes()
+            suffix = posixpath.splitext(path)[1].lower()
+
+            if suffix == ".html":
+                data = self._rewrite_html(path, data, assets)
+            if suffix in COMPRESSIBLE:
+                assets[path] = Asset(path, _digest(data), data, _compress(data))
+            else:
+                assets[path] = Asset(path, _digest(data))
+
+        pages = {}
+        if BUILD_MANIFEST in assets:
+            build = json.loads((self.root / BUILD_MANIFEST).read_text(encoding="utf-8"))
+            pages = {
+                source: entry["page"]
+                for source, entry in build["pages"].items()
+                if entry["page"] in assets
+            }
+
+        with self._lock:
+            self._assets = assets
+            self._pages = pages
+            self._built = True
+        return self
+
+    def _rewrite_html(self, path: str, html: bytes, assets: Dict[str, Asset]) -> bytes:
+        """Добавляет ?v=<digest> к локальным src/href страницы."""
+        base = posixpath.dirname(path)
+
+        def versioned(match: re.Match) -> str:
+            url = match["url"]
+            if _EXTERNAL.match(url):
+                return match[0]
+
+            if url.startswith("/"):
+                prefix = self.mount_path + "/"
+                if not url.startswith(prefix):
+                    return match[0]
+                target = url[len(prefix) :]
+            else:
+                target = posixpath.normpath(posixpath.join(base, url))
+
+            asset = assets.get(target)
+            if asset is None:
+                return match[0]
+            return f"{match['attr']}{match['q']}{url}?v={asset.digest}{match['q']}"
+
+        return _HTML_REF.sub(versioned, html.decode("utf-8")).encode("utf-8")
+
+    def _ensure_built(self) -> None:
+        """Строит манифест при первом обращении (например, в процессе бота)."""
+        if not self._built:
+            self.build()
+
+    def get(self, path: str) -> Optional[Asset]:
+        """Возвращает запись манифеста по пути относительно корня."""
+        self._ensure_built()
+        return self._assets.get(path)
+
+    def version(self, path: str) -> Optional[str]:
+        """Возвращает хэш файла или None, если файла нет в манифесте."""
+        asset = self.get(path.lstrip("/"))
+        return asset.digest if asset is not None else None
+
+    def url(self, path: str) -> str:
+        """
+        Возвращает URL файла с версией.
+
+        Для страницы, собранной utilities.build_assets, возвращается
+        URL собранной страницы.
+
+        Args:
+            path: Путь относительно корня или с префиксом mount_path.
+
+        Returns:
+            str: mount_path/path?v=<digest> (без версии, если файла нет).
+        """
+        if path.startswith(self.mount_path + "/"):
+            path = path[len(self.mount_path) + 1 :]
+        path = path.lstrip("/")
+        self._ensure_built()
+        path = self._pages.get(path, path)
+
+        version = self.version(path)
+        url = f"{self.mount_path}/{path}"
+        return f"{url}?v={version}" if version else url
+
+    def to_dict(self) -> Dict[str, str]:
+        """Манифест в виде словаря путь -> хэш."""
+        self._ensure_built()
+        return {path: asset.digest for path, asset in self._assets.items()}
+
+
+class CachedStaticFiles(StaticFiles):
+    """
+    StaticFiles с версионированием по манифесту.
+
+    - запрос с актуальным ?v=<digest> — Cache-Control: immutable на год;
+    - без версии (или с устаревшей) — no-cache, проверка по ETag;
+    - ETag — хэш содержимого (одинаков во всех воркерах и после деплоя);
+    - текстовые ресурсы отдаются из памяти, сжатыми по Accept-Encoding;
+    - остальные файлы — FileResponse с поддержкой Range.
+
+    Args:
+        manifest: Манифест каталога directory.
+    """
+
+    def __init__(self, *, manifest: AssetManifest, **kwargs) -> None:
+        super().__init__(directory=manifest.root, **kwargs)
+        self.manifest = manifest
+
+    def file_response(
+        self,
+        full_path: "os.PathLike[str] | str",
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        """Формирует ответ с заголовками кэширования по манифесту."""
+        path = Path(full_path).relative_to(self.manifest.root.resolve()).as_posix()
+        asset = self.manifest.get(path)
+        if asset is None:  # файл появился после построения манифеста
+            return super().file_response(full_path, stat_result, scope, status_code)
+
+        request = Request(scope)
+        request_headers = Headers(scope=scope)
+        versioned = request.query_params.get("v") == asset.digest
+        headers = {
+            "cache-control": IMMUTABLE if versioned else REVALIDATE,
+            "etag": asset.etag,
+        }
+
+        if asset.body is None:
+            response: Response = FileResponse(
+                full_path,
+                status_code=status_code,
+                headers=headers,
+                stat_result=stat_result,
+            )
+        else:
+            body = asset.body
+            if asset.encoded:
+                headers["vary"] = "Accept-Encoding"
+                encoding = self._negotiate(asset, request_headers)
+                if encoding is not None:
+                    body = asset.encoded[encoding]
+                    headers["content-encoding"] = encoding
+                    headers["etag"] = f'"{asset.digest}-{encoding}"'
+            response = Response(
+                body,
+                status_code=status_code,
+                headers=headers,
+                media_type=mimetypes.guess_type(path)[0] or "text/plain",
+            )
+
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+    @staticmethod
+    def _negotiate(asset: Asset, request_headers: Headers) -> Optional[str]:
+        """Выбирает сжатый вариант по Accept-Encoding (br предпочтительнее gzip)."""
+        accepted = {
+            part.split(";")[0].strip().lower()
+            for part in request_headers.get("accept-encoding", "").split(",")
+        }
+        for encoding in ("br", "gzip"):
+            if encoding in accepted and encoding in asset.encoded:
+                return encoding
+        return None
+
+
+asset_manifest = AssetManifest(
+    Path(__file__).resolve().parents[1] / "html_pages", "/html_pages"
+)
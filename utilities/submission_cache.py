@@ -0,0 +1,106 @@
+"""
+Кэш повторных отправок теста (по хэшу содержимого).
+
+Ученики часто отправляют одну и ту же форму повторно (двойное нажатие
+в Telegram WebApp, повтор после ошибки /api/check_test). Отправка
+идентифицируется хэшем (уровень, версия ключей, нормализованные ответы,
+имя участника, Telegram ID); в течение окна SUBMISSION_CACHE_TTL
+для такой отправки повторно используются:
+    - результат проверки (check_test_results не вызывается);
+    - байты PDF-отчёта (рендеринг не выполняется);
+    - загруженный в Dropbox файл (повторная загрузка не выполняется).
+
+Кэши — TTLCache в памяти процесса с LRU-вытеснением.
+
+Содержит:
+    - submission_key: хэш отправки.
+    - grading_cache / report_pdf_cache / report_upload_cache: кэши.
+    - report_lock: блокировка формирования отчёта по ключу отправки,
+      чтобы одновременные дубликаты дождались первого отчёта.
+
+Метрики:
+    - submission_grade_cache_hits / _misses
+    - submission_pdf_cache_hits / _misses
+    - submission_upload_cache_hits / _misses
+"""
+
+import asyncio
+import hashlib
+import json
+import weakref
+from typing import Any, Dict, Mapping
+
+from config import settings
+from utilities.check_function import normalize_answer
+from utilities.ttl_cache import TTLCache
+
+
+def submission_key(
+    level: str,
+    answer_key_version: int,
+    answers: Mapping[str, Mapping[str, str]],
+    test_taker: str,
+    telegram_id: int,
+) -> str:
+    """
+    Возвращает хэш отправки теста.
+
+    Ответы нормализуются так же, как при проверке, поэтому отправки,
+    отличающиеся только регистром или пробелами, считаются одинаковыми.
+    Telegram ID входит в хэш, так как отчёт загружается в папку пользователя.
+
+    Args:
+        level: Уровень теста.
+        answer_key_version: Версия ключей, по которой проверяется отправка.
+        answers: Ответы пользователя: таск -> вопрос -> ответ.
+        test_taker: Имя участника в отчёте.
+        telegram_id: Telegram ID пользователя.
+
+    Returns:
+        str: SHA-256 (hex) канонического представления отправки.
+    """
+    normalized = {
+        task: {q_num: normalize_answer(answer) for q_num, answer in questions.items()}
+        for task, questions in answers.items()
+    }
+    canonical = json.dumps(
+        [level, answer_key_version, normalized, test_taker, telegram_id],
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+# Ключ отправки -> результат check_test_results
+grading_cache: TTLCache[str, Dict[str, Any]] = TTLCache(
+    settings.submission_cache_size,
+    settings.submission_cache_ttl,
+    name="submission_grade_cache",
+)
+
+# Ключ отправки -> (имя файла, байты PDF-отчёта)
+report_pdf_cache: TTLCache[str, tuple] = TTLCache(
+    settings.submission_pdf_cache_size,
+    settings.submission_cache_ttl,
+    name="submission_pdf_cache",
+)
+
+# Ключ отправки -> результат upload_to_dropbox
+report_upload_cache: TTLCache[str, Dict[str, Any]] = TTLCache(
+    settings.submission_cache_size,
+    settings.submission_cache_ttl,
+    name="submission_upload_cache",
+)
+
+_report_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = (
+    weakref.WeakValueDictionary()
+)
+
+
+def report_lock(key: str) -> asyncio.Lock:
+    """Возвращает блокировку формирования отчёта для ключа отправки."""
+    lock = _report_locks.get(key)
+    if lock is None:
+        lock = _report_locks[key] = asyncio.Lock()
+    return lock
@@ -1,58 +1,236 @@
 """
 Утилиты для отправки уведомлений в Telegram.
 
-Содержит функции для:
-    - отправки PDF-файлов администраторам.
+Уведомления отправляются через aiogram-бота приложения: его HTTP-сессия
+живёт весь срок работы процесса, поэтому отдельное соединение (TCP + TLS)
+на каждое сообщение не создаётся. Бот привязывается к отправителю
+в lifespan приложения.
+
+Содержит:
+    - AdminNotifier: отправка сообщений, документов и альбомов документов
+      с ограничением параллелизма и частоты сообщений в один чат,
+      с метриками задержки.
+    - admin_notifier: общий экземпляр отправителя (доставку уведомлений
+      администратору выполняет utilities.notification_outbox).
+
+Метрики:
+    - telegram_send_seconds: время вызова Telegram API.
+    - telegram_send_wait_seconds: ожидание из-за лимитов частоты.
+    - telegram_send_errors: количество неудачных отправок.
+    - telegram_retry_after: количество ответов 429 (retry_after).
 """
 
+import asyncio
 import os
-from typing import Optional
+import time
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
-import aiohttp
+from aiogram import Bot
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.types import (
+    BufferedInputFile,
+    FSInputFile,
+    InputFile,
+    InputMediaDocument,
+    Message,
+)
 
 from config import settings
 from logging_config import logger
+from utilities.metrics import metrics
+from utilities.pdf_buffer import PdfDocument
+
+T = TypeVar("T")
+
+
+def as_input_file(document: Union[str, PdfDocument]) -> InputFile:
+    """
+    Преобразует документ в InputFile для aiogram без лишних копий.
+
+    Args:
+        document: PDF-документ в памяти/на диске или путь к файлу.
+
+    Returns:
+        InputFile: BufferedInputFile для документа в памяти, иначе FSInputFile.
+    """
+    if isinstance(document, PdfDocument):
+        if document.spill_path is not None:
+            return FSInputFile(document.spill_path, filename=document.filename)
+        return BufferedInputFile(document.read(), filename=document.filename)
+    return FSInputFile(document, filename=os.path.basename(document))
 
 
-async def send_pdf_to_admin(file_path: str, caption: Optional[str] = None) -> None:
+class AdminNotifier:
     """
-    Асинхронно отправляет PDF-файл администратору в Telegram.
+    Отправитель сообщений через общий aiogram-бот.
 
-    Аргументы:
-        file_path (str): Путь к PDF-файлу.
-        caption (Optional[str]): Подпись к сообщению. По умолчанию:
-            "Новая заявка получена 📄".
+    Ограничивает количество одновременных запросов к Telegram и выдерживает
+    минимальный интервал между сообщениями в один чат (Telegram допускает
+    около одного сообщения в секунду на чат). При ответе 429 ожидает
+    retry_after и повторяет отправку.
 
-    Примечания:
-        - Использует TELEGRAM_BOT_TOKEN и ADMIN_TELEGRAM_ID из настроек.
-        - Логирует ошибки в случае проблем с соединением или API.
+    Args:
+        max_concurrency: Максимум одновременных запросов к Telegram API.
+        per_chat_interval: Минимальный интервал между сообщениями в чат (сек).
+        max_retries: Количество повторов после ответа 429.
     """
-    bot_token = settings.telegram_bot_token
-    admin_id = settings.admin_telegram_id
 
-    if not bot_token or not admin_id:
-        logger.error(
-            "❌ TELEGRAM_BOT_TOKEN или ADMIN_TELEGRAM_ID не указаны в настройках."
+    def __init__(
+        self,
+        max_concurrency: int = 10,
+        per_chat_interval: float = 1.0,
+        max_retries: int = 3,
+    ) -> None:
+        self.per_chat_interval = per_chat_interval
+        self.max_retries = max_retries
+        self._bot: Optional[Bot] = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._chat_locks: Dict[int, asyncio.Lock] = {}
+        self._last_sent: Dict[int, float] = {}
+
+        self._latency = metrics.histogram(
+            "telegram_send_seconds", "Telegram Bot API call latency"
+        )
+        self._wait = metrics.histogram(
+            "telegram_send_wait_seconds", "Time spent waiting for Telegram rate limits"
+        )
+        self._errors = metrics.counter(
+            "telegram_send_errors", "Telegram sends that failed"
+        )
+        self._retry_after = metrics.counter(
+            "telegram_retry_after", "Telegram 429 responses (retry_after)"
+        )
+
+    @property
+    def bot(self) -> Bot:
+        """Привязанный бот приложения."""
+        if self._bot is None:
+            raise RuntimeError("AdminNotifier не запущен: бот не привязан")
+        return self._bot
+
+    def start(self, bot: Bot) -> None:
+        """Привязывает бота приложения (вызывается в lifespan)."""
+        self._bot = bot
+
+    def stop(self) -> None:
+        """Отвязывает бота; сессию бота закрывает его владелец."""
+        self._bot = None
+
+    async def send_document(
+        self,
+        chat_id: int,
+        document: Union[str, PdfDocument],
+        caption: Optional[str] = None,
+    ) -> Message:
+        """
+        Отправляет документ в чат с учётом лимитов Telegram.
+
+        Args:
+            chat_id: ID чата получателя.
+            document: PDF-документ или путь к файлу.
+            caption: Подпись к документу.
+
+        Returns:
+            Message: Отправленное сообщение.
+
+        Raises:
+            TelegramAPIError: Ошибка Telegram API (после исчерпания повторов).
+        """
+        input_file = as_input_file(document)
+        return await self._send(
+            chat_id,
+            lambda: self.bot.send_document(chat_id, input_file, caption=caption),
         )
-        return
-
-    caption = caption or "Новая заявка получена 📄"
-    send_url = f"https://api.telegram.org/bot{bot_token}/sendDocument"
-
-    try:
-        async with aiohttp.ClientSession() as session:
-            with open(file_path, "rb") as f:
-                form = aiohttp.FormData()
-                form.add_field("chat_id", str(admin_id))
-                form.add_field("document", f, filename=os.path.basename(file_path))
-                form.add_field("caption", caption)
-
-                async with session.post(send_url, data=form) as response:
-                    if response.status != 200:
-                        text = await response.text()
-                        logger.error(
-                            f"❌ Ошибка при отправке PDF админу: "
-                            f"{response.status} — {text}"
+
+    async def send_media_group(
+        self,
+        chat_id: int,
+        documents: Sequence[Tuple[InputFile, Optional[str]]],
+    ) -> List[Message]:
+        """
+        Отправляет до 10 документов одним альбомом (sendMediaGroup).
+
+        Альбом занимает один «слот» лимита частоты чата, поэтому всплеск
+        уведомлений доставляется без ожидания по секунде на каждое.
+
+        Args:
+            chat_id: ID чата получателя.
+            documents: Пары (файл, подпись).
+
+        Returns:
+            list[Message]: Отправленные сообщения альбома.
+        """
+        media = [
+            InputMediaDocument(media=input_file, caption=caption)
+            for input_file, caption in documents
+        ]
+        return await self._send(
+            chat_id, lambda: self.bot.send_media_group(chat_id, media)
+        )
+
+    async def send_message(self, chat_id: int, text: str) -> Message:
+        """Отправляет текстовое сообщение с учётом лимитов Telegram."""
+        return await self._send(chat_id, lambda: self.bot.send_message(chat_id, text))
+
+    async def _send(self, chat_id: int, call: Callable[[], Awaitable[T]]) -> T:
+        """Выполняет вызов Bot API с лимитами, повторами на 429 и метриками."""
+        lock = self._chat_locks.setdefault(chat_id, asyncio.Lock())
+
+        async with lock:
+            for attempt in range(self.max_retries + 1):
+                await self._wait_for_slot(chat_id)
+
+                async with self._semaphore:
+                    started = time.perf_counter()
+                    try:
+                        result = await call()
+                    except TelegramRetryAfter as e:
+                        self._retry_after.inc()
+                        self._last_sent[chat_id] = time.monotonic() + e.retry_after
+                        if attempt == self.max_retries:
+                            self._errors.inc()
+                            raise
+                        logger.warning(
+                            "Telegram rate limit for chat %s, retry in %ss",
+                            chat_id,
+                            e.retry_after,
                         )
-    except Exception as e:
-        logger.exception(f"❌ Исключение при отправке PDF админу: {e}")
+                        continue
+                    except Exception:
+                        self._errors.inc()
+                        raise
+                    finally:
+                        self._latency.observe(time.perf_counter() - started)
+
+                self._last_sent[chat_id] = time.monotonic()
+                return result
+
+        raise AssertionError("unreachable")
+
+    async def _wait_for_slot(self, chat_id: int) -> None:
+        """Ожидает, пока истечёт минимальный интервал для чата."""
+        last = self._last_sent.get(chat_id)
+        if last is None:
+            return
+        delay = last + self.per_chat_interval - time.monotonic()
+        if delay > 0:
+            self._wait.observe(delay)
+            await asyncio.sleep(delay)
+
+
+admin_notifier = AdminNotifier(
+    max_concurrency=settings.telegram_max_concurrency,
+    per_chat_interval=settings.telegram_per_chat_interval,
+    max_retries=settings.telegram_max_retries,
+)
+
@@ -0,0 +1,162 @@
+"""
+Определения тестов уровней — единый источник вопросов и ключей ответов.
+
+Каждый уровень описан файлом utilities/levels/<уровень>.json:
+    - level: название уровня (значение LevelEnum);
+    - tasks: данные заданий (вопросы, варианты, тексты, аудио) в том виде,
+      в котором их отображают рендеры страницы уровня; пути аудио указаны
+      относительно html_pages;
+    - answers: ключи правильных ответов (таск -> вопрос -> ответ(ы)) —
+      единственное место, где хранятся правильные ответы; в tasks их нет.
+
+Из этих файлов строятся встроенные ключи ответов
+(utilities.check_function.global_answer_key) и публичные определения
+тестов для страниц (GET /api/tests/{level}). Публичное определение
+не содержит ответов, а пути аудио в нём заменены URL с версией
+(utilities.static_assets), поэтому аудио кэшируется браузером бессрочно.
+
+Публичные определения сериализуются один раз и хранятся в памяти вместе
+с ETag (хэш содержимого): повторный запрос страницы с If-None-Match
+получает ответ 304 без тела.
+
+Содержит:
+    - load_test_definitions: чтение файлов определений.
+    - level_answer_keys: ключи ответов всех уровней.
+    - resolve_level: название уровня по названию или каталогу страницы.
+    - TestDefinitionCache: сериализованные публичные определения с ETag.
+    - test_definitions: общий экземпляр кэша.
+"""
+
+import hashlib
+import json
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from utilities.static_assets import asset_manifest
+
+LEVELS_DIR = Path(__file__).resolve().parent / "levels"
+
+
+@lru_cache(maxsize=1)
+def load_test_definitions() -> Dict[str, Dict[str, Any]]:
+    """
+    Читает определения тестов всех уровней.
+
+    Returns:
+        dict: Название уровня -> определение (level, tasks, answers).
+    """
+    definitions = {}
+    for path in sorted(LEVELS_DIR.glob("*.json")):
+        definition = json.loads(path.read_text(encoding="utf-8"))
+        definitions[definition["level"]] = definition
+    return definitions
+
+
+def level_answer_keys() -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """Возвращает ключи ответов: уровень -> таск -> вопрос -> ответ(ы)."""
+    return {
+        level: definition["answers"]
+        for level, definition in load_test_definitions().items()
+    }
+
+
+def _level_slug(level: str) -> str:
+    """Starter, starter, Pre-Intermediate и pre_intermediate -> один ключ."""
+    return level.strip().lower().replace("_", "-")
+
+
+def resolve_level(level: str) -> Optional[str]:
+    """
+    Возвращает название уровня, для которого есть определение теста.
+
+    Args:
+        level: Название (Pre-Intermediate) или каталог страницы
+            (pre_intermediate), без учёта регистра.
+
+    Returns:
+        str | None: Название уровня или None, если уровень неизвестен.
+    """
+    slug = _level_slug(level)
+    return next(
+        (name for name in load_test_definitions() if _level_slug(name) == slug), None
+    )
+
+
+# Поля заданий, которые не отдаются странице
+PRIVATE_TASK_FIELDS = frozenset({"correct"})
+
+
+def _public_tasks(value: Any) -> Any:
+    """Заменяет пути аудио URL с версией и убирает правильные ответы."""
+    if isinstance(value, dict):
+        return {
+            key: asset_manifest.url(item) if key == "audio" else _public_tasks(item)
+            for key, item in value.items()
+            if key not in PRIVATE_TASK_FIELDS
+        }
+    if isinstance(value, list):
+        return [_public_tasks(item) for item in value]
+    return value
+
+
+@dataclass(frozen=True)
+class SerializedDefinition:
+    """
+    Публичное определение теста, готовое к отправке.
+
+    Attributes:
+        body: Компактный JSON (без ответов).
+        etag: ETag по содержимому body.
+    """
+
+    body: bytes
+    etag: str
+
+
+class TestDefinitionCache:
+    """
+    Публичные определения тестов, сериализованные при первом запросе.
+
+    Уровень можно указывать названием (Pre-Intermediate) или в виде
+    каталога страницы (pre_intermediate), без учёта регистра.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[str, SerializedDefinition] = {}
+        self._lock = threading.Lock()
+
+    def get(self, level: str) -> Optional[SerializedDefinition]:
+        """
+        Возвращает сериализованное определение уровня.
+
+        Args:
+            level: Название уровня.
+
+        Returns:
+            SerializedDefinition | None: None, если уровень неизвестен.
+        """
+        slug = _level_slug(level)
+        entry = self._entries.get(slug)
+        if entry is not None:
+            return entry
+
+        name = resolve_level(level)
+        if name is None:
+            return None
+        definition = load_test_definitions()[name]
+
+        body = json.dumps(
+            {"level": definition["level"], "tasks": _public_tasks(definition["tasks"])},
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ).encode("utf-8")
+        entry = SerializedDefinition(body, f'"{hashlib.sha256(body).hexdigest()[:16]}"')
+
+        with self._lock:
+            return self._entries.setdefault(slug, entry)
+
+
+test_definitions = TestDefinitionCache()
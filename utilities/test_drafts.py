@@ -0,0 +1,331 @@
+"""
+Черновики тестов: буфер автосохранения с отложенной пакетной записью.
+
+Страница теста каждые несколько секунд присылает только изменённые
+ответы ("task1.3" -> ответ). Изменения сливаются в словарь в памяти
+процесса и не обращаются к БД; фоновая задача раз в
+TEST_DRAFT_FLUSH_INTERVAL записывает все накопленные черновики пакетами
+по TEST_DRAFT_BATCH_SIZE одним INSERT ... ON CONFLICT на пакет
+(database.crud.test_draft.merge_test_drafts). Если в буфере больше
+TEST_DRAFT_MAX_PENDING черновиков, запись начинается не дожидаясь интервала.
+
+Чтение черновика объединяет сохранённые ответы с ещё не записанными
+изменениями этого процесса. Изменения, принятые другим воркером,
+видны после его ближайшей записи.
+
+Если запись пакета не удалась, его изменения возвращаются в буфер
+(более новые изменения тех же вопросов не перезаписываются) и будут
+записаны при следующей попытке. Черновик, который БД отвергает
+(ошибка данных), не возвращается: пакет делится, остальные черновики
+записываются, а отвергнутый отбрасывается. При остановке приложения
+буфер записывается полностью.
+
+После отправки теста черновик очищается с отметкой времени отправки;
+изменения, полученные раньше неё и записанные позже (в том числе
+буфером другого воркера), к нему не применяются.
+
+Содержит:
+    - draft_question_id / split_draft_answers: формат ответов черновика.
+    - PendingDraft: незаписанные изменения одного черновика.
+    - TestDraftBuffer: буфер, фоновая запись и удаление устаревших черновиков.
+    - test_drafts: общий экземпляр приложения.
+
+Метрики:
+    - test_draft_updates: принятые изменения черновиков.
+    - test_draft_flushed: записанные в БД черновики.
+    - test_draft_flush_errors: неудачные записи пакетов.
+    - test_draft_dropped: черновики, отвергнутые БД и отброшенные.
+    - test_draft_flush_seconds: длительность записи буфера.
+    - test_draft_pending: черновики, ожидающие записи.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from sqlalchemy.exc import DataError, IntegrityError
+
+from config import settings
+from database.base import AsyncSessionLocal
+from database.crud.test_draft import (
+    delete_expired_test_drafts,
+    merge_test_drafts,
+    read_test_draft,
+    submit_test_draft,
+)
+from database.models import LevelEnum
+from logging_config import logger
+from utilities.metrics import metrics
+
+DraftKey = Tuple[int, LevelEnum]
+
+
+def draft_question_id(task: str, question: str) -> str:
+    """Идентификатор вопроса в черновике: task1 + 3 -> "task1.3"."""
+    return f"{task}.{question}"
+
+
+def split_draft_answers(answers: Mapping[str, str]) -> Dict[str, Dict[str, str]]:
+    """
+    Преобразует ответы черновика в формат отправки теста.
+
+    Args:
+        answers: "task1.3" -> ответ.
+
+    Returns:
+        dict: таск -> номер вопроса -> ответ (как TestSubmissionSchema.answers).
+    """
+    nested: Dict[str, Dict[str, str]] = {}
+    for question_id, answer in answers.items():
+        task, _, question = question_id.partition(".")
+        nested.setdefault(task, {})[question] = answer
+    return nested
+
+
+@dataclass
+class PendingDraft:
+    """
+    Ещё не записанные изменения одного черновика.
+
+    Attributes:
+        answers: "task1.3" -> ответ.
+        received_at: Время получения последнего изменения.
+    """
+
+    answers: Dict[str, str]
+    received_at: datetime
+
+
+class TestDraftBuffer:
+    """
+    Буфер изменений черновиков с фоновой пакетной записью.
+
+    Args:
+        flush_interval: Период записи буфера (сек).
+        batch_size: Черновиков в одном INSERT.
+        max_pending: Черновиков в буфере, после которого запись
+            начинается досрочно.
+        ttl: Время жизни неизменяемого черновика (сек).
+        purge_interval: Период удаления устаревших черновиков (сек).
+    """
+
+    def __init__(
+        self,
+        flush_interval: float = 5.0,
+        batch_size: int = 1000,
+        max_pending: int = 20000,
+        ttl: float = 604800.0,
+        purge_interval: float = 3600.0,
+    ) -> None:
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.ttl = ttl
+        self.purge_interval = purge_interval
+
+        self._pending: Dict[DraftKey, PendingDraft] = {}
+        # Изменения, которые записываются прямо сейчас (видны при чтении)
+        self._flushing: Dict[DraftKey, PendingDraft] = {}
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._last_purge = 0.0
+
+        self._updates = metrics.counter(
+            "test_draft_updates", "Test draft updates accepted"
+        )
+        self._flushed = metrics.counter(
+            "test_draft_flushed", "Test drafts written to the database"
+        )
+        self._errors = metrics.counter(
+            "test_draft_flush_errors", "Test draft batches that failed to write"
+        )
+        self._dropped = metrics.counter(
+            "test_draft_dropped", "Test drafts rejected by the database and dropped"
+        )
+        self._duration = metrics.histogram(
+            "test_draft_flush_seconds", "Time to write buffered test drafts"
+        )
+        metrics.gauge(
+            "test_draft_pending",
+            lambda: len(self._pending),
+            "Test drafts waiting to be written",
+        )
+
+    def update(self, user_id: int, level: LevelEnum, answers: Mapping[str, str]) -> int:
+        """
+        Принимает изменённые ответы черновика (без обращения к БД).
+
+        Args:
+            user_id: Telegram ID пользователя.
+            level: Уровень теста.
+            answers: "task1.3" -> ответ (пустая строка — ответ стёрт).
+
+        Returns:
+            int: Количество черновиков, ожидающих записи.
+        """
+        now = datetime.now(timezone.utc)
+        pending = self._pending.setdefault((user_id, level), PendingDraft({}, now))
+        pending.answers.update(answers)
+        pending.received_at = now
+        self._updates.inc()
+        if len(self._pending) >= self.max_pending:
+            self._wakeup.set()
+        return len(self._pending)
+
+    async def read(self, user_id: int, level: LevelEnum) -> Dict[str, str]:
+        """
+        Возвращает ответы черновика: сохранённые и ещё не записанные.
+
+        Args:
+            user_id: Telegram ID пользователя.
+            level: Уровень теста.
+
+        Returns:
+            dict: "task1.3" -> ответ (пустой, если черновика нет).
+        """
+        async with AsyncSessionLocal() as session:
+            draft = await read_test_draft(session, user_id, level)
+
+        key = (user_id, level)
+        answers = dict(draft.answers) if draft is not None else {}
+        for buffer in (self._flushing, self._pending):
+            if key in buffer:
+                answers.update(buffer[key].answers)
+        return answers
+
+    async def discard(self, user_id: int, level: LevelEnum) -> None:
+        """
+        Очищает черновик после отправки теста.
+
+        Не ждёт текущей записи буфера: изменения, полученные до отправки
+        (в том числе уже переданные в запись этим или другим процессом),
+        к отправленному черновику не применятся (submit_test_draft).
+        """
+        self._pending.pop((user_id, level), None)
+        async with AsyncSessionLocal() as session:
+            await submit_test_draft(session, user_id, level)
+
+    async def flush(self) -> int:
+        """
+        Записывает все накопленные изменения в БД пакетами.
+
+        Returns:
+            int: Количество записанных черновиков.
+        """
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+
+            started = time.perf_counter()
+            self._flushing, self._pending = self._pending, {}
+            items = list(self._flushing.items())
+            written = 0
+            try:
+                for start in range(0, len(items), self.batch_size):
+                    batch = items[start : start + self.batch_size]
+                    try:
+                        written += await self._write(batch)
+                    except Exception as e:
+                        self._errors.inc()
+                        logger.error(
+                            "Не удалось записать %s черновиков тестов: %s",
+                            len(batch),
+                            e,
+                        )
+                        self._requeue(batch)
+            finally:
+                self._flushing = {}
+                self._flushed.inc(written)
+                self._duration.observe(time.perf_counter() - started)
+            return written
+
+    async def _write(self, batch: List[Tuple[DraftKey, PendingDraft]]) -> int:
+        """
+        Записывает пакет; черновики, которые БД отвергает, отбрасывает.
+
+        Ошибка данных (например, user_id вне BIGINT) отклоняет весь INSERT,
+        поэтому пакет делится пополам, пока отвергнутый черновик не
+        останется один: остальные записываются, а он не возвращается
+        в буфер. Прочие ошибки (БД недоступна) передаются вызывающему.
+        """
+        try:
+            async with AsyncSessionLocal() as session:
+                return await merge_test_drafts(
+                    session,
+                    [
+                        (uid, lvl, pending.answers, pending.received_at)
+                        for (uid, lvl), pending in batch
+                    ],
+                )
+        except (DataError, IntegrityError) as e:
+            if len(batch) == 1:
+                (user_id, level), _ = batch[0]
+                self._dropped.inc()
+                logger.error(
+                    "Черновик теста %s (%s) отвергнут БД и отброшен: %s",
+                    user_id,
+                    level.value,
+                    e,
+                )
+                return 0
+            middle = len(batch) // 2
+            return await self._write(batch[:middle]) + await self._write(batch[middle:])
+
+    def _requeue(self, batch: List[Tuple[DraftKey, PendingDraft]]) -> None:
+        """Возвращает незаписанные изменения в буфер под более новыми."""
+        for key, pending in batch:
+            newer = self._pending.get(key)
+            if newer is None:
+                self._pending[key] = pending
+            else:
+                newer.answers = {**pending.answers, **newer.answers}
+
+    async def start(self) -> None:
+        """Запускает фоновую запись буфера."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="test-draft-flush")
+
+    async def stop(self) -> None:
+        """Останавливает фоновую запись и записывает оставшиеся изменения."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        await self.flush()
+
+    async def _run(self) -> None:
+        """Цикл записи буфера и удаления устаревших черновиков."""
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            try:
+                await self.flush()
+                if time.monotonic() - self._last_purge >= self.purge_interval:
+                    self._last_purge = time.monotonic()
+                    await self._purge()
+            except Exception as e:
+                logger.exception("Ошибка записи черновиков тестов: %s", e)
+
+    async def _purge(self) -> None:
+        """Удаляет черновики, не менявшиеся дольше ttl."""
+        updated_before = datetime.now(timezone.utc) - timedelta(seconds=self.ttl)
+        async with AsyncSessionLocal() as session:
+            deleted = await delete_expired_test_drafts(session, updated_before)
+        if deleted:
+            logger.info("Удалено устаревших черновиков тестов: %s", deleted)
+
+
+test_drafts = TestDraftBuffer(
+    flush_interval=settings.test_draft_flush_interval,
+    batch_size=settings.test_draft_batch_size,
+    max_pending=settings.test_draft_max_pending,
+    ttl=settings.test_draft_ttl,
+    purge_interval=settings.test_draft_purge_interval,
+)
@@ -0,0 +1,92 @@
+"""
+Кэш в памяти процесса с ограничением по времени жизни (TTL) и размеру (LRU).
+
+Содержит:
+    - TTLCache: словарь с вытеснением самых давно использованных записей
+      и истечением записей по времени; опционально ведёт счётчики
+      попаданий/промахов в utilities.metrics.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, Optional, Tuple, TypeVar
+
+from utilities.metrics import metrics
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """
+    LRU-кэш с временем жизни записей.
+
+    Args:
+        maxsize: Максимальное количество записей.
+        ttl: Время жизни записи (сек).
+        name: Имя для метрик <name>_hits / <name>_misses (None — без метрик).
+        clock: Источник времени (для тестов).
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        name: Optional[str] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data: "OrderedDict[K, Tuple[float, V]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = metrics.counter(f"{name}_hits") if name else None
+        self._misses = metrics.counter(f"{name}_misses") if name else None
+
+    def get(self, key: K) -> Optional[V]:
+        """Возвращает значение по ключу или None, если записи нет или она истекла."""
+        now = self._clock()
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None and item[0] > now:
+                self._data.move_to_end(key)
+                if self._hits is not None:
+                    self._hits.inc()
+                return item[1]
+
+            if item is not None:
+                del self._data[key]
+        if self._misses is not None:
+            self._misses.inc()
+        return None
+
+    def peek(self, key: K) -> Optional[V]:
+        """Как get, но без обновления порядка LRU и счётчиков метрик."""
+        with self._lock:
+            item = self._data.get(key)
+        if item is not None and item[0] > self._clock():
+            return item[1]
+        return None
+
+    def set(self, key: K, value: V) -> None:
+        """Сохраняет значение, вытесняя самые давно использованные записи."""
+        with self._lock:
+            self._data[key] = (self._clock() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: K) -> Optional[V]:
+        """Удаляет запись и возвращает её значение (если была)."""
+        with self._lock:
+            item = self._data.pop(key, None)
+        return item[1] if item is not None else None
+
+    def clear(self) -> None:
+        """Удаляет все записи."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)